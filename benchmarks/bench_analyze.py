@@ -0,0 +1,101 @@
+"""
+analyzeの集計のマイクロベンチマーク
+
+StockDataを1件ずつ読んで集計する方法と、StockBatchの列をNumPy配列のまま集計する
+analyze_portfolioを比較する（評価額・損益・配当額・セクター比率の一致を確認する）。
+
+実行方法:
+    python -m benchmarks.bench_analyze --rows 100000
+"""
+
+import argparse
+import math
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from src.analysis.portfolio import analyze_portfolio
+from src.models.batch import StockBatch
+
+
+def per_stock_analyze(data):
+    """StockDataを1件ずつ読んで集計する方法（比較用）"""
+    total_value = total_cost = income = 0.0
+    by_sector = defaultdict(float)
+    for stock in data:
+        value = stock.value if stock.value is not None else (
+            stock.shares * stock.current_price
+            if stock.shares is not None and stock.current_price is not None else None)
+        if value is None:
+            continue
+        total_value += value
+        by_sector[stock.sector or "(未分類)"] += value
+        if stock.cost is not None and stock.shares is not None:
+            total_cost += stock.shares * stock.cost
+        if stock.yield_ttm is not None:
+            income += value * stock.yield_ttm
+    return total_value, total_cost, income, dict(by_sector)
+
+
+def best_of(repeat, func):
+    """funcをrepeat回実行し、最短の所要時間と結果を返す"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def build_batch(rows: int) -> StockBatch:
+    """保有情報・グレード・52週高値安値を含むダミーデータ"""
+    rng = np.random.default_rng(0)
+    sectors = ['Technology', 'Healthcare', 'Financials', 'Energy', 'Utilities', None]
+    grades = ['A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F', None]
+    price = rng.uniform(5, 500, rows)
+    low = price * rng.uniform(0.5, 1.0, rows)
+    high = price * rng.uniform(1.0, 1.8, rows)
+    shares = np.where(rng.random(rows) < 0.7, rng.integers(1, 500, rows), np.nan)
+    return StockBatch.from_columns({
+        'symbol': [f"SYM{i}" for i in range(rows)],
+        'exchange': ['NASDAQ' if i % 2 else 'NYSE' for i in range(rows)],
+        'sector': [sectors[i] for i in rng.integers(0, len(sectors), rows)],
+        'industry': [f"Industry {i}" for i in rng.integers(0, 60, rows)],
+        'current_price': price.tolist(),
+        'week52_low': low.tolist(),
+        'week52_high': high.tolist(),
+        'shares': [None if math.isnan(v) else v for v in shares.tolist()],
+        'cost': (price * rng.uniform(0.6, 1.3, rows)).tolist(),
+        'yield_ttm': [None if v < 0.01 else v for v in rng.uniform(0, 0.06, rows).tolist()],
+        'valuation_grade': [grades[i] for i in rng.integers(0, len(grades), rows)],
+        'dividend_safety': [grades[i] for i in rng.integers(0, len(grades), rows)],
+    }, length=rows)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--rows', type=int, default=100000, help='銘柄数')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='計測の繰り返し回数（最短の時間を表示）')
+    args = arg_parser.parse_args()
+
+    batch = build_batch(args.rows)
+    data = batch.to_stock_data()
+
+    per_stock_time, (total_value, total_cost, income, by_sector) = best_of(
+        args.repeat, lambda: per_stock_analyze(data))
+    vectorized_time, analysis = best_of(args.repeat, lambda: analyze_portfolio(batch))
+
+    expected = [total_value, total_cost, income] + sorted(by_sector.values())
+    actual = [analysis.total_value, analysis.total_cost, analysis.annual_income] + \
+        sorted(group.value for group in analysis.sector_weights)
+    if not np.allclose(expected, actual):
+        raise SystemExit("結果が一致しません")
+
+    print(f"rows={args.rows}, repeat={args.repeat}")
+    print(f"per-stock (StockData)         : {per_stock_time:8.3f} s")
+    print(f"analyze_portfolio (StockBatch): {vectorized_time:8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+変換時のログ出力のマイクロベンチマーク
+
+setup_loggingでINFOレベルのログ（コンソールとローテーションするログファイル）を設定した状態で、
+レコードごとにINFOログを出力する従来の変換と、進捗と要約のみをまとめて出力する
+FormatConverter.convert_listを比較する。ログを出力しない場合の所要時間も表示する。
+
+実行方法:
+    python -m benchmarks.bench_conversion_logging --records 50000
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.converters.format_converter import FormatConverter
+from src.models.stock import TradingViewData
+from src.utils.logging_config import get_logger, setup_logging
+
+
+def per_record_logging(converter, data_list, logger):
+    """レコードごとにINFOログを出力する従来の変換（比較用）"""
+    converted_list = []
+    for item in data_list:
+        logger.info(f"TradingViewDataをStockDataに変換中: {item.symbol}")
+        stock_data = converter.to_stock_data(item)
+        logger.info(f"StockDataをSeekingAlphaDataに変換中: {stock_data.symbol}")
+        converted_list.append(converter.to_platform_data(stock_data, "seekingalpha"))
+    return converted_list
+
+
+def best_of(repeat, func):
+    """funcをrepeat回実行し、最短の所要時間と結果を返す"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--records', type=int, default=50000, help='レコード数')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='計測の繰り返し回数（最短の時間を表示）')
+    args = arg_parser.parse_args()
+
+    exchanges = ['NASDAQ', 'NYSE', 'AMEX']
+    data_list = [
+        TradingViewData(symbol=f"SYM{i}", exchange=exchanges[i % 3], section=f"SECTION {i % 10}")
+        for i in range(args.records)
+    ]
+    converter = FormatConverter()
+    logger = get_logger('converters.format_converter')
+
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        # コンソールへの出力は捨て、ログファイルへの書き込みは実際と同じく行う
+        with contextlib.redirect_stderr(devnull):
+            setup_logging(log_level="INFO", log_file=str(Path(directory) / "stock_cli.log"))
+
+        per_record_time, expected = best_of(
+            args.repeat, lambda: per_record_logging(converter, data_list, logger))
+        summary_time, actual = best_of(args.repeat, lambda: converter.convert_list(data_list, "seekingalpha"))
+        logging.disable(logging.CRITICAL)
+        silent_time, _ = best_of(args.repeat, lambda: converter.convert_list(data_list, "seekingalpha"))
+        logging.disable(logging.NOTSET)
+        logging.getLogger().handlers.clear()
+
+    if [item.symbol for item in actual] != [item.symbol for item in expected]:
+        raise SystemExit("結果が一致しません")
+
+    print(f"records={args.records}, repeat={args.repeat}")
+    print(f"per-record INFO logs        : {per_record_time:8.3f} s")
+    print(f"convert_list (summary only) : {summary_time:8.3f} s")
+    print(f"convert_list (logs disabled): {silent_time:8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
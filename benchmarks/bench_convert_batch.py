@@ -0,0 +1,62 @@
+"""
+convert-batch（複数ファイルの並列変換）のベンチマーク
+
+サンプルファイルを複製した入力ディレクトリを一時ディレクトリに作成し、
+ワーカープロセス数を変えて一括変換の所要時間を比較する。
+
+実行方法:
+    python -m benchmarks.bench_convert_batch --files 64 --jobs 1 2 4
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from src.converters.batch_converter import collect_input_files, convert_files
+
+SAMPLE_DIR = Path(__file__).resolve().parent.parent / "sample"
+
+
+def make_inputs(directory: Path, files: int) -> None:
+    """TradingView/Seeking Alphaのサンプルを交互に複製して入力ファイルを作成する"""
+    samples = [SAMPLE_DIR / "US_STOCK_012ed.txt", SAMPLE_DIR / "UsStock 2025-07-30.xlsx"]
+    for i in range(files):
+        sample = samples[i % len(samples)]
+        shutil.copy(sample, directory / f"input{i:04d}{sample.suffix}")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--files', type=int, default=64, help='入力ファイル数')
+    arg_parser.add_argument('--jobs', type=int, nargs='+', default=[1, os.cpu_count() or 1],
+                            help='比較するワーカープロセス数')
+    arg_parser.add_argument('--to', default='csv', help='出力形式')
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_dir = Path(tmp) / "input"
+        input_dir.mkdir()
+        make_inputs(input_dir, args.files)
+        input_paths = collect_input_files(str(input_dir))
+
+        print(f"files={args.files} cpus={os.cpu_count()}")
+        baseline = None
+        for jobs in args.jobs:
+            output_dir = Path(tmp) / f"output_{jobs}"
+            start = time.perf_counter()
+            results = list(convert_files(input_paths, args.to, output_dir, jobs=jobs))
+            elapsed = time.perf_counter() - start
+
+            failures = [r for r in results if not r.ok]
+            if failures:
+                raise SystemExit(f"変換に失敗しました: {failures[0].input_path}: {failures[0].error}")
+            baseline = baseline or elapsed
+            print(f"jobs={jobs:<3d}: {elapsed:8.3f} s  ({args.files / elapsed:7.1f} files/s, "
+                  f"speedup {baseline / elapsed:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+convert --mergeの統合のマイクロベンチマーク
+
+StockDataを1件ずつ辞書で突き合わせて欠損を補完する方法と、StockBatchを連結して
+WatchlistIndex.mergeで列単位に統合する方法を比較する（統合後の銘柄と価格の一致を確認する）。
+行数を倍にした場合の所要時間も表示し、行数に比例する時間で統合できることを確認する。
+
+実行方法:
+    python -m benchmarks.bench_merge --rows 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.models.batch import StockBatch
+from src.models.watchlist_index import WatchlistIndex
+
+
+def per_stock_merge(sources):
+    """StockDataを1件ずつ突き合わせ、先のソースの値を優先して欠損を補完する方法（比較用）"""
+    qualified = {}
+    for data in sources:
+        for stock in data:
+            if stock.exchange:
+                qualified.setdefault(stock.symbol, stock.full_symbol)
+    merged = {}
+    for data in sources:
+        for stock in data:
+            key = stock.full_symbol if stock.exchange else qualified.get(stock.symbol, stock.symbol)
+            row = merged.setdefault(key, {})
+            for name, value in stock.model_dump().items():
+                if row.get(name) is None:
+                    row[name] = value
+    return merged
+
+
+def best_of(repeat, func):
+    """funcをrepeat回実行し、最短の所要時間と結果を返す"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def build_sources(rows: int):
+    """TradingView形式（取引所・セクションあり）とSeekingAlpha形式（取引所なし・価格あり）のダミーデータ"""
+    rng = np.random.default_rng(0)
+    tradingview = StockBatch.from_columns({
+        'symbol': [f"SYM{i}" for i in range(rows)],
+        'exchange': ['NASDAQ' if i % 2 else 'NYSE' for i in range(rows)],
+        'tradingview_section': [f"Section {i % 20}" for i in range(rows)],
+        'source_platform': ['tradingview'] * rows,
+    }, length=rows)
+    # 半分は共通の銘柄、残りはSeekingAlphaにのみある銘柄
+    symbols = rng.permutation(rows)[:rows // 2].tolist() + list(range(rows, rows + rows // 2))
+    seekingalpha = StockBatch.from_columns({
+        'symbol': [f"SYM{i}" for i in symbols],
+        'current_price': rng.uniform(5, 500, len(symbols)).tolist(),
+        'sector': ['Technology'] * len(symbols),
+        'source_platform': ['seekingalpha'] * len(symbols),
+    }, length=len(symbols))
+    return [tradingview, seekingalpha]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--rows', type=int, default=100000, help='1つ目のソースの銘柄数')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='計測の繰り返し回数（最短の時間を表示）')
+    args = arg_parser.parse_args()
+
+    sources = build_sources(args.rows)
+    data = [source.to_stock_data() for source in sources]
+
+    per_stock_time, expected = best_of(args.repeat, lambda: per_stock_merge(data))
+    merge_time, index = best_of(args.repeat, lambda: WatchlistIndex.merge(sources))
+    doubled = build_sources(args.rows * 2)
+    double_time, _ = best_of(args.repeat, lambda: WatchlistIndex.merge(doubled))
+
+    merged = index.batch
+    actual = dict(zip(merged.to_pylist('full_symbol'), merged.to_pylist('current_price')))
+    if actual != {key: row['current_price'] for key, row in expected.items()}:
+        raise SystemExit("結果が一致しません")
+
+    print(f"rows={args.rows}, repeat={args.repeat}, merged={len(merged)}")
+    print(f"per-stock (StockData)           : {per_stock_time:8.3f} s")
+    print(f"WatchlistIndex.merge (StockBatch): {merge_time:8.3f} s")
+    print(f"WatchlistIndex.merge (rows x 2)  : {double_time:8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
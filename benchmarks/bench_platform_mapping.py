@@ -0,0 +1,93 @@
+"""
+プラットフォームのデータとStockDataの相互変換のマイクロベンチマーク
+
+レコードごとにmodel_dumpした辞書のフィールド名をpopで読み替える従来の方法と、
+対応表から1回だけ組み立てた変換手順（platform_mapping）で値をまとめて取り出す方法を比較する。
+
+実行方法:
+    python -m benchmarks.bench_platform_mapping --records 50000
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from src.models.platform_mapping import from_stock_plan, to_stock_plan
+from src.models.stock import SeekingAlphaData, StockData
+
+# 従来のFormatConverterがSeekingAlphaDataとStockDataで読み替えていたフィールド名
+_RENAMES = {'company_name': 'name', 'price': 'current_price'}
+
+
+def dict_rename_to_stock(data_list, now):
+    """model_dumpした辞書のフィールド名をpopで読み替える従来の方法（比較用）"""
+    records = []
+    for sa_data in data_list:
+        record = sa_data.model_dump(exclude_none=False)
+        for sa_field, stock_field in _RENAMES.items():
+            if sa_field in record:
+                record[stock_field] = record.pop(sa_field)
+        record.update({"source_platform": "seekingalpha", "date_added": now, "date_updated": now,
+                       "notes": None, "status": "active", "tradingview_section": None})
+        records.append(record)
+    return records
+
+
+def dict_rename_from_stock(stock_list):
+    """StockDataをmodel_dumpし、フィールド名の読み替えと絞り込みを毎回行う従来の方法（比較用）"""
+    result = []
+    for stock_data in stock_list:
+        values = stock_data.model_dump(exclude_none=True)
+        for sa_field, stock_field in _RENAMES.items():
+            if stock_field in values:
+                values[sa_field] = values.pop(stock_field)
+        seekingalpha_fields = set(SeekingAlphaData.model_fields.keys())
+        result.append(SeekingAlphaData(**{k: v for k, v in values.items() if k in seekingalpha_fields}))
+    return result
+
+
+def best_of(repeat, func):
+    """funcをrepeat回実行し、最短の所要時間と結果を返す"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--records', type=int, default=50000, help='レコード数')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='計測の繰り返し回数（最短の時間を表示）')
+    args = arg_parser.parse_args()
+
+    data_list = [
+        SeekingAlphaData(symbol=f"SYM{i}", company_name=f"Company {i}", price=10.0 + i % 100, shares=float(i % 7),
+                         valuation_grade="B", yield_ttm=0.02)
+        for i in range(args.records)
+    ]
+    now = datetime.now()
+    plan = to_stock_plan('seekingalpha')
+
+    dict_to_time, expected = best_of(args.repeat, lambda: dict_rename_to_stock(data_list, now))
+    plan_to_time, actual = best_of(args.repeat, lambda: [plan.record(sa_data, now) for sa_data in data_list])
+    if actual != expected:
+        raise SystemExit("StockDataへの変換結果が一致しません")
+
+    stock_list = StockData.from_trusted_many(actual)
+    back_plan = from_stock_plan('seekingalpha')
+    dict_from_time, expected_back = best_of(args.repeat, lambda: dict_rename_from_stock(stock_list))
+    plan_from_time, actual_back = best_of(args.repeat, lambda: [back_plan.convert(s) for s in stock_list])
+    if actual_back != expected_back:
+        raise SystemExit("SeekingAlphaDataへの変換結果が一致しません")
+
+    print(f"records={args.records}, repeat={args.repeat}")
+    print(f"SeekingAlpha -> StockData  dict rename : {dict_to_time:8.3f} s")
+    print(f"SeekingAlpha -> StockData  plan        : {plan_to_time:8.3f} s")
+    print(f"StockData -> SeekingAlpha  dict rename : {dict_from_time:8.3f} s")
+    print(f"StockData -> SeekingAlpha  plan        : {plan_from_time:8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+シートの行への変換のマイクロベンチマーク
+
+sheets importでStockDataをシートの行に変換する処理について、
+セルごとに見出しの変換・getattr・型の判定を行う従来の方法と、
+見出しごとの対応を1回だけ決めて列単位で変換するRowSerializerを比較する。
+
+実行方法:
+    python -m benchmarks.bench_row_serializer --rows 50000
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from src.google_sheets.client import DEFAULT_HEADERS
+from src.google_sheets.field_mapping import RowSerializer, header_to_attribute, to_cell_value
+from src.models.batch import StockBatch
+from src.models.stock import StockData
+
+
+def per_cell_serialize(headers, data):
+    """セルごとに変換する従来の方法"""
+    return [[to_cell_value(getattr(stock, header_to_attribute(header), "")) for header in headers]
+            for stock in data]
+
+
+def best_of(repeat, func):
+    """funcをrepeat回実行し、最短の所要時間と結果を返す"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--rows', type=int, default=50000, help='行数')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='計測の繰り返し回数（最短の時間を表示）')
+    args = arg_parser.parse_args()
+
+    exchanges = ['NASDAQ', 'NYSE', 'AMEX']
+    now = datetime.now()
+    data = StockData.from_trusted_many(
+        dict(symbol=f"SYM{i}", exchange=exchanges[i % 3], full_symbol=f"{exchanges[i % 3]}:SYM{i}",
+             name=f"Company {i}", current_price=100.0 + i % 500 / 4, source_platform="tradingview",
+             date_updated=now, status="active")
+        for i in range(args.rows)
+    )
+    batch = StockBatch.from_stock_data(data)
+    headers = list(DEFAULT_HEADERS)
+
+    serializer = RowSerializer(headers)
+    per_cell_time, per_cell = best_of(args.repeat, lambda: per_cell_serialize(headers, data))
+    objects_time, from_objects = best_of(args.repeat, lambda: serializer.serialize(data))
+    batch_time, from_batch = best_of(args.repeat, lambda: serializer.serialize(batch))
+
+    if not per_cell == from_objects == from_batch:
+        raise SystemExit("結果が一致しません")
+
+    print(f"rows={args.rows}, repeat={args.repeat}")
+    print(f"per-cell                  : {per_cell_time:8.3f} s")
+    print(f"RowSerializer (StockData) : {objects_time:8.3f} s")
+    print(f"RowSerializer (StockBatch): {batch_time:8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+SeekingAlphaParserのベンチマーク
+
+銘柄ごとに各シートを走査する旧来の処理（このスクリプトのparse_symbol_data）と、
+シートをSymbolで1度だけ索引付けして列単位で変換する処理（SeekingAlphaParser._build_frame）を比較する。
+Excelの読み込み時間を除くため、4シート分のDataFrameをメモリ上で生成して計測する。
+
+実行方法:
+    python -m benchmarks.bench_seekingalpha_parser --rows 5000
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.models.stock import SeekingAlphaData
+from src.parsers.seekingalpha import SeekingAlphaParser
+
+
+def make_workbook(rows: int, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """サンプルファイルと同じ列構成のダミーワークブックを生成する"""
+    rng = random.Random(seed)
+    symbols = [f"SYM{i:05d}" for i in range(rows)]
+    grades = ['A+', 'A', 'A-', 'B+', 'B', 'B-', 'C', 'D', 'F', '-']
+
+    def num() -> object:
+        return rng.choice([round(rng.uniform(1, 500), 2), '-', None])
+
+    summary = pd.DataFrame({
+        'Symbol': symbols,
+        'Price': [num() for _ in symbols],
+        'Change': [num() for _ in symbols],
+        'Change %': [num() for _ in symbols],
+        'Volume': [rng.randint(0, 10 ** 7) for _ in symbols],
+        'Avg. Vol': [num() for _ in symbols],
+        'Day Low': [num() for _ in symbols],
+        'Day High': [num() for _ in symbols],
+        '52W Low': [num() for _ in symbols],
+        '52W High': [num() for _ in symbols],
+        'Quant Rating': [num() for _ in symbols],
+        'SA Analyst Ratings': [num() for _ in symbols],
+        'Wall Street Ratings': [num() for _ in symbols],
+    })
+    # 各シートの行順は Summary と一致しない前提でシャッフルする
+    shuffled = symbols[:]
+    rng.shuffle(shuffled)
+    ratings = pd.DataFrame({'Symbol': shuffled})
+    for column in ['Valuation Grade', 'Growth Grade', 'Profitability Grade', 'Momentum Grade', 'EPS Revision Grade']:
+        ratings[column] = [rng.choice(grades) for _ in shuffled]
+    holdings = pd.DataFrame({'Symbol': shuffled})
+    for column in ['Shares', 'Cost', 'Total Change', 'Total % Change', 'Value']:
+        holdings[column] = [num() for _ in shuffled]
+    dividends = pd.DataFrame({'Symbol': shuffled})
+    for column in ['Safety', 'Growth', 'Yield', 'Consistency']:
+        dividends[column] = [rng.choice(grades) for _ in shuffled]
+    dividends['Ex-Div Date'] = [rng.choice(['5/12/2025', '-', '12/1/2024']) for _ in shuffled]
+    dividends['Payout Date'] = [rng.choice(['5/15/2025', '-']) for _ in shuffled]
+    dividends['Frequency'] = [rng.choice(['Quarterly', 'Monthly', '-']) for _ in shuffled]
+    for column in ['Yield TTM', 'Yield FWD', 'Div Rate TTM', 'Div Rate FWD', 'Payout Ratio',
+                   'Div Growth 3Y', 'Div Growth 5Y', '24M Beta']:
+        dividends[column] = [num() for _ in shuffled]
+
+    return {'Summary': summary, 'Ratings': ratings, 'Holdings': holdings, 'Dividends': dividends}
+
+
+def parse_symbol_data(symbol: str, excel_data: Dict[str, pd.DataFrame]) -> SeekingAlphaData:
+    """特定銘柄のデータを4シートから統合する（銘柄ごとに各シートを走査する旧来の処理、比較用）"""
+    data = SeekingAlphaData(symbol=symbol)
+
+    # Summaryシートからデータ取得
+    summary_row = excel_data['Summary'][excel_data['Summary']['Symbol'] == symbol]
+    if not summary_row.empty:
+        row = summary_row.iloc[0]
+        data.price = _safe_float(row.get('Price'))
+        data.change = _safe_float(row.get('Change'))
+        data.change_percent = _safe_float(row.get('Change %'))
+        data.volume = _safe_int(row.get('Volume'))
+        data.avg_volume = _safe_float(row.get('Avg. Vol'))
+        data.day_low = _safe_float(row.get('Day Low'))
+        data.day_high = _safe_float(row.get('Day High'))
+        data.week52_low = _safe_float(row.get('52W Low'))
+        data.week52_high = _safe_float(row.get('52W High'))
+        data.quant_rating = _safe_float(row.get('Quant Rating'))
+        data.sa_analyst_rating = _safe_float(row.get('SA Analyst Ratings'))
+        data.wall_street_rating = _safe_float(row.get('Wall Street Ratings'))
+
+    # Ratingsシートからデータ取得
+    ratings_df = excel_data['Ratings']
+    ratings_row = ratings_df[ratings_df['Symbol'] == symbol]
+    if not ratings_row.empty:
+        row = ratings_row.iloc[0]
+        data.valuation_grade = _safe_str(row.get('Valuation Grade'))
+        data.growth_grade = _safe_str(row.get('Growth Grade'))
+        data.profitability_grade = _safe_str(row.get('Profitability Grade'))
+        data.momentum_grade = _safe_str(row.get('Momentum Grade'))
+        data.eps_revision_grade = _safe_str(row.get('EPS Revision Grade'))
+
+    # Holdingsシートからデータ取得
+    holdings_df = excel_data['Holdings']
+    holdings_row = holdings_df[holdings_df['Symbol'] == symbol]
+    if not holdings_row.empty:
+        row = holdings_row.iloc[0]
+        data.shares = _safe_float(row.get('Shares'))
+        data.cost = _safe_float(row.get('Cost'))
+        data.todays_gain = _safe_float(row.get("Today's Gain"))
+        data.todays_gain_percent = _safe_float(row.get("Today's % Gain"))
+        data.total_change = _safe_float(row.get('Total Change'))
+        data.total_change_percent = _safe_float(row.get('Total % Change'))
+        data.value = _safe_float(row.get('Value'))
+
+    # Dividendsシートからデータ取得
+    dividends_df = excel_data['Dividends']
+    dividends_row = dividends_df[dividends_df['Symbol'] == symbol]
+    if not dividends_row.empty:
+        row = dividends_row.iloc[0]
+        data.dividend_safety = _safe_str(row.get('Safety'))
+        data.dividend_growth = _safe_str(row.get('Growth'))
+        data.dividend_yield_grade = _safe_str(row.get('Yield'))
+        data.dividend_consistency = _safe_str(row.get('Consistency'))
+        data.ex_dividend_date = _safe_date(row.get('Ex-Div Date'))
+        data.payout_date = _safe_date(row.get('Payout Date'))
+        data.frequency = _safe_str(row.get('Frequency'))
+        data.yield_ttm = _safe_float(row.get('Yield TTM'))
+        data.yield_forward = _safe_float(row.get('Yield FWD'))
+        data.dividend_rate_ttm = _safe_float(row.get('Div Rate TTM'))
+        data.dividend_rate_forward = _safe_float(row.get('Div Rate FWD'))
+        data.payout_ratio = _safe_float(row.get('Payout Ratio'))
+        data.dividend_growth_3y = _safe_float(row.get('Div Growth 3Y'))
+        data.dividend_growth_5y = _safe_float(row.get('Div Growth 5Y'))
+        data.beta_24m = _safe_float(row.get('24M Beta'))
+
+    return data
+
+
+def _safe_float(value: Any) -> Optional[float]:
+    """安全なfloat変換（'-'や空値を処理）"""
+    if pd.isna(value) or value == '-' or value == '':
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _safe_int(value: Any) -> Optional[int]:
+    """安全なint変換"""
+    if pd.isna(value) or value == '-' or value == '':
+        return None
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return None
+
+
+def _safe_str(value: Any) -> Optional[str]:
+    """安全なstring変換"""
+    if pd.isna(value) or value == '-' or value == '':
+        return None
+    return str(value).strip()
+
+
+def _safe_date(value: Any) -> Optional[str]:
+    """安全な日付変換"""
+    if pd.isna(value) or value == '-' or value == '':
+        return None
+    try:
+        # M/D/YYYY形式をYYYY-MM-DD形式に変換
+        if isinstance(value, str) and '/' in value:
+            parts = value.split('/')
+            if len(parts) == 3:
+                month, day, year = parts
+                return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+        return str(value)
+    except:
+        return None
+
+
+def per_symbol_parse(excel_data: Dict[str, pd.DataFrame]) -> List[SeekingAlphaData]:
+    """Summaryシートの銘柄ごとにparse_symbol_dataを呼ぶ旧来の処理（比較用）"""
+    symbols = excel_data['Summary']['Symbol'].dropna().tolist()
+    return [parse_symbol_data(symbol, excel_data) for symbol in symbols]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--rows', type=int, default=5000, help='銘柄数')
+    args = arg_parser.parse_args()
+
+    parser = SeekingAlphaParser()
+    excel_data = make_workbook(args.rows)
+
+    start = time.perf_counter()
+    legacy = per_symbol_parse(excel_data)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = parser._frame_to_data(parser._build_frame(excel_data))
+    vectorized_time = time.perf_counter() - start
+
+    if [d.model_dump() for d in legacy] != [d.model_dump() for d in vectorized]:
+        raise SystemExit("結果が一致しません")
+
+    print(f"rows={args.rows}")
+    print(f"per-symbol loop : {legacy_time:8.3f} s")
+    print(f"vectorized      : {vectorized_time:8.3f} s")
+    print(f"speedup         : {legacy_time / vectorized_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+シートのエクスポート変換のマイクロベンチマーク
+
+sheets exportでシートの内容をStockBatchに変換する処理について、
+レコード（辞書）ごとにStockDataを生成する従来の方法（get_all_records + from_records）と、
+値を列単位で変換する方法（get_all_values + from_values）を比較する。API呼び出しは計測対象外。
+
+実行方法:
+    python -m benchmarks.bench_sheet_export --rows 50000
+"""
+
+import argparse
+import logging
+import time
+
+from src.converters.format_converter import FormatConverter
+from src.google_sheets.client import DEFAULT_HEADERS
+from src.models.batch import StockBatch
+
+# 行ごとのログ出力は計測対象外
+logging.disable(logging.CRITICAL)
+
+
+def make_values(rows: int) -> list:
+    """get_all_values()の戻り値を模したシートの値を生成する"""
+    exchanges = ['NASDAQ', 'NYSE', 'AMEX']
+    values = [list(DEFAULT_HEADERS)]
+    for i in range(rows):
+        row = []
+        for header in DEFAULT_HEADERS:
+            key = header.lower()
+            if key == 'symbol':
+                row.append(f"SYM{i}")
+            elif key == 'exchange':
+                row.append(exchanges[i % 3])
+            elif key in ('current_price', 'quant_rating', 'yield_ttm'):
+                row.append(100.0 + i % 500 / 4)
+            elif key == 'date_updated':
+                row.append("2024-05-01T09:30:00")
+            elif key == 'company_name':
+                row.append(f"Company {i}")
+            else:
+                row.append("")
+        values.append(row)
+    return values
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--rows', type=int, default=50000, help='シートの行数')
+    args = arg_parser.parse_args()
+
+    values = make_values(args.rows)
+    # get_all_records()はヘッダーをキーとする辞書のリストを返す
+    records = [dict(zip(values[0], row)) for row in values[1:]]
+    converter = FormatConverter()
+
+    start = time.perf_counter()
+    from_records = StockBatch.from_stock_data(converter.from_records(records))
+    records_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from_values = converter.from_values(values)
+    values_time = time.perf_counter() - start
+
+    if len(from_records) != len(from_values) or \
+            from_records.to_pylist('full_symbol') != from_values.to_pylist('full_symbol'):
+        raise SystemExit("結果が一致しません")
+
+    print(f"rows={args.rows}")
+    print(f"from_records : {records_time:8.3f} s")
+    print(f"from_values  : {values_time:8.3f} s")
+    print(f"speedup      : {records_time / values_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+StockData生成のマイクロベンチマーク
+
+TradingViewDataからStockDataを生成する際の、フィールド単位のバリデーションを伴う
+従来の生成方法（StockData(...)に全フィールドを渡す）と、
+検証済みデータ向けの一括生成（FormatConverter.to_stock_data_many）を比較する。
+
+実行方法:
+    python -m benchmarks.bench_stock_data_construction --records 100000
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime
+
+from src.converters.format_converter import FormatConverter
+from src.models.stock import StockData, TradingViewData
+
+# 銘柄ごとのログ出力は計測対象外
+logging.disable(logging.CRITICAL)
+
+# 従来の_from_tradingview_to_stock_dataが明示的にNoneを渡していたフィールド
+_NONE_FIELDS = [
+    name for name in StockData.model_fields
+    if name not in ('symbol', 'exchange', 'full_symbol', 'source_platform', 'date_added',
+                    'date_updated', 'tradingview_section', 'status', 'sector', 'industry')
+]
+
+
+def validated_construction(data_list):
+    """バリデーションを伴う従来の生成方法"""
+    result = []
+    for tv_data in data_list:
+        full_symbol = f"{tv_data.exchange}:{tv_data.symbol}" if tv_data.exchange else tv_data.symbol
+        result.append(StockData(
+            symbol=tv_data.symbol,
+            exchange=tv_data.exchange,
+            full_symbol=full_symbol,
+            source_platform="tradingview",
+            date_added=datetime.now(),
+            date_updated=datetime.now(),
+            tradingview_section=tv_data.section,
+            status="active",
+            **{name: None for name in _NONE_FIELDS}
+        ))
+    return result
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--records', type=int, default=100000, help='レコード数')
+    args = arg_parser.parse_args()
+
+    exchanges = ['NASDAQ', 'NYSE', 'AMEX']
+    data_list = [
+        TradingViewData(symbol=f"SYM{i}", exchange=exchanges[i % 3], section=f"SECTION {i % 10}")
+        for i in range(args.records)
+    ]
+    converter = FormatConverter()
+
+    start = time.perf_counter()
+    validated = validated_construction(data_list)
+    validated_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trusted = converter.to_stock_data_many(data_list)
+    trusted_time = time.perf_counter() - start
+
+    exclude = {'date_added', 'date_updated'}
+    if [s.model_dump(exclude=exclude) for s in validated] != [s.model_dump(exclude=exclude) for s in trusted]:
+        raise SystemExit("結果が一致しません")
+
+    print(f"records={args.records}")
+    print(f"validated StockData(...) : {validated_time:8.3f} s")
+    print(f"to_stock_data_many       : {trusted_time:8.3f} s")
+    print(f"speedup                  : {validated_time / trusted_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+銘柄索引による取引所の補完のマイクロベンチマーク
+
+変換のたびに対応表のJSONを読み込んで辞書で引く方法と、build-symbol-indexで作成した索引を
+SymbolResolverでメモリマップして列ごとに二分探索する方法を比較する（読み込みから検索までの時間、結果の一致を確認する）。
+
+実行方法:
+    python -m benchmarks.bench_symbol_resolver --entries 500000 --rows 10000
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.converters.symbol_resolver import SymbolResolver, build_symbol_index, load_symbol_mapping
+
+
+def dict_lookup(mapping_path, symbols):
+    """対応表のJSONを読み込み、辞書で1件ずつ引く方法（比較用）"""
+    with open(mapping_path, 'r', encoding='utf-8') as f:
+        mapping = json.load(f)
+    return [mapping.get(symbol) for symbol in symbols]
+
+
+def best_of(repeat, func):
+    """funcをrepeat回実行し、最短の所要時間と結果を返す"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--entries', type=int, default=500000, help='対応表の銘柄数')
+    arg_parser.add_argument('--rows', type=int, default=10000, help='1回の変換で取引所を引く行数')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='計測の繰り返し回数（最短の時間を表示）')
+    args = arg_parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    exchanges = ['NASDAQ', 'NYSE', 'AMEX', 'TSE', 'LSE', 'FRA', 'TSX', 'HKEX']
+    mapping = {f"S{i:06d}": exchanges[i % len(exchanges)] for i in range(args.entries)}
+    # 1割は対応表に無いシンボル
+    symbols = [f"S{i:06d}" for i in rng.integers(0, int(args.entries * 1.1), args.rows)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        mapping_path = Path(directory) / "symbol_mapping.json"
+        mapping_path.write_text(json.dumps(mapping), encoding='utf-8')
+        index_path = Path(directory) / "symbol-index.bin"
+
+        build_time, count = best_of(1, lambda: build_symbol_index(load_symbol_mapping(mapping_path), index_path))
+        dict_time, expected = best_of(args.repeat, lambda: dict_lookup(mapping_path, symbols))
+        # 変換ごとに新しいプロセスで索引を開く場合と同じく、毎回SymbolResolverを作り直す
+        index_time, actual = best_of(args.repeat, lambda: SymbolResolver(index_path).lookup_many(symbols))
+
+        if actual != expected:
+            raise SystemExit("結果が一致しません")
+
+        print(f"entries={count}, rows={args.rows}, repeat={args.repeat}, "
+              f"index size={index_path.stat().st_size / 1024 / 1024:.1f} MB")
+        print(f"build-symbol-index (1回のみ)       : {build_time:8.3f} s")
+        print(f"JSON + dict (変換ごと)             : {dict_time:8.3f} s")
+        print(f"SymbolResolver (memmap, 変換ごと)  : {index_time:8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
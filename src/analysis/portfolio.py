@@ -0,0 +1,228 @@
+"""ウォッチリスト・保有銘柄の集計モジュール"""
+from typing import Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.models.batch import StockBatch
+
+# 分布を集計するグレードの列
+GRADE_FIELDS = (
+    'valuation_grade', 'growth_grade', 'profitability_grade', 'momentum_grade', 'eps_revision_grade',
+    'dividend_safety', 'dividend_growth', 'dividend_yield_grade', 'dividend_consistency',
+)
+
+# グレードの表示順（これ以外の値は出現順に末尾に並べる）
+GRADE_ORDER = ('A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F')
+
+# セクター・業種が無い銘柄をまとめる区分名
+UNCLASSIFIED = "(未分類)"
+
+
+class GroupWeight(BaseModel):
+    """セクター・業種ごとの集計"""
+    name: str
+    count: int
+    # 評価額の合計（保有情報が無い場合は銘柄数）と全体に占める割合
+    value: float
+    weight: float
+    # 配当利回り（TTM）から見込む年間配当額
+    income: float
+
+
+class RangePosition(BaseModel):
+    """52週の高値・安値に対する現在価格の位置（割合は0.05 = 5%）"""
+    symbol: str
+    price: float
+    week52_low: float
+    week52_high: float
+    below_high: float
+    above_low: float
+
+
+class PortfolioAnalysis(BaseModel):
+    """
+    ウォッチリスト・保有銘柄の集計結果（割合は0.05 = 5%）
+
+    評価額はvalue列（無い場合はshares x current_price）、取得額はshares x cost（costは1株あたりの取得単価）とする。
+    保有情報が無いウォッチリストでは、セクター・業種の比率は銘柄数で計算する。
+    """
+    stock_count: int
+    holding_count: int
+    total_value: float
+    total_cost: float
+    unrealized_pnl: float
+    unrealized_return: Optional[float] = None
+    annual_income: float
+    weighted_yield: Optional[float] = None
+    sector_weights: List[GroupWeight] = []
+    industry_weights: List[GroupWeight] = []
+    # グレードの列 -> グレード -> 銘柄数
+    grade_distributions: Dict[str, Dict[str, int]] = {}
+    # 52週の高値・安値と現在価格が揃っている銘柄数と、高値からの下落率の中央値
+    range_count: int = 0
+    median_below_high: Optional[float] = None
+    near_high_count: int = 0
+    near_low_count: int = 0
+    nearest_highs: List[RangePosition] = []
+    nearest_lows: List[RangePosition] = []
+
+
+def analyze_portfolio(batch: StockBatch, top: int = 5, near_threshold: float = 0.05) -> PortfolioAnalysis:
+    """
+    StockBatchの列をNumPy配列のまま集計する（銘柄ごとのPythonのループは行わない）
+
+    Args:
+        batch: 集計するデータ
+        top: 52週高値・安値に近い銘柄を何件まで返すか
+        near_threshold: 52週高値・安値に「近い」とみなす割合
+    """
+    price = batch.column('current_price')
+    shares = batch.column('shares')
+    value = batch.column('value')
+
+    # 評価額はvalue列を優先し、無い銘柄は保有株数と現在価格から求める
+    market_value = np.where(np.isnan(value), shares * price, value)
+    held = np.isfinite(market_value)
+    cost_basis = shares * batch.column('cost')
+    with_cost = held & np.isfinite(cost_basis)
+    total_cost = float(cost_basis[with_cost].sum())
+    unrealized_pnl = float((market_value[with_cost] - cost_basis[with_cost]).sum())
+
+    yield_ttm = batch.column('yield_ttm')
+    income = np.where(held & np.isfinite(yield_ttm), market_value * yield_ttm, 0.0)
+    with_yield = held & np.isfinite(yield_ttm)
+    if with_yield.any():
+        yield_base = market_value[with_yield].sum()
+        weighted_yield = float(income.sum() / yield_base) if yield_base else None
+    elif np.isfinite(yield_ttm).any():
+        # 保有情報が無い場合は単純平均
+        weighted_yield = float(np.nanmean(yield_ttm))
+    else:
+        weighted_yield = None
+
+    # 保有情報があれば評価額、無ければ銘柄数でセクター・業種の比率を計算する
+    weights = np.where(held, market_value, 0.0) if held.any() else np.ones(len(batch))
+
+    analysis = PortfolioAnalysis(
+        stock_count=len(batch),
+        holding_count=int(held.sum()),
+        total_value=float(market_value[held].sum()),
+        total_cost=total_cost,
+        unrealized_pnl=unrealized_pnl,
+        unrealized_return=unrealized_pnl / total_cost if total_cost else None,
+        annual_income=float(income.sum()),
+        weighted_yield=weighted_yield,
+        sector_weights=_group_weights(batch, 'sector', weights, income),
+        industry_weights=_group_weights(batch, 'industry', weights, income),
+        grade_distributions={
+            field: distribution for field in GRADE_FIELDS if (distribution := _grade_distribution(batch, field))
+        },
+    )
+    _add_range_positions(analysis, batch, price, top, near_threshold)
+    return analysis
+
+
+def _group_weights(batch: StockBatch, field: str, weights: np.ndarray, income: np.ndarray) -> List[GroupWeight]:
+    """辞書エンコードされた列のコードごとに銘柄数・評価額・配当額を合計し、評価額の大きい順に返す"""
+    names = batch.categories(field) + [UNCLASSIFIED]
+    codes = batch.codes(field)
+    index = np.where(codes < 0, len(names) - 1, codes)
+    counts = np.bincount(index, minlength=len(names))
+    values = np.bincount(index, weights=weights, minlength=len(names))
+    incomes = np.bincount(index, weights=income, minlength=len(names))
+    total = values.sum()
+    return [
+        GroupWeight(name=names[i], count=int(counts[i]), value=float(values[i]),
+                    weight=float(values[i] / total) if total else 0.0, income=float(incomes[i]))
+        for i in np.argsort(-values, kind='stable') if counts[i]
+    ]
+
+
+def _grade_distribution(batch: StockBatch, field: str) -> Dict[str, int]:
+    """グレードごとの銘柄数をGRADE_ORDERの順に返す（欠損は数えない）"""
+    names = batch.categories(field)
+    codes = batch.codes(field)
+    counts = np.bincount(codes[codes >= 0], minlength=len(names))
+    rank = {grade: i for i, grade in enumerate(GRADE_ORDER)}
+    order = sorted(range(len(names)), key=lambda i: rank.get(names[i], len(rank)))
+    return {names[i]: int(counts[i]) for i in order if counts[i]}
+
+
+def _add_range_positions(analysis: PortfolioAnalysis, batch: StockBatch, price: np.ndarray,
+                         top: int, near_threshold: float) -> None:
+    """52週の高値・安値に対する現在価格の位置を集計してanalysisに設定する"""
+    low = batch.column('week52_low')
+    high = batch.column('week52_high')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mask = np.isfinite(price) & np.isfinite(low) & np.isfinite(high) & (price > 0) & (low > 0)
+        index = np.flatnonzero(mask)
+        below_high = 1.0 - price[index] / high[index]
+        above_low = price[index] / low[index] - 1.0
+
+    analysis.range_count = len(index)
+    if not len(index):
+        return
+    analysis.median_below_high = float(np.median(below_high))
+    analysis.near_high_count = int((below_high <= near_threshold).sum())
+    analysis.near_low_count = int((above_low <= near_threshold).sum())
+
+    symbols = batch.column('full_symbol')
+
+    def nearest(distance: np.ndarray) -> List[RangePosition]:
+        count = min(top, len(distance))
+        if count <= 0:
+            return []
+        candidates = np.argpartition(distance, count - 1)[:count]
+        chosen = candidates[np.argsort(distance[candidates], kind='stable')]
+        return [
+            RangePosition(symbol=symbols[index[i]], price=float(price[index[i]]),
+                          week52_low=float(low[index[i]]), week52_high=float(high[index[i]]),
+                          below_high=float(below_high[i]), above_low=float(above_low[i]))
+            for i in chosen
+        ]
+
+    analysis.nearest_highs = nearest(below_high)
+    analysis.nearest_lows = nearest(above_low)
+
+
+def format_report(analysis: PortfolioAnalysis, top: int = 10) -> str:
+    """集計結果をテキストのレポートにする（セクター・業種は上位top件まで）"""
+    def percent(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value * 100:.2f}%"
+
+    lines = [f"銘柄数: {analysis.stock_count}（保有: {analysis.holding_count}）"]
+    if analysis.holding_count:
+        lines.extend([
+            f"評価額: {analysis.total_value:,.2f}",
+            f"取得額: {analysis.total_cost:,.2f}",
+            f"評価損益: {analysis.unrealized_pnl:+,.2f} ({percent(analysis.unrealized_return)})",
+            f"年間配当（見込み）: {analysis.annual_income:,.2f}",
+        ])
+    lines.append(f"配当利回り: {percent(analysis.weighted_yield)}")
+    for title, groups in (("セクター", analysis.sector_weights), ("業種", analysis.industry_weights)):
+        if not groups or (len(groups) == 1 and groups[0].name == UNCLASSIFIED):
+            continue
+        lines.append("")
+        lines.append(f"[{title}]")
+        lines.extend(f"  {group.name}: {percent(group.weight)} ({group.count}銘柄)" for group in groups[:top])
+        if len(groups) > top:
+            lines.append(f"  ...他{len(groups) - top}件")
+    if analysis.grade_distributions:
+        lines.append("")
+        lines.append("[グレード分布]")
+        for field, distribution in analysis.grade_distributions.items():
+            counts = ", ".join(f"{grade}: {count}" for grade, count in distribution.items())
+            lines.append(f"  {field}: {counts}")
+    if analysis.range_count:
+        lines.append("")
+        lines.append(f"[52週高値・安値] 対象: {analysis.range_count}銘柄  "
+                     f"高値からの下落率（中央値）: {percent(analysis.median_below_high)}  "
+                     f"高値圏: {analysis.near_high_count}銘柄  安値圏: {analysis.near_low_count}銘柄")
+        for title, positions in (("高値に近い銘柄", analysis.nearest_highs),
+                                 ("安値に近い銘柄", analysis.nearest_lows)):
+            if positions:
+                lines.append(f"  {title}: " + ", ".join(
+                    f"{p.symbol} (高値-{percent(p.below_high)}, 安値+{percent(p.above_low)})" for p in positions
+                ))
+    return "\n".join(lines)
@@ -17,6 +17,9 @@ class GoogleSheetsConfig(BaseModel):
     default_spreadsheet_id: str = ""
     sheet_name: str = "Stock_Data"
     batch_size: int = 100
+    # Sheets APIの書き込みクォータ（毎分のリクエスト数）と、429/5xxエラー時の再試行回数
+    requests_per_minute: int = 60
+    max_retries: int = 5
 
 
 class TradingViewConfig(BaseModel):
@@ -58,6 +61,14 @@ class ConversionConfig(BaseModel):
     auto_detect_exchange: bool = True
     fallback_exchange: str = "NASDAQ"
     preserve_sections: bool = True
+    output_buffer_size: int = 1024 * 1024
+
+
+class CacheConfig(BaseModel):
+    """解析キャッシュ設定"""
+    enabled: bool = True
+    directory: str = "~/.cache/stock-watchlist-cli"
+    max_size_mb: int = 512
 
 
 class DevelopmentConfig(BaseModel):
@@ -73,6 +84,7 @@ class AppConfig(BaseModel):
     platforms: PlatformsConfig = Field(default_factory=PlatformsConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     conversion: ConversionConfig = Field(default_factory=ConversionConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
     development: DevelopmentConfig = Field(default_factory=DevelopmentConfig)
 
 
@@ -127,7 +139,9 @@ class ConfigManager:
                 "oauth_port": 8080,
                 "default_spreadsheet_id": "",
                 "sheet_name": "Stock_Data",
-                "batch_size": 100
+                "batch_size": 100,
+                "requests_per_minute": 60,
+                "max_retries": 5
             },
             "platforms": {
                 "tradingview": {
@@ -152,7 +166,13 @@ class ConfigManager:
                 "symbol_mapping_file": "symbol_mapping.json",
                 "auto_detect_exchange": True,
                 "fallback_exchange": "NASDAQ",
-                "preserve_sections": True
+                "preserve_sections": True,
+                "output_buffer_size": 1048576
+            },
+            "cache": {
+                "enabled": True,
+                "directory": "${STOCK_CLI_CACHE_DIR:~/.cache/stock-watchlist-cli}",
+                "max_size_mb": 512
             },
             "development": {
                 "debug_mode": "${DEVELOPMENT_MODE:false}",
@@ -0,0 +1,199 @@
+"""複数ファイルの一括変換"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pydantic import BaseModel
+
+from src.converters.format_converter import FormatConverter
+from src.parsers.registry import registry
+from src.utils.file_io import DEFAULT_OUTPUT_BUFFER_SIZE
+from src.utils.logging_config import get_logger
+from src.utils.parse_cache import ParseCache
+
+if TYPE_CHECKING:
+    from src.converters.symbol_resolver import SymbolResolver
+
+logger = get_logger(__name__)
+
+# 出力形式 -> 出力ファイルの拡張子
+OUTPUT_EXTENSIONS: Dict[str, str] = {
+    'tradingview': '.txt',
+    'seekingalpha': '.csv',
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+
+class FileConversionResult(BaseModel):
+    """1ファイル分の変換結果（シートからのエクスポートではinput_pathは 'スプレッドシートID:シート名'）"""
+    input_path: str
+    output_path: Optional[str] = None
+    rows: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def collect_input_files(pattern: str) -> List[Path]:
+    """
+    ディレクトリまたはglobパターンから入力ファイルの一覧を返す
+    ディレクトリの場合は直下の対応拡張子のファイルのみを対象とする。
+    """
+    path = Path(pattern)
+    if path.is_dir():
+        return sorted(p for p in path.iterdir() if p.is_file() and registry.is_supported_path(p))
+    return sorted(Path(p) for p in glob.glob(pattern, recursive=True) if Path(p).is_file())
+
+
+def output_path_for(input_path: Path, output_dir: Path, to_format: str) -> Path:
+    """入力ファイル名と出力形式から出力ファイルのパスを決める"""
+    return output_dir / f"{input_path.stem}{OUTPUT_EXTENSIONS[to_format]}"
+
+
+def sheet_output_path(output_dir: Path, sheet_name: str, to_format: str, prefix: str = "") -> Path:
+    """シート名と出力形式から出力ファイルのパスを決める（ファイル名に使えない文字は '_' に置き換える）"""
+    safe_sheet_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in sheet_name)
+    return output_dir / f"{prefix}{safe_sheet_name}{OUTPUT_EXTENSIONS[to_format]}"
+
+
+def convert_file(input_path: str, to_format: str, output_path: str, preserve_sections: bool = False,
+                 buffer_size: int = DEFAULT_OUTPUT_BUFFER_SIZE,
+                 cache: Optional[ParseCache] = None,
+                 resolver: Optional['SymbolResolver'] = None) -> FileConversionResult:
+    """
+    1ファイルを変換して結果を返す（ワーカープロセスから呼び出される）
+    入力形式はファイル先頭から判定する。resolverを指定した場合は取引所の無い行の取引所を補完する。
+    例外は送出せず、エラーメッセージを結果に格納する。
+    """
+    started = time.perf_counter()
+    try:
+        converter = FormatConverter()
+        stock_batch = converter.read_file(input_path, "auto", cache)
+        if resolver is not None:
+            stock_batch, _ = resolver.resolve_batch(stock_batch)
+        converter.write_file(stock_batch, to_format, output_path, preserve_sections, buffer_size)
+        return FileConversionResult(input_path=input_path, output_path=output_path, rows=len(stock_batch),
+                                    elapsed=time.perf_counter() - started)
+    except Exception as e:
+        logger.error(f"{input_path} の変換中にエラーが発生しました: {e}")
+        return FileConversionResult(input_path=input_path, error=str(e) or type(e).__name__,
+                                    elapsed=time.perf_counter() - started)
+
+
+def convert_files(input_paths: List[Path], to_format: str, output_dir: Union[str, Path],
+                  jobs: Optional[int] = None, preserve_sections: bool = False,
+                  buffer_size: int = DEFAULT_OUTPUT_BUFFER_SIZE,
+                  cache: Optional[ParseCache] = None,
+                  resolver: Optional['SymbolResolver'] = None) -> Iterator[FileConversionResult]:
+    """
+    複数ファイルをプロセスプールで並列に変換し、完了した順に結果を返す
+
+    Args:
+        input_paths: 入力ファイルのリスト
+        to_format: 出力形式
+        output_dir: 出力ディレクトリ
+        jobs: ワーカープロセス数（Noneの場合はCPU数、1の場合は現在のプロセスで順に変換）
+        preserve_sections: TradingView形式への変換時にセクション情報を保持する
+        buffer_size: 出力ファイルのバッファサイズ
+        cache: 解析キャッシュ（Noneの場合は使用しない）
+        resolver: 取引所の無い行の取引所を補完する銘柄索引（Noneの場合は補完しない）
+
+    Raises:
+        ValueError: 出力ファイル名が重複する場合
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = []
+    seen: Dict[Path, Path] = {}
+    for input_path in input_paths:
+        output_path = output_path_for(input_path, output_dir, to_format)
+        if output_path in seen:
+            raise ValueError(f"出力ファイル名が重複します: {seen[output_path]} と {input_path} -> {output_path}")
+        seen[output_path] = input_path
+        tasks.append((str(input_path), to_format, str(output_path), preserve_sections, buffer_size, cache, resolver))
+
+    yield from _run_tasks(convert_file, tasks, jobs)
+
+
+def export_sheet_values(label: str, values: List[List[Any]], to_format: str, output_path: str,
+                        preserve_sections: bool = False,
+                        buffer_size: int = DEFAULT_OUTPUT_BUFFER_SIZE) -> FileConversionResult:
+    """
+    1シート分の値（1行目はヘッダー）を変換してファイルに書き込み、結果を返す（ワーカープロセスから呼び出される）
+    例外は送出せず、エラーメッセージを結果に格納する。
+    """
+    started = time.perf_counter()
+    try:
+        converter = FormatConverter()
+        stock_batch = converter.from_values(values)
+        converter.write_file(stock_batch, to_format, output_path, preserve_sections, buffer_size)
+        return FileConversionResult(input_path=label, output_path=output_path, rows=len(stock_batch),
+                                    elapsed=time.perf_counter() - started)
+    except Exception as e:
+        logger.error(f"{label} のエクスポート中にエラーが発生しました: {e}")
+        return FileConversionResult(input_path=label, error=str(e) or type(e).__name__,
+                                    elapsed=time.perf_counter() - started)
+
+
+def export_sheets(spreadsheet_id: str, sheet_values: Dict[str, List[List[Any]]], to_format: str,
+                  output_dir: Union[str, Path], jobs: Optional[int] = None, preserve_sections: bool = False,
+                  buffer_size: int = DEFAULT_OUTPUT_BUFFER_SIZE) -> Iterator[FileConversionResult]:
+    """
+    1つのスプレッドシートから取得した複数のシートの値を、プロセスプールで並列に変換して
+    シートごとのファイルに書き込み、完了した順に結果を返す
+
+    Args:
+        spreadsheet_id: 取得元のスプレッドシートID（結果の表示に使用する）
+        sheet_values: シート名 -> シートの値（GoogleSheetsClient.get_values_manyの結果）
+        to_format: 出力形式
+        output_dir: 出力ディレクトリ（ファイル名はシート名から決める）
+        jobs: ワーカープロセス数（Noneの場合はCPU数、1の場合は現在のプロセスで順に変換）
+        preserve_sections: TradingView形式への変換時にセクション情報を保持する
+        buffer_size: 出力ファイルのバッファサイズ
+
+    Raises:
+        ValueError: 出力ファイル名が重複する場合
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = []
+    seen: Dict[Path, str] = {}
+    for sheet_name, values in sheet_values.items():
+        output_path = sheet_output_path(output_dir, sheet_name, to_format)
+        if output_path in seen:
+            raise ValueError(f"出力ファイル名が重複します: '{seen[output_path]}' と '{sheet_name}' -> {output_path}")
+        seen[output_path] = sheet_name
+        tasks.append((f"{spreadsheet_id}:{sheet_name}", values, to_format, str(output_path),
+                      preserve_sections, buffer_size))
+
+    yield from _run_tasks(export_sheet_values, tasks, jobs)
+
+
+def _run_tasks(worker: Callable[..., FileConversionResult], tasks: Sequence[Tuple],
+               jobs: Optional[int]) -> Iterator[FileConversionResult]:
+    """tasksの各引数でworkerをプロセスプールで実行し、完了した順に結果を返す（taskの先頭は結果の識別名）"""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield worker(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+        futures = {executor.submit(worker, *task): task[0] for task in tasks}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # ワーカープロセスの異常終了など、worker内で捕捉できなかったエラー
+                yield FileConversionResult(input_path=futures[future], error=str(e) or type(e).__name__)
@@ -1,10 +1,105 @@
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import csv
+import io
+from typing import List, Dict, Any, Optional, Union, Iterable, Tuple, TextIO
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
 from src.models.stock import StockData, TradingViewData, SeekingAlphaData, PlatformData
-from src.utils.logging_config import get_logger
+from src.models.batch import FIELD_KINDS, StockBatch
+from src.models.platform_mapping import PLATFORM_MAPPINGS, from_stock_plan, platform_for_model, to_stock_plan
+from src.google_sheets.field_mapping import header_to_attribute
+from src.utils.logging_config import ProgressLogger, get_logger
+from src.utils.optional_deps import import_pyarrow
+from src.utils.file_io import open_text_output, DEFAULT_OUTPUT_BUFFER_SIZE
+from src.utils.parse_cache import ParseCache
+from src.parsers.registry import detect_format, create_parser
 
 logger = get_logger(__name__)
 
+# StockBatchからCSVを書き出す際に一度に取り出す行数
+CSV_ROW_CHUNK_SIZE = 10000
+
+# シートの値をStockBatchに変換する際に、空のセルを既定値で埋めるフィールド
+SHEET_VALUE_DEFAULTS = {'source_platform': 'googlesheets', 'status': 'active'}
+
+
+def _coerce_float_column(values: List[Any]) -> Tuple[np.ndarray, List[int]]:
+    """列をfloat64配列に変換する（空セルはNaN）。変換できない値の行番号も返す"""
+    cleaned = [np.nan if v == "" or v is None else v for v in values]
+    try:
+        # 全ての値が数値・数値文字列の場合は1回で変換できる
+        return np.array(cleaned, dtype=np.float64), []
+    except (TypeError, ValueError):
+        pass
+    array = np.empty(len(cleaned), dtype=np.float64)
+    invalid = []
+    for i, v in enumerate(cleaned):
+        try:
+            array[i] = float(v)
+        except (TypeError, ValueError):
+            array[i] = np.nan
+            invalid.append(i)
+    return array, invalid
+
+
+def _coerce_int_column(values: List[Any]) -> Tuple[List[Optional[int]], List[int]]:
+    """列を整数のリストに変換する（空セルはNone）。小数を含む値も変換できない値として扱う"""
+    array, invalid = _coerce_float_column(values)
+    missing = np.isnan(array)
+    fractional = ~missing & (np.floor(array) != array)
+    invalid = sorted(set(invalid) | set(np.flatnonzero(fractional).tolist()))
+    return [None if m else int(v) for v, m in zip(array.tolist(), missing.tolist())], invalid
+
+
+def _coerce_datetime_column(values: List[Any]) -> Tuple[List[Optional[datetime]], List[int]]:
+    """列をdatetimeのリストに変換する（ISO 8601形式の文字列を受け付け、空セルはNone）"""
+    result: List[Optional[datetime]] = []
+    invalid = []
+    for i, v in enumerate(values):
+        if v == "" or v is None:
+            result.append(None)
+        elif isinstance(v, datetime):
+            result.append(v)
+        else:
+            try:
+                parsed = datetime.fromisoformat(str(v).strip())
+            except ValueError:
+                result.append(None)
+                invalid.append(i)
+                continue
+            # 列はタイムゾーンを持たないため、タイムゾーン付きの日時はUTCに揃える
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            result.append(parsed)
+    return result, invalid
+
+
+def _coerce_str_column(values: List[Any]) -> Tuple[List[Optional[str]], List[int]]:
+    """列を文字列のリストに変換する（空セルはNone、整数値の数値は小数点なしの文字列にする）"""
+    result: List[Optional[str]] = []
+    for v in values:
+        if v == "" or v is None:
+            result.append(None)
+        elif isinstance(v, str):
+            result.append(v)
+        elif isinstance(v, float) and v.is_integer():
+            result.append(str(int(v)))
+        else:
+            result.append(str(v))
+    return result, []
+
+
+# 列の種類 -> シートの値の列を変換する関数
+_SHEET_COLUMN_COERCERS = {
+    'float': _coerce_float_column,
+    'int': _coerce_int_column,
+    'datetime': _coerce_datetime_column,
+    'category': _coerce_str_column,
+    'str': _coerce_str_column,
+}
+
 class FormatConverter:
     """
     異なるプラットフォームの株式データを相互に変換するクラス。
@@ -19,197 +114,246 @@ class FormatConverter:
         """
         TradingViewDataまたはSeekingAlphaDataをStockDataに変換する。
         """
-        if isinstance(platform_data, TradingViewData):
-            return self._from_tradingview_to_stock_data(platform_data)
-        elif isinstance(platform_data, SeekingAlphaData):
-            return self._from_seekingalpha_to_stock_data(platform_data)
-        else:
-            raise ValueError(f"サポートされていないデータ型です: {type(platform_data)}")
+        # レコードごとの詳細はDEBUGレベルのみ（無効な場合は文字列を組み立てない）
+        logger.debug("%sをStockDataに変換中: %s", type(platform_data).__name__, getattr(platform_data, 'symbol', None))
+        return StockData.from_trusted_many([self._stock_record(platform_data, datetime.now())])[0]
 
-    def _from_tradingview_to_stock_data(self, tv_data: TradingViewData) -> StockData:
-        """
-        TradingViewDataをStockDataに変換する内部メソッド。
-        """
-        logger.info(f"TradingViewDataをStockDataに変換中: {tv_data.symbol}")
-        full_symbol = f"{tv_data.exchange}:{tv_data.symbol}" if tv_data.exchange else tv_data.symbol
-        return StockData(
-            symbol=tv_data.symbol,
-            exchange=tv_data.exchange,
-            full_symbol=full_symbol,
-            source_platform="tradingview",
-            date_added=datetime.now(),
-            date_updated=datetime.now(),
-            tradingview_section=tv_data.section,
-            # SeekingAlpha関連のフィールドはNoneで初期化
-            name=None,
-            current_price=None,
-            change=None,
-            change_percent=None,
-            volume=None,
-            avg_volume=None,
-            day_low=None,
-            day_high=None,
-            week52_low=None,
-            week52_high=None,
-            quant_rating=None,
-            sa_analyst_rating=None,
-            wall_street_rating=None,
-            valuation_grade=None,
-            growth_grade=None,
-            profitability_grade=None,
-            momentum_grade=None,
-            eps_revision_grade=None,
-            shares=None,
-            cost=None,
-            todays_gain=None,
-            todays_gain_percent=None,
-            total_change=None,
-            total_change_percent=None,
-            value=None,
-            dividend_safety=None,
-            dividend_growth=None,
-            dividend_yield_grade=None,
-            dividend_consistency=None,
-            ex_dividend_date=None,
-            payout_date=None,
-            frequency=None,
-            yield_ttm=None,
-            yield_forward=None,
-            dividend_rate_ttm=None,
-            dividend_rate_forward=None,
-            payout_ratio=None,
-            dividend_growth_3y=None,
-            dividend_growth_5y=None,
-            beta_24m=None,
-            notes=None,
-            status="active"
-        )
-
-    def _from_seekingalpha_to_stock_data(self, sa_data: SeekingAlphaData) -> StockData:
-        """
-        SeekingAlphaDataをStockDataに変換する内部メソッド。
-        """
-        logger.info(f"SeekingAlphaDataをStockDataに変換中: {sa_data.symbol}")
-        full_symbol = f"{sa_data.exchange}:{sa_data.symbol}" if sa_data.exchange else sa_data.symbol
-        # SeekingAlphaDataの全てのフィールドを辞書として取得し、StockDataに渡す
-        # StockDataに存在しないフィールドは無視される
-        stock_data_dict = sa_data.model_dump(exclude_none=False)
-        # company_nameをnameにマッピング
-        if 'company_name' in stock_data_dict:
-            stock_data_dict['name'] = stock_data_dict.pop('company_name')
-        # priceをcurrent_priceにマッピング
-        if 'price' in stock_data_dict:
-            stock_data_dict['current_price'] = stock_data_dict.pop('price')
-
-        stock_data_dict.update({
-            "full_symbol": full_symbol,
-            "source_platform": "seekingalpha",
-            "date_added": datetime.now(),
-            "date_updated": datetime.now(),
-            "notes": None,
-            "status": "active",
-            "tradingview_section": None
-        })
-        return StockData(**stock_data_dict)
+    def to_stock_data_many(self, data_list: List[PlatformData]) -> List[StockData]:
+        """
+        PlatformDataのリストをまとめてStockDataのリストに変換する。
+        入力は検証済みのプラットフォームデータなので、StockDataの再検証は省略する。
+        """
+        with ProgressLogger(logger, "StockDataへの変換", total=len(data_list)) as progress:
+            now = datetime.now()
+            records = [self._stock_record(platform_data, now) for platform_data in data_list]
+            stock_data_list = StockData.from_trusted_many(records)
+            progress.update(len(stock_data_list))
+        return stock_data_list
 
-    def to_platform_data(self, stock_data: StockData, target_platform: str) -> PlatformData:
+    def to_stock_batch(self, data_list: List[PlatformData]) -> StockBatch:
         """
-        StockDataを特定のプラットフォームデータ形式に変換する。
+        PlatformDataのリストをStockBatchに変換する。StockDataオブジェクトは生成しない。
         """
-        if target_platform.lower() == "tradingview":
-            return self._from_stock_data_to_tradingview(stock_data)
-        elif target_platform.lower() == "seekingalpha":
-            return self._from_stock_data_to_seekingalpha(stock_data)
-        else:
-            raise ValueError(f"サポートされていないターゲットプラットフォームです: {target_platform}")
+        with ProgressLogger(logger, "StockBatchへの変換", total=len(data_list)) as progress:
+            now = datetime.now()
+            records = [self._stock_record(platform_data, now) for platform_data in data_list]
 
-    def _from_stock_data_to_tradingview(self, stock_data: StockData) -> TradingViewData:
+            field_names = {name for record in records for name in record}
+            columns = {name: [record.get(name) for record in records] for name in field_names}
+            batch = StockBatch.from_columns(columns, length=len(records))
+            progress.update(len(batch))
+        return batch
+
+    def columns_to_stock_batch(self, platform: str, columns: Dict[str, List[Any]]) -> StockBatch:
         """
-        StockDataをTradingViewDataに変換する内部メソッド。
+        パーサーのparse_columnsが返すプラットフォーム固有の列データをStockBatchに変換する。
+        列のまま変換するため、行ごとのオブジェクトは生成しない。
         """
-        logger.info(f"StockDataをTradingViewDataに変換中: {stock_data.symbol}")
-        return TradingViewData(
-            symbol=stock_data.symbol,
-            exchange=stock_data.exchange,
-            section=stock_data.tradingview_section
-        )
+        length = len(columns.get('symbol', []))
+        mapping = PLATFORM_MAPPINGS.get(platform)
+        if mapping is None or mapping.model is None:
+            raise ValueError(f"サポートされていないプラットフォームです: {platform}")
+        stock_columns = to_stock_plan(platform).columns(columns, length, datetime.now())
+        return StockBatch.from_columns(stock_columns, length=length)
 
-    def _from_stock_data_to_seekingalpha(self, stock_data: StockData) -> SeekingAlphaData:
+    def _stock_record(self, platform_data: PlatformData, now: datetime) -> Dict[str, Any]:
         """
-        StockDataをSeekingAlphaDataに変換する内部メソッド。
+        プラットフォームのデータからStockDataのフィールド値を生成する（対応表から組み立てた変換手順を使う）。
+        対応するフィールドが無いStockDataのフィールドは既定値(None)のままとする。
         """
-        logger.info(f"StockDataをSeekingAlphaDataに変換中: {stock_data.symbol}")
-        sa_data_dict = stock_data.model_dump(exclude_none=True)
-        # nameをcompany_nameにマッピング
-        if 'name' in sa_data_dict:
-            sa_data_dict['company_name'] = sa_data_dict.pop('name')
-        # current_priceをpriceにマッピング
-        if 'current_price' in sa_data_dict:
-            sa_data_dict['price'] = sa_data_dict.pop('current_price')
-        
-        # StockDataのフィールドでSeekingAlphaDataに存在しないものを削除
-        # SeekingAlphaDataのフィールドリストを取得
-        seekingalpha_fields = set(SeekingAlphaData.model_fields.keys())
-        filtered_sa_data_dict = {k: v for k, v in sa_data_dict.items() if k in seekingalpha_fields}
+        platform = platform_for_model(type(platform_data))
+        if platform is None:
+            raise ValueError(f"サポートされていないデータ型です: {type(platform_data)}")
+        return to_stock_plan(platform).record(platform_data, now)
 
-        return SeekingAlphaData(**filtered_sa_data_dict)
+    def to_platform_data(self, stock_data: StockData, target_platform: str) -> PlatformData:
+        """
+        StockDataを特定のプラットフォームデータ形式に変換する。
+        """
+        platform = target_platform.lower()
+        mapping = PLATFORM_MAPPINGS.get(platform)
+        if mapping is None or mapping.model is None:
+            raise ValueError(f"サポートされていないターゲットプラットフォームです: {target_platform}")
+        logger.debug("StockDataを%sに変換中: %s", mapping.model.__name__, stock_data.symbol)
+        return from_stock_plan(platform).convert(stock_data)
 
     def convert_list(self, data_list: List[PlatformData], target_platform: str) -> List[PlatformData]:
         """
         PlatformDataのリストを別のPlatformDataのリストに変換する。
+        進捗は一定時間ごとと終了時にまとめて記録する。
         """
         converted_list = []
-        for item in data_list:
-            stock_data = self.to_stock_data(item)
-            converted_list.append(self.to_platform_data(stock_data, target_platform))
+        with ProgressLogger(logger, f"{target_platform}形式への変換", total=len(data_list)) as progress:
+            for item in data_list:
+                stock_data = self.to_stock_data(item)
+                converted_list.append(self.to_platform_data(stock_data, target_platform))
+                progress.update()
         return converted_list
 
-    def convert_to_csv(self, data_list: List[SeekingAlphaData]) -> str:
+    def read_file(self, file_path: Union[str, Path], input_format: str = "auto",
+                  cache: Optional[ParseCache] = None) -> StockBatch:
         """
-        SeekingAlphaDataのリストをCSV形式の文字列に変換する。
+        入力ファイルを読み込みStockBatchとして返す。
+        input_formatが"auto"の場合はファイル先頭の数KBから形式を判定する。
+        tradingview / seekingalpha はパーサーの列データを（cacheがあれば解析キャッシュを使用して）変換し、
+        parquet / arrow はそのまま読み込む。
         """
-        if not data_list:
-            return ""
+        if input_format == "auto":
+            input_format = detect_format(file_path)
+            logger.info(f"入力形式を判定しました: {file_path} -> {input_format}")
+
+        if input_format == "parquet":
+            return self.read_parquet(file_path)
+        if input_format == "arrow":
+            return self.read_arrow(file_path)
+
+        parser = create_parser(input_format)
+        columns = cache.parse_columns(parser, file_path) if cache else parser.parse_columns(file_path)
+        return self.columns_to_stock_batch(input_format, columns)
+
+    def write_file(self, data_list: Union[List[PlatformData], StockBatch], output_format: str,
+                   file_path: Union[str, Path], preserve_sections: bool = False,
+                   buffer_size: int = DEFAULT_OUTPUT_BUFFER_SIZE) -> None:
+        """
+        指定された出力形式(tradingview / seekingalpha / csv / parquet / arrow)でファイルに書き込む。
+        CSVは全体を文字列に組み立てず、バッファ付きで行ごとに書き込む。
+        """
+        if output_format == "tradingview":
+            output_content = self.convert_to_tradingview_txt(data_list, preserve_sections)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(output_content)
+        elif output_format in ("seekingalpha", "csv"):
+            with open_text_output(file_path, buffer_size) as f:
+                self.write_csv(data_list, f)
+        elif output_format == "parquet":
+            self.write_parquet(data_list, file_path)
+        elif output_format == "arrow":
+            self.write_arrow(data_list, file_path)
+        else:
+            raise ValueError(f"未サポートの出力形式です: {output_format}")
+
+    def convert_to_csv(self, data_list: Union[List[SeekingAlphaData], StockBatch]) -> str:
+        """
+        SeekingAlphaDataのリスト（またはStockBatch）をCSV形式の文字列に変換する。
+        大量データをファイルに出力する場合はwrite_csvを使用する。
+        """
+        buffer = io.StringIO()
+        self.write_csv(data_list, buffer)
+        content = buffer.getvalue()
+        # 従来通り末尾の改行は含めない
+        return content[:-1] if content.endswith("\n") else content
+
+    def write_csv(self, data_list: Union[List[SeekingAlphaData], StockBatch], file_obj: TextIO) -> int:
+        """
+        SeekingAlphaDataのリスト（またはStockBatch）をCSVとしてファイルオブジェクトに逐次書き込む。
+        カンマや引用符を含む値（会社名など）はcsvモジュールにより引用符で囲まれる。
+        ファイルに書き込む場合は newline='' で開いたファイルオブジェクトを渡すこと。
+
+        Returns:
+            書き込んだデータ行数
+        """
+        if not len(data_list):
+            return 0
 
         # ヘッダー行を生成
         # SeekingAlphaDataのフィールドを全て含める
         headers = list(SeekingAlphaData.model_fields.keys())
-        csv_lines = [",".join(headers)]
-
-        # データ行を生成
-        for item in data_list:
-            values = []
-            for field in headers:
-                value = getattr(item, field)
-                if value is None:
-                    values.append("")
-                elif isinstance(value, (float, int)):
-                    values.append(str(value))
-                elif isinstance(value, datetime):
-                    values.append(value.strftime("%Y-%m-%d"))
-                else:
-                    values.append(str(value))
-            csv_lines.append(",".join(values))
-        
-        return "\n".join(csv_lines)
+        writer = csv.writer(file_obj, lineterminator="\n")
+        writer.writerow(headers)
+        # Noneは空文字列、数値はstr()と同じ表記で書き込まれる
+        writer.writerows(self._iter_seekingalpha_rows(data_list, headers))
+        return len(data_list)
+
+    def write_parquet(self, data_list: Union[List[StockData], StockBatch], file_path: Union[str, Path],
+                      compression: str = "snappy") -> int:
+        """
+        StockDataのリスト（またはStockBatch）をStockDataのスキーマでParquetファイルに書き込む。
+        グレードなどのカテゴリ列は辞書エンコードされる。pyarrowが必要。
+
+        Returns:
+            書き込んだ行数
+        """
+        pq = import_pyarrow("parquet")
+        batch = self._ensure_stock_batch(data_list)
+        pq.write_table(batch.to_arrow(), str(file_path), compression=compression)
+        return len(batch)
+
+    def write_arrow(self, data_list: Union[List[StockData], StockBatch], file_path: Union[str, Path]) -> int:
+        """
+        StockDataのリスト（またはStockBatch）をStockDataのスキーマでArrow IPCファイルに書き込む。
+        メモリマップでそのまま読み込めるよう圧縮は行わない。pyarrowが必要。
 
-    def convert_to_tradingview_txt(self, data_list: List[TradingViewData], preserve_sections: bool = True) -> str:
+        Returns:
+            書き込んだ行数
         """
-        TradingViewDataのリストをTradingViewテキスト形式の文字列に変換する。
+        pa = import_pyarrow()
+        batch = self._ensure_stock_batch(data_list)
+        table = batch.to_arrow()
+        with pa.OSFile(str(file_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return len(batch)
+
+    def read_parquet(self, file_path: Union[str, Path], memory_map: bool = True) -> StockBatch:
+        """ParquetファイルをStockBatchとして読み込む。memory_mapがTrueの場合はファイルをメモリマップで読む。"""
+        pq = import_pyarrow("parquet")
+        return StockBatch.from_arrow(pq.read_table(str(file_path), memory_map=memory_map))
+
+    def read_arrow(self, file_path: Union[str, Path], memory_map: bool = True) -> StockBatch:
         """
-        if not data_list:
+        Arrow IPCファイルをStockBatchとして読み込む。
+        memory_mapがTrueの場合はファイルをメモリマップで開き、欠損のない数値列はコピーせずに参照する。
+        """
+        pa = import_pyarrow()
+        source = pa.memory_map(str(file_path), "r") if memory_map else pa.OSFile(str(file_path), "rb")
+        with source:
+            table = pa.ipc.open_file(source).read_all()
+        return StockBatch.from_arrow(table)
+
+    def _ensure_stock_batch(self, data_list: Union[List[StockData], StockBatch]) -> StockBatch:
+        """StockDataのリストであればStockBatchに変換する"""
+        if isinstance(data_list, StockBatch):
+            return data_list
+        return StockBatch.from_stock_data(data_list)
+
+    def _iter_seekingalpha_rows(self, data_list: Union[List[SeekingAlphaData], StockBatch],
+                                headers: List[str]) -> Iterable[Tuple[Any, ...]]:
+        """SeekingAlpha形式の各行の値をヘッダー順に返す"""
+        if isinstance(data_list, StockBatch):
+            # SeekingAlphaのフィールド名をStockDataのフィールド名に読み替え、一定行数ずつ列のまま取り出す
+            stock_fields = from_stock_plan('seekingalpha').stock_field_names(headers)
+            for start in range(0, len(data_list), CSV_ROW_CHUNK_SIZE):
+                stop = start + CSV_ROW_CHUNK_SIZE
+                yield from zip(*[data_list.to_pylist(field, start, stop) for field in stock_fields])
+        else:
+            for item in data_list:
+                yield tuple(getattr(item, field) for field in headers)
+
+    def convert_to_tradingview_txt(self, data_list: Union[List[TradingViewData], StockBatch],
+                                   preserve_sections: bool = True) -> str:
+        """
+        TradingViewDataのリスト（またはStockBatch）をTradingViewテキスト形式の文字列に変換する。
+        """
+        if not len(data_list):
             return ""
 
+        if isinstance(data_list, StockBatch):
+            entries: Iterable[Tuple[str, Optional[str], Optional[str]]] = zip(
+                data_list.to_pylist('symbol'),
+                data_list.to_pylist('exchange'),
+                data_list.to_pylist('tradingview_section'),
+            )
+        else:
+            entries = ((item.symbol, item.exchange, item.section) for item in data_list)
+
         output_lines = []
-        current_section = None
         
         # セクションごとに銘柄をグループ化
-        grouped_by_section = {}
-        for item in data_list:
-            section_key = item.section if preserve_sections and item.section else "No Section"
-            if section_key not in grouped_by_section:
-                grouped_by_section[section_key] = []
-            grouped_by_section[section_key].append(item)
+        grouped_by_section: Dict[str, List[str]] = {}
+        for symbol, exchange, section in entries:
+            section_key = section if preserve_sections and section else "No Section"
+            symbol_with_exchange = f"{exchange}:{symbol}" if exchange else symbol
+            grouped_by_section.setdefault(section_key, []).append(symbol_with_exchange)
         
         # セクション名でソート（"No Section"は最後）
         sorted_sections = sorted(grouped_by_section.keys(), key=lambda x: (x == "No Section", x))
@@ -218,22 +362,79 @@ class FormatConverter:
             if preserve_sections and section_name != "No Section":
                 output_lines.append(f"###{section_name}")
             
-            symbols = []
-            for item in grouped_by_section[section_name]:
-                symbol_with_exchange = f"{item.exchange}:{item.symbol}" if item.exchange else item.symbol
-                symbols.append(symbol_with_exchange)
-            
-            output_lines.append(",".join(symbols))
+            output_lines.append(",".join(grouped_by_section[section_name]))
         
         return "\n".join(output_lines)
 
+    def from_values(self, values: List[List[Any]]) -> StockBatch:
+        """
+        gspreadのget_all_values()で取得したシートの値（1行目はヘッダー）からStockBatchを作成する
+
+        ヘッダーとフィールドの対応、列ごとの変換関数は最初に1回だけ決め、値は列単位でまとめて変換する。
+        - 空のセルは欠損値として扱う（source_platformとstatusは既定値で埋める）
+        - full_symbolはシートの値を使わず、Exchange列とSymbol列から生成する
+        - 全てのセルが空の行は無視し、変換できない値を含む行は警告を出して除外する
+        """
+        if not values:
+            return StockBatch.from_columns({}, length=0)
+
+        # ヘッダー -> フィールド（同じフィールドに対応する列が複数ある場合は最初の列を使う）
+        field_columns: Dict[str, int] = {}
+        for col, header in enumerate(values[0]):
+            name = header_to_attribute(header)
+            if name in FIELD_KINDS and name != 'full_symbol':
+                field_columns.setdefault(name, col)
+        if 'symbol' not in field_columns:
+            raise ValueError("シートにSymbol列がありません")
+
+        rows = [row for row in values[1:] if any(cell != "" and cell is not None for cell in row)]
+        length = len(rows)
+        invalid_rows: Dict[int, str] = {}
+        columns: Dict[str, Any] = {}
+        for name, col in field_columns.items():
+            cells = [row[col] if col < len(row) else "" for row in rows]
+            column, invalid = _SHEET_COLUMN_COERCERS[FIELD_KINDS[name]](cells)
+            for i in invalid:
+                invalid_rows.setdefault(i, f"{name}={cells[i]!r}")
+            columns[name] = column
+
+        # symbol・exchangeはStockDataのバリデーションと同じく前後の空白を除いて大文字にする
+        symbols = columns['symbol']
+        for i, symbol in enumerate(symbols):
+            if symbol is None or not symbol.strip():
+                invalid_rows.setdefault(i, "symbolが空です")
+            else:
+                symbols[i] = symbol.strip().upper()
+        if 'exchange' in columns:
+            columns['exchange'] = [e.strip().upper() or None if e is not None else None for e in columns['exchange']]
+        for name, default in SHEET_VALUE_DEFAULTS.items():
+            if name in columns:
+                columns[name] = [default if v is None else v for v in columns[name]]
+            else:
+                columns[name] = [default] * length
+
+        if invalid_rows:
+            for i in sorted(invalid_rows):
+                logger.warning(f"行の変換に失敗したため除外します: {i + 2}行目 ({invalid_rows[i]})")
+            keep = np.ones(length, dtype=bool)
+            keep[list(invalid_rows)] = False
+            keep_list = keep.tolist()
+            columns = {
+                name: column[keep] if isinstance(column, np.ndarray)
+                else [v for v, ok in zip(column, keep_list) if ok]
+                for name, column in columns.items()
+            }
+            length = int(keep.sum())
+
+        return StockBatch.from_columns(columns, length=length)
+
     def from_records(self, records: List[Dict[str, Any]]) -> List[StockData]:
         """gspreadのget_all_records()で取得した辞書のリストからStockDataのリストを作成する"""
         stock_data_list = []
         for rec in records:
-            # Pydanticモデルのフィールド名とシートのヘッダー名を柔軟にマッピング
-            # (例: Company_Name -> company_name)
-            mapped_rec = {key.lower(): val for key, val in rec.items()}
+            # シートのヘッダー名をPydanticモデルのフィールド名にマッピング
+            # (例: Current_Price -> current_price, Company_Name -> name)
+            mapped_rec = {header_to_attribute(key): val for key, val in rec.items()}
             
             # 必須フィールドの補完
             symbol = mapped_rec.get("symbol", "")
@@ -0,0 +1,225 @@
+"""銘柄シンボルから取引所を引く索引（build-symbol-indexで作成し、変換時にメモリマップで読み込む）"""
+
+import csv
+import json
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.models.batch import StockBatch
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 索引ファイル名（キャッシュディレクトリ内）
+SYMBOL_INDEX_FILE = "symbol-index.bin"
+
+# 索引ファイルの先頭のマジックナンバーと形式のバージョン。保存形式を変更した場合は更新する
+SYMBOL_INDEX_MAGIC = b"STKSYMIX"
+SYMBOL_INDEX_VERSION = 1
+
+# ヘッダー（マジックナンバー・ヘッダー長・JSON）の後の配列の開始位置の境界
+_ALIGNMENT = 64
+
+
+def _normalize(value: Any) -> str:
+    """シンボル・取引所はStockDataのバリデーションと同じく前後の空白を除いて大文字にする"""
+    return str(value).strip().upper() if value is not None else ""
+
+
+def load_symbol_mapping(path: Union[str, Path]) -> Dict[str, str]:
+    """
+    シンボル -> 取引所の対応表を読み込む
+
+    - JSON: {"AAPL": "NASDAQ", ...} または [{"symbol": "AAPL", "exchange": "NASDAQ"}, ...]
+    - CSV: symbol・exchange列を持つヘッダー付きのCSV（ヘッダーが無い場合は1列目をシンボル、2列目を取引所とする）
+
+    同じシンボルが複数回現れる場合は最初の取引所を使用する。
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            pairs: Iterable[Tuple[Any, Any]] = data.items()
+        elif isinstance(data, list):
+            pairs = ((item.get('symbol'), item.get('exchange')) for item in data)
+        else:
+            raise ValueError(f"対応表のJSONはオブジェクトか配列である必要があります: {path}")
+    else:
+        pairs = _read_csv_pairs(path)
+
+    mapping: Dict[str, str] = {}
+    conflicts = 0
+    for symbol, exchange in pairs:
+        symbol, exchange = _normalize(symbol), _normalize(exchange)
+        if not symbol or not exchange:
+            continue
+        if mapping.setdefault(symbol, exchange) != exchange:
+            conflicts += 1
+    if conflicts:
+        logger.warning(f"{path}: {conflicts}件のシンボルに複数の取引所が指定されているため、最初の取引所を使用します")
+    return mapping
+
+
+def _read_csv_pairs(path: Path) -> List[Tuple[str, str]]:
+    """CSVからシンボルと取引所の組を読み込む"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        rows = [row for row in csv.reader(f) if row]
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    if 'symbol' in header and 'exchange' in header:
+        symbol_index, exchange_index = header.index('symbol'), header.index('exchange')
+        rows = rows[1:]
+    else:
+        symbol_index, exchange_index = 0, 1
+    return [(row[symbol_index], row[exchange_index]) for row in rows if len(row) > max(symbol_index, exchange_index)]
+
+
+def build_symbol_index(mapping: Dict[str, str], output_path: Union[str, Path]) -> int:
+    """
+    対応表から索引ファイルを作成し、登録した銘柄数を返す
+
+    ファイルはヘッダー（取引所の一覧などのJSON）の後に、ソート済みの固定長シンボル配列と
+    取引所の番号（uint16）の配列を並べた形式で、読み込み時は配列部分をそのままメモリマップする。
+    """
+    symbols = sorted(mapping)
+    key_width = max((len(symbol.encode('utf-8')) for symbol in symbols), default=1)
+    exchanges = sorted(set(mapping.values()))
+    if len(exchanges) > np.iinfo(np.uint16).max:
+        raise ValueError(f"取引所の数が多すぎます: {len(exchanges)}")
+    exchange_codes = {exchange: code for code, exchange in enumerate(exchanges)}
+
+    keys = np.array([symbol.encode('utf-8') for symbol in symbols], dtype=f'S{key_width}')
+    codes = np.array([exchange_codes[mapping[symbol]] for symbol in symbols], dtype=np.uint16)
+    header = json.dumps({
+        'version': SYMBOL_INDEX_VERSION,
+        'count': len(symbols),
+        'key_width': key_width,
+        'exchanges': exchanges,
+    }).encode('utf-8')
+    prefix_size = len(SYMBOL_INDEX_MAGIC) + 4 + len(header)
+    padding = -prefix_size % _ALIGNMENT
+
+    output_path = Path(output_path).expanduser()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # 変換中のプロセスが書き込み途中のファイルを読まないよう、一時ファイルに書いてから置き換える
+    with tempfile.NamedTemporaryFile('wb', dir=output_path.parent, suffix='.tmp', delete=False) as f:
+        temp_path = Path(f.name)
+        try:
+            f.write(SYMBOL_INDEX_MAGIC)
+            f.write(struct.pack('<I', len(header) + padding))
+            f.write(header + b' ' * padding)
+            f.write(keys.tobytes())
+            f.write(codes.tobytes())
+        except BaseException:
+            f.close()
+            temp_path.unlink(missing_ok=True)
+            raise
+    os.replace(temp_path, output_path)
+    return len(symbols)
+
+
+class SymbolResolver:
+    """
+    索引ファイルを使ってシンボルから取引所を引くクラス
+
+    索引は初回の検索時にメモリマップで開くため、数十万件の索引でも読み込みの時間はほぼかからず、
+    一括変換のワーカープロセス間ではページキャッシュが共有される。検索はソート済み配列の二分探索で、
+    StockBatchの列はまとめて検索する。
+    pickleしても索引のパスだけが渡されるため、ワーカープロセスにそのまま渡せる。
+    """
+
+    def __init__(self, index_path: Union[str, Path], fallback_exchange: Optional[str] = None):
+        self.index_path = Path(index_path).expanduser()
+        self.fallback_exchange = _normalize(fallback_exchange) or None
+        self._keys: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._exchanges: List[str] = []
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'index_path': self.index_path, 'fallback_exchange': self.fallback_exchange}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state['index_path'], state['fallback_exchange'])
+
+    def _load(self) -> np.ndarray:
+        """索引ファイルを開き、シンボルの配列を返す"""
+        if self._keys is not None:
+            return self._keys
+        with open(self.index_path, 'rb') as f:
+            if f.read(len(SYMBOL_INDEX_MAGIC)) != SYMBOL_INDEX_MAGIC:
+                raise ValueError(f"銘柄索引ファイルではありません: {self.index_path}")
+            (header_size,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_size))
+        if header.get('version') != SYMBOL_INDEX_VERSION:
+            raise ValueError(f"銘柄索引の形式が古いため、build-symbol-indexで作り直してください: {self.index_path}")
+
+        count, key_width = header['count'], header['key_width']
+        offset = len(SYMBOL_INDEX_MAGIC) + 4 + header_size
+        self._exchanges = header['exchanges']
+        if count == 0:
+            self._keys, self._codes = np.empty(0, dtype=f'S{key_width}'), np.empty(0, dtype=np.uint16)
+        else:
+            self._keys = np.memmap(self.index_path, dtype=f'S{key_width}', mode='r', offset=offset, shape=(count,))
+            self._codes = np.memmap(self.index_path, dtype=np.uint16, mode='r',
+                                    offset=offset + count * key_width, shape=(count,))
+        return self._keys
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def lookup(self, symbol: str) -> Optional[str]:
+        """シンボルの取引所を返す（索引に無い場合はfallback_exchange）"""
+        return self.lookup_many([symbol])[0]
+
+    def lookup_many(self, symbols: Sequence[Optional[str]]) -> List[Optional[str]]:
+        """シンボルの列の取引所をまとめて返す（索引に無いシンボルはfallback_exchange、Noneや空文字はNone）"""
+        keys = self._load()
+        queries = [_normalize(symbol).encode('utf-8') for symbol in symbols]
+        result: List[Optional[str]] = [None if not query else self.fallback_exchange for query in queries]
+        if not len(keys) or not queries:
+            return result
+
+        # 索引のシンボルより長いものは索引に無い（固定長に切り詰めると別のシンボルに一致するため除く）
+        key_width = keys.dtype.itemsize
+        candidates = np.array(queries, dtype=object)
+        searchable = np.array([0 < len(query) <= key_width for query in queries])
+        query_array = candidates[searchable].astype(f'S{key_width}')
+        positions = np.searchsorted(keys, query_array)
+        positions[positions == len(keys)] = 0
+        found = keys[positions] == query_array
+
+        rows = np.flatnonzero(searchable)[found]
+        exchanges = self._exchanges
+        for row, code in zip(rows.tolist(), self._codes[positions[found]].tolist()):
+            result[row] = exchanges[code]
+        return result
+
+    def resolve_batch(self, batch: StockBatch) -> Tuple[StockBatch, int]:
+        """
+        取引所の無い行の取引所を補完したStockBatchと、補完した行数を返す
+        full_symbolも 'EXCHANGE:SYMBOL' に更新する。取引所がある行は変更しない。
+        """
+        exchanges = batch.to_pylist('exchange')
+        rows = [row for row, exchange in enumerate(exchanges) if not exchange]
+        if not rows:
+            return batch, 0
+        symbols = batch.to_pylist('symbol')
+        resolved = self.lookup_many([symbols[row] for row in rows])
+
+        full_symbols = batch.to_pylist('full_symbol')
+        count = 0
+        for row, exchange in zip(rows, resolved):
+            if exchange:
+                exchanges[row] = exchange
+                full_symbols[row] = f"{exchange}:{symbols[row]}"
+                count += 1
+        if not count:
+            return batch, 0
+        return batch.with_column('exchange', exchanges).with_column('full_symbol', full_symbols), count
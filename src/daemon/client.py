@@ -0,0 +1,84 @@
+"""
+常駐プロセス（stock-cli serve）にコマンドを送るシンクライアント
+
+使い方:
+    stock-cli-client [--socket PATH] [--no-fallback] <stock-cliの引数...>
+    stock-cli-client [--socket PATH] --ping | --stop
+
+コマンドは常駐プロセスで実行し、標準出力・標準エラー出力・終了コードをそのまま返す。
+常駐プロセスに接続できない場合は、--no-fallbackを指定しない限りこのプロセス内でコマンドを実行する。
+起動を速くするため、常駐プロセスに接続できた場合は標準ライブラリ以外を読み込まない。
+"""
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from src.daemon.protocol import default_socket_path, send_request
+
+USAGE = "使い方: stock-cli-client [--socket PATH] [--no-fallback] <stock-cliの引数...> | --ping | --stop"
+
+
+def _run_locally(args: List[str]) -> int:
+    """常駐プロセスを使わずにこのプロセス内でコマンドを実行する"""
+    from src.main import cli
+    try:
+        cli.main(args=args, prog_name='stock-cli')
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = list(sys.argv[1:] if argv is None else argv)
+    socket_path = default_socket_path()
+    fallback = True
+    op = "run"
+
+    # 先頭のクライアント用オプションだけを解釈し、残りはstock-cliの引数としてそのまま送る
+    while args:
+        if args[0] == '--socket' and len(args) > 1:
+            socket_path = Path(args[1]).expanduser()
+            del args[:2]
+        elif args[0] == '--no-fallback':
+            fallback = False
+            del args[0]
+        elif args[0] in ('--ping', '--stop'):
+            op = 'ping' if args[0] == '--ping' else 'shutdown'
+            del args[0]
+        elif args[0] == '--':
+            del args[0]
+            break
+        else:
+            break
+
+    if op == "run" and not args:
+        print(USAGE, file=sys.stderr)
+        return 2
+
+    request = {"op": op}
+    if op == "run":
+        request.update(args=args, cwd=os.getcwd())
+    try:
+        response = send_request(socket_path, request)
+    except OSError as e:
+        if op == "run" and fallback:
+            return _run_locally(args)
+        print(f"常駐プロセスに接続できません: {socket_path}: {e}", file=sys.stderr)
+        return 1
+
+    if not response.get("ok"):
+        print(f"エラー: {response.get('error')}", file=sys.stderr)
+        return 1
+    if op == "ping":
+        print(f"pid={response.get('pid')} jobs={response.get('jobs')} uptime={response.get('uptime', 0):.0f}s")
+    elif op == "run":
+        sys.stdout.write(response.get("stdout", ""))
+        sys.stdout.flush()
+        sys.stderr.write(response.get("stderr", ""))
+        return int(response.get("exit_code", 1))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
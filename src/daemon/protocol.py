@@ -0,0 +1,70 @@
+"""
+常駐プロセス（stock-cli serve）とクライアントの通信プロトコル
+
+1回の接続で1つのリクエストを送り、1つのレスポンスを受け取る。メッセージはUTF-8のJSONを1行で送る。
+- {"op": "run", "args": [...], "cwd": "..."}: CLIのコマンドを実行する
+  -> {"ok": true, "exit_code": 0, "stdout": "...", "stderr": "...", "elapsed": 0.01}
+- {"op": "ping"}: 常駐プロセスの状態を確認する -> {"ok": true, "pid": 123, "jobs": 10}
+- {"op": "shutdown"}: 常駐プロセスを終了する -> {"ok": true}
+エラーの場合は {"ok": false, "error": "..."} を返す。
+
+クライアントから読み込まれるため、このモジュールは標準ライブラリだけに依存する。
+"""
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+
+PROTOCOL_VERSION = 1
+
+# ソケットファイル名（キャッシュディレクトリ内）
+SOCKET_FILE_NAME = "stock-cli.sock"
+
+# リクエスト1行の最大サイズ
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+def default_socket_path() -> Path:
+    """ソケットの既定のパス（STOCK_CLI_SOCKET > キャッシュディレクトリ内の順に決める）"""
+    if os.environ.get('STOCK_CLI_SOCKET'):
+        return Path(os.environ['STOCK_CLI_SOCKET']).expanduser()
+    cache_dir = os.environ.get('STOCK_CLI_CACHE_DIR') or "~/.cache/stock-watchlist-cli"
+    return Path(cache_dir).expanduser() / SOCKET_FILE_NAME
+
+
+def write_message(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    """メッセージを1行のJSONとして書き込む"""
+    stream.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+    stream.flush()
+
+
+def read_message(stream: BinaryIO, limit: int = -1) -> Optional[Dict[str, Any]]:
+    """1行のJSONメッセージを読み込む。接続が閉じられた場合はNoneを返す"""
+    line = stream.readline(limit)
+    if not line:
+        return None
+    if not line.endswith(b'\n') and len(line) == limit:
+        raise ValueError(f"メッセージが大きすぎます（上限{limit}バイト）")
+    message = json.loads(line.decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError("メッセージはJSONオブジェクトである必要があります")
+    return message
+
+
+def send_request(socket_path: Path, request: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    常駐プロセスにリクエストを送り、レスポンスを返す
+
+    Raises:
+        OSError: 常駐プロセスに接続できない場合（FileNotFoundError・ConnectionRefusedErrorなど）
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        with sock.makefile('rwb') as stream:
+            write_message(stream, dict(request, version=PROTOCOL_VERSION))
+            response = read_message(stream)
+    if response is None:
+        raise ConnectionError("常駐プロセスからの応答がありません")
+    return response
@@ -0,0 +1,149 @@
+"""常駐プロセスでCLIのコマンドを実行するUnixソケットサーバー"""
+import io
+import logging
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import click
+
+from src.daemon.protocol import MAX_REQUEST_BYTES, PROTOCOL_VERSION, read_message, write_message
+
+logger = logging.getLogger(__name__)
+
+# 常駐プロセスから実行できないコマンド
+DISALLOWED_COMMANDS = frozenset({'serve'})
+
+
+def _prepare_socket_path(socket_path: Path) -> None:
+    """ソケットのディレクトリを作成し、前回異常終了した際に残ったソケットファイルを削除する"""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if not socket_path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()
+            return
+    raise RuntimeError(f"既に常駐プロセスが起動しています: {socket_path}")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """1回の接続で1つのリクエストを処理する"""
+
+    def handle(self) -> None:
+        try:
+            request = read_message(self.rfile, MAX_REQUEST_BYTES)
+            if request is None:
+                return
+            response = self.server.dispatch(request)
+        except Exception as e:
+            logger.warning(f"不正なリクエストを受信しました: {e}")
+            response = {"ok": False, "error": str(e)}
+        try:
+            write_message(self.wfile, response)
+        except OSError as e:
+            logger.warning(f"レスポンスを送信できませんでした: {e}")
+
+
+class CommandServer(socketserver.UnixStreamServer):
+    """
+    Unixソケットでリクエストを受け付け、CLIのコマンドを常駐プロセス内で実行するサーバー
+
+    モジュール・設定・認証情報はプロセス内で読み込み済みのものを使い回すため、コマンドごとの起動コストがかからない。
+    ジョブは作業ディレクトリと標準入出力をジョブごとに切り替えて1つずつ順に実行する。
+    標準入力は空のため、確認プロンプトを表示するコマンドは中断される。
+    """
+
+    def __init__(self, socket_path: Union[str, Path], command: click.Command):
+        self.socket_path = Path(socket_path).expanduser()
+        self.command = command
+        self.jobs = 0
+        self.started = time.monotonic()
+        _prepare_socket_path(self.socket_path)
+        # ソケットは起動したユーザーだけが読み書きできるようにする
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.socket_path), _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        logger.info(f"常駐プロセスを起動しました: {self.socket_path} (pid={os.getpid()})")
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """リクエストを処理してレスポンスを返す"""
+        version = request.get("version", PROTOCOL_VERSION)
+        if version != PROTOCOL_VERSION:
+            return {"ok": False, "error": f"未対応のプロトコルバージョンです: {version}"}
+        op = request.get("op")
+        if op == "run":
+            args = request.get("args")
+            if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+                return {"ok": False, "error": "argsは文字列のリストである必要があります"}
+            return self.run_job(args, request.get("cwd"))
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "jobs": self.jobs, "uptime": time.monotonic() - self.started}
+        if op == "shutdown":
+            logger.info("終了リクエストを受信しました。")
+            # serve_foreverを実行中のスレッドからはshutdownを呼べないため別スレッドで呼ぶ
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        return {"ok": False, "error": f"未対応の操作です: {op}"}
+
+    def run_job(self, args: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
+        """コマンドを実行し、終了コードと標準出力・標準エラー出力を返す"""
+        if args and args[0] in DISALLOWED_COMMANDS:
+            return {"ok": False, "error": f"常駐プロセスからは実行できないコマンドです: {args[0]}"}
+
+        start = time.perf_counter()
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8', newline='')
+        stderr = io.TextIOWrapper(io.BytesIO(), encoding='utf-8', newline='')
+        stdin = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        saved = sys.stdin, sys.stdout, sys.stderr
+        saved_cwd = os.getcwd()
+        try:
+            if cwd:
+                os.chdir(cwd)
+            sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+            exit_code = self._invoke(args)
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved
+            os.chdir(saved_cwd)
+        self.jobs += 1
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"ジョブを実行しました: {' '.join(args)} (終了コード{exit_code}, {elapsed:.3f}秒)")
+        return {"ok": True, "exit_code": exit_code, "stdout": self._getvalue(stdout),
+                "stderr": self._getvalue(stderr), "elapsed": elapsed}
+
+    def _invoke(self, args: List[str]) -> int:
+        """click.Commandを実行し、終了コードを返す（standalone_mode=Falseでの例外を終了コードに変換する）"""
+        try:
+            result = self.command.main(args=args, prog_name='stock-cli', standalone_mode=False,
+                                       obj={'serving': True})
+            return result if isinstance(result, int) else 0
+        except click.ClickException as e:
+            e.show()
+            return e.exit_code
+        except click.Abort:
+            click.echo("Aborted!", err=True)
+            return 1
+        except Exception as e:
+            logger.exception(f"ジョブの実行中にエラーが発生しました: {e}")
+            click.echo(f"エラー: {e}", err=True)
+            return 1
+
+    @staticmethod
+    def _getvalue(stream: io.TextIOWrapper) -> str:
+        stream.flush()
+        return stream.buffer.getvalue().decode('utf-8', errors='replace')
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+        logger.info("常駐プロセスを終了しました。")
@@ -0,0 +1,150 @@
+"""Google Sheets API 非同期クライアントモジュール"""
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+
+from src.google_sheets.auth import GoogleSheetsAuth
+from src.google_sheets.batch_writer import SheetBatchWriter
+from src.google_sheets.client import GoogleSheetsClient
+from src.models.batch import StockBatch
+from src.models.stock import StockData
+
+logger = logging.getLogger(__name__)
+
+# 同時に実行するAPI呼び出しの既定の上限
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class SheetRecordsResult(BaseModel):
+    """1シート分の取得結果"""
+    spreadsheet_id: str
+    sheet_name: str
+    records: List[Dict[str, Any]] = []
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class SheetValuesResult(BaseModel):
+    """1シート分の値（1行目はヘッダー）の取得結果"""
+    spreadsheet_id: str
+    sheet_name: str
+    values: List[List[Any]] = []
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class AsyncGoogleSheetsClient:
+    """
+    asyncioから複数のスプレッドシートを並行して読み書きするGoogle Sheetsクライアント
+
+    gspreadは同期APIのため、呼び出しはmax_concurrency個のワーカースレッドで実行し、
+    同時に実行する呼び出しの数はセマフォで制限する。HTTP接続は全スレッドで1つのセッションを共有し、
+    接続プールの大きさを同時実行数に合わせることで、スプレッドシートごとの接続の確立を省く。
+    """
+
+    def __init__(self, auth_manager: GoogleSheetsAuth, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 batch_writer: Optional[SheetBatchWriter] = None):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrencyは1以上である必要があります: {max_concurrency}")
+        self.max_concurrency = max_concurrency
+        self.sync_client = GoogleSheetsClient(auth_manager, batch_writer=batch_writer)
+        self._configure_connection_pool()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="sheets")
+        logger.info(f"AsyncGoogleSheetsClient initialized (max_concurrency={max_concurrency}).")
+
+    @property
+    def request_count(self) -> int:
+        """このクライアント経由で送信したAPIリクエストの数"""
+        return self.sync_client.request_count
+
+    def _configure_connection_pool(self) -> None:
+        """共有するHTTPセッションの接続プールを同時実行数に合わせる"""
+        http_client = getattr(self.sync_client.client, 'http_client', None)
+        session = getattr(http_client, 'session', None)
+        if session is None or not hasattr(session, 'mount'):
+            return
+        # セッションはプロセス内で共有されるため、既に十分な大きさの接続プールがあればそのまま使う
+        adapter = getattr(session, 'adapters', {}).get('https://')
+        if getattr(adapter, '_pool_maxsize', 0) >= self.max_concurrency:
+            return
+        session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=self.max_concurrency))
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """同期APIの呼び出しをワーカースレッドで実行する"""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def get_all_records(self, spreadsheet_id: str, sheet_name: str) -> List[Dict[str, Any]]:
+        """指定したシートのすべてのレコードを取得する"""
+        return await self._run(self.sync_client.get_all_records, spreadsheet_id, sheet_name)
+
+    async def get_all_values(self, spreadsheet_id: str, sheet_name: str) -> List[List[Any]]:
+        """指定したシートのすべての値（1行目はヘッダー）を取得する"""
+        return await self._run(self.sync_client.get_all_values, spreadsheet_id, sheet_name)
+
+    async def update_sheet_with_data(self, spreadsheet_id: str, sheet_name: str,
+                                     data: Union[List[StockData], StockBatch], resume: bool = False) -> None:
+        """StockDataのリストまたはStockBatchでシートを更新する"""
+        await self._run(self.sync_client.update_sheet_with_data, spreadsheet_id, sheet_name, data, resume)
+
+    async def fetch_records_many(self, targets: Sequence[Tuple[str, str]]) -> List[SheetRecordsResult]:
+        """
+        複数の (スプレッドシートID, シート名) のレコードを並行して取得する
+        結果はtargetsと同じ順序で返し、取得に失敗したシートはerrorに内容を設定する。
+        """
+        async def fetch(spreadsheet_id: str, sheet_name: str) -> SheetRecordsResult:
+            start = time.perf_counter()
+            try:
+                records = await self.get_all_records(spreadsheet_id, sheet_name)
+            except Exception as e:
+                return SheetRecordsResult(spreadsheet_id=spreadsheet_id, sheet_name=sheet_name,
+                                          elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__)
+            return SheetRecordsResult(spreadsheet_id=spreadsheet_id, sheet_name=sheet_name, records=records,
+                                      elapsed=time.perf_counter() - start)
+
+        return list(await asyncio.gather(*(fetch(spreadsheet_id, sheet_name)
+                                           for spreadsheet_id, sheet_name in targets)))
+
+    async def fetch_values_many(self, targets: Sequence[Tuple[str, str]]) -> List[SheetValuesResult]:
+        """
+        複数の (スプレッドシートID, シート名) の値を並行して取得する
+        結果はtargetsと同じ順序で返し、取得に失敗したシートはerrorに内容を設定する。
+        """
+        async def fetch(spreadsheet_id: str, sheet_name: str) -> SheetValuesResult:
+            start = time.perf_counter()
+            try:
+                values = await self.get_all_values(spreadsheet_id, sheet_name)
+            except Exception as e:
+                return SheetValuesResult(spreadsheet_id=spreadsheet_id, sheet_name=sheet_name,
+                                         elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__)
+            return SheetValuesResult(spreadsheet_id=spreadsheet_id, sheet_name=sheet_name, values=values,
+                                     elapsed=time.perf_counter() - start)
+
+        return list(await asyncio.gather(*(fetch(spreadsheet_id, sheet_name)
+                                           for spreadsheet_id, sheet_name in targets)))
+
+    async def close(self) -> None:
+        """ワーカースレッドを終了する"""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> 'AsyncGoogleSheetsClient':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
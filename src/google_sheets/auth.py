@@ -1,33 +1,158 @@
 """Google Sheets API 認証管理モジュール"""
-import json
 import logging
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from google.auth.transport.requests import Request
+from google.auth.transport.requests import AuthorizedSession, Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 import gspread
 
 logger = logging.getLogger(__name__)
 
+# トークンの有効期限までの残り時間がこれを下回ったら、次のリクエストの前に更新する
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+
+def _utcnow() -> datetime:
+    """google-authのexpiryと比較できる現在時刻（タイムゾーンなしのUTC）"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class _SharedAuthorizedSession(AuthorizedSession):
+    """リクエストの送信前に、キャッシュを通してトークンの有効期限を確認するセッション"""
+
+    def __init__(self, credentials: Credentials, ensure_fresh: Callable[[], Any]):
+        super().__init__(credentials)
+        self._ensure_fresh = ensure_fresh
+
+    def request(self, method, url, *args, **kwargs):
+        self._ensure_fresh()
+        return super().request(method, url, *args, **kwargs)
+
+
+class _CacheEntry:
+    """1つの認証設定に対応するキャッシュの内容"""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.credentials: Optional[Credentials] = None
+        self.session: Optional[AuthorizedSession] = None
+
+
+class CredentialCache:
+    """
+    認証情報とHTTPセッションをプロセス内で共有するキャッシュ（複数スレッドから利用できる）
+
+    認証ファイル・トークンファイル・スコープが同じGoogleSheetsAuthの間では、トークンファイルの読み込みと
+    セッションの生成を1回だけ行う。トークンは有効期限のrefresh_margin前になったら、
+    次のリクエストの送信前に1つのスレッドだけが更新し、トークンファイルに保存する。
+    """
+
+    def __init__(self, refresh_margin: timedelta = TOKEN_REFRESH_MARGIN,
+                 clock: Callable[[], datetime] = _utcnow):
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str, Tuple[str, ...]], _CacheEntry] = {}
+
+    def _entry(self, auth: 'GoogleSheetsAuth') -> _CacheEntry:
+        with self._lock:
+            entry = self._entries.get(auth.cache_key)
+            if entry is None:
+                entry = self._entries[auth.cache_key] = _CacheEntry()
+            return entry
+
+    def get_credentials(self, auth: 'GoogleSheetsAuth') -> Credentials:
+        """キャッシュした認証情報を返す（無ければ読み込み、有効期限が近ければ更新する）"""
+        entry = self._entry(auth)
+        with entry.lock:
+            if entry.credentials is None:
+                entry.credentials = auth.load_credentials()
+            else:
+                self._refresh_if_expiring(auth, entry.credentials)
+            return entry.credentials
+
+    def get_session(self, auth: 'GoogleSheetsAuth') -> AuthorizedSession:
+        """認証済みのHTTPセッションを返す（同じ認証設定では同じセッションを共有する）"""
+        credentials = auth.get_credentials()
+        entry = self._entry(auth)
+        with entry.lock:
+            if entry.session is None:
+                entry.session = _SharedAuthorizedSession(credentials, auth.get_credentials)
+            return entry.session
+
+    def _refresh_if_expiring(self, auth: 'GoogleSheetsAuth', credentials: Credentials) -> None:
+        expiry = getattr(credentials, 'expiry', None)
+        if not isinstance(expiry, datetime) or not credentials.refresh_token:
+            return
+        if expiry - self._clock() > self.refresh_margin:
+            return
+        try:
+            credentials.refresh(Request())
+        except Exception as e:
+            # 更新に失敗しても、期限が切れるまでは現在のトークンで続行する
+            logger.warning(f"トークン更新に失敗: {e}")
+            return
+        logger.info("有効期限が近いため認証トークンを更新しました")
+        auth._save_credentials(credentials)
+
+    def invalidate(self, auth: Optional['GoogleSheetsAuth'] = None) -> None:
+        """キャッシュを破棄する。authを省略した場合は全て破棄する"""
+        with self._lock:
+            if auth is None:
+                entries = list(self._entries.values())
+                self._entries.clear()
+            else:
+                entry = self._entries.pop(auth.cache_key, None)
+                entries = [entry] if entry else []
+        for entry in entries:
+            if entry.session is not None:
+                entry.session.close()
+
+
+# プロセス全体で共有するキャッシュ
+_credential_cache = CredentialCache()
+
+
+def get_credential_cache() -> CredentialCache:
+    """プロセス全体で共有する認証情報のキャッシュを取得する"""
+    return _credential_cache
+
+
 class GoogleSheetsAuth:
-    """Google Sheets認証管理クラス"""
+    """
+    Google Sheets認証管理クラス
+    認証情報とHTTPセッションはCredentialCache（既定ではプロセス全体で共有するキャッシュ）に保持する。
+    """
 
     def __init__(self,
                  credentials_file: str,
                  token_file: str,
                  scopes: List[str],
-                 port: int = 8080):
+                 port: int = 8080,
+                 cache: Optional[CredentialCache] = None):
         # チルダ(~)をホームディレクトリに展開する
         self.credentials_file = Path(credentials_file).expanduser()
         self.token_file = Path(token_file).expanduser()
         self.scopes = scopes
         self.port = port
+        self.cache = cache or get_credential_cache()
         logger.info(f"GoogleSheetsAuth initialized with credentials: {self.credentials_file}")
 
+    @property
+    def cache_key(self) -> Tuple[str, str, Tuple[str, ...]]:
+        """キャッシュで同じ認証情報として扱う組み合わせ"""
+        return str(self.credentials_file.resolve()), str(self.token_file.resolve()), tuple(sorted(self.scopes))
+
     def get_credentials(self) -> Credentials:
-        """認証情報を取得または新規作成する"""
+        """認証情報を取得する（プロセス内で読み込み済みの場合はキャッシュから返す）"""
+        return self.cache.get_credentials(self)
+
+    def load_credentials(self) -> Credentials:
+        """トークンファイルから認証情報を読み込む（無効な場合は更新または新規作成する）"""
         creds: Optional[Credentials] = None
         
         # 既存のトークンファイルをチェック
@@ -77,14 +202,15 @@ class GoogleSheetsAuth:
             raise
 
     def get_gspread_client(self) -> gspread.Client:
-        """gspreadクライアントを取得"""
-        creds = self.get_credentials()
-        client = gspread.authorize(creds)
+        """gspreadクライアントを取得（HTTPセッションはキャッシュしたものを共有する）"""
+        session = self.cache.get_session(self)
+        client = gspread.authorize(None, session=session)
         logger.info("Google Sheetsクライアントを作成しました")
         return client
 
     def revoke_credentials(self) -> None:
         """認証情報を削除（再認証強制用）"""
+        self.cache.invalidate(self)
         if self.token_file.exists():
             self.token_file.unlink()
             logger.info("認証情報を削除しました")
\ No newline at end of file
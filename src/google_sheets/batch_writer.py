@@ -0,0 +1,259 @@
+"""Google Sheetsへの分割書き込みモジュール"""
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import gspread
+import requests
+from gspread.spreadsheet import Spreadsheet
+from gspread.utils import absolute_range_name
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Sheets APIの書き込みリクエストの既定のクォータ（ユーザーあたり毎分60リクエスト）
+DEFAULT_REQUESTS_PER_MINUTE = 60
+
+# 再試行の対象とするHTTPステータス（レート制限とサーバーエラー）
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    トークンバケット方式のレート制限。
+    トークンは毎秒rate個ずつ最大capacity個まで補充され、acquireは必要なトークンが貯まるまで待機する。
+    """
+
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rateとcapacityは正の値である必要があります")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """トークンを取得する。待機した秒数を返す（複数スレッドから呼ばれた場合は順に待機する）"""
+        waited = 0.0
+        with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+                self._sleep(wait)
+                waited += wait
+
+
+class BatchWriteCheckpoint(BaseModel):
+    """分割書き込みの進捗（書き込みが完了した行数）"""
+    spreadsheet_id: str
+    sheet_name: str
+    digest: str
+    committed_rows: int
+    total_rows: int
+
+
+class BatchWriteError(Exception):
+    """分割書き込みの途中で失敗した場合の例外"""
+
+    def __init__(self, message: str, committed_rows: int, total_rows: int):
+        super().__init__(message)
+        self.committed_rows = committed_rows
+        self.total_rows = total_rows
+
+
+class SheetBatchWriter:
+    """
+    行データをbatch_size行ずつに分割し、values.batchUpdateでシートに書き込むライター。
+
+    - リクエストはトークンバケットでrequests_per_minute以下に抑える
+    - 429と5xxのエラー・通信エラーは指数バックオフで最大max_retries回再試行する
+    - checkpoint_pathを指定した場合、チャンクの書き込みが完了するたびに進捗を保存し、
+      resume=Trueで同じデータを書き込む際は書き込み済みのチャンクを飛ばして再開する
+      （取り込み日時のように実行ごとに変わる列はdigest_ignore_columnsで同じデータかの判定から除く）
+    """
+
+    def __init__(self,
+                 batch_size: int = 100,
+                 requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+                 max_retries: int = 5,
+                 initial_backoff: float = 1.0,
+                 max_backoff: float = 64.0,
+                 checkpoint_path: Optional[Union[str, Path]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if batch_size <= 0:
+            raise ValueError(f"batch_sizeは1以上である必要があります: {batch_size}")
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.checkpoint_path = Path(checkpoint_path).expanduser() if checkpoint_path else None
+        self._sleep = sleep
+        # 1分間の上限を超えないよう、バースト数は毎秒の補充量の数秒分に抑える
+        rate = requests_per_minute / 60.0
+        self._bucket = TokenBucket(rate, capacity=max(1.0, rate * 5), clock=clock, sleep=sleep)
+
+    def write(self, spreadsheet: Spreadsheet, sheet_name: str, rows: Sequence[List[Any]],
+              start_row: int = 2, resume: bool = False, digest_ignore_columns: Sequence[int] = ()) -> int:
+        """
+        rowsをstart_row行目から順に書き込み、今回書き込んだ行数を返す
+        digest_ignore_columnsの列（0始まり）は、再開時に同じデータかを判定する際に比較しない。
+
+        Raises:
+            BatchWriteError: 再試行しても書き込めないチャンクがあった場合
+        """
+        total = len(rows)
+        digest = self._digest(rows, start_row, digest_ignore_columns)
+        offset = 0
+        if resume:
+            checkpoint = self._matching_checkpoint(spreadsheet.id, sheet_name, digest)
+            if checkpoint:
+                offset = checkpoint.committed_rows
+                logger.info(f"'{sheet_name}'への書き込みを{offset}/{total}行目から再開します。")
+            else:
+                logger.warning("再開できる書き込みの進捗が見つからないため、先頭から書き込みます。")
+
+        first = offset
+        while offset < total:
+            chunk = list(rows[offset:offset + self.batch_size])
+            body = {
+                "valueInputOption": "RAW",
+                "data": [{
+                    "range": absolute_range_name(sheet_name, f"A{start_row + offset}"),
+                    "values": chunk,
+                }],
+            }
+            try:
+                self._send(spreadsheet, body)
+            except Exception as e:
+                raise BatchWriteError(
+                    f"'{sheet_name}'への書き込みに失敗しました（{offset}/{total}行を書き込み済み）: {e}",
+                    committed_rows=offset, total_rows=total
+                ) from e
+            offset += len(chunk)
+            logger.debug("Committed rows %d/%d to '%s'", offset, total, sheet_name)
+            self._save_checkpoint(BatchWriteCheckpoint(
+                spreadsheet_id=spreadsheet.id, sheet_name=sheet_name, digest=digest,
+                committed_rows=offset, total_rows=total
+            ))
+
+        self.clear_checkpoint()
+        return total - first
+
+    def resumable_checkpoint(self, spreadsheet_id: str, sheet_name: str, rows: Sequence[List[Any]],
+                             start_row: int = 2,
+                             digest_ignore_columns: Sequence[int] = ()) -> Optional[BatchWriteCheckpoint]:
+        """
+        同じシートに同じデータ（rows）を書き込んでいた途中の進捗を返す（無い場合はNone）
+        writeをresume=Trueで呼ぶ前に、書き込み済みの行を残して続きから再開できるかを確認するために使用する。
+        """
+        digest = self._digest(rows, start_row, digest_ignore_columns)
+        return self._matching_checkpoint(spreadsheet_id, sheet_name, digest)
+
+    def _matching_checkpoint(self, spreadsheet_id: str, sheet_name: str,
+                             digest: str) -> Optional[BatchWriteCheckpoint]:
+        """書き込み先とデータのハッシュが一致する進捗を返す（無い場合はNone）"""
+        checkpoint = self.load_checkpoint()
+        if checkpoint and (checkpoint.spreadsheet_id, checkpoint.sheet_name, checkpoint.digest) == \
+                (spreadsheet_id, sheet_name, digest):
+            return checkpoint
+        return None
+
+    def update_ranges(self, spreadsheet: Spreadsheet, sheet_name: str, data: List[Dict[str, Any]]) -> None:
+        """
+        範囲ごとの値の一覧（values.batchUpdateのdata）を1回のリクエストで書き込む
+
+        Raises:
+            BatchWriteError: 再試行しても書き込めなかった場合
+        """
+        total = sum(len(item["values"]) for item in data)
+        try:
+            self._send(spreadsheet, {"valueInputOption": "RAW", "data": data})
+        except Exception as e:
+            raise BatchWriteError(f"'{sheet_name}'への書き込みに失敗しました: {e}",
+                                  committed_rows=0, total_rows=total) from e
+
+    def _send(self, spreadsheet: Spreadsheet, body: Dict[str, Any]) -> Any:
+        """values.batchUpdateのリクエストを送信する。再試行可能なエラーは指数バックオフで再送する"""
+        attempt = 0
+        while True:
+            self._bucket.acquire()
+            try:
+                return spreadsheet.values_batch_update(body)
+            except gspread.exceptions.APIError as e:
+                if e.code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    raise
+                reason = f"HTTP {e.code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                reason = type(e).__name__
+
+            # 2^n秒にランダムな揺らぎを加えた時間だけ待つ（上限max_backoff秒）
+            delay = min(self.max_backoff, self.initial_backoff * 2 ** attempt + random.uniform(0, 1))
+            attempt += 1
+            logger.warning(f"書き込みリクエストが失敗したため{delay:.1f}秒後に再試行します"
+                           f"（{attempt}/{self.max_retries}回目, {reason}）")
+            self._sleep(delay)
+
+    @staticmethod
+    def _digest(rows: Sequence[List[Any]], start_row: int, ignore_columns: Sequence[int] = ()) -> str:
+        """書き込むデータを識別するハッシュ（再開時に同じデータかを確認するために使用。ignore_columnsの列は含めない）"""
+        digest = hashlib.sha256(str(start_row).encode())
+        ignored = set(ignore_columns)
+        for row in rows:
+            if ignored:
+                row = [value for col, value in enumerate(row) if col not in ignored]
+            digest.update(json.dumps(row, default=str, ensure_ascii=False).encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    def load_checkpoint(self) -> Optional[BatchWriteCheckpoint]:
+        """保存された進捗を返す。無い・読み込めない場合はNoneを返す"""
+        if self.checkpoint_path is None:
+            return None
+        try:
+            return BatchWriteCheckpoint.model_validate_json(self.checkpoint_path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"書き込みの進捗を読み込めませんでした: {self.checkpoint_path}: {e}")
+            return None
+
+    def _save_checkpoint(self, checkpoint: BatchWriteCheckpoint) -> None:
+        if self.checkpoint_path is None:
+            return
+        temp_path = None
+        try:
+            self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=self.checkpoint_path.parent, suffix='.tmp',
+                                             delete=False, encoding='utf-8') as f:
+                temp_path = Path(f.name)
+                f.write(checkpoint.model_dump_json())
+            os.replace(temp_path, self.checkpoint_path)
+        except Exception as e:
+            logger.warning(f"書き込みの進捗を保存できませんでした: {e}")
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+
+    def clear_checkpoint(self) -> None:
+        """保存された進捗を削除する"""
+        if self.checkpoint_path is not None:
+            self.checkpoint_path.unlink(missing_ok=True)
@@ -1,25 +1,78 @@
 """Google Sheets API クライアントモジュール"""
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 import gspread
 from gspread.spreadsheet import Spreadsheet
+from gspread.utils import DateTimeOption, ValueRenderOption, absolute_range_name, fill_gaps
 from gspread.worksheet import Worksheet
 
 from src.google_sheets.auth import GoogleSheetsAuth
+from src.google_sheets.batch_writer import BatchWriteCheckpoint, BatchWriteError, SheetBatchWriter
+from src.google_sheets.field_mapping import RowSerializer, header_to_attribute
+from src.google_sheets.sheet_sync import SyncPlan, plan_sync
+from src.models.batch import StockBatch
 from src.models.stock import StockData
 
 logger = logging.getLogger(__name__)
 
+# 新規シートに設定するデフォルトのヘッダー
+DEFAULT_HEADERS = [
+    "Symbol", "Exchange", "Company_Name", "Current_Price",
+    "Source_Platform", "TradingView_Section", "Quant_Rating",
+    "SA_Analyst_Rating", "Valuation_Grade", "Dividend_Safety",
+    "Yield_TTM", "Date_Updated", "Notes"
+]
+
+# 解析のたびに値が変わるフィールド（--resumeで前回と同じデータかを判定する際に比較しない）
+RESUME_IGNORED_FIELDS = frozenset({'date_added', 'date_updated'})
+
 class GoogleSheetsClient:
-    """Google Sheetsクライアント"""
+    """
+    Google Sheetsクライアント
+
+    一度開いたSpreadsheet/Worksheetはインスタンス内にキャッシュし、同じコマンド内の後続の呼び出しで再利用する。
+    シートの作成・名前変更はこのクライアント経由で行うとキャッシュに反映される。
+    それ以外の方法でシート構成が変わった場合はinvalidateでキャッシュを破棄する。
+    """
 
-    def __init__(self, auth_manager: GoogleSheetsAuth):
+    def __init__(self, auth_manager: GoogleSheetsAuth, batch_writer: Optional[SheetBatchWriter] = None):
         self.auth_manager = auth_manager
         self.client = auth_manager.get_gspread_client()
+        self.batch_writer = batch_writer or SheetBatchWriter()
+        self._spreadsheets: Dict[str, Spreadsheet] = {}
+        self._worksheets: Dict[Tuple[str, str], Worksheet] = {}
+        # このクライアント経由で送信したAPIリクエストの数（複数スレッドから呼ばれる場合に備えてロックで保護する）
+        self.request_count = 0
+        self._request_count_lock = threading.Lock()
+        self._install_request_counter()
         logger.info("GoogleSheetsClient initialized.")
 
+    def _install_request_counter(self) -> None:
+        """gspreadのHTTPクライアントのrequestを包み、送信したリクエスト数を数える"""
+        http_client = getattr(self.client, 'http_client', None)
+        if http_client is None:
+            return
+        request = http_client.request
+
+        def counted_request(*args, **kwargs):
+            with self._request_count_lock:
+                self.request_count += 1
+            return request(*args, **kwargs)
+
+        http_client.request = counted_request
+
+    def invalidate(self, spreadsheet_id: Optional[str] = None) -> None:
+        """キャッシュしたSpreadsheet/Worksheetを破棄する。spreadsheet_idを省略した場合は全て破棄する"""
+        if spreadsheet_id is None:
+            self._spreadsheets.clear()
+            self._worksheets.clear()
+            return
+        self._spreadsheets.pop(spreadsheet_id, None)
+        for key in [key for key in self._worksheets if key[0] == spreadsheet_id]:
+            del self._worksheets[key]
+
     def create_spreadsheet(self, name: str) -> Spreadsheet:
         """新しいスプレッドシートを作成する"""
         try:
@@ -34,16 +87,23 @@ class GoogleSheetsClient:
             worksheet.update_title("Stock_Data")
             logger.info("デフォルトのシート名を 'Stock_Data' に変更しました。")
 
+            self._spreadsheets[spreadsheet.id] = spreadsheet
+            self._worksheets[(spreadsheet.id, worksheet.title)] = worksheet
+
             return spreadsheet
         except Exception as e:
             logger.error(f"スプレッドシートの作成に失敗しました: {e}")
             raise
 
     def get_spreadsheet_by_id(self, spreadsheet_id: str) -> Spreadsheet:
-        """IDでスプレッドシートを取得する"""
+        """IDでスプレッドシートを取得する（セッション内で開いたものはキャッシュから返す）"""
+        spreadsheet = self._spreadsheets.get(spreadsheet_id)
+        if spreadsheet is not None:
+            return spreadsheet
         try:
             spreadsheet = self.client.open_by_key(spreadsheet_id)
             logger.info(f"スプレッドシートを開きました: {spreadsheet.title}")
+            self._spreadsheets[spreadsheet_id] = spreadsheet
             return spreadsheet
         except gspread.exceptions.SpreadsheetNotFound:
             logger.error(f"スプレッドシートが見つかりません: ID={spreadsheet_id}")
@@ -52,11 +112,24 @@ class GoogleSheetsClient:
             logger.error(f"スプレッドシートの取得中にエラーが発生しました: {e}")
             raise
 
+    def get_worksheet(self, spreadsheet_id: str, sheet_name: str) -> Worksheet:
+        """
+        シート名でワークシートを取得する（セッション内で取得したものはキャッシュから返す）
+
+        Raises:
+            gspread.exceptions.WorksheetNotFound: シートが存在しない場合
+        """
+        key = (spreadsheet_id, sheet_name)
+        worksheet = self._worksheets.get(key)
+        if worksheet is None:
+            worksheet = self.get_spreadsheet_by_id(spreadsheet_id).worksheet(sheet_name)
+            self._worksheets[key] = worksheet
+        return worksheet
+
     def get_all_records(self, spreadsheet_id: str, sheet_name: str) -> List[Dict[str, Any]]:
         """指定したシートのすべてのレコードを取得する"""
         try:
-            spreadsheet = self.get_spreadsheet_by_id(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
             records = worksheet.get_all_records()
             logger.info(f"'{sheet_name}'から{len(records)}件のレコードを取得しました。")
             return records
@@ -67,72 +140,170 @@ class GoogleSheetsClient:
             logger.error(f"レコードの取得中にエラーが発生しました: {e}")
             raise
 
-    def setup_default_headers(self, worksheet: Worksheet) -> None:
-        """指定したワークシートにデフォルトのヘッダーを設定する"""
+    def get_all_values(self, spreadsheet_id: str, sheet_name: str) -> List[List[Any]]:
+        """
+        指定したシートのすべての値（1行目はヘッダー）を1回のリクエストで取得する
+        数値は書式を適用しない値で取得し、日時は書式設定された文字列で取得する。
+        """
+        try:
+            worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
+            values = worksheet.get_all_values(value_render_option=ValueRenderOption.unformatted,
+                                              date_time_render_option=DateTimeOption.formatted_string)
+            logger.info(f"'{sheet_name}'から{max(len(values) - 1, 0)}行の値を取得しました。")
+            return values
+        except gspread.exceptions.WorksheetNotFound:
+            logger.error(f"ワークシートが見つかりません: {sheet_name}")
+            raise
+        except Exception as e:
+            logger.error(f"値の取得中にエラーが発生しました: {e}")
+            raise
+
+    def get_values_many(self, spreadsheet_id: str,
+                        sheet_names: Optional[List[str]] = None) -> Dict[str, List[List[Any]]]:
+        """
+        1つのスプレッドシートの複数のシートの値（1行目はヘッダー）をvalues.batchGetの1回のリクエストで取得する
+        sheet_namesを省略した場合はすべてのシートを対象とする。結果はシート名 -> 値で、指定した順序で返す。
+        """
+        try:
+            spreadsheet = self.get_spreadsheet_by_id(spreadsheet_id)
+            if sheet_names is None:
+                sheet_names = [worksheet.title for worksheet in spreadsheet.worksheets()]
+            sheet_names = list(dict.fromkeys(sheet_names))
+            if not sheet_names:
+                return {}
+            response = spreadsheet.values_batch_get(
+                [absolute_range_name(name) for name in sheet_names],
+                params={"valueRenderOption": ValueRenderOption.unformatted,
+                        "dateTimeRenderOption": DateTimeOption.formatted_string},
+            )
+            # 値の範囲はリクエストした順序で返る。行の長さはget_all_valuesと同様に揃える
+            result = {
+                name: fill_gaps(value_range.get("values", [[]]))
+                for name, value_range in zip(sheet_names, response.get("valueRanges", []))
+            }
+            logger.info(f"{len(result)}件のシートの値を取得しました: {', '.join(result)}")
+            return result
+        except Exception as e:
+            logger.error(f"値の取得中にエラーが発生しました: {e}")
+            raise
+
+    def setup_default_headers(self, worksheet: Worksheet) -> List[str]:
+        """指定したワークシートにデフォルトのヘッダーを設定し、設定したヘッダーを返す"""
         try:
-            headers = [
-                "Symbol", "Exchange", "Company_Name", "Current_Price",
-                "Source_Platform", "TradingView_Section", "Quant_Rating",
-                "SA_Analyst_Rating", "Valuation_Grade", "Dividend_Safety",
-                "Yield_TTM", "Date_Updated", "Notes"
-            ]
+            headers = list(DEFAULT_HEADERS)
             worksheet.update('A1', [headers])
             logger.info(f"'{worksheet.title}'シートにデフォルトヘッダーを設定しました。")
+            return headers
         except Exception as e:
             logger.error(f"ヘッダーの設定に失敗しました: {e}")
             raise
 
-    def update_sheet_with_data(self, spreadsheet_id: str, sheet_name: str, data: List[StockData]) -> None:
-        """StockDataのリストでシートを更新する（バッチ処理）"""
+    def update_sheet_with_data(self, spreadsheet_id: str, sheet_name: str,
+                               data: Union[List[StockData], StockBatch], resume: bool = False) -> None:
+        """
+        StockDataのリストまたはStockBatchでシートを更新する（バッチ処理）
+        データはbatch_writerでbatch_size行ずつ書き込む。resume=Trueの場合は前回失敗した書き込みの続きから再開する。
+
+        Raises:
+            BatchWriteError: 書き込みが途中で失敗した場合
+        """
         try:
-            spreadsheet = self.get_spreadsheet_by_id(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
             
             # ヘッダーを取得して、書き込むデータの順序を決定
             headers = worksheet.row_values(1)
             if not headers:
                 logger.warning(f"'{sheet_name}'にヘッダーが見つかりません。デフォルトヘッダーを設定します。")
-                self.setup_default_headers(worksheet)
-                headers = worksheet.row_values(1)
+                headers = self.setup_default_headers(worksheet)
 
             # StockDataをヘッダー順のリストのリストに変換
-            values_to_update = []
-            for stock in data:
-                row = []
-                for header in headers:
-                    attr = header.lower()
-                    # シートの見出しとStockData属性名の差異を吸収
-                    if attr == "company_name":
-                        attr = "name"
-                    value = getattr(stock, attr, "")
-                    if isinstance(value, datetime):
-                        row.append(value.isoformat())
-                    elif value is None:
-                        row.append("")
-                    else:
-                        row.append(value)
-                values_to_update.append(row)
+            values_to_update = RowSerializer(headers).serialize(data)
             
             if not values_to_update:
                 logger.info("更新するデータがありません。")
                 return
 
             # 2行目からデータを書き込む (A2から)
-            worksheet.update(f'A2', values_to_update)
+            volatile_columns = self._volatile_columns(headers)
+            spreadsheet = self.get_spreadsheet_by_id(spreadsheet_id)
+            self.batch_writer.write(spreadsheet, sheet_name, values_to_update, start_row=2, resume=resume,
+                                    digest_ignore_columns=volatile_columns)
             
             logger.info(f"'{sheet_name}'シートを{len(values_to_update)}件のデータで更新しました。")
 
         except gspread.exceptions.WorksheetNotFound:
             logger.error(f"ワークシートが見つかりません: {sheet_name}")
             raise
+        except BatchWriteError as e:
+            logger.error(str(e))
+            raise
         except Exception as e:
             logger.error(f"シートの更新中にエラーが発生しました: {e}")
 
+    def resumable_checkpoint(self, spreadsheet_id: str, sheet_name: str,
+                             data: Union[List[StockData], StockBatch]) -> Optional[BatchWriteCheckpoint]:
+        """
+        同じシートに同じデータを書き込んでいた途中の進捗を返す（無い場合はNone）
+        update_sheet_with_dataと同じくシートのヘッダー順の行に変換して比較する。
+        シートやヘッダーが無い場合は再開できないためNoneを返す。
+        """
+        try:
+            headers = self.get_worksheet(spreadsheet_id, sheet_name).row_values(1)
+        except gspread.exceptions.WorksheetNotFound:
+            return None
+        if not headers:
+            return None
+        rows = RowSerializer(headers).serialize(data)
+        return self.batch_writer.resumable_checkpoint(spreadsheet_id, sheet_name, rows, start_row=2,
+                                                      digest_ignore_columns=self._volatile_columns(headers))
+
+    @staticmethod
+    def _volatile_columns(headers: List[str]) -> List[int]:
+        """取り込み日時のように解析のたびに変わる列（再開時に同じデータかを判定する際は比較しない）"""
+        return [col for col, header in enumerate(headers)
+                if header_to_attribute(header) in RESUME_IGNORED_FIELDS]
+
+    def sync_sheet_with_data(self, spreadsheet_id: str, sheet_name: str, data: List[StockData],
+                             dry_run: bool = False) -> SyncPlan:
+        """
+        シートを読み込んでデータとの差分を求め、変更のある行だけを1回の一括更新で書き込む
+        シートが存在しない場合は作成する。dry_run=Trueの場合は書き込まずに同期内容だけを返す。
+
+        Raises:
+            BatchWriteError: 書き込みに失敗した場合
+        """
+        if not self.sheet_exists(spreadsheet_id, sheet_name):
+            if dry_run:
+                values = [list(DEFAULT_HEADERS)]
+                return plan_sync(sheet_name, values, data)
+            self.create_sheet(spreadsheet_id, sheet_name)
+        worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
+
+        values = worksheet.get_all_values(value_render_option=ValueRenderOption.unformatted)
+        if not values or not any(cell != "" for cell in values[0]):
+            logger.warning(f"'{sheet_name}'にヘッダーが見つかりません。デフォルトヘッダーを設定します。")
+            headers = list(DEFAULT_HEADERS) if dry_run else self.setup_default_headers(worksheet)
+            values = [headers] + values[1:]
+
+        plan = plan_sync(sheet_name, values, data)
+        logger.info(f"'{sheet_name}'の同期内容: 追加{plan.inserted}件, 更新{plan.updated}件, "
+                    f"削除{plan.deleted}件, 変更なし{plan.unchanged}件 (書き込み{plan.changed_rows}行)")
+        if dry_run or not plan.data:
+            return plan
+
+        # 同期後の行数がシートの行数を超える場合は先に行を追加する
+        required_rows = max(plan.row_count, len(values) - 1) + 1
+        if required_rows > worksheet.row_count:
+            worksheet.add_rows(required_rows - worksheet.row_count)
+
+        spreadsheet = self.get_spreadsheet_by_id(spreadsheet_id)
+        self.batch_writer.update_ranges(spreadsheet, sheet_name, plan.data)
+        return plan
+
     def sheet_exists(self, spreadsheet_id: str, sheet_name: str) -> bool:
         """指定したシートが存在するかを確認する"""
         try:
-            spreadsheet = self.get_spreadsheet_by_id(spreadsheet_id)
-            spreadsheet.worksheet(sheet_name)
+            self.get_worksheet(spreadsheet_id, sheet_name)
             return True
         except gspread.exceptions.WorksheetNotFound:
             return False
@@ -146,6 +317,7 @@ class GoogleSheetsClient:
             spreadsheet = self.get_spreadsheet_by_id(spreadsheet_id)
             worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=26)
             logger.info(f"シートを作成しました: {sheet_name}")
+            self._worksheets[(spreadsheet_id, sheet_name)] = worksheet
             
             # デフォルトのヘッダーを設定
             self.setup_default_headers(worksheet)
@@ -155,11 +327,28 @@ class GoogleSheetsClient:
             logger.error(f"シートの作成に失敗しました: {e}")
             raise
 
+    def rename_sheet(self, spreadsheet_id: str, sheet_name: str, new_name: str) -> Worksheet:
+        """シート名を変更する"""
+        try:
+            worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
+            worksheet.update_title(new_name)
+            logger.info(f"シート名を変更しました: {sheet_name} -> {new_name}")
+        except gspread.exceptions.WorksheetNotFound:
+            logger.error(f"ワークシートが見つかりません: {sheet_name}")
+            raise
+        except Exception as e:
+            # 変更が反映されたか不明なため、このスプレッドシートのキャッシュを破棄する
+            self.invalidate(spreadsheet_id)
+            logger.error(f"シート名の変更に失敗しました: {e}")
+            raise
+        self._worksheets.pop((spreadsheet_id, sheet_name), None)
+        self._worksheets[(spreadsheet_id, new_name)] = worksheet
+        return worksheet
+
     def clear_sheet(self, spreadsheet_id: str, sheet_name: str) -> None:
         """指定したシートの全内容をクリアする（書式は維持）"""
         try:
-            spreadsheet = self.get_spreadsheet_by_id(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
             worksheet.clear()
             logger.info(f"'{sheet_name}' の内容をクリアしました。")
         except gspread.exceptions.WorksheetNotFound:
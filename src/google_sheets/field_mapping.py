@@ -0,0 +1,85 @@
+"""Google Sheetsの見出しとStockDataのフィールドの対応付けモジュール"""
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.models.batch import FIELD_KINDS, StockBatch
+from src.models.platform_mapping import PLATFORM_MAPPINGS
+from src.models.stock import StockData
+
+# シートの見出し（小文字）-> StockDataのフィールド名（見出しとフィールド名が異なるもの）
+SHEET_HEADER_ALIASES = PLATFORM_MAPPINGS['googlesheets'].renames
+
+
+def header_to_attribute(header: str) -> str:
+    """シートの見出しをStockDataの属性名に変換する"""
+    attr = str(header).strip().lower()
+    return SHEET_HEADER_ALIASES.get(attr, attr)
+
+
+def to_cell_value(value: Any) -> Any:
+    """StockDataの値をシートに書き込む値に変換する"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None:
+        return ""
+    return value
+
+
+def _datetime_cells(values: Sequence[Any]) -> List[Any]:
+    # 取り込み日時など同じ値が続くことが多いため、文字列への変換は値ごとに1回だけ行う
+    formatted = {None: ""}
+    return [formatted[v] if v in formatted else formatted.setdefault(v, v.isoformat()) for v in values]
+
+
+def _datetime64_cells(array: np.ndarray) -> List[str]:
+    """datetime64配列の値をdatetime.isoformat()の文字列に変換する（重複する値は1回だけ変換する）"""
+    uniques, inverse = np.unique(array, return_inverse=True)
+    formatted = np.empty(len(uniques), dtype=object)
+    formatted[:] = _datetime_cells(uniques.astype(object).tolist())
+    return formatted[inverse].tolist()
+
+
+def _plain_cells(values: Sequence[Any]) -> List[Any]:
+    return ["" if v is None else v for v in values]
+
+
+class RowSerializer:
+    """
+    見出しの並びに合わせてStockDataをシートの行に変換するシリアライザー。
+
+    見出しとフィールドの対応と列ごとの変換関数は生成時に1回だけ決め、
+    値は列単位で取り出して変換してから行にまとめる。StockDataに対応しない見出しの列は空にする。
+    """
+
+    def __init__(self, headers: Sequence[str]):
+        self.headers = list(headers)
+        # 列ごとのフィールド名（対応するフィールドが無い列はNone）
+        self.attributes: List[Optional[str]] = [
+            attr if attr in FIELD_KINDS else None for attr in map(header_to_attribute, self.headers)
+        ]
+        self._fields = list(dict.fromkeys(attr for attr in self.attributes if attr is not None))
+        # StockDataから使用するフィールドの値をタプルでまとめて取り出す
+        self._getter = attrgetter(*self._fields) if len(self._fields) > 1 else \
+            lambda stock: tuple(getattr(stock, field) for field in self._fields)
+
+    def serialize(self, data: Union[Sequence[StockData], StockBatch]) -> List[List[Any]]:
+        """StockDataのリストまたはStockBatchをシートの行のリストに変換する"""
+        if isinstance(data, StockBatch):
+            return self._build_rows(len(data), lambda attr: (
+                _datetime64_cells(data.column(attr)) if FIELD_KINDS[attr] == 'datetime'
+                else _plain_cells(data.to_pylist(attr))
+            ))
+        columns = dict(zip(self._fields, zip(*map(self._getter, data))))
+        return self._build_rows(len(data), lambda attr: (
+            _datetime_cells if FIELD_KINDS[attr] == 'datetime' else _plain_cells
+        )(columns[attr]))
+
+    def _build_rows(self, length: int, get_cells: Callable[[str], Sequence[Any]]) -> List[List[Any]]:
+        if not length:
+            return []
+        empty = [""] * length
+        cells = [empty if attr is None else get_cells(attr) for attr in self.attributes]
+        return list(map(list, zip(*cells)))
@@ -0,0 +1,181 @@
+"""Google Sheetsのシートと株式データの差分同期モジュール"""
+from typing import Any, Dict, List, Optional, Sequence
+
+from gspread.utils import absolute_range_name
+from pydantic import BaseModel
+
+from src.google_sheets.field_mapping import header_to_attribute, to_cell_value
+from src.models.stock import StockData
+
+# 差分の判定に使用しないフィールド（データを取り込むたびに変わる日時）
+IGNORED_FIELDS = frozenset({'date_added', 'date_updated'})
+
+# 既存の行を更新する際に、シート上の値を維持するフィールド（追加日とシート上で入力するメモ）
+PRESERVED_FIELDS = frozenset({'date_added', 'notes'})
+
+
+def _normalize(value: Any) -> Any:
+    """比較用にセルの値を正規化する（空セルとNone、intとfloatを同一視する）"""
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+class SyncPlan(BaseModel):
+    """シートの同期内容"""
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    # 同期後のデータ行数（ヘッダーを除く）
+    row_count: int = 0
+    # values.batchUpdateに渡す、変更のある範囲と値の一覧
+    data: List[Dict[str, Any]] = []
+
+    @property
+    def changed_rows(self) -> int:
+        """書き込む行数"""
+        return sum(len(item["values"]) for item in self.data)
+
+
+def plan_sync(sheet_name: str, values: List[List[Any]], data: Sequence[StockData]) -> SyncPlan:
+    """
+    シートの現在の値（1行目はヘッダー）とデータを比較し、変更のある行だけを書き込む同期内容を作成する
+
+    行はfull_symbol（シートにFull_Symbol列が無い場合はExchange列とSymbol列から生成）で対応付ける。
+    - シートに無い銘柄は、削除された行の位置または末尾に追加する
+    - 値が変わった銘柄は、その行だけを書き換える（IGNORED_FIELDSの違いは無視する）
+    - データに無い銘柄の行は、末尾の行を移動して詰めてから末尾を空にする
+    ヘッダーがStockDataの属性に対応しない列は比較せず、シート上の値を維持する。
+    """
+    headers = list(values[0]) if values else []
+    attrs: List[Optional[str]] = [
+        attr if attr in StockData.model_fields else None for attr in map(header_to_attribute, headers)
+    ]
+    if 'symbol' not in attrs:
+        raise ValueError(f"シート'{sheet_name}'にSymbol列がありません")
+    symbol_col = attrs.index('symbol')
+    exchange_col = attrs.index('exchange') if 'exchange' in attrs else None
+    full_symbol_col = attrs.index('full_symbol') if 'full_symbol' in attrs else None
+
+    existing = [list(row) for row in values[1:]]
+    width = max([len(headers)] + [len(row) for row in existing])
+
+    def cell(row: List[Any], col: Optional[int]) -> Any:
+        return row[col] if col is not None and col < len(row) else ""
+
+    def row_key(row: List[Any]) -> str:
+        full_symbol = cell(row, full_symbol_col)
+        if full_symbol != "":
+            return str(full_symbol)
+        symbol = cell(row, symbol_col)
+        if symbol == "":
+            return ""
+        exchange = cell(row, exchange_col)
+        return f"{exchange}:{symbol}" if exchange != "" else str(symbol)
+
+    def build_row(stock: StockData, old: Optional[List[Any]]) -> List[Any]:
+        row = []
+        for col, attr in enumerate(attrs):
+            if attr is None or (attr in PRESERVED_FIELDS and old and cell(old, col) != ""):
+                row.append(cell(old, col) if old else "")
+            else:
+                row.append(to_cell_value(getattr(stock, attr)))
+        if old:
+            row.extend(old[len(row):])
+        return row + [""] * (width - len(row))
+
+    def differs(old: List[Any], new: List[Any]) -> bool:
+        return any(
+            _normalize(cell(old, col)) != _normalize(new[col])
+            for col, attr in enumerate(attrs) if attr is not None and attr not in IGNORED_FIELDS
+        )
+
+    plan = SyncPlan()
+
+    # シート上の行を銘柄ごとに対応付ける（空行と重複した行は空き位置として扱う）
+    index_by_key: Dict[str, int] = {}
+    free: List[int] = []
+    for index, row in enumerate(existing):
+        key = row_key(row)
+        if not key:
+            free.append(index)
+        elif key in index_by_key:
+            free.append(index)
+            plan.deleted += 1
+        else:
+            index_by_key[key] = index
+
+    final = list(existing)
+    dirty = set()
+    inserts: List[List[Any]] = []
+    seen = set()
+    for stock in data:
+        if stock.full_symbol in seen:
+            continue
+        seen.add(stock.full_symbol)
+        index = index_by_key.pop(stock.full_symbol, None)
+        if index is None:
+            inserts.append(build_row(stock, None))
+            plan.inserted += 1
+            continue
+        new_row = build_row(stock, existing[index])
+        if differs(existing[index], new_row):
+            final[index] = new_row
+            dirty.add(index)
+            plan.updated += 1
+        else:
+            plan.unchanged += 1
+
+    plan.deleted += len(index_by_key)
+    free.extend(index_by_key.values())
+    free.sort()
+
+    # 追加する行は空き位置を先に埋め、残りを末尾に追加する
+    for index, row in zip(free, inserts):
+        final[index] = row
+        dirty.add(index)
+    remaining_free = free[len(inserts):]
+    for row in inserts[len(free):]:
+        final.append(row)
+        dirty.add(len(final) - 1)
+
+    # 残った空き位置は末尾の行を移動して詰める
+    holes = set(remaining_free)
+    while holes:
+        last = len(final) - 1
+        if last in holes:
+            holes.remove(last)
+        else:
+            target = min(holes)
+            holes.remove(target)
+            final[target] = final[last]
+            dirty.add(target)
+        final.pop()
+        dirty.discard(last)
+
+    # 詰めた分だけ末尾の行を空にする
+    blank = [""] * width
+    for index in range(len(final), len(existing)):
+        dirty.add(index)
+
+    plan.row_count = len(final)
+    for start, rows in _contiguous_runs(sorted(dirty), lambda i: final[i] if i < len(final) else blank):
+        plan.data.append({
+            "range": absolute_range_name(sheet_name, f"A{start + 2}"),
+            "values": [row + [""] * (width - len(row)) for row in rows],
+        })
+    return plan
+
+
+def _contiguous_runs(indices: List[int], row_at) -> List[tuple]:
+    """昇順のインデックスを連続した範囲ごとに (開始インデックス, 行のリスト) にまとめる"""
+    runs = []
+    for index in indices:
+        if runs and runs[-1][0] + len(runs[-1][1]) == index:
+            runs[-1][1].append(row_at(index))
+        else:
+            runs.append((index, [row_at(index)]))
+    return runs
@@ -1,13 +1,136 @@
 """株式ウォッチリスト管理CLI メインエントリーポイント"""
 
+import sys
+
 import click
-from typing import Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union, List
 
 from src.utils.logging_config import setup_logging, get_logger
 from src.config.settings import get_config, AppConfig
-from src.google_sheets.auth import GoogleSheetsAuth
 from src.converters.format_converter import FormatConverter
+from src.models.batch import StockBatch
+from src.models.stock import TradingViewData, SeekingAlphaData, StockData
 from src.utils.param_utils import PrefixChoice
+from src.utils.parse_cache import ParseCache
+from src.parsers.registry import registry, detect_format
+
+# Google API関連のモジュール（google-auth・gspreadなど）は読み込みに時間がかかるため、
+# 使用するコマンドの実行時に初めてインポートする
+if TYPE_CHECKING:
+    from src.google_sheets.auth import GoogleSheetsAuth
+    from src.google_sheets.batch_writer import SheetBatchWriter
+    from src.google_sheets.client import GoogleSheetsClient
+    from src.converters.symbol_resolver import SymbolResolver
+
+
+def _write_output(converter: FormatConverter,
+                  data: Union[StockBatch, List[TradingViewData], List[SeekingAlphaData]],
+                  output_format: str, output_path: Optional[str],
+                  preserve_sections: bool, buffer_size: int) -> None:
+    """
+    変換結果を指定されたファイル（未指定の場合は標準出力）に書き込む。
+    Parquet/Arrowはバイナリ形式のため出力ファイルの指定が必須。
+    """
+    if output_path:
+        converter.write_file(data, output_format, output_path, preserve_sections, buffer_size)
+    elif output_format == "tradingview":
+        click.echo(converter.convert_to_tradingview_txt(data, preserve_sections))
+    elif output_format in ("seekingalpha", "csv"):
+        converter.write_csv(data, sys.stdout)
+    elif output_format in ("parquet", "arrow"):
+        raise ValueError(f"{output_format}形式で出力する場合は --output を指定してください")
+    else:
+        raise ValueError(f"未サポートの出力形式です: {output_format}")
+
+
+def _get_parse_cache(config: AppConfig, no_cache: bool) -> Optional[ParseCache]:
+    """設定と--no-cacheの指定から解析キャッシュを返す（無効な場合はNone）"""
+    if no_cache or not config.cache.enabled:
+        return None
+    return ParseCache(config.cache.directory, max_size_bytes=config.cache.max_size_mb * 1024 * 1024)
+
+
+def _get_symbol_resolver(config: AppConfig) -> Optional['SymbolResolver']:
+    """取引所の無いシンボルの取引所を補完する銘柄索引を返す（auto_detect_exchangeが無効か、索引が未作成の場合はNone）"""
+    if not config.conversion.auto_detect_exchange:
+        return None
+    from src.converters.symbol_resolver import SYMBOL_INDEX_FILE, SymbolResolver
+    index_path = Path(config.cache.directory).expanduser() / SYMBOL_INDEX_FILE
+    if not index_path.exists():
+        return None
+    return SymbolResolver(index_path, config.conversion.fallback_exchange)
+
+
+def _resolve_exchanges(resolver: Optional['SymbolResolver'], stock_batch: StockBatch, label: str) -> StockBatch:
+    """銘柄索引で取引所の無い行の取引所を補完する"""
+    if resolver is None:
+        return stock_batch
+    stock_batch, resolved = resolver.resolve_batch(stock_batch)
+    if resolved:
+        get_logger('main').info(f"{label}: {resolved}件の銘柄の取引所を銘柄索引から補完しました。")
+    return stock_batch
+
+
+# sheets importの書き込みの進捗を保存するファイル名（キャッシュディレクトリ内）
+SHEETS_IMPORT_CHECKPOINT = "sheets-import-checkpoint.json"
+
+
+def _get_batch_writer(config: AppConfig) -> 'SheetBatchWriter':
+    """設定からGoogle Sheetsへの分割書き込みライターを生成する"""
+    from src.google_sheets.batch_writer import SheetBatchWriter
+    return SheetBatchWriter(
+        batch_size=config.google_sheets.batch_size,
+        requests_per_minute=config.google_sheets.requests_per_minute,
+        max_retries=config.google_sheets.max_retries,
+        checkpoint_path=Path(config.cache.directory).expanduser() / SHEETS_IMPORT_CHECKPOINT
+    )
+
+
+def _parse_stock_data(config: AppConfig, file_path: str, file_format: str, no_cache: bool) -> List[StockData]:
+    """入力ファイルを解析してStockDataのリストに変換する（file_formatが'auto'の場合は内容から判定する）"""
+    logger = get_logger('main')
+    if file_format == 'auto':
+        file_format = detect_format(file_path)
+        logger.info(f"ファイル形式を判定しました: {file_format}")
+    if file_format not in registry.formats:
+        raise ValueError(f"未サポートのファイル形式です: {file_format}")
+    parser = registry.create_parser(file_format)
+
+    cache = _get_parse_cache(config, no_cache)
+    platform_data = cache.parse(parser, file_path) if cache else parser.parse(file_path)
+    converter = FormatConverter()
+
+    resolver = _get_symbol_resolver(config)
+    if resolver is None:
+        return converter.to_stock_data_many(platform_data)
+    # 取引所の補完は列単位で行い、StockDataへの変換は最後に1回だけ行う
+    stock_batch = _resolve_exchanges(resolver, converter.to_stock_batch(platform_data), file_path)
+    return stock_batch.to_stock_data()
+
+
+# Google APIの認証で要求するスコープ（全コマンドで同じにし、プロセス内で認証情報を共有する）
+GOOGLE_API_SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+
+
+def _create_auth_manager(config: AppConfig, **kwargs: Any) -> 'GoogleSheetsAuth':
+    """設定からGoogle API認証マネージャーを生成する（認証情報とHTTPセッションはプロセス内で共有される）"""
+    from src.google_sheets.auth import GoogleSheetsAuth
+    return GoogleSheetsAuth(
+        credentials_file=config.google_sheets.credentials_file,
+        token_file=config.google_sheets.token_file,
+        scopes=GOOGLE_API_SCOPES,
+        **kwargs
+    )
+
+
+def _create_sheets_client(config: AppConfig) -> 'GoogleSheetsClient':
+    """設定からGoogle Sheetsクライアントを生成する"""
+    from src.google_sheets.client import GoogleSheetsClient
+    return GoogleSheetsClient(_create_auth_manager(config), batch_writer=_get_batch_writer(config))
 
 
 @click.group()
@@ -23,9 +146,10 @@ def cli(ctx: click.Context, config: Optional[str], verbose: bool) -> None:
     # コンテキストオブジェクトの初期化
     ctx.ensure_object(dict)
     
-    # ログレベルの設定
-    log_level = "DEBUG" if verbose else "INFO"
-    setup_logging(log_level=log_level)
+    # ログレベルの設定（常駐プロセスで実行するジョブは起動時の設定を引き継ぐ）
+    if not ctx.obj.get('serving'):
+        log_level = "DEBUG" if verbose else "INFO"
+        setup_logging(log_level=log_level)
     
     # 設定の読み込み
     try:
@@ -39,62 +163,59 @@ def cli(ctx: click.Context, config: Optional[str], verbose: bool) -> None:
         ctx.exit(1)
 
 @cli.command()
-@click.option('--from', 'from_format', required=True, type=PrefixChoice(['tradingview', 'seekingalpha']),
-              help='変換元のファイル形式 (tradingview, seekingalpha)')
-@click.option('--to', 'to_format', required=True, type=PrefixChoice(['tradingview', 'seekingalpha', 'csv']),
-              help='変換先のファイル形式 (tradingview, seekingalpha, csv)')
-@click.option('--input', 'input_path', required=True, type=click.Path(exists=True),
+@click.option('--from', 'from_format', default='auto', show_default=True,
+              type=PrefixChoice(['auto', 'tradingview', 'seekingalpha', 'parquet', 'arrow']),
+              help='変換元のファイル形式 (auto, tradingview, seekingalpha, parquet, arrow)。autoはファイル内容から判定')
+@click.option('--to', 'to_format', required=True,
+              type=PrefixChoice(['tradingview', 'seekingalpha', 'csv', 'parquet', 'arrow']),
+              help='変換先のファイル形式 (tradingview, seekingalpha, csv, parquet, arrow)')
+@click.option('--input', 'input_path', type=click.Path(exists=True),
               help='入力ファイルパス')
 @click.option('--output', 'output_path', type=click.Path(),
               help='出力ファイルパス (指定しない場合、標準出力)')
 @click.option('--preserve-sections', is_flag=True,
               help='TradingView形式への変換時にセクション情報を保持する')
+@click.option('--no-cache', is_flag=True, help='解析キャッシュを使用しない')
+@click.option('--merge', is_flag=True,
+              help='--inputと引数に指定した複数のファイルを銘柄ごとに1行に統合して変換する')
+@click.option('--precedence', default='first', show_default=True, type=PrefixChoice(['first', 'last']),
+              help='--mergeで同じ銘柄の値が複数のファイルにある場合に優先するファイル（先に指定したもの/後に指定したもの）')
+@click.argument('merge_inputs', nargs=-1, type=click.Path(exists=True, dir_okay=False))
 @click.pass_context
-def convert(ctx: click.Context, from_format: str, to_format: str, input_path: str,
-            output_path: Optional[str], preserve_sections: bool) -> None:
-    """ファイル形式変換コマンド"""
+def convert(ctx: click.Context, from_format: str, to_format: str, input_path: Optional[str],
+            output_path: Optional[str], preserve_sections: bool, no_cache: bool, merge: bool,
+            precedence: str, merge_inputs: tuple) -> None:
+    """ファイル形式変換コマンド（--mergeを指定すると複数のファイルを統合する: convert --merge a.txt b.xlsx --to csv）"""
     logger = get_logger('main')
     converter = FormatConverter()
     
     try:
-        # ファイル読み込み
-        # TODO: file_io.py にてファイル形式を自動判定し、適切なパーサーを呼び出すロジックを実装
-        # 現時点では、from_formatに基づいて手動でパーサーを選択
-        if from_format == "tradingview":
-            from src.parsers.tradingview import TradingViewParser
-            parser = TradingViewParser()
-            raw_data = parser.parse(input_path)
-            # TradingViewDataのリストをStockDataのリストに変換
-            stock_data_list = [converter.to_stock_data(d) for d in raw_data]
-        elif from_format == "seekingalpha":
-            from src.parsers.seekingalpha import SeekingAlphaParser
-            parser = SeekingAlphaParser()
-            raw_data = parser.parse(input_path)
-            # SeekingAlphaDataのリストをStockDataのリストに変換
-            stock_data_list = [converter.to_stock_data(d) for d in raw_data]
-        else:
-            logger.error(f"未サポートの入力形式: {from_format}")
-            ctx.exit(1)
+        if merge_inputs and not merge:
+            raise ValueError("複数の入力ファイルを指定する場合は --merge を指定してください")
+        input_paths = ([input_path] if input_path else []) + list(merge_inputs)
+        if not input_paths:
+            raise ValueError("--input で入力ファイルを指定してください")
 
-        output_content: str = ""
-        if to_format == "tradingview":
-            # StockDataのリストをTradingViewDataのリストに変換
-            tv_data_list = [converter.to_platform_data(d, "tradingview") for d in stock_data_list]
-            output_content = converter.convert_to_tradingview_txt(tv_data_list, preserve_sections)
-        elif to_format == "seekingalpha" or to_format == "csv":
-            # StockDataのリストをSeekingAlphaDataのリストに変換
-            sa_data_list = [converter.to_platform_data(d, "seekingalpha") for d in stock_data_list]
-            output_content = converter.convert_to_csv(sa_data_list)
+        # ファイル読み込み（autoの場合はファイル先頭から形式を判定して対応するパーサーを選択）
+        cache = _get_parse_cache(ctx.obj['config'], no_cache)
+        resolver = _get_symbol_resolver(ctx.obj['config'])
+        if merge:
+            from src.models.watchlist_index import WatchlistIndex
+            # 取引所の補完は統合の前に行い、取引所の無いシンボルも取引所付きの銘柄と対応付ける
+            sources = [_resolve_exchanges(resolver, converter.read_file(path, from_format, cache), path)
+                       for path in input_paths]
+            stock_batch = WatchlistIndex.merge(sources, precedence=precedence).batch
+            logger.info(f"{len(input_paths)}件のファイルの{sum(len(source) for source in sources)}行を"
+                        f"{len(stock_batch)}銘柄に統合しました。")
         else:
-            logger.error(f"未サポートの出力形式: {to_format}")
-            ctx.exit(1)
+            stock_batch = _resolve_exchanges(resolver, converter.read_file(input_paths[0], from_format, cache),
+                                             input_paths[0])
 
+        buffer_size = ctx.obj['config'].conversion.output_buffer_size
+        _write_output(converter, stock_batch, to_format, output_path, preserve_sections, buffer_size)
         if output_path:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(output_content)
             logger.info(f"変換結果を {output_path} に出力しました。")
         else:
-            click.echo(output_content)
             logger.info("変換結果を標準出力しました。")
 
     except Exception as e:
@@ -102,6 +223,83 @@ def convert(ctx: click.Context, from_format: str, to_format: str, input_path: st
         click.echo(f"エラー: {e}", err=True)
         ctx.exit(1)
 
+@cli.command('convert-batch')
+@click.option('--input', 'input_pattern', required=True,
+              help='入力ファイルのディレクトリまたはglobパターン (例: "exports/*.txt")')
+@click.option('--to', 'to_format', required=True,
+              type=PrefixChoice(['tradingview', 'seekingalpha', 'csv', 'parquet', 'arrow']),
+              help='変換先のファイル形式 (tradingview, seekingalpha, csv, parquet, arrow)')
+@click.option('--output-dir', 'output_dir', required=True, type=click.Path(file_okay=False),
+              help='出力ディレクトリ')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='並列に処理するプロセス数 (既定: CPU数)')
+@click.option('--preserve-sections', is_flag=True,
+              help='TradingView形式への変換時にセクション情報を保持する')
+@click.option('--no-cache', is_flag=True, help='解析キャッシュを使用しない')
+@click.pass_context
+def convert_batch(ctx: click.Context, input_pattern: str, to_format: str, output_dir: str,
+                  jobs: Optional[int], preserve_sections: bool, no_cache: bool) -> None:
+    """複数ファイルを並列に一括変換するコマンド（入力形式はファイルごとに内容から判定）"""
+    logger = get_logger('main')
+    from src.converters.batch_converter import collect_input_files, convert_files
+
+    try:
+        input_paths = collect_input_files(input_pattern)
+        if not input_paths:
+            raise ValueError(f"入力ファイルが見つかりません: {input_pattern}")
+
+        logger.info(f"{len(input_paths)}件のファイルを変換します。")
+        buffer_size = ctx.obj['config'].conversion.output_buffer_size
+        cache = _get_parse_cache(ctx.obj['config'], no_cache)
+        failures = 0
+        total_rows = 0
+        resolver = _get_symbol_resolver(ctx.obj['config'])
+        for result in convert_files(input_paths, to_format, output_dir, jobs, preserve_sections, buffer_size,
+                                    cache, resolver):
+            if result.ok:
+                total_rows += result.rows
+                click.echo(f"成功: {result.input_path} -> {result.output_path} ({result.rows}件, {result.elapsed:.2f}秒)")
+            else:
+                failures += 1
+                click.echo(f"失敗: {result.input_path}: {result.error}", err=True)
+
+        click.echo(f"完了: {len(input_paths) - failures}件成功, {failures}件失敗 (合計{total_rows}件)")
+        if failures:
+            ctx.exit(1)
+
+    except click.exceptions.Exit:
+        raise
+    except Exception as e:
+        logger.error(f"一括変換中にエラーが発生しました: {e}")
+        click.echo(f"エラー: {e}", err=True)
+        ctx.exit(1)
+
+@cli.command('build-symbol-index')
+@click.option('--input', 'input_path', type=click.Path(dir_okay=False), default=None,
+              help='シンボルと取引所の対応表 (JSONまたはCSV、既定: 設定のconversion.symbol_mapping_file)')
+@click.pass_context
+def build_symbol_index_command(ctx: click.Context, input_path: Optional[str]) -> None:
+    """シンボルと取引所の対応表から、変換時に取引所を補完する銘柄索引を作成するコマンド"""
+    logger = get_logger('main')
+    from src.converters.symbol_resolver import SYMBOL_INDEX_FILE, build_symbol_index, load_symbol_mapping
+
+    config = ctx.obj['config']
+    try:
+        input_path = input_path or config.conversion.symbol_mapping_file
+        if not Path(input_path).is_file():
+            raise ValueError(f"対応表のファイルが見つかりません: {input_path}")
+        index_path = Path(config.cache.directory).expanduser() / SYMBOL_INDEX_FILE
+        count = build_symbol_index(load_symbol_mapping(input_path), index_path)
+        logger.info(f"{count}件の銘柄の索引を {index_path} に作成しました。")
+        click.echo(f"{count}件の銘柄の索引を作成しました: {index_path}")
+        if not config.conversion.auto_detect_exchange:
+            click.echo("設定のconversion.auto_detect_exchangeが無効なため、変換時には使用されません。", err=True)
+
+    except Exception as e:
+        logger.error(f"銘柄索引の作成中にエラーが発生しました: {e}")
+        click.echo(f"エラー: {e}", err=True)
+        ctx.exit(1)
+
 @click.group()
 def auth():
     """Google認証関連のコマンド"""
@@ -117,15 +315,7 @@ def setup(ctx: click.Context):
         gs_config = config.google_sheets
         
         logger.info("Google認証セットアップを開始します...")
-        auth_manager = GoogleSheetsAuth(
-            credentials_file=gs_config.credentials_file,
-            token_file=gs_config.token_file,
-            scopes=[
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive"
-            ],
-            port=gs_config.oauth_port
-        )
+        auth_manager = _create_auth_manager(config, port=gs_config.oauth_port)
         
         # 認証実行
         auth_manager.get_credentials()
@@ -150,14 +340,18 @@ def sheets() -> None:
 
 @sheets.command('import')
 @click.option('--file', 'file_path', required=True, type=click.Path(exists=True), help='インポートするファイルパス')
-@click.option('--format', 'file_format', required=True, type=PrefixChoice(['tradingview', 'seekingalpha']), help='インポートするファイル形式')
+@click.option('--format', 'file_format', required=True, type=PrefixChoice(['auto', 'tradingview', 'seekingalpha']), help='インポートするファイル形式 (autoはファイル内容から判定)')
 @click.option('--spreadsheet-id', required=True, help='インポート先のスプレッドシートID')
 @click.option('--sheet-name', default=None, help='インポート先のシート名')
+@click.option('--no-cache', is_flag=True, help='解析キャッシュを使用しない')
+@click.option('--resume', is_flag=True, help='前回途中で失敗した書き込みの続きから再開する')
 @click.pass_context
-def sheets_import(ctx: click.Context, file_path: str, file_format: str, spreadsheet_id: str, sheet_name: Optional[str]):
+def sheets_import(ctx: click.Context, file_path: str, file_format: str, spreadsheet_id: str, sheet_name: Optional[str],
+                  no_cache: bool, resume: bool):
     """ローカルファイルをGoogle Sheetsにインポートする"""
     logger = get_logger('main')
     config: AppConfig = ctx.obj['config']
+    from src.google_sheets.batch_writer import BatchWriteError
     
     try:
         logger.info(f"'{file_path}' をGoogle Sheetsにインポートします...")
@@ -169,37 +363,24 @@ def sheets_import(ctx: click.Context, file_path: str, file_format: str, spreadsh
             sheet_name = os.path.splitext(os.path.basename(file_path))[0]
             logger.info(f"シート名が指定されていないため、ファイル名からシート名を生成: {sheet_name}")
         
-        # 1. パーサーを選択してファイルをパース
-        if file_format == 'tradingview':
-            from src.parsers.tradingview import TradingViewParser
-            parser = TradingViewParser()
-        elif file_format == 'seekingalpha':
-            from src.parsers.seekingalpha import SeekingAlphaParser
-            parser = SeekingAlphaParser()
-        else:
-            # このケースはChoiceによって弾かれるはず
-            raise ValueError(f"未サポートのファイル形式です: {file_format}")
-            
-        platform_data = parser.parse(file_path)
+        # 1. ファイルをパースしてStockDataに変換
+        stock_data_list = _parse_stock_data(config, file_path, file_format, no_cache)
         
-        # 2. データをStockDataに変換
-        converter = FormatConverter()
-        stock_data_list = [converter.to_stock_data(d) for d in platform_data]
-        
-        # 3. GoogleSheetsClientを使ってシートを更新
-        auth_manager = GoogleSheetsAuth(
-            credentials_file=config.google_sheets.credentials_file,
-            token_file=config.google_sheets.token_file,
-            scopes=[
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive"
-            ]
-        )
-        from src.google_sheets.client import GoogleSheetsClient
-        sheets_client = GoogleSheetsClient(auth_manager)
+        # 2. GoogleSheetsClientを使ってシートを更新
+        sheets_client = _create_sheets_client(config)
+
+        # 書き込み先だけでなくデータも前回と同じ場合にのみ再開する（異なる場合はクリアして最初から書き込む）
+        checkpoint = sheets_client.resumable_checkpoint(spreadsheet_id, sheet_name, stock_data_list) \
+            if resume else None
+        resuming = checkpoint is not None
+        if resume and not resuming:
+            click.echo("再開できる書き込みが見つからないため、最初からインポートします。")
         
         # シートの存在確認とハンドリング
-        if not sheets_client.sheet_exists(spreadsheet_id, sheet_name):
+        if resuming:
+            # 書き込み済みの行を残したまま続きを書き込む
+            click.echo(f"前回の書き込み（{checkpoint.committed_rows}/{checkpoint.total_rows}行）の続きから再開します。")
+        elif not sheets_client.sheet_exists(spreadsheet_id, sheet_name):
             logger.info(f"シート '{sheet_name}' が存在しないため、新規作成します。")
             sheets_client.create_sheet(spreadsheet_id, sheet_name)
         else:
@@ -212,64 +393,105 @@ def sheets_import(ctx: click.Context, file_path: str, file_format: str, spreadsh
             # クリアしてから書き込み
             sheets_client.clear_sheet(spreadsheet_id, sheet_name)
         
-        sheets_client.update_sheet_with_data(spreadsheet_id, sheet_name, stock_data_list)
+        sheets_client.update_sheet_with_data(spreadsheet_id, sheet_name, stock_data_list, resume=resuming)
+        logger.info(f"Google Sheets APIリクエスト数: {sheets_client.request_count}")
         
         click.echo(f"正常にインポートが完了しました。{len(stock_data_list)}件のデータが'{sheet_name}'シートに書き込まれました。")
         logger.info("インポート処理が正常に完了しました。")
 
+    except BatchWriteError as e:
+        logger.error(f"インポート処理中にエラーが発生しました: {e}")
+        click.echo(f"エラー: {e}", err=True)
+        click.echo("--resume を指定して再実行すると、書き込み済みの行の続きから再開できます。", err=True)
+        ctx.exit(1)
     except Exception as e:
         logger.error(f"インポート処理中にエラーが発生しました: {e}")
         click.echo(f"エラー: {e}", err=True)
         ctx.exit(1)
 
+@sheets.command('sync')
+@click.option('--file', 'file_path', required=True, type=click.Path(exists=True), help='同期するファイルパス')
+@click.option('--format', 'file_format', default='auto', type=PrefixChoice(['auto', 'tradingview', 'seekingalpha']), help='同期するファイル形式 (autoはファイル内容から判定)')
+@click.option('--spreadsheet-id', required=True, help='同期先のスプレッドシートID')
+@click.option('--sheet-name', default=None, help='同期先のシート名 (省略時はファイル名)')
+@click.option('--no-cache', is_flag=True, help='解析キャッシュを使用しない')
+@click.option('--dry-run', is_flag=True, help='シートを変更せずに同期内容だけを表示する')
+@click.pass_context
+def sheets_sync(ctx: click.Context, file_path: str, file_format: str, spreadsheet_id: str, sheet_name: Optional[str],
+                no_cache: bool, dry_run: bool):
+    """ローカルファイルの内容でシートを差分更新する（変更のある行だけを書き込む）"""
+    logger = get_logger('main')
+    config: AppConfig = ctx.obj['config']
+
+    try:
+        if sheet_name is None:
+            sheet_name = Path(file_path).stem
+        logger.info(f"'{file_path}' の内容でシート'{sheet_name}'を同期します...")
+
+        stock_data_list = _parse_stock_data(config, file_path, file_format, no_cache)
+        sheets_client = _create_sheets_client(config)
+        plan = sheets_client.sync_sheet_with_data(spreadsheet_id, sheet_name, stock_data_list, dry_run=dry_run)
+        logger.info(f"Google Sheets APIリクエスト数: {sheets_client.request_count}")
+
+        summary = (f"追加{plan.inserted}件, 更新{plan.updated}件, 削除{plan.deleted}件, "
+                   f"変更なし{plan.unchanged}件 (書き込み{plan.changed_rows}行)")
+        if dry_run:
+            click.echo(f"同期内容（ドライラン）: {summary}")
+        else:
+            click.echo(f"同期が完了しました: {summary}")
+
+    except Exception as e:
+        logger.error(f"同期処理中にエラーが発生しました: {e}")
+        click.echo(f"エラー: {e}", err=True)
+        ctx.exit(1)
+
 @sheets.command('export')
 @click.option('--spreadsheet-id', required=True, help='エクスポート元のスプレッドシートID')
-@click.option('--sheet-name', default='Stock_Data', help='エクスポート元のシート名')
-@click.option('--format', 'output_format', required=True, type=PrefixChoice(['tradingview', 'seekingalpha', 'csv']), help='エクスポートするファイル形式')
+@click.option('--sheet-name', 'sheet_names', multiple=True,
+              help='エクスポート元のシート名（複数指定可、既定: Stock_Data）')
+@click.option('--all-sheets', is_flag=True, help='スプレッドシートのすべてのシートをエクスポートする')
+@click.option('--format', 'output_format', required=True, type=PrefixChoice(['tradingview', 'seekingalpha', 'csv', 'parquet', 'arrow']), help='エクスポートするファイル形式')
 @click.option('--output', 'output_path', type=click.Path(), help='出力ファイルパス (指定しない場合、標準出力)')
+@click.option('--output-dir', 'output_dir', type=click.Path(file_okay=False),
+              help='複数のシートをエクスポートする場合の出力ディレクトリ（シートごとに1ファイル）')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='複数のシートを並列に変換するプロセス数 (既定: CPU数)')
 @click.pass_context
-def sheets_export(ctx: click.Context, spreadsheet_id: str, sheet_name: str, output_format: str, output_path: Optional[str]):
+def sheets_export(ctx: click.Context, spreadsheet_id: str, sheet_names: tuple, all_sheets: bool,
+                  output_format: str, output_path: Optional[str], output_dir: Optional[str], jobs: Optional[int]):
     """Google Sheetsのデータをローカルファイルにエクスポートする"""
     logger = get_logger('main')
     config: AppConfig = ctx.obj['config']
+
+    sheet_names = list(sheet_names) or ['Stock_Data']
+    if all_sheets or len(sheet_names) > 1 or output_dir:
+        # 複数のシートは1回のリクエストでまとめて取得し、シートごとのファイルに出力する
+        if output_path:
+            click.echo("エラー: 複数のシートをエクスポートする場合は --output ではなく --output-dir を指定してください",
+                       err=True)
+            ctx.exit(1)
+        _export_sheets_to_dir(ctx, spreadsheet_id, None if all_sheets else sheet_names,
+                              output_format, output_dir, jobs)
+        return
+    sheet_name = sheet_names[0]
     
     try:
         logger.info(f"Google Sheetsから'{sheet_name}'シートのデータをエクスポートします...")
         
         # 1. GoogleSheetsClientを使ってデータを取得
-        auth_manager = GoogleSheetsAuth(
-            credentials_file=config.google_sheets.credentials_file,
-            token_file=config.google_sheets.token_file,
-            scopes=["https://www.googleapis.com/auth/spreadsheets"]
-        )
-        from src.google_sheets.client import GoogleSheetsClient
-        sheets_client = GoogleSheetsClient(auth_manager)
+        sheets_client = _create_sheets_client(config)
         
-        records = sheets_client.get_all_records(spreadsheet_id, sheet_name)
+        values = sheets_client.get_all_values(spreadsheet_id, sheet_name)
         
-        # 2. レコードをStockDataに変換
+        # 2. シートの値を列単位でStockBatchに変換
         converter = FormatConverter()
-        stock_data_list = converter.from_records(records)
+        stock_batch = converter.from_values(values)
         
-        # 3. 指定されたフォーマットに変換
-        output_content = ""
-
-        if output_format == "tradingview":
-            tv_data_list = [converter.to_platform_data(d, "tradingview") for d in stock_data_list]
-            output_content = converter.convert_to_tradingview_txt(tv_data_list, preserve_sections=True)
-        elif output_format in ["seekingalpha", "csv"]:
-            sa_data_list = [converter.to_platform_data(d, "seekingalpha") for d in stock_data_list]
-            output_content = converter.convert_to_csv(sa_data_list)
-        else:
-            raise ValueError(f"未サポートの出力形式です: {output_format}")
-
-        # 4. 結果を出力
+        # 3. 指定されたフォーマットに変換して出力（CSVはファイルに直接書き込む）
+        _write_output(converter, stock_batch, output_format, output_path,
+                      preserve_sections=True, buffer_size=config.conversion.output_buffer_size)
         if output_path:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(output_content)
             click.echo(f"正常にエクスポートが完了しました。{output_path} に出力しました。")
-        else:
-            click.echo(output_content)
         
         logger.info("エクスポート処理が正常に完了しました。")
 
@@ -278,6 +500,140 @@ def sheets_export(ctx: click.Context, spreadsheet_id: str, sheet_name: str, outp
         click.echo(f"エラー: {e}", err=True)
         ctx.exit(1)
 
+
+def _export_sheets_to_dir(ctx: click.Context, spreadsheet_id: str, sheet_names: Optional[List[str]],
+                          output_format: str, output_dir: Optional[str], jobs: Optional[int]) -> None:
+    """
+    1つのスプレッドシートの複数のシートをvalues.batchGetでまとめて取得し、
+    シートごとに並列に変換してoutput_dirにファイルを書き込む（sheet_namesがNoneの場合はすべてのシート）
+    """
+    logger = get_logger('main')
+    config: AppConfig = ctx.obj['config']
+    from src.converters.batch_converter import export_sheets
+
+    try:
+        if not output_dir:
+            raise ValueError("複数のシートをエクスポートする場合は --output-dir を指定してください")
+        target = "すべてのシート" if sheet_names is None else f"{len(sheet_names)}件のシート"
+        logger.info(f"Google Sheetsから{target}のデータをエクスポートします...")
+
+        sheets_client = _create_sheets_client(config)
+        sheet_values = sheets_client.get_values_many(spreadsheet_id, sheet_names)
+        logger.info(f"Google Sheets APIリクエスト数: {sheets_client.request_count}")
+        if not sheet_values:
+            raise ValueError("エクスポートするシートがありません")
+
+        failures = 0
+        for result in export_sheets(spreadsheet_id, sheet_values, output_format, output_dir, jobs,
+                                    preserve_sections=True, buffer_size=config.conversion.output_buffer_size):
+            if result.ok:
+                click.echo(f"成功: {result.input_path} -> {result.output_path} ({result.rows}件, {result.elapsed:.2f}秒)")
+            else:
+                failures += 1
+                click.echo(f"失敗: {result.input_path}: {result.error}", err=True)
+
+        click.echo(f"完了: {len(sheet_values) - failures}件成功, {failures}件失敗")
+        if failures:
+            ctx.exit(1)
+
+    except click.exceptions.Exit:
+        raise
+    except Exception as e:
+        logger.error(f"エクスポート処理中にエラーが発生しました: {e}")
+        click.echo(f"エラー: {e}", err=True)
+        ctx.exit(1)
+
+
+def _parse_sheet_targets(sheet_specs: List[str], targets_file: Optional[str],
+                         default_sheet_name: str) -> List[tuple]:
+    """
+    'SPREADSHEET_ID' または 'SPREADSHEET_ID:SHEET_NAME' 形式の指定を (スプレッドシートID, シート名) のリストにする
+    targets_fileには1行に1つ同じ形式で記載する（空行と '#' で始まる行は無視する）。重複は除く。
+    """
+    specs = list(sheet_specs)
+    if targets_file:
+        with open(targets_file, 'r', encoding='utf-8') as f:
+            specs.extend(line.strip() for line in f if line.strip() and not line.lstrip().startswith('#'))
+
+    targets = []
+    for spec in specs:
+        spreadsheet_id, _, sheet_name = spec.partition(':')
+        if not spreadsheet_id.strip():
+            raise ValueError(f"スプレッドシートIDが指定されていません: {spec}")
+        target = (spreadsheet_id.strip(), sheet_name.strip() or default_sheet_name)
+        if target not in targets:
+            targets.append(target)
+    return targets
+
+
+@sheets.command('export-many')
+@click.option('--sheet', 'sheet_specs', multiple=True,
+              help='エクスポート元 (SPREADSHEET_ID または SPREADSHEET_ID:SHEET_NAME、複数指定可)')
+@click.option('--targets-file', type=click.Path(exists=True, dir_okay=False),
+              help='エクスポート元を1行に1つ記載したファイル')
+@click.option('--format', 'output_format', required=True, type=PrefixChoice(['tradingview', 'seekingalpha', 'csv', 'parquet', 'arrow']), help='エクスポートするファイル形式')
+@click.option('--output-dir', 'output_dir', required=True, type=click.Path(file_okay=False), help='出力ディレクトリ')
+@click.option('--concurrency', '-j', type=click.IntRange(min=1), default=8, show_default=True,
+              help='同時に取得するシートの数')
+@click.pass_context
+def sheets_export_many(ctx: click.Context, sheet_specs: tuple, targets_file: Optional[str], output_format: str,
+                       output_dir: str, concurrency: int):
+    """複数のスプレッドシート・シートを並行して取得し、シートごとにファイルへエクスポートする"""
+    logger = get_logger('main')
+    config: AppConfig = ctx.obj['config']
+    import asyncio
+    from src.converters.batch_converter import sheet_output_path
+    from src.google_sheets.async_client import AsyncGoogleSheetsClient
+
+    try:
+        targets = _parse_sheet_targets(list(sheet_specs), targets_file, config.google_sheets.sheet_name)
+        if not targets:
+            raise ValueError("--sheet または --targets-file でエクスポート元を指定してください")
+        logger.info(f"{len(targets)}件のシートを並行してエクスポートします（同時実行数: {concurrency}）...")
+
+        auth_manager = _create_auth_manager(config)
+
+        async def fetch_all():
+            async with AsyncGoogleSheetsClient(auth_manager, max_concurrency=concurrency) as client:
+                results = await client.fetch_values_many(targets)
+                logger.info(f"Google Sheets APIリクエスト数: {client.request_count}")
+                return results
+
+        results = asyncio.run(fetch_all())
+
+        output_dir_path = Path(output_dir)
+        output_dir_path.mkdir(parents=True, exist_ok=True)
+        converter = FormatConverter()
+        failures = 0
+        for result in results:
+            label = f"{result.spreadsheet_id}:{result.sheet_name}"
+            if not result.ok:
+                failures += 1
+                click.echo(f"失敗: {label}: {result.error}", err=True)
+                continue
+            output_path = sheet_output_path(output_dir_path, result.sheet_name, output_format,
+                                            prefix=f"{result.spreadsheet_id}_")
+            try:
+                stock_batch = converter.from_values(result.values)
+                converter.write_file(stock_batch, output_format, str(output_path), preserve_sections=True,
+                                     buffer_size=config.conversion.output_buffer_size)
+            except Exception as e:
+                failures += 1
+                click.echo(f"失敗: {label}: {e}", err=True)
+                continue
+            click.echo(f"成功: {label} -> {output_path} ({len(stock_batch)}件, {result.elapsed:.2f}秒)")
+
+        click.echo(f"完了: {len(results) - failures}件成功, {failures}件失敗")
+        if failures:
+            ctx.exit(1)
+
+    except click.exceptions.Exit:
+        raise
+    except Exception as e:
+        logger.error(f"エクスポート処理中にエラーが発生しました: {e}")
+        click.echo(f"エラー: {e}", err=True)
+        ctx.exit(1)
+
 @sheets.command('create')
 @click.option('--name', required=True, help='作成するスプレッドシートの名前')
 @click.pass_context
@@ -289,16 +645,7 @@ def sheets_create(ctx: click.Context, name: str):
     try:
         logger.info(f"新しいスプレッドシート '{name}' を作成します...")
         
-        auth_manager = GoogleSheetsAuth(
-            credentials_file=config.google_sheets.credentials_file,
-            token_file=config.google_sheets.token_file,
-            scopes=[
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive"
-            ]
-        )
-        from src.google_sheets.client import GoogleSheetsClient
-        sheets_client = GoogleSheetsClient(auth_manager)
+        sheets_client = _create_sheets_client(config)
         
         spreadsheet = sheets_client.create_spreadsheet(name)
         
@@ -317,9 +664,92 @@ def sheets_create(ctx: click.Context, name: str):
 cli.add_command(auth)
 
 @cli.command()
-def analyze() -> None:
-    """データ分析コマンド"""
-    pass
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False), default=None,
+              help='待ち受けるUnixソケットのパス (既定: $STOCK_CLI_SOCKET またはキャッシュディレクトリ内のstock-cli.sock)')
+@click.pass_context
+def serve(ctx: click.Context, socket_path: Optional[str]):
+    """常駐プロセスとして起動し、stock-cli-clientから受け付けたコマンドを実行する"""
+    logger = get_logger('main')
+    import os
+    import signal
+    import threading
+    from src.daemon.protocol import default_socket_path
+    from src.daemon.server import CommandServer
+
+    try:
+        # ジョブで使用するモジュールを先に読み込んでおく
+        import src.converters.batch_converter  # noqa: F401
+        import src.google_sheets.async_client  # noqa: F401
+        import src.google_sheets.client  # noqa: F401
+
+        server = CommandServer(socket_path or default_socket_path(), cli)
+    except Exception as e:
+        logger.error(f"常駐プロセスの起動に失敗しました: {e}")
+        click.echo(f"エラー: {e}", err=True)
+        ctx.exit(1)
+
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    click.echo(f"常駐プロセスを起動しました: {server.socket_path} (pid={os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+@cli.command()
+@click.option('--input', 'input_path', type=click.Path(exists=True, dir_okay=False),
+              help='分析するファイル（tradingview, seekingalpha, parquet, arrow）')
+@click.option('--from', 'from_format', default='auto', show_default=True,
+              type=PrefixChoice(['auto', 'tradingview', 'seekingalpha', 'parquet', 'arrow']),
+              help='入力ファイルの形式。autoはファイル内容から判定')
+@click.option('--spreadsheet-id', help='分析するスプレッドシートのID（--inputの代わりに指定）')
+@click.option('--sheet-name', default='Stock_Data', show_default=True, help='分析するシート名')
+@click.option('--format', 'output_format', default='text', show_default=True,
+              type=PrefixChoice(['text', 'json']), help='出力形式')
+@click.option('--output', 'output_path', type=click.Path(), help='出力ファイルパス (指定しない場合、標準出力)')
+@click.option('--top', type=click.IntRange(min=0), default=5, show_default=True,
+              help='52週高値・安値に近い銘柄を表示する件数')
+@click.option('--near', 'near_threshold', type=click.FloatRange(min=0.0), default=0.05, show_default=True,
+              help='52週高値・安値に近いとみなす割合 (0.05 = 5%)')
+@click.option('--no-cache', is_flag=True, help='解析キャッシュを使用しない')
+@click.pass_context
+def analyze(ctx: click.Context, input_path: Optional[str], from_format: str, spreadsheet_id: Optional[str],
+            sheet_name: str, output_format: str, output_path: Optional[str], top: int, near_threshold: float,
+            no_cache: bool) -> None:
+    """ウォッチリスト・保有銘柄を集計するコマンド（セクター比率、配当、損益、グレード分布、52週高値・安値）"""
+    logger = get_logger('main')
+    config: AppConfig = ctx.obj['config']
+    from src.analysis.portfolio import analyze_portfolio, format_report
+
+    try:
+        if bool(input_path) == bool(spreadsheet_id):
+            raise ValueError("--input または --spreadsheet-id のどちらか一方を指定してください")
+
+        converter = FormatConverter()
+        if input_path:
+            stock_batch = converter.read_file(input_path, from_format, _get_parse_cache(config, no_cache))
+        else:
+            values = _create_sheets_client(config).get_all_values(spreadsheet_id, sheet_name)
+            stock_batch = converter.from_values(values)
+        logger.info(f"{len(stock_batch)}件のデータを分析します。")
+
+        analysis = analyze_portfolio(stock_batch, top=top, near_threshold=near_threshold)
+        content = analysis.model_dump_json(indent=2) if output_format == 'json' else format_report(analysis)
+        if output_path:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(content + "\n")
+            click.echo(f"分析結果を {output_path} に出力しました。")
+        else:
+            click.echo(content)
+
+    except Exception as e:
+        logger.error(f"分析中にエラーが発生しました: {e}")
+        click.echo(f"エラー: {e}", err=True)
+        ctx.exit(1)
 
 if __name__ == '__main__':
     cli()
@@ -0,0 +1,380 @@
+"""株式データの列指向コンテナ"""
+
+import typing
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from src.models.stock import StockData
+from src.utils.optional_deps import import_pyarrow
+
+# 値の種類が少ない文字列フィールド（辞書エンコードして保持する）
+CATEGORICAL_FIELDS = frozenset({
+    'exchange', 'sector', 'industry',
+    'valuation_grade', 'growth_grade', 'profitability_grade', 'momentum_grade', 'eps_revision_grade',
+    'dividend_safety', 'dividend_growth', 'dividend_yield_grade', 'dividend_consistency', 'frequency',
+    'tradingview_section', 'source_platform', 'status',
+})
+
+
+def _field_kind(name: str, annotation: Any) -> str:
+    """StockDataのフィールド型から列の種類を決定する"""
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)] or [annotation]
+    field_type = args[0]
+    if field_type is float:
+        return 'float'
+    if field_type is int:
+        return 'int'
+    if field_type is datetime:
+        return 'datetime'
+    return 'category' if name in CATEGORICAL_FIELDS else 'str'
+
+
+# フィールド名 -> 列の種類 (float / int / datetime / category / str)
+FIELD_KINDS: Dict[str, str] = {
+    name: _field_kind(name, field.annotation) for name, field in StockData.model_fields.items()
+}
+
+# 列が与えられなかった場合に使う既定値
+_FIELD_DEFAULTS: Dict[str, Any] = {
+    name: None if field.is_required() else field.get_default(call_default_factory=True)
+    for name, field in StockData.model_fields.items()
+}
+
+
+class StockBatch:
+    """
+    StockDataを列単位で保持するコンテナ。
+    フィールドごとに型付きのNumPy配列を1つ持ち、StockDataオブジェクトは必要になった時点で生成する。
+
+    列の保持形式:
+    - float: float64配列（欠損はNaN）
+    - int: int64配列と有効値マスク
+    - datetime: datetime64[us]配列（欠損はNaT）
+    - category: int32のコード配列とカテゴリ一覧（欠損は-1）
+    - str: object配列（欠損はNone）
+    """
+
+    def __init__(self, length: int, arrays: Dict[str, np.ndarray],
+                 valid: Optional[Dict[str, np.ndarray]] = None,
+                 categories: Optional[Dict[str, List[str]]] = None):
+        self._length = length
+        self._arrays = arrays
+        self._valid = valid or {}
+        self._categories = categories or {}
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, Sequence[Any]], length: Optional[int] = None) -> 'StockBatch':
+        """
+        フィールド名をキーとする列データ（Noneを欠損とする値のリスト）からStockBatchを生成する。
+        与えられなかったフィールドはStockDataの既定値で埋め、full_symbolが無ければsymbol/exchangeから生成する。
+        StockDataに存在しないキーは無視する。
+        """
+        if length is None:
+            length = len(columns['symbol']) if 'symbol' in columns else 0
+
+        values_by_field = dict(columns)
+        if 'full_symbol' not in values_by_field and length:
+            symbols = values_by_field['symbol']
+            exchanges = values_by_field.get('exchange') or [None] * length
+            values_by_field['full_symbol'] = [
+                f"{exchange}:{symbol}" if exchange else symbol for symbol, exchange in zip(symbols, exchanges)
+            ]
+
+        arrays: Dict[str, np.ndarray] = {}
+        valid: Dict[str, np.ndarray] = {}
+        categories: Dict[str, List[str]] = {}
+        for name, kind in FIELD_KINDS.items():
+            values = values_by_field.get(name)
+            if values is None:
+                values = [_FIELD_DEFAULTS[name]] * length
+            elif len(values) != length:
+                raise ValueError(f"列'{name}'の長さが一致しません: {len(values)} != {length}")
+            cls._encode_values(name, kind, values, length, arrays, valid, categories)
+
+        return cls(length, arrays, valid, categories)
+
+    @staticmethod
+    def _encode_values(name: str, kind: str, values: Sequence[Any], length: int, arrays: Dict[str, np.ndarray],
+                       valid: Dict[str, np.ndarray], categories: Dict[str, List[str]]) -> None:
+        """Pythonの値のリストを列の種類に応じた配列に変換して格納する"""
+        if kind == 'float':
+            arrays[name] = np.array(values, dtype=np.float64)
+        elif kind == 'int':
+            valid[name] = np.fromiter((v is not None for v in values), dtype=bool, count=length)
+            arrays[name] = np.fromiter((0 if v is None else v for v in values), dtype=np.int64, count=length)
+        elif kind == 'datetime':
+            arrays[name] = np.array(values, dtype='datetime64[us]')
+        elif kind == 'category':
+            lookup: Dict[str, int] = {}
+            arrays[name] = np.fromiter(
+                (-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values),
+                dtype=np.int32, count=length
+            )
+            categories[name] = list(lookup)
+        else:
+            array = np.empty(length, dtype=object)
+            array[:] = values
+            arrays[name] = array
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> 'StockBatch':
+        """
+        pyarrow.TableからStockBatchを生成する。
+        欠損値のない数値・日時列はコピーせずに参照するため、メモリマップで読み込んだテーブルでも展開は最小限で済む。
+        テーブルに無いフィールドはStockDataの既定値で埋め、StockDataに存在しない列は無視する。
+        """
+        pa = import_pyarrow()
+        table = table.unify_dictionaries()
+        length = table.num_rows
+        present = set(table.column_names)
+
+        arrays: Dict[str, np.ndarray] = {}
+        valid: Dict[str, np.ndarray] = {}
+        categories: Dict[str, List[str]] = {}
+        for name, kind in FIELD_KINDS.items():
+            if name not in present:
+                if name == 'full_symbol' and 'symbol' in present:
+                    symbols = table.column('symbol').to_pylist()
+                    exchanges = (table.column('exchange').to_pylist() if 'exchange' in present
+                                 else [None] * length)
+                    values = [f"{exchange}:{symbol}" if exchange else symbol
+                              for symbol, exchange in zip(symbols, exchanges)]
+                else:
+                    values = [_FIELD_DEFAULTS[name]] * length
+                cls._encode_values(name, kind, values, length, arrays, valid, categories)
+                continue
+
+            column = table.column(name).combine_chunks()
+            if kind == 'float':
+                arrays[name] = column.cast(pa.float64()).to_numpy(zero_copy_only=False)
+            elif kind == 'int':
+                column = column.cast(pa.int64())
+                valid[name] = column.is_valid().to_numpy(zero_copy_only=False)
+                arrays[name] = column.fill_null(0).to_numpy()
+            elif kind == 'datetime':
+                arrays[name] = column.cast(pa.timestamp('us')).to_numpy(zero_copy_only=False)
+            elif kind == 'category':
+                if not pa.types.is_dictionary(column.type):
+                    column = column.cast(pa.string()).dictionary_encode()
+                arrays[name] = column.indices.fill_null(-1).to_numpy().astype(np.int32)
+                categories[name] = column.dictionary.to_pylist()
+            else:
+                array = np.empty(length, dtype=object)
+                array[:] = column.cast(pa.string()).to_pylist()
+                arrays[name] = array
+
+        return cls(length, arrays, valid, categories)
+
+    @classmethod
+    def from_stock_data(cls, stock_data_list: Sequence[StockData]) -> 'StockBatch':
+        """StockDataのリストからStockBatchを生成する"""
+        columns = {
+            name: [getattr(stock, name) for stock in stock_data_list] for name in FIELD_KINDS
+        }
+        return cls.from_columns(columns, length=len(stock_data_list))
+
+    @classmethod
+    def concat(cls, batches: Sequence['StockBatch']) -> 'StockBatch':
+        """複数のStockBatchを順に連結する（カテゴリ列はカテゴリ一覧を統合してコードを付け替える）"""
+        length = sum(len(batch) for batch in batches)
+        arrays: Dict[str, np.ndarray] = {}
+        valid: Dict[str, np.ndarray] = {}
+        categories: Dict[str, List[str]] = {}
+        for name, kind in FIELD_KINDS.items():
+            if kind == 'category':
+                lookup: Dict[str, int] = {}
+                remapped = []
+                for batch in batches:
+                    # 末尾の-1は欠損（コード-1）をそのまま欠損に対応付けるため
+                    mapping = np.array([lookup.setdefault(c, len(lookup)) for c in batch._categories[name]] + [-1],
+                                       dtype=np.int32)
+                    remapped.append(mapping[batch._arrays[name]])
+                arrays[name] = np.concatenate(remapped) if remapped else np.empty(0, dtype=np.int32)
+                categories[name] = list(lookup)
+                continue
+            if batches:
+                arrays[name] = np.concatenate([batch._arrays[name] for batch in batches])
+            else:
+                cls._encode_values(name, kind, [], 0, arrays, valid, categories)
+            if kind == 'int' and batches:
+                valid[name] = np.concatenate([batch._valid[name] for batch in batches])
+        return cls(length, arrays, valid, categories)
+
+    def take(self, indices: Sequence[int]) -> 'StockBatch':
+        """指定した行だけを指定した順に持つStockBatchを返す"""
+        indices = np.asarray(indices, dtype=np.intp)
+        return StockBatch(
+            len(indices),
+            {name: array[indices] for name, array in self._arrays.items()},
+            {name: mask[indices] for name, mask in self._valid.items()},
+            {name: list(values) for name, values in self._categories.items()},
+        )
+
+    def with_column(self, name: str, values: Sequence[Any]) -> 'StockBatch':
+        """指定したフィールドの列だけを置き換えたStockBatchを返す（他の列は共有する）"""
+        if len(values) != self._length:
+            raise ValueError(f"列'{name}'の長さが一致しません: {len(values)} != {self._length}")
+        arrays, valid, categories = dict(self._arrays), dict(self._valid), dict(self._categories)
+        self._encode_values(name, self._kind(name), values, self._length, arrays, valid, categories)
+        return StockBatch(self._length, arrays, valid, categories)
+
+    def coalesce_rows(self, groups: np.ndarray, group_count: int, order: np.ndarray) -> 'StockBatch':
+        """
+        行をグループごとに1行にまとめたStockBatchを返す（フィールドごとの値の結合を列単位で行う）
+
+        Args:
+            groups: 各行が属するグループの番号（0からgroup_count-1）
+            group_count: グループの数（結果の行数）
+            order: 行の優先順（先頭ほど優先）。各フィールドはorderの順で最初の欠損でない値を採用する
+        """
+        order = np.asarray(order, dtype=np.intp)
+        ordered_groups = groups[order]
+        arrays: Dict[str, np.ndarray] = {}
+        valid: Dict[str, np.ndarray] = {}
+        for name, kind in FIELD_KINDS.items():
+            array = self._arrays[name]
+            present = self._present(name)[order]
+            # グループごとに、優先順で最初に値がある行を選ぶ（np.uniqueは最初の出現位置を返す）
+            chosen_groups, first = np.unique(ordered_groups[present], return_index=True)
+            source_rows = order[present][first]
+            if kind == 'float':
+                result = np.full(group_count, np.nan)
+            elif kind == 'int':
+                result = np.zeros(group_count, dtype=np.int64)
+                valid[name] = np.zeros(group_count, dtype=bool)
+                valid[name][chosen_groups] = True
+            elif kind == 'datetime':
+                result = np.full(group_count, np.datetime64('NaT'), dtype=array.dtype)
+            elif kind == 'category':
+                result = np.full(group_count, -1, dtype=np.int32)
+            else:
+                result = np.full(group_count, None, dtype=object)
+            result[chosen_groups] = array[source_rows]
+            arrays[name] = result
+        return StockBatch(group_count, arrays, valid,
+                          {name: list(values) for name, values in self._categories.items()})
+
+    def _present(self, name: str) -> np.ndarray:
+        """列の値が欠損でない行のマスク"""
+        kind = self._kind(name)
+        array = self._arrays[name]
+        if kind == 'float':
+            return ~np.isnan(array)
+        if kind == 'int':
+            return self._valid[name]
+        if kind == 'datetime':
+            return ~np.isnat(array)
+        if kind == 'category':
+            return array >= 0
+        return np.not_equal(array, None)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def field_names(self) -> List[str]:
+        """保持しているフィールド名の一覧"""
+        return list(FIELD_KINDS)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        列をNumPy配列として返す（集計などの配列演算向け）。
+        intはNaNを欠損とするfloat64、categoryは文字列のobject配列に変換して返す。
+        """
+        kind = self._kind(name)
+        array = self._arrays[name]
+        if kind == 'int':
+            return np.where(self._valid[name], array, np.nan)
+        if kind == 'category':
+            lookup = np.empty(len(self._categories[name]) + 1, dtype=object)
+            lookup[:-1] = self._categories[name]
+            lookup[-1] = None
+            return lookup[array]
+        return array
+
+    def codes(self, name: str) -> np.ndarray:
+        """辞書エンコードされた列のコード配列（欠損は-1）を返す"""
+        if self._kind(name) != 'category':
+            raise ValueError(f"辞書エンコードされた列ではありません: {name}")
+        return self._arrays[name]
+
+    def categories(self, name: str) -> List[str]:
+        """辞書エンコードされた列のカテゴリ一覧を返す"""
+        if self._kind(name) != 'category':
+            raise ValueError(f"辞書エンコードされた列ではありません: {name}")
+        return list(self._categories[name])
+
+    def to_pylist(self, name: str, start: int = 0, stop: Optional[int] = None) -> List[Any]:
+        """列をPythonの値のリストとして返す（欠損はNone）"""
+        kind = self._kind(name)
+        array = self._arrays[name][start:stop]
+        if kind == 'float':
+            return [None if v != v else v for v in array.tolist()]
+        if kind == 'int':
+            return [v if ok else None for v, ok in zip(array.tolist(), self._valid[name][start:stop].tolist())]
+        if kind == 'datetime':
+            return array.astype(object).tolist()
+        if kind == 'category':
+            lookup = self._categories[name]
+            return [None if code < 0 else lookup[code] for code in array.tolist()]
+        return array.tolist()
+
+    def to_arrow(self) -> Any:
+        """
+        pyarrow.Tableに変換する。
+        数値・日時列は型付きの列、カテゴリ列は辞書エンコードされた文字列列として出力し、欠損はnullとする。
+        """
+        pa = import_pyarrow()
+        fields = []
+        columns = []
+        for name, kind in FIELD_KINDS.items():
+            array = self._arrays[name]
+            if kind == 'float':
+                column = pa.array(array, type=pa.float64(), mask=np.isnan(array))
+            elif kind == 'int':
+                column = pa.array(array, type=pa.int64(), mask=~self._valid[name])
+            elif kind == 'datetime':
+                column = pa.array(array, type=pa.timestamp('us'), mask=np.isnat(array))
+            elif kind == 'category':
+                column = pa.DictionaryArray.from_arrays(
+                    pa.array(array, type=pa.int32(), mask=array < 0),
+                    pa.array(self._categories[name], type=pa.string())
+                )
+            else:
+                column = pa.array(array, type=pa.string())
+            fields.append(pa.field(name, column.type))
+            columns.append(column)
+        return pa.Table.from_arrays(columns, schema=pa.schema(fields))
+
+    def __getitem__(self, index: int) -> StockData:
+        """指定行のStockDataを生成して返す"""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"インデックスが範囲外です: {index}")
+        return self._build_stock_data(index, index + 1)[0]
+
+    def __iter__(self) -> Iterator[StockData]:
+        return self.iter_stock_data()
+
+    def iter_stock_data(self, chunk_size: int = 1024) -> Iterator[StockData]:
+        """StockDataをchunk_size件ずつ生成しながら返す"""
+        for start in range(0, self._length, chunk_size):
+            yield from self._build_stock_data(start, min(start + chunk_size, self._length))
+
+    def to_stock_data(self) -> List[StockData]:
+        """全行をStockDataのリストとして返す"""
+        return self._build_stock_data(0, self._length)
+
+    def _build_stock_data(self, start: int, stop: int) -> List[StockData]:
+        names = list(FIELD_KINDS)
+        columns = [self.to_pylist(name, start, stop) for name in names]
+        return StockData.from_trusted_many(dict(zip(names, row)) for row in zip(*columns))
+
+    def _kind(self, name: str) -> str:
+        try:
+            return FIELD_KINDS[name]
+        except KeyError:
+            raise KeyError(f"StockDataに存在しないフィールドです: {name}") from None
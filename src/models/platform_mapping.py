@@ -0,0 +1,152 @@
+"""
+プラットフォーム固有のデータとStockDataのフィールドの対応表
+
+プラットフォームごとの対応表（PlatformMapping）を登録しておくと、変換手順
+（取り出すフィールドと変換先のフィールドの並び）を1回だけ組み立てて再利用する。
+新しいプラットフォームに対応する場合は、データモデルと対応表を登録する。
+"""
+from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.models.stock import SeekingAlphaData, StockData, TradingViewData
+
+
+class PlatformMapping(BaseModel):
+    """
+    1つのプラットフォームとStockDataのフィールドの対応表
+
+    renamesに無いフィールドは同じ名前のStockDataのフィールドに対応し、StockDataに無いフィールドは変換しない。
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    platform: str
+    # プラットフォーム固有のデータモデル（シートの行のようにモデルの無いものはNone）
+    model: Optional[Type[BaseModel]] = None
+    # プラットフォームのフィールド名 -> StockDataのフィールド名（名前が異なるもの）
+    renames: Dict[str, str] = Field(default_factory=dict)
+    # StockDataに変換する際に設定する値
+    constants: Dict[str, Any] = Field(default_factory=dict)
+
+    def to_stock_field(self, name: str) -> str:
+        """プラットフォームのフィールド名に対応するStockDataのフィールド名"""
+        return self.renames.get(name, name)
+
+    def stock_fields(self) -> List[Tuple[str, str]]:
+        """モデルのフィールドのうちStockDataに対応するもの（プラットフォームのフィールド名, StockDataのフィールド名）"""
+        if self.model is None:
+            return []
+        return [(name, self.to_stock_field(name)) for name in self.model.model_fields
+                if self.to_stock_field(name) in StockData.model_fields]
+
+
+# プラットフォーム名 -> 対応表
+PLATFORM_MAPPINGS: Dict[str, PlatformMapping] = {}
+
+
+def register_platform_mapping(mapping: PlatformMapping) -> PlatformMapping:
+    """対応表を登録する（同じプラットフォームの対応表は置き換える）"""
+    PLATFORM_MAPPINGS[mapping.platform] = mapping
+    to_stock_plan.cache_clear()
+    from_stock_plan.cache_clear()
+    return mapping
+
+
+def platform_for_model(model: Type[BaseModel]) -> Optional[str]:
+    """データモデルに対応するプラットフォーム名（登録されていない場合はNone）"""
+    for mapping in PLATFORM_MAPPINGS.values():
+        if mapping.model is model:
+            return mapping.platform
+    return None
+
+
+class ToStockPlan:
+    """プラットフォームのデータ -> StockDataのフィールド値の変換手順"""
+
+    def __init__(self, mapping: PlatformMapping):
+        fields = mapping.stock_fields()
+        self.source_fields = [source for source, _ in fields]
+        self.target_fields = tuple(target for _, target in fields)
+        self.constants = dict(mapping.constants)
+        self._getter = _tuple_getter(self.source_fields)
+
+    def record(self, data: BaseModel, now: datetime) -> Dict[str, Any]:
+        """1件分のStockDataのフィールド値"""
+        record = dict(zip(self.target_fields, self._getter(data)))
+        record.update(self.constants)
+        record['date_added'] = record['date_updated'] = now
+        return record
+
+    def columns(self, columns: Dict[str, List[Any]], length: int, now: datetime) -> Dict[str, List[Any]]:
+        """パーサーの列データのフィールド名をStockDataのフィールド名に読み替える（値はコピーしない）"""
+        stock_columns = {target: columns[source]
+                         for source, target in zip(self.source_fields, self.target_fields) if source in columns}
+        for name, value in self.constants.items():
+            stock_columns[name] = [value] * length
+        stock_columns['date_added'] = stock_columns['date_updated'] = [now] * length
+        return stock_columns
+
+
+class FromStockPlan:
+    """StockData -> プラットフォームのデータの変換手順"""
+
+    def __init__(self, mapping: PlatformMapping):
+        fields = mapping.stock_fields()
+        self.model = mapping.model
+        self.target_fields = [target for target, _ in fields]
+        self.stock_fields = [stock for _, stock in fields]
+        self._getter = _tuple_getter(self.stock_fields)
+
+    def convert(self, stock_data: StockData) -> BaseModel:
+        """StockDataをプラットフォームのデータに変換する（Noneのフィールドはモデルの既定値とする）"""
+        values = zip(self.target_fields, self._getter(stock_data))
+        return self.model(**{name: value for name, value in values if value is not None})
+
+    def stock_field_names(self, headers: Sequence[str]) -> List[str]:
+        """プラットフォームのフィールド名の並びを、StockBatchから取り出すフィールド名の並びに読み替える"""
+        renames = dict(zip(self.target_fields, self.stock_fields))
+        return [renames.get(name, name) for name in headers]
+
+
+def _tuple_getter(fields: Sequence[str]) -> Callable[[Any], Tuple[Any, ...]]:
+    """オブジェクトから指定したフィールドの値をタプルでまとめて取り出す関数"""
+    if len(fields) == 1:
+        getter = attrgetter(fields[0])
+        return lambda obj: (getter(obj),)
+    return attrgetter(*fields) if fields else lambda obj: ()
+
+
+@lru_cache(maxsize=None)
+def to_stock_plan(platform: str) -> ToStockPlan:
+    """プラットフォームのデータをStockDataに変換する手順（プラットフォームごとに1回だけ組み立てる）"""
+    return ToStockPlan(PLATFORM_MAPPINGS[platform])
+
+
+@lru_cache(maxsize=None)
+def from_stock_plan(platform: str) -> FromStockPlan:
+    """StockDataをプラットフォームのデータに変換する手順（プラットフォームごとに1回だけ組み立てる）"""
+    return FromStockPlan(PLATFORM_MAPPINGS[platform])
+
+
+register_platform_mapping(PlatformMapping(
+    platform='tradingview',
+    model=TradingViewData,
+    renames={'section': 'tradingview_section'},
+    constants={'source_platform': 'tradingview', 'status': 'active'},
+))
+
+register_platform_mapping(PlatformMapping(
+    platform='seekingalpha',
+    model=SeekingAlphaData,
+    renames={'company_name': 'name', 'price': 'current_price'},
+    constants={'source_platform': 'seekingalpha', 'status': 'active', 'notes': None, 'tradingview_section': None},
+))
+
+# Google Sheetsの行は見出し（小文字）で対応付ける（空のセルの既定値はFormatConverter.from_valuesで補う）
+register_platform_mapping(PlatformMapping(
+    platform='googlesheets',
+    renames={'company_name': 'name'},
+))
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Optional, Union, Dict, Any, Type, TypeVar, List, ClassVar, Set
+from typing import Optional, Union, Dict, Any, Type, TypeVar, List, ClassVar, Set, Iterable
 from datetime import datetime
 
 # PlatformDataの型変数を定義
@@ -224,6 +224,54 @@ class StockData(BaseModel):
             self.full_symbol = self.symbol
         return self
     
+    @classmethod
+    def from_trusted_many(cls, records: Iterable[Dict[str, Any]]) -> List['StockData']:
+        """
+        検証済みのデータからStockDataをまとめて生成する。
+        TradingViewData/SeekingAlphaDataなど、既にバリデーション済みの値を前提に
+        model_constructと同様にフィールド単位の検証を省略する。
+        recordのキーはStockDataのフィールド名で、symbol/exchangeは正規化済み（大文字・前後空白なし）であること。
+        full_symbolはnormalize_full_symbolと同じ規則で生成する。
+        """
+        if cls.__private_attributes__ or cls.model_config.get('extra') == 'allow':
+            # 内部状態の初期化が必要なモデルはmodel_constructに任せる
+            return [cls.model_construct(**cls._with_full_symbol(dict(record))) for record in records]
+
+        # 全フィールドを定義順に持つ雛形。update後もフィールド順が保たれる
+        template = {
+            name: None if field.is_required() else field.get_default(call_default_factory=True)
+            for name, field in cls.model_fields.items()
+        }
+
+        stock_data_list = []
+        for record in records:
+            values = template.copy()
+            values.update(record)
+            values = cls._with_full_symbol(values)
+            stock_data_list.append(cls._construct_unchecked(values, set(record) | {'full_symbol'}))
+        return stock_data_list
+
+    @classmethod
+    def _construct_unchecked(cls, values: Dict[str, Any], fields_set: Set[str]) -> 'StockData':
+        """
+        全フィールドの値を持つvaluesからmodel_constructと同じ状態のインスタンスを生成する。
+        pydanticの内部属性を直接設定するのはここだけにする（model_constructとの一致はテストで確認する）。
+        """
+        instance = cls.__new__(cls)
+        object.__setattr__(instance, '__dict__', values)
+        object.__setattr__(instance, '__pydantic_fields_set__', fields_set)
+        object.__setattr__(instance, '__pydantic_extra__', None)
+        object.__setattr__(instance, '__pydantic_private__', None)
+        return instance
+
+    @staticmethod
+    def _with_full_symbol(values: Dict[str, Any]) -> Dict[str, Any]:
+        """normalize_full_symbolと同じ規則でfull_symbolを設定する"""
+        symbol = values['symbol']
+        exchange = values.get('exchange')
+        values['full_symbol'] = f"{exchange}:{symbol}" if exchange else symbol
+        return values
+
     # def convert_platform_data(self, target_class: Type[T]) -> T:
     #     """プラットフォームデータを別の型に変換"""
     #     if isinstance(self.platform_data, target_class):
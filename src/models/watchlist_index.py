@@ -0,0 +1,128 @@
+"""銘柄の索引と複数のデータソースの統合"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.models.batch import StockBatch
+from src.models.stock import StockData
+
+# 統合時にフィールドの値が重複した場合の優先順位
+PRECEDENCES = ('first', 'last')
+
+
+class WatchlistIndex:
+    """
+    StockBatchの銘柄をfull_symbolで引く索引（取引所・TradingViewセクションごとの副索引を持つ）
+
+    full_symbolが重複する行は最初の行を索引に登録する。
+    取引所を含まないシンボル（例: SeekingAlphaの 'AAPL'）は、同じシンボルの取引所付きの銘柄が1つだけの場合にその銘柄に解決する。
+    """
+
+    def __init__(self, batch: StockBatch):
+        self.batch = batch
+        self._positions: Dict[str, int] = {}
+        for position, key in enumerate(batch.to_pylist('full_symbol')):
+            self._positions.setdefault(key, position)
+        self._qualified = _qualified_keys(batch.to_pylist('symbol'), batch.to_pylist('exchange'))
+        self._exchange_rows = self._group_rows('exchange')
+        self._section_rows = self._group_rows('tradingview_section')
+
+    def _group_rows(self, name: str) -> Dict[str, np.ndarray]:
+        """辞書エンコードされた列の値ごとの行番号（元の順序）"""
+        codes = self.batch.codes(name)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(self.batch.categories(name)) + 1))
+        return {
+            category: order[bounds[code]:bounds[code + 1]]
+            for code, category in enumerate(self.batch.categories(name))
+        }
+
+    def __len__(self) -> int:
+        """重複を除いた銘柄数"""
+        return len(self._positions)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.resolve(key) is not None
+
+    def resolve(self, key: str) -> Optional[str]:
+        """full_symbolまたは取引所を含まないシンボルを、索引に登録されたfull_symbolに解決する"""
+        key = key.strip().upper()
+        if key in self._positions:
+            return key
+        qualified = self._qualified.get(key)
+        return qualified if qualified in self._positions else None
+
+    def position(self, key: str) -> Optional[int]:
+        """銘柄の行番号を返す（無い場合はNone）"""
+        resolved = self.resolve(key)
+        return None if resolved is None else self._positions[resolved]
+
+    def get(self, key: str) -> Optional[StockData]:
+        """銘柄のStockDataを返す（無い場合はNone）"""
+        position = self.position(key)
+        return None if position is None else self.batch[position]
+
+    @property
+    def exchanges(self) -> List[str]:
+        """取引所の一覧"""
+        return [name for name, rows in self._exchange_rows.items() if len(rows)]
+
+    @property
+    def sections(self) -> List[str]:
+        """TradingViewのセクションの一覧"""
+        return [name for name, rows in self._section_rows.items() if len(rows)]
+
+    def rows_by_exchange(self, exchange: str) -> StockBatch:
+        """指定した取引所の銘柄を元の順序で返す"""
+        return self.batch.take(self._exchange_rows.get(exchange.strip().upper(), np.empty(0, dtype=np.intp)))
+
+    def rows_by_section(self, section: str) -> StockBatch:
+        """指定したTradingViewセクションの銘柄を元の順序で返す"""
+        return self.batch.take(self._section_rows.get(section, np.empty(0, dtype=np.intp)))
+
+    @classmethod
+    def merge(cls, sources: Sequence[StockBatch], precedence: str = 'first') -> 'WatchlistIndex':
+        """
+        複数のデータソースを銘柄ごとに1行に統合し、その索引を返す（ハッシュ結合のため行数に比例する時間で処理する）
+
+        - 銘柄はfull_symbolで対応付ける。取引所を含まないシンボルは、全ソースで取引所付きの銘柄が1つだけの場合にその銘柄とする
+        - 各フィールドは優先するソースから順に、最初の欠損でない値を採用する
+          （precedence='first'は先に指定したソース、'last'は後に指定したソースを優先する。同じソース内では先の行を優先する）
+        - 銘柄の順序は、指定したソースの順に最初に現れた順とする
+        """
+        if precedence not in PRECEDENCES:
+            raise ValueError(f"precedenceは{'/'.join(PRECEDENCES)}のいずれかです: {precedence}")
+        combined = StockBatch.concat(sources)
+        symbols = combined.to_pylist('symbol')
+        exchanges = combined.to_pylist('exchange')
+        qualified = _qualified_keys(symbols, exchanges)
+
+        # 行ごとの統合後のキーとグループ番号（辞書で1回ずつ引くだけの線形時間）
+        keys: Dict[str, int] = {}
+        groups = np.fromiter(
+            (keys.setdefault(f"{exchange}:{symbol}" if exchange else qualified.get(symbol, symbol), len(keys))
+             for symbol, exchange in zip(symbols, exchanges)),
+            dtype=np.intp, count=len(combined)
+        )
+
+        # ソースの優先順、同じソース内は行の順で並べた行番号
+        source_of_row = np.repeat(np.arange(len(sources)), [len(source) for source in sources])
+        rank = source_of_row if precedence == 'first' else len(sources) - 1 - source_of_row
+        order = np.lexsort((np.arange(len(combined)), rank))
+
+        # 取引所を補完した銘柄のfull_symbolは統合後のキーに揃える
+        merged = combined.coalesce_rows(groups, len(keys), order).with_column('full_symbol', list(keys))
+        return cls(merged)
+
+
+def _qualified_keys(symbols: Sequence[str], exchanges: Sequence[Optional[str]]) -> Dict[str, str]:
+    """シンボル -> 取引所付きのfull_symbol（同じシンボルが複数の取引所にある場合は含めない）"""
+    qualified: Dict[str, Optional[str]] = {}
+    for symbol, exchange in zip(symbols, exchanges):
+        if not exchange:
+            continue
+        key = f"{exchange}:{symbol}"
+        if qualified.setdefault(symbol, key) != key:
+            qualified[symbol] = None
+    return {symbol: key for symbol, key in qualified.items() if key is not None}
+
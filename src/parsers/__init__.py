@@ -1,3 +1,18 @@
-from .tradingview import TradingViewParser
-from .seekingalpha import SeekingAlphaParser
-from .base_parser import BaseParser
\ No newline at end of file
+"""入力ファイルのパーサー（パーサークラスは参照された時点で初めてインポートする）"""
+import importlib
+
+# 公開するクラス名 -> 定義しているモジュール
+_LAZY_ATTRIBUTES = {
+    'TradingViewParser': 'src.parsers.tradingview',
+    'SeekingAlphaParser': 'src.parsers.seekingalpha',
+    'BaseParser': 'src.parsers.base_parser',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    # SeekingAlphaParserはpandasなどの重い依存を読み込むため、使用しない処理の起動を遅くしないよう遅延させる
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
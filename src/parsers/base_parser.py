@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import Any, Dict, List, Type, Union
 from pathlib import Path
 
+from pydantic import BaseModel
+
 from src.models.stock import PlatformData
 
 class BaseParser(ABC):
@@ -10,6 +12,11 @@ class BaseParser(ABC):
     新しいパーサーを追加する際は、このクラスを継承し、
     parse, validate_format, get_supported_extensions メソッドを実装する。
     """
+
+    # 解析結果のバージョン。解析結果が変わる変更を行った場合は更新する（解析キャッシュの無効化に使用）
+    version: str = "1"
+    # parseが返すプラットフォームデータのモデル
+    data_model: Type[BaseModel]
     
     @abstractmethod
     def parse(self, file_path: Union[str, Path]) -> List[PlatformData]:
@@ -19,6 +26,30 @@ class BaseParser(ABC):
         """
         pass
     
+    def parse_columns(self, file_path: Union[str, Path]) -> Dict[str, List[Any]]:
+        """
+        ファイルを解析し、プラットフォームデータのフィールド名をキーとする列データを返す。
+        既定ではparseの結果を列に組み替える。列単位で解析できるパーサーはオーバーライドする。
+        """
+        columns: Dict[str, List[Any]] = {}
+        for data in self.parse(file_path):
+            for name, value in data.model_dump().items():
+                columns.setdefault(name, []).append(value)
+        return columns
+
+    def columns_to_data(self, columns: Dict[str, List[Any]]) -> List[PlatformData]:
+        """parse_columnsが返す列データからparseと同じプラットフォームデータのリストを生成する"""
+        names = list(columns)
+        return [self.data_model(**dict(zip(names, row))) for row in zip(*columns.values())]
+    
+    @classmethod
+    def sniff(cls, header: bytes) -> bool:
+        """
+        ファイル先頭のバイト列だけから、このパーサーで解析できる形式かを簡易判定する。
+        形式の自動判定に使用する。既定では判定しない（Falseを返す）。
+        """
+        return False
+
     @abstractmethod
     def validate_format(self, file_path: Union[str, Path]) -> bool:
         """
@@ -0,0 +1,122 @@
+"""パーサーの登録と入力ファイル形式の自動判定"""
+
+import importlib
+from pathlib import Path
+from typing import Dict, List, Optional, Type, Union
+
+from src.parsers.base_parser import BaseParser
+
+# 形式の判定に読み込むファイル先頭のバイト数
+SNIFF_SIZE = 4096
+
+# パーサーを使わずに読み込む列指向形式のマジックナンバー
+COLUMNAR_MAGIC: Dict[bytes, str] = {
+    b'PAR1': 'parquet',
+    b'ARROW1': 'arrow',
+}
+
+# 列指向形式の拡張子
+COLUMNAR_EXTENSIONS: Dict[str, str] = {
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+
+
+class ParserRegistry:
+    """
+    入力形式名とパーサーの対応を管理し、ファイル先頭の一定バイト数だけを読んで形式を判定する。
+    パーサーは "モジュール:クラス名" で登録し、使用時に初めてインポートする。
+    """
+
+    def __init__(self, sniff_size: int = SNIFF_SIZE):
+        self.sniff_size = sniff_size
+        self._targets: Dict[str, str] = {}
+        self._extensions: Dict[str, List[str]] = {}
+
+    def register(self, format_name: str, target: str, extensions: Optional[List[str]] = None) -> None:
+        """
+        パーサーを登録する
+
+        Args:
+            format_name: 入力形式名（例: 'tradingview'）
+            target: パーサークラスの場所（例: 'src.parsers.tradingview:TradingViewParser'）
+            extensions: サポートする拡張子（指定するとパーサーをインポートせずに拡張子で判定できる。
+                        省略した場合はパーサーのget_supported_extensions()を使う）
+        """
+        self._targets[format_name] = target
+        self._extensions.pop(format_name, None)
+        if extensions is not None:
+            self._extensions[format_name] = [ext.lower() for ext in extensions]
+
+    @property
+    def formats(self) -> List[str]:
+        """登録されている入力形式名の一覧"""
+        return list(self._targets)
+
+    def parser_class(self, format_name: str) -> Type[BaseParser]:
+        """入力形式に対応するパーサークラスを返す"""
+        try:
+            module_name, class_name = self._targets[format_name].split(':')
+        except KeyError:
+            raise ValueError(f"未サポートの入力形式: {format_name}") from None
+        return getattr(importlib.import_module(module_name), class_name)
+
+    def create_parser(self, format_name: str) -> BaseParser:
+        """入力形式に対応するパーサーを生成する"""
+        return self.parser_class(format_name)()
+
+    def extensions(self, format_name: str) -> List[str]:
+        """入力形式のパーサーがサポートする拡張子の一覧"""
+        if format_name not in self._extensions:
+            self._extensions[format_name] = [
+                ext.lower() for ext in self.create_parser(format_name).get_supported_extensions()
+            ]
+        return self._extensions[format_name]
+
+    def is_supported_path(self, file_path: Union[str, Path]) -> bool:
+        """拡張子が登録済みのパーサーまたは列指向形式のものかを返す"""
+        suffix = Path(file_path).suffix.lower()
+        return suffix in COLUMNAR_EXTENSIONS or any(suffix in self.extensions(name) for name in self.formats)
+
+    def detect(self, file_path: Union[str, Path]) -> str:
+        """
+        ファイル先頭のsniff_sizeバイトだけを読み、入力形式を判定する
+        拡張子が一致するパーサーから順に判定し、Parquet/Arrowはマジックナンバーで判定する。
+
+        Returns:
+            入力形式名（登録済みのパーサーの形式名、'parquet' または 'arrow'）
+
+        Raises:
+            ValueError: 形式を判定できない場合
+        """
+        with open(file_path, 'rb') as f:
+            header = f.read(self.sniff_size)
+
+        for magic, format_name in COLUMNAR_MAGIC.items():
+            if header.startswith(magic):
+                return format_name
+
+        suffix = Path(file_path).suffix.lower()
+        candidates = sorted(self.formats, key=lambda name: suffix not in self.extensions(name))
+        for format_name in candidates:
+            if self.parser_class(format_name).sniff(header):
+                return format_name
+
+        raise ValueError(f"ファイル形式を判定できません: {file_path}")
+
+
+# 既定のレジストリ
+registry = ParserRegistry()
+registry.register('tradingview', 'src.parsers.tradingview:TradingViewParser', extensions=['.txt'])
+registry.register('seekingalpha', 'src.parsers.seekingalpha:SeekingAlphaParser', extensions=['.xlsx', '.xls'])
+
+
+def detect_format(file_path: Union[str, Path]) -> str:
+    """既定のレジストリでファイルの入力形式を判定する"""
+    return registry.detect(file_path)
+
+
+def create_parser(format_name: str) -> BaseParser:
+    """既定のレジストリから入力形式に対応するパーサーを生成する"""
+    return registry.create_parser(format_name)
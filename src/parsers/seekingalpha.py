@@ -1,12 +1,83 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Union, Tuple
 from pathlib import Path
 
+from python_calamine import CalamineWorkbook
+
 from src.models.stock import SeekingAlphaData
 from src.parsers.base_parser import BaseParser
 
+# 各シートの列名とSeekingAlphaDataのフィールド名・変換種別の対応表
+# 変換種別: float / int / str / date
+SHEET_COLUMN_MAP: Dict[str, List[Tuple[str, str, str]]] = {
+    'Summary': [
+        ('Price', 'price', 'float'),
+        ('Change', 'change', 'float'),
+        ('Change %', 'change_percent', 'float'),
+        ('Volume', 'volume', 'int'),
+        ('Avg. Vol', 'avg_volume', 'float'),
+        ('Day Low', 'day_low', 'float'),
+        ('Day High', 'day_high', 'float'),
+        ('52W Low', 'week52_low', 'float'),
+        ('52W High', 'week52_high', 'float'),
+        ('Quant Rating', 'quant_rating', 'float'),
+        ('SA Analyst Ratings', 'sa_analyst_rating', 'float'),
+        ('Wall Street Ratings', 'wall_street_rating', 'float'),
+    ],
+    'Ratings': [
+        ('Valuation Grade', 'valuation_grade', 'str'),
+        ('Growth Grade', 'growth_grade', 'str'),
+        ('Profitability Grade', 'profitability_grade', 'str'),
+        ('Momentum Grade', 'momentum_grade', 'str'),
+        ('EPS Revision Grade', 'eps_revision_grade', 'str'),
+    ],
+    'Holdings': [
+        ('Shares', 'shares', 'float'),
+        ('Cost', 'cost', 'float'),
+        ("Today's Gain", 'todays_gain', 'float'),
+        ("Today's % Gain", 'todays_gain_percent', 'float'),
+        ('Total Change', 'total_change', 'float'),
+        ('Total % Change', 'total_change_percent', 'float'),
+        ('Value', 'value', 'float'),
+    ],
+    'Dividends': [
+        ('Safety', 'dividend_safety', 'str'),
+        ('Growth', 'dividend_growth', 'str'),
+        ('Yield', 'dividend_yield_grade', 'str'),
+        ('Consistency', 'dividend_consistency', 'str'),
+        ('Ex-Div Date', 'ex_dividend_date', 'date'),
+        ('Payout Date', 'payout_date', 'date'),
+        ('Frequency', 'frequency', 'str'),
+        ('Yield TTM', 'yield_ttm', 'float'),
+        ('Yield FWD', 'yield_forward', 'float'),
+        ('Div Rate TTM', 'dividend_rate_ttm', 'float'),
+        ('Div Rate FWD', 'dividend_rate_forward', 'float'),
+        ('Payout Ratio', 'payout_ratio', 'float'),
+        ('Div Growth 3Y', 'dividend_growth_3y', 'float'),
+        ('Div Growth 5Y', 'dividend_growth_5y', 'float'),
+        ('24M Beta', 'beta_24m', 'float'),
+    ],
+}
+
+# シートごとに読み込む列（Symbolと対応表にある列のみ）
+SHEET_USECOLS: Dict[str, frozenset] = {
+    sheet: frozenset(['Symbol', *(column for column, _, _ in column_map)])
+    for sheet, column_map in SHEET_COLUMN_MAP.items()
+}
+
+# xlsx (ZIP) と xls (OLE2) のファイル先頭のマジックナンバー
+_WORKBOOK_MAGIC = (b'PK\x03\x04', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1')
+
+# '-'や空文字列は欠損値として扱う
+_BLANK_VALUES = ['-', '']
+
+
 class SeekingAlphaParser(BaseParser):
     """Seeking Alpha Excelファイルパーサー（4シート対応）"""
+
+    version = "1"
+    data_model = SeekingAlphaData
     
     def __init__(self):
         self.required_sheets = ['Summary', 'Ratings', 'Holdings', 'Dividends']
@@ -14,150 +85,163 @@ class SeekingAlphaParser(BaseParser):
     def parse(self, file_path: Union[str, Path]) -> List[SeekingAlphaData]:
         """4シート構成のExcelファイルを解析"""
         try:
-            # 全シートを読み込み
-            excel_data = pd.read_excel(file_path, sheet_name=None, engine='calamine')
-            
-            # 必要なシートの存在確認
-            missing_sheets = [sheet for sheet in self.required_sheets
-                            if sheet not in excel_data.keys()]
-            if missing_sheets:
-                raise ValueError(f"必要なシートが見つかりません: {missing_sheets}")
-            
-            # 各シートのデータを統合
-            symbols = self._get_symbols_list(excel_data)
-            seeking_alpha_data = []
+            # 必要なシートの必要な列のみを読み込み
+            excel_data = self._read_sheets(file_path)
             
-            for symbol in symbols:
-                data = self._parse_symbol_data(symbol, excel_data)
-                seeking_alpha_data.append(data)
-            
-            return seeking_alpha_data
+            # 各シートのデータを列単位で統合
+            frame = self._build_frame(excel_data)
+            return self._frame_to_data(frame)
             
         except Exception as e:
             raise ValueError(f"Seeking Alphaファイルの解析に失敗: {e}")
-    
-    def _get_symbols_list(self, excel_data: Dict) -> List[str]:
-        """全シートから銘柄シンボルのリストを取得"""
+
+    def parse_columns(self, file_path: Union[str, Path]) -> Dict[str, List[Any]]:
+        """
+        4シート構成のExcelファイルを解析し、SeekingAlphaDataのフィールド名をキーとする列データを返す
+        SeekingAlphaDataオブジェクトを生成せずに列のまま変換する。
+        """
+        try:
+            excel_data = self._read_sheets(file_path)
+            frame = self._build_frame(excel_data)
+            symbols = frame.index.to_series().astype(str)
+            if (symbols == '').any():
+                raise ValueError("Symbol cannot be empty")
+
+            columns: Dict[str, List[Any]] = {'symbol': symbols.str.strip().str.upper().tolist()}
+            for field in frame.columns:
+                columns[field] = self._column_to_list(frame[field])
+            return columns
+
+        except Exception as e:
+            raise ValueError(f"Seeking Alphaファイルの解析に失敗: {e}")
+
+    def _read_sheets(self, file_path: Union[str, Path]) -> Dict[str, pd.DataFrame]:
+        """
+        ワークブックを1度だけ開き、必要なシートの存在を確認した上で、
+        各シートのSymbol列と対応表にある列のみを読み込む。
+        """
+        with pd.ExcelFile(file_path, engine='calamine') as workbook:
+            missing_sheets = [sheet for sheet in self.required_sheets
+                              if sheet not in workbook.sheet_names]
+            if missing_sheets:
+                raise ValueError(f"必要なシートが見つかりません: {missing_sheets}")
+
+            return {
+                sheet: workbook.parse(sheet, usecols=SHEET_USECOLS[sheet].__contains__)
+                for sheet in SHEET_COLUMN_MAP
+            }
+
+    def _build_frame(self, excel_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        4シートをSymbolで1度だけ索引付けし、1回の結合で銘柄ごとの列データにまとめる。
+        各列の変換（float/int/str/date）は列全体に対してまとめて適用する。
+        返り値はSummaryシートの銘柄順に並んだDataFrame（列名はSeekingAlphaDataのフィールド名）。
+        """
         summary_df = excel_data['Summary']
-        if 'Symbol' in summary_df.columns:
-            return summary_df['Symbol'].dropna().tolist()
-        else:
+        if 'Symbol' not in summary_df.columns:
             raise ValueError("Summaryシートに'Symbol'列が見つかりません")
+        symbols = summary_df['Symbol'].dropna().tolist()
+
+        sheet_frames = []
+        for sheet_name, column_map in SHEET_COLUMN_MAP.items():
+            sheet_frames.append(self._coerce_sheet(excel_data[sheet_name], column_map))
+
+        # 各シートはSymbolで一意に索引付け済みなので、結合は1回のreindexで済む
+        merged = pd.concat(sheet_frames, axis=1).reindex(symbols)
+        merged.index.name = 'Symbol'
+        return merged
+
+    def _coerce_sheet(self, df: pd.DataFrame, column_map: List[Tuple[str, str, str]]) -> pd.DataFrame:
+        """シートをSymbolで索引付けし、対応表に従って列ごとに型変換する"""
+        if 'Symbol' not in df.columns:
+            raise ValueError("シートに'Symbol'列が見つかりません")
+
+        # 同一シンボルが複数行ある場合は、従来通り先頭行を採用する
+        indexed = df[df['Symbol'].notna()].drop_duplicates(subset='Symbol', keep='first').set_index('Symbol')
+
+        coerced: Dict[str, pd.Series] = {}
+        for column, field, kind in column_map:
+            if column not in indexed.columns:
+                coerced[field] = pd.Series(None, index=indexed.index, dtype=object)
+                continue
+            series = indexed[column]
+            if kind == 'float':
+                coerced[field] = self._coerce_float(series)
+            elif kind == 'int':
+                coerced[field] = self._coerce_int(series)
+            elif kind == 'date':
+                coerced[field] = self._coerce_date(series)
+            else:
+                coerced[field] = self._coerce_str(series)
+        return pd.DataFrame(coerced, index=indexed.index)
+
+    def _frame_to_data(self, frame: pd.DataFrame) -> List[SeekingAlphaData]:
+        """列データからSeekingAlphaDataのリストを生成する"""
+        fields = list(frame.columns)
+        columns = [self._column_to_list(frame[field]) for field in fields]
+        symbols = frame.index.tolist()
+
+        return [
+            SeekingAlphaData(symbol=symbol, **dict(zip(fields, values)))
+            for symbol, values in zip(symbols, zip(*columns))
+        ]
+
+    @staticmethod
+    def _column_to_list(series: pd.Series) -> List[Any]:
+        """列をPythonの値のリストに変換する（欠損値はNone）"""
+        if series.dtype.kind == 'f':
+            return [None if v != v else v for v in series.tolist()]
+        return series.astype(object).where(series.notna(), None).tolist()
+
+    @staticmethod
+    def _blank_mask(series: pd.Series) -> pd.Series:
+        """欠損値・'-'・空文字列の位置を返す"""
+        values = series.astype(object)
+        return values.isna() | values.isin(_BLANK_VALUES)
+
+    def _coerce_float(self, series: pd.Series) -> pd.Series:
+        """列全体をfloatに変換する（欠損値・'-'・空文字列・数値でない値はNaN）"""
+        if series.dtype.kind in 'fiu':
+            return series.astype('float64')
+        values = series.astype(object).mask(self._blank_mask(series))
+        return pd.to_numeric(values, errors='coerce').astype('float64')
+
+    def _coerce_int(self, series: pd.Series) -> pd.Series:
+        """列全体をintに変換する（小数部は切り捨て、変換できない値はNone）"""
+        floats = self._coerce_float(series)
+        floats = floats.where(np.isfinite(floats))
+        ints = pd.Series(np.trunc(floats.to_numpy()), index=series.index).astype('Int64')
+        return ints.astype(object).where(ints.notna(), None).map(lambda v: v if v is None else int(v))
+
+    def _coerce_str(self, series: pd.Series) -> pd.Series:
+        """列全体を前後の空白を除いた文字列に変換する（欠損値・'-'・空文字列はNone）"""
+        blank = self._blank_mask(series)
+        text = series.astype(object).astype(str).str.strip()
+        return text.astype(object).where(~blank, None)
+
+    def _coerce_date(self, series: pd.Series) -> pd.Series:
+        """列全体を日付の文字列に変換する（M/D/YYYY形式はYYYY-MM-DDに変換）"""
+        blank = self._blank_mask(series)
+        text = series.astype(object).astype(str)
+        parts = text.str.extract(r'^([^/]*)/([^/]*)/([^/]*)$')
+        slashed = parts[0].notna()
+        reformatted = parts[2] + '-' + parts[0].str.zfill(2) + '-' + parts[1].str.zfill(2)
+        result = text.astype(object).where(~slashed, reformatted)
+        return result.astype(object).where(~blank, None)
     
-    def _parse_symbol_data(self, symbol: str, excel_data: Dict) -> SeekingAlphaData:
-        """特定銘柄のデータを4シートから統合"""
-        data = SeekingAlphaData(symbol=symbol)
-        
-        # Summaryシートからデータ取得
-        summary_row = excel_data['Summary'][excel_data['Summary']['Symbol'] == symbol]
-        if not summary_row.empty:
-            row = summary_row.iloc[0]
-            data.price = self._safe_float(row.get('Price'))
-            data.change = self._safe_float(row.get('Change'))
-            data.change_percent = self._safe_float(row.get('Change %'))
-            data.volume = self._safe_int(row.get('Volume'))
-            data.avg_volume = self._safe_float(row.get('Avg. Vol'))
-            data.day_low = self._safe_float(row.get('Day Low'))
-            data.day_high = self._safe_float(row.get('Day High'))
-            data.week52_low = self._safe_float(row.get('52W Low'))
-            data.week52_high = self._safe_float(row.get('52W High'))
-            data.quant_rating = self._safe_float(row.get('Quant Rating'))
-            data.sa_analyst_rating = self._safe_float(row.get('SA Analyst Ratings'))
-            data.wall_street_rating = self._safe_float(row.get('Wall Street Ratings'))
-        
-        # Ratingsシートからデータ取得
-        ratings_df = excel_data['Ratings']
-        ratings_row = ratings_df[ratings_df['Symbol'] == symbol]
-        if not ratings_row.empty:
-            row = ratings_row.iloc[0]
-            data.valuation_grade = self._safe_str(row.get('Valuation Grade'))
-            data.growth_grade = self._safe_str(row.get('Growth Grade'))
-            data.profitability_grade = self._safe_str(row.get('Profitability Grade'))
-            data.momentum_grade = self._safe_str(row.get('Momentum Grade'))
-            data.eps_revision_grade = self._safe_str(row.get('EPS Revision Grade'))
-        
-        # Holdingsシートからデータ取得
-        holdings_df = excel_data['Holdings']
-        holdings_row = holdings_df[holdings_df['Symbol'] == symbol]
-        if not holdings_row.empty:
-            row = holdings_row.iloc[0]
-            data.shares = self._safe_float(row.get('Shares'))
-            data.cost = self._safe_float(row.get('Cost'))
-            data.todays_gain = self._safe_float(row.get("Today's Gain"))
-            data.todays_gain_percent = self._safe_float(row.get("Today's % Gain"))
-            data.total_change = self._safe_float(row.get('Total Change'))
-            data.total_change_percent = self._safe_float(row.get('Total % Change'))
-            data.value = self._safe_float(row.get('Value'))
-        
-        # Dividendsシートからデータ取得
-        dividends_df = excel_data['Dividends']
-        dividends_row = dividends_df[dividends_df['Symbol'] == symbol]
-        if not dividends_row.empty:
-            row = dividends_row.iloc[0]
-            data.dividend_safety = self._safe_str(row.get('Safety'))
-            data.dividend_growth = self._safe_str(row.get('Growth'))
-            data.dividend_yield_grade = self._safe_str(row.get('Yield'))
-            data.dividend_consistency = self._safe_str(row.get('Consistency'))
-            data.ex_dividend_date = self._safe_date(row.get('Ex-Div Date'))
-            data.payout_date = self._safe_date(row.get('Payout Date'))
-            data.frequency = self._safe_str(row.get('Frequency'))
-            data.yield_ttm = self._safe_float(row.get('Yield TTM'))
-            data.yield_forward = self._safe_float(row.get('Yield FWD'))
-            data.dividend_rate_ttm = self._safe_float(row.get('Div Rate TTM'))
-            data.dividend_rate_forward = self._safe_float(row.get('Div Rate FWD'))
-            data.payout_ratio = self._safe_float(row.get('Payout Ratio'))
-            data.dividend_growth_3y = self._safe_float(row.get('Div Growth 3Y'))
-            data.dividend_growth_5y = self._safe_float(row.get('Div Growth 5Y'))
-            data.beta_24m = self._safe_float(row.get('24M Beta'))
-        
-        return data
-    
-    def _safe_float(self, value: Any) -> Optional[float]:
-        """安全なfloat変換（'-'や空値を処理）"""
-        if pd.isna(value) or value == '-' or value == '':
-            return None
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return None
-    
-    def _safe_int(self, value: Any) -> Optional[int]:
-        """安全なint変換"""
-        if pd.isna(value) or value == '-' or value == '':
-            return None
-        try:
-            return int(float(value))
-        except (ValueError, TypeError):
-            return None
-    
-    def _safe_str(self, value: Any) -> Optional[str]:
-        """安全なstring変換"""
-        if pd.isna(value) or value == '-' or value == '':
-            return None
-        return str(value).strip()
-    
-    def _safe_date(self, value: Any) -> Optional[str]:
-        """安全な日付変換"""
-        if pd.isna(value) or value == '-' or value == '':
-            return None
-        try:
-            # M/D/YYYY形式をYYYY-MM-DD形式に変換
-            if isinstance(value, str) and '/' in value:
-                parts = value.split('/')
-                if len(parts) == 3:
-                    month, day, year = parts
-                    return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-            return str(value)
-        except:
-            return None
-    
+    @classmethod
+    def sniff(cls, header: bytes) -> bool:
+        """ファイル先頭がExcelワークブック (xlsx/xls) のマジックナンバーかを判定"""
+        return header.startswith(_WORKBOOK_MAGIC)
+
     def validate_format(self, file_path: Union[str, Path]) -> bool:
         """ファイル形式の妥当性を検証"""
         try:
-            excel_data = pd.read_excel(file_path, sheet_name=None, engine='calamine')
+            # シート一覧のみを読み込み、セルの内容はデコードしない
+            sheet_names = CalamineWorkbook.from_path(str(file_path)).sheet_names
             # 必要なシートが存在するかチェック
-            return all(sheet in excel_data.keys() for sheet in self.required_sheets)
-        except:
+            return all(sheet in sheet_names for sheet in self.required_sheets)
+        except Exception:
             return False
     
     def get_supported_extensions(self) -> List[str]:
@@ -1,84 +1,173 @@
+import codecs
 import re
-from typing import List, Dict, Tuple, Union, Optional
+from typing import Any, List, Dict, Tuple, Union, Optional, Iterator
 from pathlib import Path
 
 from src.models.stock import StockData, TradingViewData
-from src.utils.file_io import read_file
+from src.utils.file_io import read_file, iter_text_chunks, DEFAULT_CHUNK_SIZE
 from src.parsers.base_parser import BaseParser
+from src.parsers.registry import SNIFF_SIZE
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 銘柄・セクションマーカーの区切り文字（カンマまたは改行）
+_ITEM_SEPARATOR = re.compile(r'[,\n]')
+
+# '###<name>' も '###SECTION <name>' も許容
+SECTION_PATTERN = r'^###(?:SECTION\s*)?(.+)$'
+SYMBOL_PATTERN = r'^(?P<exchange>[A-Z]+):(?P<symbol>[A-Z0-9\.\-]+)$'
+_SECTION_RE = re.compile(SECTION_PATTERN)
+_SYMBOL_RE = re.compile(SYMBOL_PATTERN)
+
+
 class TradingViewParser(BaseParser):
     """TradingView テキストファイルパーサー（セクション対応）"""
-    
+
+    version = "1"
+    data_model = TradingViewData
+
     def __init__(self):
         self.supported_exchanges = ['NASDAQ', 'NYSE', 'AMEX', 'TSE', 'LSE', 'FRA']
-        # '###<name>' も '###SECTION <name>' も許容
-        self.section_pattern = r'^###(?:SECTION\s*)?(.+)$'
-        self.symbol_pattern = r'^(?P<exchange>[A-Z]+):(?P<symbol>[A-Z0-9\.\-]+)$'
-    
+        self.section_pattern = SECTION_PATTERN
+        self.symbol_pattern = SYMBOL_PATTERN
+        self._section_re = _SECTION_RE
+        self._symbol_re = _SYMBOL_RE
+
     def parse(self, file_path: Union[str, Path]) -> List[TradingViewData]:
         """
         TradingViewのウォッチリストファイルを解析する
-        
+
         Args:
             file_path: ファイルパス
-            
+
         Returns:
-            TradingViewDataオブジェクトのリスト
+            TradingViewDataオブジェクトのリスト（セクションの出現順にグループ化）
         """
-        content = read_file(file_path)
-        lines = content.strip().split('\n')
-        
-        tradingview_data_list: List[TradingViewData] = []
-        
-        # セクションごとに銘柄を一時的に保持する辞書
+        # セクションごとに銘柄を保持する辞書
         # キーはセクション名 (Noneを含む), 値は銘柄リスト
-        grouped_items: Dict[Optional[str], List[str]] = {None: []}
+        grouped_items: Dict[Optional[str], List[TradingViewData]] = {None: []}
+        for section, data in self._iter_entries(file_path, DEFAULT_CHUNK_SIZE):
+            items = grouped_items.setdefault(section, [])
+            if data is not None:
+                items.append(data)
+
+        return [data for items in grouped_items.values() for data in items]
+
+    def parse_columns(self, file_path: Union[str, Path]) -> Dict[str, List[Any]]:
+        """
+        TradingViewのウォッチリストファイルを解析し、列データ(symbol/exchange/section)を返す
+        行の順序はparseと同じ（セクションの出現順にグループ化）。
+        """
+        grouped: Dict[Optional[str], Tuple[List[str], List[Optional[str]]]] = {None: ([], [])}
+        # TradingViewDataを生成せず、正規化済みの文字列のまま列に振り分ける
+        for section, symbol, exchange in self._iter_raw_entries(file_path, DEFAULT_CHUNK_SIZE):
+            symbols, exchanges = grouped.setdefault(section, ([], []))
+            if symbol is not None:
+                symbols.append(symbol)
+                exchanges.append(exchange)
+
+        columns: Dict[str, List[Any]] = {'symbol': [], 'exchange': [], 'section': []}
+        for section, (symbols, exchanges) in grouped.items():
+            columns['symbol'].extend(symbols)
+            columns['exchange'].extend(exchanges)
+            columns['section'].extend([section] * len(symbols))
+        return columns
+
+    def iter_parse(self, file_path: Union[str, Path],
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[TradingViewData]:
+        """
+        TradingViewのウォッチリストファイルを1パスで解析し、銘柄をファイル中の出現順に返す
+        ファイルはchunk_sizeごとに読み込むため、銘柄数に関わらずメモリ使用量は一定に保たれる。
+
+        Args:
+            file_path: ファイルパス
+            chunk_size: 1回に読み込む文字数
+
+        Yields:
+            TradingViewDataオブジェクト
+        """
+        for _, data in self._iter_entries(file_path, chunk_size):
+            if data is not None:
+                yield data
+
+    def _iter_entries(self, file_path: Union[str, Path],
+                      chunk_size: int) -> Iterator[Tuple[Optional[str], Optional[TradingViewData]]]:
+        """
+        (セクション名, TradingViewData) の組を出現順に返す
+        セクションマーカーを読んだ時点では (セクション名, None) を返す。
+        """
+        for section, symbol, exchange in self._iter_raw_entries(file_path, chunk_size):
+            if symbol is None:
+                yield section, None
+            else:
+                yield section, TradingViewData(symbol=symbol, exchange=exchange, section=section)
+
+    def _iter_raw_entries(self, file_path: Union[str, Path],
+                          chunk_size: int) -> Iterator[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """
+        (セクション名, シンボル, 取引所) の組を出現順に返す（シンボルと取引所は大文字に正規化済み）
+        セクションマーカーを読んだ時点では (セクション名, None, None) を返す。
+        """
         current_section: Optional[str] = None
-        
-        for line in lines:
-            items = [item.strip() for item in line.split(',') if item.strip()]
-            
-            for item in items:
-                logger.debug(f"Processing item: '{item}', Current section before processing: '{current_section}'")
-                section_match = re.match(self.section_pattern, item)
-                if section_match:
-                    current_section = section_match.group(1).strip()
-                    logger.debug(f"Section found: {current_section}") # ログ出力追加
-                    if current_section not in grouped_items:
-                        grouped_items[current_section] = []
-                    continue
-
-                # 現在のセクションに銘柄を追加
-                if current_section is None:
-                    grouped_items[None].append(item)
-                else:
-                    grouped_items[current_section].append(item)
-
-        # グループ化されたアイテムからTradingViewDataを作成
-        for section_name, symbols_in_section in grouped_items.items():
-            for item_symbol in symbols_in_section:
-                symbol_match = re.match(self.symbol_pattern, item_symbol)
-                if symbol_match:
-                    exchange = symbol_match.group('exchange').upper()
-                    symbol = symbol_match.group('symbol').upper()
-                    
-                    if exchange in self.supported_exchanges:
-                        tradingview_data = TradingViewData(
-                            symbol=symbol,
-                            exchange=exchange,
-                            section=section_name # グループ化されたセクションを割り当てる
-                        )
-                        tradingview_data_list.append(tradingview_data)
-                        logger.debug(f"Parsed: {tradingview_data}") # ログ出力追加
-                    else:
-                        logger.warning(f"Unsupported exchange for item: {item_symbol}")
-                else:
-                    logger.warning(f"Invalid symbol format for item: {item_symbol}")
-                            
-        return tradingview_data_list
+
+        for item in self._iter_items(file_path, chunk_size):
+            section_match = self._section_re.match(item)
+            if section_match:
+                current_section = section_match.group(1).strip()
+                logger.debug("Section found: %s", current_section)
+                yield current_section, None, None
+                continue
+
+            symbol_match = self._symbol_re.match(item)
+            if not symbol_match:
+                logger.warning(f"Invalid symbol format for item: {item}")
+                continue
+
+            exchange = symbol_match.group('exchange').upper()
+            symbol = symbol_match.group('symbol').upper()
+            if exchange not in self.supported_exchanges:
+                logger.warning(f"Unsupported exchange for item: {item}")
+                continue
+
+            logger.debug("Parsed: %s:%s (section=%s)", exchange, symbol, current_section)
+            yield current_section, symbol, exchange
+
+    def _iter_items(self, file_path: Union[str, Path], chunk_size: int) -> Iterator[str]:
+        """ファイルをチャンク単位で読み込み、カンマ・改行区切りの項目を順に返す"""
+        remainder = ''
+        for chunk in iter_text_chunks(file_path, chunk_size):
+            tokens = _ITEM_SEPARATOR.split(remainder + chunk)
+            # 最後の要素はチャンク境界で途切れている可能性があるため次のチャンクに持ち越す
+            remainder = tokens.pop()
+            for token in tokens:
+                token = token.strip()
+                if token:
+                    yield token
+
+        remainder = remainder.strip()
+        if remainder:
+            yield remainder
+
+    @classmethod
+    def sniff(cls, header: bytes) -> bool:
+        """
+        ファイル先頭の項目がセクションマーカーまたは 'EXCHANGE:SYMBOL' 形式で、
+        かつ 'EXCHANGE:SYMBOL' 形式の項目を含むかを判定
+        """
+        if header.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            text = header.decode('utf-16', errors='ignore')
+        else:
+            text = header.decode('utf-8', errors='ignore').lstrip('\ufeff')
+
+        items = _ITEM_SEPARATOR.split(text)
+        if len(items) > 1 and len(header) >= SNIFF_SIZE:
+            # 読み込み範囲いっぱいの場合、最後の項目は境界で途切れている可能性があるため判定に使わない
+            items.pop()
+        items = [item.strip() for item in items if item.strip()]
+        if not items or not (_SECTION_RE.match(items[0]) or _SYMBOL_RE.match(items[0])):
+            return False
+        return any(_SYMBOL_RE.match(item) for item in items)
 
     def validate_format(self, file_path: Union[str, Path]) -> bool:
         """ファイル形式の妥当性を検証"""
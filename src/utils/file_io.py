@@ -1,7 +1,14 @@
-import chardet
-import pandas as pd
+import codecs
 from pathlib import Path
-from typing import Union, Optional, Any
+from typing import Union, Optional, Any, Iterator, List, TextIO
+
+# chardetとpandasは読み込みに時間がかかるため、必要になった時点でインポートする
+
+# テキストファイルを分割して読み込む際の既定のチャンクサイズ（文字数）
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# 出力ファイルの既定のバッファサイズ（バイト数）
+DEFAULT_OUTPUT_BUFFER_SIZE = 1024 * 1024
 
 def get_file_encoding(file_path: Union[str, Path], sample_size: int = 1024) -> Optional[str]:
     """
@@ -18,8 +25,88 @@ def get_file_encoding(file_path: Union[str, Path], sample_size: int = 1024) -> O
         sample = f.read(sample_size)
         if b'\x50\x4B\x03\x04' in sample[:100]:
              return 'binary'
-        result = chardet.detect(sample)
-        return result["encoding"] or "utf-8"
+    # UTF-8（ASCIIを含む）としてデコードできる場合はchardetを使わない
+    # サンプルの末尾で切れた多バイト文字はエラーとしないよう、インクリメンタルデコーダーで判定する
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8-sig' if sample.startswith(codecs.BOM_UTF8) else 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    import chardet
+    result = chardet.detect(sample)
+    return result["encoding"] or "utf-8"
+
+def _candidate_encodings(path: Path) -> List[str]:
+    """試行するエンコーディングの候補を優先順に返す"""
+    detected_encoding = get_file_encoding(path)
+    # 先頭サンプルがASCIIのみでも後続に多バイト文字が現れうるため、上位互換のUTF-8として扱う
+    if detected_encoding and detected_encoding.lower() == 'ascii':
+        detected_encoding = 'utf-8'
+
+    # 一般的なエンコーディングを試すリスト
+    encodings_to_try = [
+        detected_encoding,
+        'utf-8',
+        'shift_jis',
+        'euc_jp',
+        'iso2022_jp'
+    ]
+    # 重複を除き、Noneを除外
+    return [enc for enc in dict.fromkeys(encodings_to_try) if enc]
+
+
+def iter_text_chunks(file_path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    テキストファイルを一定サイズごとに読み込んで返すジェネレーター
+    ファイル全体をメモリに載せないため、巨大なファイルでもメモリ使用量が一定に保たれる。
+
+    Args:
+        file_path: ファイルパス
+        chunk_size: 1回に読み込む文字数
+
+    Yields:
+        ファイル内容の断片
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+        ValueError: 適切なエンコーディングが見つからない場合
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"ファイルが見つかりません: {path}")
+
+    # 一度返した内容は取り消せないため、ファイル全体をデコードできるエンコーディングを先に決める
+    encoding = _find_decodable_encoding(path)
+    if encoding is None:
+        raise ValueError(f"適切なエンコーディングが見つかりませんでした: {path}")
+
+    with open(path, "r", encoding=encoding) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _find_decodable_encoding(path: Path, block_size: int = 1024 * 1024) -> Optional[str]:
+    """
+    候補のうちファイル全体をデコードできる最初のエンコーディングを返す（見つからない場合はNone）
+    先頭のサンプルだけでは判定できない、途中から多バイト文字が現れるファイルにも対応する。
+    ファイルはblock_sizeバイトずつ読むため、メモリ使用量はファイルサイズによらない。
+    """
+    for encoding in _candidate_encodings(path):
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            with open(path, "rb") as f:
+                while True:
+                    block = f.read(block_size)
+                    decoder.decode(block, final=not block)
+                    if not block:
+                        return encoding
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return None
+
 
 def read_file(file_path: Union[str, Path]) -> Any:
     """
@@ -44,20 +131,7 @@ def read_file(file_path: Union[str, Path]) -> Any:
     suffix = path.suffix.lower()
 
     if suffix in [".txt", ".csv"]:
-        detected_encoding = get_file_encoding(path)
-        
-        # 一般的なエンコーディングを試すリスト
-        encodings_to_try = [
-            detected_encoding,
-            'utf-8',
-            'shift_jis',
-            'euc_jp',
-            'iso2022_jp'
-        ]
-        # 重複を除き、Noneを除外
-        encodings_to_try = [enc for enc in dict.fromkeys(encodings_to_try) if enc]
-
-        for encoding in encodings_to_try:
+        for encoding in _candidate_encodings(path):
             try:
                 with open(path, "r", encoding=encoding) as f:
                     return f.read()
@@ -67,6 +141,22 @@ def read_file(file_path: Union[str, Path]) -> Any:
         raise ValueError(f"適切なエンコーディングが見つかりませんでした: {path}")
 
     elif suffix == ".xlsx":
+        import pandas as pd
         return pd.read_excel(path)
     else:
         raise ValueError(f"サポートされていないファイル形式です: {suffix}")
+
+
+def open_text_output(file_path: Union[str, Path], buffer_size: int = DEFAULT_OUTPUT_BUFFER_SIZE) -> TextIO:
+    """
+    出力用のテキストファイルをUTF-8・指定したバッファサイズで開く
+    csvモジュールで書き込めるよう、改行コードの変換は行わない (newline='')。
+
+    Args:
+        file_path: ファイルパス
+        buffer_size: 書き込みバッファのサイズ（バイト数）
+
+    Returns:
+        書き込み用のファイルオブジェクト
+    """
+    return open(file_path, "w", encoding="utf-8", newline="", buffering=buffer_size)
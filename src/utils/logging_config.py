@@ -3,6 +3,7 @@
 import logging
 import logging.handlers
 import os
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -128,4 +129,46 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         ロガーインスタンス
     """
-    return logging.getLogger(f'stock_watchlist_cli.{name}')
\ No newline at end of file
+    return logging.getLogger(f'stock_watchlist_cli.{name}')
+
+
+class ProgressLogger:
+    """
+    大量のレコードを処理する際の進捗をまとめて記録するクラス
+
+    レコードごとにはログを出力せず、interval秒ごとに処理件数を、finish()（withブロックの終了時）に
+    件数・所要時間・処理速度をINFOレベルで出力する。レコードごとの詳細はDEBUGレベルで出力すること。
+    """
+
+    def __init__(self, logger: logging.Logger, label: str, total: Optional[int] = None, interval: float = 5.0):
+        self.logger = logger
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.count = 0
+        self._started = time.perf_counter()
+        self._last_report = self._started
+
+    def __enter__(self) -> 'ProgressLogger':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.finish()
+
+    def update(self, count: int = 1) -> None:
+        """処理件数を加算し、前回の出力からinterval秒以上経過していれば進捗を出力する"""
+        self.count += count
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            if self.total:
+                self.logger.info(f"{self.label}: {self.count}/{self.total}件 ({self.count / self.total:.0%})")
+            else:
+                self.logger.info(f"{self.label}: {self.count}件")
+
+    def finish(self) -> None:
+        """処理件数・所要時間・処理速度を出力する"""
+        elapsed = time.perf_counter() - self._started
+        rate = f", {self.count / elapsed:,.0f}件/秒" if elapsed > 0 else ""
+        self.logger.info(f"{self.label}: {self.count}件を処理しました ({elapsed:.2f}秒{rate})")
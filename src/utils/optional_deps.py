@@ -0,0 +1,29 @@
+"""オプション依存パッケージの遅延インポート"""
+
+import importlib
+from types import ModuleType
+from typing import Optional
+
+
+def import_pyarrow(submodule: Optional[str] = None) -> ModuleType:
+    """
+    pyarrow（またはそのサブモジュール）をインポートする
+    pyarrowはParquet/Arrow形式を扱う場合のみ必要なため、使用時点でインポートする。
+
+    Args:
+        submodule: サブモジュール名（例: 'parquet', 'ipc'）
+
+    Returns:
+        インポートしたモジュール
+
+    Raises:
+        ImportError: pyarrowがインストールされていない場合
+    """
+    module_name = f"pyarrow.{submodule}" if submodule else "pyarrow"
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(
+            "Parquet/Arrow形式を扱うにはpyarrowが必要です。"
+            "`pip install 'stock-watchlist-cli[arrow]'` でインストールしてください。"
+        ) from e
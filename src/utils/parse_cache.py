@@ -0,0 +1,138 @@
+"""解析結果のディスクキャッシュ"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.models.stock import PlatformData
+from src.parsers.base_parser import BaseParser
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# キャッシュファイルの形式のバージョン。保存形式を変更した場合は更新する
+CACHE_FORMAT_VERSION = 1
+
+# キャッシュエントリの拡張子
+CACHE_SUFFIX = ".pickle"
+
+# ファイルのハッシュを計算する際に1回に読み込むバイト数
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ParseCache:
+    """
+    パーサーの解析結果（列データ）をディスクに保存するキャッシュ。
+    キーはファイル内容のSHA-256・パーサーのクラス名・パーサーのバージョンから生成するため、
+    ファイルの内容かパーサーが変わった場合は自動的に再解析される。
+    キャッシュ全体のサイズがmax_size_bytesを超えた場合は、最後に使用された日時の古いエントリから削除する。
+    """
+
+    def __init__(self, directory: Union[str, Path], max_size_bytes: int = 512 * 1024 * 1024):
+        self.directory = Path(directory).expanduser()
+        self.max_size_bytes = max_size_bytes
+
+    def make_key(self, parser: BaseParser, file_path: Union[str, Path]) -> str:
+        """ファイル内容とパーサーからキャッシュキーを生成する"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return f"{type(parser).__name__}-{parser.version}-{CACHE_FORMAT_VERSION}-{digest.hexdigest()}"
+
+    def get(self, key: str) -> Optional[Dict[str, List[Any]]]:
+        """キャッシュされた列データを返す。存在しない・読み込めない場合はNoneを返す"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                columns = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"キャッシュの読み込みに失敗したため削除します: {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # 最終使用日時として更新日時を更新する（LRUによる削除順に使用）
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return columns
+
+    def put(self, key: str, columns: Dict[str, List[Any]]) -> None:
+        """列データをキャッシュに保存する。保存に失敗しても例外は送出しない"""
+        temp_path = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # 書き込み途中のファイルが読まれないよう、一時ファイルに書いてから置き換える
+            with tempfile.NamedTemporaryFile('wb', dir=self.directory, suffix='.tmp', delete=False) as f:
+                temp_path = Path(f.name)
+                pickle.dump(columns, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._entry_path(key))
+        except Exception as e:
+            logger.warning(f"キャッシュの保存に失敗しました: {e}")
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def parse_columns(self, parser: BaseParser, file_path: Union[str, Path]) -> Dict[str, List[Any]]:
+        """キャッシュがあればそれを返し、なければ解析してキャッシュに保存した列データを返す"""
+        key = self.make_key(parser, file_path)
+        columns = self.get(key)
+        if columns is not None:
+            logger.debug("Parse cache hit: %s", file_path)
+            return columns
+
+        logger.debug("Parse cache miss: %s", file_path)
+        columns = parser.parse_columns(file_path)
+        self.put(key, columns)
+        return columns
+
+    def parse(self, parser: BaseParser, file_path: Union[str, Path]) -> List[PlatformData]:
+        """parser.parseと同じプラットフォームデータのリストを、キャッシュを使用して返す"""
+        key = self.make_key(parser, file_path)
+        columns = self.get(key)
+        if columns is not None:
+            logger.debug("Parse cache hit: %s", file_path)
+            return parser.columns_to_data(columns)
+
+        logger.debug("Parse cache miss: %s", file_path)
+        data = parser.parse(file_path)
+        names = list(parser.data_model.model_fields)
+        self.put(key, {name: [getattr(item, name) for item in data] for name in names})
+        return data
+
+    def evict(self) -> None:
+        """キャッシュ全体のサイズが上限を超えている場合、最後に使用された日時の古いエントリから削除する"""
+        entries = []
+        total_size = 0
+        for path in self.directory.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        if total_size <= self.max_size_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            total_size -= size
+            logger.debug("Parse cache evicted: %s", path.name)
+            if total_size <= self.max_size_bytes:
+                break
+
+    def clear(self) -> None:
+        """キャッシュを全て削除する"""
+        for path in self.directory.glob(f"*{CACHE_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}{CACHE_SUFFIX}"
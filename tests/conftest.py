@@ -0,0 +1,17 @@
+import os
+import tempfile
+
+import pytest
+
+# テスト実行中の解析キャッシュはユーザーのキャッシュディレクトリではなく一時ディレクトリに保存する
+# (設定の読み込み前に環境変数を設定する必要があるため、モジュール読み込み時に設定する)
+_cache_dir = tempfile.TemporaryDirectory(prefix="stock-cli-test-cache-")
+os.environ["STOCK_CLI_CACHE_DIR"] = _cache_dir.name
+
+from src.config.settings import get_config  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _log_file_in_tmp_path(tmp_path, monkeypatch):
+    """CLIが書き出すログファイルをリポジトリ直下ではなくテストごとの一時ディレクトリに保存する"""
+    monkeypatch.setattr(get_config().logging, 'file', str(tmp_path / "stock_cli.log"))
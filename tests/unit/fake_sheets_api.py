@@ -0,0 +1,266 @@
+"""
+テスト用のGoogle Sheets APIのローカルフェイク
+
+gspread.Clientにrequestsのセッションとして渡すと、Sheets API v4の一部のエンドポイントを
+メモリ上のスプレッドシートで処理する。受け付けたリクエストはrequestsに記録される。
+"""
+import json as jsonlib
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+import gspread
+
+SHEETS_API_PREFIX = "https://sheets.googleapis.com/v4/spreadsheets/"
+
+_CELL_RE = re.compile(r'^([A-Z]*)(\d*)$')
+
+
+class FakeResponse:
+    """requests.Responseの代わりに返すレスポンス"""
+
+    def __init__(self, status_code: int, payload: Any):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = jsonlib.dumps(payload)
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        return self._payload
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + (ord(letter) - ord('A') + 1)
+    return index
+
+
+def _parse_range(range_name: str) -> Tuple[str, int, int, Optional[int], Optional[int]]:
+    """'シート名'!A1:B2 形式の範囲を(シート名, 開始行, 開始列, 終了行, 終了列)に分解する（1始まり）"""
+    range_name = unquote(range_name)
+    if '!' in range_name:
+        title, cells = range_name.rsplit('!', 1)
+    else:
+        title, cells = range_name, ''
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+
+    if not cells:
+        return title, 1, 1, None, None
+
+    start, _, end = cells.partition(':')
+    start_col, start_row = _CELL_RE.match(start).groups()
+    if end:
+        end_col, end_row = _CELL_RE.match(end).groups()
+    else:
+        end_col, end_row = start_col, start_row
+        if start_col and start_row:
+            # 単一セルの指定は書き込み時の左上の位置として扱う
+            end_col, end_row = '', ''
+    return (
+        title,
+        int(start_row) if start_row else 1,
+        _column_index(start_col) if start_col else 1,
+        int(end_row) if end_row else None,
+        _column_index(end_col) if end_col else None,
+    )
+
+
+class FakeSheetsSession:
+    """Sheets APIのリクエストをメモリ上のスプレッドシートで処理するセッション"""
+
+    def __init__(self, latency: float = 0.0):
+        self.spreadsheets: Dict[str, Dict[str, Any]] = {}
+        # 1リクエストあたりの応答時間（並行実行のテスト用）と、同時に処理中だったリクエスト数の最大値
+        self.latency = latency
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.requests: List[Tuple[str, str]] = []
+        self._next_sheet_id = 1
+        # (URLに含まれる文字列, ステータスコード) の順に、該当するリクエストを失敗させる
+        self._failures: List[Tuple[str, int]] = []
+
+    def add_spreadsheet(self, spreadsheet_id: str, title: str = "Test Spreadsheet",
+                        sheets: Optional[Dict[str, List[List[Any]]]] = None) -> None:
+        """スプレッドシートを追加する。sheetsはシート名 -> 行データ"""
+        self.spreadsheets[spreadsheet_id] = {"title": title, "sheets": []}
+        for sheet_title, values in (sheets or {"Sheet1": []}).items():
+            self._add_sheet(spreadsheet_id, sheet_title, max(1000, len(values)), 26, values)
+
+    def fail_next(self, status_code: int, times: int = 1, endpoint: str = "") -> None:
+        """URLにendpointを含む次のtimes回のリクエストをstatus_codeのエラーにする"""
+        self._failures.extend([(endpoint, status_code)] * times)
+
+    def values(self, spreadsheet_id: str, sheet_title: str) -> List[List[Any]]:
+        """シートの値を返す"""
+        return self._find_sheet(spreadsheet_id, sheet_title)["values"]
+
+    def request(self, method: str, url: str, json: Any = None, params: Any = None, **kwargs) -> FakeResponse:
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            with self._lock:
+                return self._handle(method, url, json, params)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _handle(self, method: str, url: str, json: Any, params: Any = None) -> FakeResponse:
+        self.requests.append((method.upper(), url))
+        for index, (endpoint, status_code) in enumerate(self._failures):
+            if endpoint in url:
+                del self._failures[index]
+                return FakeResponse(status_code, {"error": {"code": status_code, "message": "Injected failure"}})
+        if not url.startswith(SHEETS_API_PREFIX):
+            return FakeResponse(404, {"error": {"code": 404, "message": f"Unknown endpoint: {url}"}})
+
+        path = url[len(SHEETS_API_PREFIX):]
+        spreadsheet_id, _, rest = path.partition('/')
+        if ':' in spreadsheet_id and not rest:
+            spreadsheet_id, _, action = spreadsheet_id.partition(':')
+            rest = f":{action}"
+        if spreadsheet_id not in self.spreadsheets:
+            return FakeResponse(404, {"error": {"code": 404, "message": "Requested entity was not found."}})
+
+        try:
+            if method.lower() == 'get' and not rest:
+                return FakeResponse(200, self._metadata(spreadsheet_id))
+            if rest == ':batchUpdate':
+                return FakeResponse(200, self._batch_update(spreadsheet_id, json))
+            if rest == 'values:batchGet':
+                return FakeResponse(200, self._values_batch_get(spreadsheet_id, (params or {})["ranges"]))
+            if rest == 'values:batchUpdate':
+                return FakeResponse(200, self._values_batch_update(spreadsheet_id, json))
+            if rest.startswith('values/'):
+                range_name = rest[len('values/'):]
+                if range_name.endswith(':clear'):
+                    return FakeResponse(200, self._values_clear(spreadsheet_id, range_name[:-len(':clear')]))
+                if method.lower() == 'get':
+                    return FakeResponse(200, self._values_get(spreadsheet_id, range_name))
+                if method.lower() == 'put':
+                    return FakeResponse(200, self._values_update(spreadsheet_id, range_name, json["values"]))
+        except KeyError as e:
+            return FakeResponse(400, {"error": {"code": 400, "message": f"Unable to parse range: {e}"}})
+        return FakeResponse(404, {"error": {"code": 404, "message": f"Unknown endpoint: {url}"}})
+
+    def _add_sheet(self, spreadsheet_id: str, title: str, rows: int, cols: int,
+                   values: Optional[List[List[Any]]] = None) -> Dict[str, Any]:
+        sheets = self.spreadsheets[spreadsheet_id]["sheets"]
+        properties = {
+            "sheetId": self._next_sheet_id,
+            "title": title,
+            "index": len(sheets),
+            "sheetType": "GRID",
+            "gridProperties": {"rowCount": rows, "columnCount": cols},
+        }
+        self._next_sheet_id += 1
+        sheets.append({"properties": properties, "values": [list(row) for row in values or []]})
+        return properties
+
+    def _find_sheet(self, spreadsheet_id: str, title: str) -> Dict[str, Any]:
+        for sheet in self.spreadsheets[spreadsheet_id]["sheets"]:
+            if sheet["properties"]["title"] == title:
+                return sheet
+        raise KeyError(title)
+
+    def _metadata(self, spreadsheet_id: str) -> Dict[str, Any]:
+        spreadsheet = self.spreadsheets[spreadsheet_id]
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "properties": {"title": spreadsheet["title"]},
+            "sheets": [{"properties": dict(sheet["properties"])} for sheet in spreadsheet["sheets"]],
+        }
+
+    def _batch_update(self, spreadsheet_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        replies = []
+        for request in body["requests"]:
+            if "addSheet" in request:
+                properties = request["addSheet"]["properties"]
+                grid = properties.get("gridProperties", {})
+                added = self._add_sheet(spreadsheet_id, properties["title"],
+                                        grid.get("rowCount", 1000), grid.get("columnCount", 26))
+                replies.append({"addSheet": {"properties": dict(added)}})
+            elif "updateSheetProperties" in request:
+                properties = request["updateSheetProperties"]["properties"]
+                for sheet in self.spreadsheets[spreadsheet_id]["sheets"]:
+                    if sheet["properties"]["sheetId"] == properties["sheetId"]:
+                        if "title" in properties:
+                            sheet["properties"]["title"] = properties["title"]
+                        if "gridProperties" in properties:
+                            sheet["properties"]["gridProperties"].update(properties["gridProperties"])
+                replies.append({})
+            else:
+                replies.append({})
+        return {"spreadsheetId": spreadsheet_id, "replies": replies}
+
+    def _values_get(self, spreadsheet_id: str, range_name: str) -> Dict[str, Any]:
+        title, start_row, start_col, end_row, end_col = _parse_range(range_name)
+        rows = self._find_sheet(spreadsheet_id, title)["values"][start_row - 1:end_row]
+        values = [row[start_col - 1:end_col] for row in rows]
+        while values and not any(cell != "" for cell in values[-1]):
+            values.pop()
+        result = {"range": unquote(range_name), "majorDimension": "ROWS"}
+        if values:
+            result["values"] = values
+        return result
+
+    def _values_batch_get(self, spreadsheet_id: str, ranges: List[str]) -> Dict[str, Any]:
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "valueRanges": [self._values_get(spreadsheet_id, range_name) for range_name in ranges],
+        }
+
+    def _values_update(self, spreadsheet_id: str, range_name: str, values: List[List[Any]]) -> Dict[str, Any]:
+        title, start_row, start_col, _, _ = _parse_range(range_name)
+        grid = self._find_sheet(spreadsheet_id, title)["values"]
+        for offset, row in enumerate(values):
+            row_index = start_row - 1 + offset
+            while len(grid) <= row_index:
+                grid.append([])
+            target = grid[row_index]
+            while len(target) < start_col - 1 + len(row):
+                target.append("")
+            target[start_col - 1:start_col - 1 + len(row)] = row
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "updatedRange": unquote(range_name),
+            "updatedRows": len(values),
+            "updatedCells": sum(len(row) for row in values),
+        }
+
+    def _values_batch_update(self, spreadsheet_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        responses = [
+            self._values_update(spreadsheet_id, data["range"], data["values"]) for data in body["data"]
+        ]
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "totalUpdatedRows": sum(response["updatedRows"] for response in responses),
+            "responses": responses,
+        }
+
+    def _values_clear(self, spreadsheet_id: str, range_name: str) -> Dict[str, Any]:
+        title, start_row, start_col, end_row, end_col = _parse_range(range_name)
+        grid = self._find_sheet(spreadsheet_id, title)["values"]
+        if start_row == 1 and start_col == 1 and end_row is None and end_col is None:
+            grid.clear()
+        else:
+            for row in grid[start_row - 1:end_row]:
+                stop = len(row) if end_col is None else min(end_col, len(row))
+                for index in range(start_col - 1, stop):
+                    row[index] = ""
+        return {"spreadsheetId": spreadsheet_id, "clearedRange": unquote(range_name)}
+
+
+def make_fake_gspread_client(session: FakeSheetsSession) -> gspread.Client:
+    """フェイクのセッションを使用する実際のgspread.Clientを生成する"""
+    return gspread.Client(auth=None, session=session)
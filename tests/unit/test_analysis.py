@@ -0,0 +1,122 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from src.analysis.portfolio import UNCLASSIFIED, analyze_portfolio, format_report
+from src.main import cli
+from src.models.batch import StockBatch
+
+
+@pytest.fixture
+def holdings_batch():
+    """保有情報・配当・グレード・52週高値安値を持つサンプルデータ"""
+    return StockBatch.from_columns({
+        'symbol': ['AAPL', 'MSFT', 'KO', 'XOM', 'NEW'],
+        'exchange': ['NASDAQ', 'NASDAQ', 'NYSE', 'NYSE', 'NYSE'],
+        'sector': ['Technology', 'Technology', 'Consumer Staples', 'Energy', None],
+        'current_price': [200.0, 500.0, 60.0, 100.0, 10.0],
+        'shares': [10.0, 2.0, 50.0, None, None],
+        'cost': [150.0, 550.0, 50.0, None, None],
+        # XOMは評価額のみ（保有株数が無い）、NEWは保有していない
+        'value': [None, None, None, 1000.0, None],
+        'yield_ttm': [0.005, None, 0.03, 0.04, None],
+        'week52_low': [150.0, 350.0, 58.0, 80.0, None],
+        'week52_high': [250.0, 505.0, 75.0, 110.0, None],
+        'valuation_grade': ['F', 'C', 'B-', 'A', None],
+    })
+
+
+class TestAnalyzePortfolio:
+    def test_totals(self, holdings_batch):
+        """評価額・取得額・損益・配当額をテスト"""
+        analysis = analyze_portfolio(holdings_batch)
+
+        assert analysis.stock_count == 5
+        assert analysis.holding_count == 4
+        assert analysis.total_value == pytest.approx(2000 + 1000 + 3000 + 1000)
+        # 取得額は保有株数と取得単価が揃っている銘柄のみ
+        assert analysis.total_cost == pytest.approx(1500 + 1100 + 2500)
+        assert analysis.unrealized_pnl == pytest.approx(500 - 100 + 500)
+        assert analysis.unrealized_return == pytest.approx(900 / 5100)
+        assert analysis.annual_income == pytest.approx(2000 * 0.005 + 3000 * 0.03 + 1000 * 0.04)
+        assert analysis.weighted_yield == pytest.approx(140 / 6000)
+
+    def test_sector_weights(self, holdings_batch):
+        """セクター比率は評価額の大きい順に並び、セクターの無い銘柄は未分類にまとめられる"""
+        weights = analyze_portfolio(holdings_batch).sector_weights
+
+        assert [(w.name, w.count) for w in weights] == [
+            ("Technology", 2), ("Consumer Staples", 1), ("Energy", 1), (UNCLASSIFIED, 1)
+        ]
+        assert weights[0].weight == pytest.approx(3000 / 7000)
+        assert weights[0].income == pytest.approx(10)
+        assert weights[3].value == 0
+        assert sum(w.weight for w in weights) == pytest.approx(1)
+
+    def test_weights_without_holdings(self):
+        """保有情報が無いウォッチリストでは銘柄数で比率を計算し、利回りは単純平均とする"""
+        batch = StockBatch.from_columns({
+            'symbol': ['A', 'B', 'C', 'D'],
+            'sector': ['Tech', 'Tech', 'Tech', 'Energy'],
+            'yield_ttm': [0.01, 0.03, None, None],
+        })
+        analysis = analyze_portfolio(batch)
+
+        assert analysis.holding_count == 0
+        assert [(w.name, w.weight) for w in analysis.sector_weights] == [("Tech", 0.75), ("Energy", 0.25)]
+        assert analysis.weighted_yield == pytest.approx(0.02)
+        assert analysis.unrealized_return is None
+
+    def test_grade_distribution(self, holdings_batch):
+        """グレードの分布はグレード順に並び、欠損とデータの無い列は含まれない"""
+        distributions = analyze_portfolio(holdings_batch).grade_distributions
+
+        assert list(distributions) == ['valuation_grade']
+        assert list(distributions['valuation_grade'].items()) == [('A', 1), ('B-', 1), ('C', 1), ('F', 1)]
+
+    def test_range_positions(self, holdings_batch):
+        """52週の高値・安値に近い銘柄が近い順に返される"""
+        analysis = analyze_portfolio(holdings_batch, top=2, near_threshold=0.05)
+
+        assert analysis.range_count == 4
+        assert [p.symbol for p in analysis.nearest_highs] == ['NASDAQ:MSFT', 'NYSE:XOM']
+        assert analysis.nearest_highs[0].below_high == pytest.approx(1 - 500 / 505)
+        assert [p.symbol for p in analysis.nearest_lows] == ['NYSE:KO', 'NYSE:XOM']
+        assert analysis.near_high_count == 1
+        assert analysis.near_low_count == 1
+        assert analysis.median_below_high == pytest.approx((1 - 100 / 110 + 0.2) / 2)
+
+    def test_empty_batch(self):
+        """空のデータでもエラーにならないことをテスト"""
+        analysis = analyze_portfolio(StockBatch.from_columns({'symbol': []}))
+
+        assert analysis.stock_count == 0
+        assert analysis.sector_weights == []
+        assert analysis.range_count == 0
+        assert format_report(analysis).startswith("銘柄数: 0")
+
+
+def test_analyze_command(tmp_path):
+    """analyzeコマンドでファイルを集計し、JSONで出力できることをテスト"""
+    input_file = tmp_path / "watchlist.txt"
+    input_file.write_text("###Tech,NASDAQ:AAPL,NASDAQ:MSFT,###Energy,NYSE:XOM", encoding="utf-8")
+    output_file = tmp_path / "analysis.json"
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ['analyze', '--input', str(input_file), '--no-cache'])
+    assert result.exit_code == 0, result.output
+    assert "銘柄数: 3（保有: 0）" in result.output
+
+    result = runner.invoke(cli, ['analyze', '--input', str(input_file), '--no-cache', '--format', 'json',
+                                 '--output', str(output_file)])
+    assert result.exit_code == 0, result.output
+    assert json.loads(output_file.read_text(encoding="utf-8"))["stock_count"] == 3
+
+
+def test_analyze_requires_one_source():
+    """--inputと--spreadsheet-idはどちらか一方のみ指定できる"""
+    result = CliRunner().invoke(cli, ['analyze'])
+
+    assert result.exit_code == 1
+    assert "どちらか一方を指定してください" in result.output
@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import pytest
+from click.testing import CliRunner
+from unittest.mock import MagicMock, patch
+
+from src.google_sheets.async_client import AsyncGoogleSheetsClient
+from src.google_sheets.auth import GoogleSheetsAuth
+from src.main import cli
+from tests.unit.fake_sheets_api import FakeSheetsSession, make_fake_gspread_client
+
+SHEET_COUNT = 12
+LATENCY = 0.05
+
+
+@pytest.fixture
+def fake_session():
+    """応答に時間がかかるSheets APIのフェイク（スプレッドシートごとに1シート）"""
+    session = FakeSheetsSession(latency=LATENCY)
+    for i in range(SHEET_COUNT):
+        session.add_spreadsheet(f"id{i}", sheets={"Stock_Data": [
+            ["Symbol", "Exchange"],
+            [f"SYM{i}", "NASDAQ"],
+        ]})
+    return session
+
+
+@pytest.fixture
+def mock_auth(fake_session):
+    auth = MagicMock(spec=GoogleSheetsAuth)
+    auth.get_gspread_client.side_effect = lambda: make_fake_gspread_client(fake_session)
+    return auth
+
+
+async def fetch(auth, targets, max_concurrency):
+    async with AsyncGoogleSheetsClient(auth, max_concurrency=max_concurrency) as client:
+        results = await client.fetch_records_many(targets)
+        return results, client.request_count
+
+
+class TestAsyncGoogleSheetsClient:
+    """AsyncGoogleSheetsClientのテスト"""
+
+    def test_fetch_many_in_order(self, mock_auth):
+        """結果は指定した順序で返る"""
+        targets = [(f"id{i}", "Stock_Data") for i in reversed(range(SHEET_COUNT))]
+
+        results, request_count = asyncio.run(fetch(mock_auth, targets, max_concurrency=4))
+
+        assert [r.spreadsheet_id for r in results] == [t[0] for t in targets]
+        assert all(r.ok for r in results)
+        assert results[0].records == [{"Symbol": f"SYM{SHEET_COUNT - 1}", "Exchange": "NASDAQ"}]
+        assert request_count == len(targets) * 3
+
+    def test_concurrency_is_bounded(self, mock_auth, fake_session):
+        """同時に実行されるリクエスト数はmax_concurrency以下に抑えられ、逐次実行より速い"""
+        targets = [(f"id{i}", "Stock_Data") for i in range(SHEET_COUNT)]
+
+        start = time.perf_counter()
+        asyncio.run(fetch(mock_auth, targets, max_concurrency=4))
+        elapsed = time.perf_counter() - start
+
+        assert 1 < fake_session.max_in_flight <= 4
+        # 逐次実行の場合は (シート数 x 3リクエスト x 応答時間) かかる
+        assert elapsed < SHEET_COUNT * 3 * LATENCY * 0.75
+
+    def test_errors_are_reported_per_sheet(self, mock_auth):
+        """取得に失敗したシートは他のシートの取得を妨げない"""
+        targets = [("id0", "Stock_Data"), ("missing", "Stock_Data"), ("id1", "NoSuchSheet")]
+
+        results, _ = asyncio.run(fetch(mock_auth, targets, max_concurrency=2))
+
+        assert [r.ok for r in results] == [True, False, False]
+        assert results[2].error
+
+    def test_invalid_concurrency(self, mock_auth):
+        with pytest.raises(ValueError):
+            AsyncGoogleSheetsClient(mock_auth, max_concurrency=0)
+
+
+def test_sheets_export_many(mock_auth, tmp_path):
+    """sheets export-manyコマンドでシートごとにファイルが出力されることをテスト"""
+    targets_file = tmp_path / "targets.txt"
+    targets_file.write_text("# チームのウォッチリスト\nid2:Stock_Data\n\nid3\n")
+    output_dir = tmp_path / "out"
+
+    with patch('src.google_sheets.auth.GoogleSheetsAuth', return_value=mock_auth):
+        result = CliRunner().invoke(cli, [
+            'sheets', 'export-many', '--sheet', 'id0', '--sheet', 'id1:Stock_Data', '--sheet', 'missing',
+            '--targets-file', str(targets_file), '--format', 'tradingview', '--output-dir', str(output_dir),
+            '-j', '3'
+        ])
+
+    assert result.exit_code == 1
+    assert "完了: 4件成功, 1件失敗" in result.output
+    assert (output_dir / "id0_Stock_Data.txt").read_text() == "NASDAQ:SYM0"
+    assert (output_dir / "id3_Stock_Data.txt").read_text() == "NASDAQ:SYM3"
+    assert not (output_dir / "missing_Stock_Data.txt").exists()
+
+
+def test_fetch_values_many(mock_auth):
+    """シートの値を並行して取得できることをテスト"""
+    async def fetch_values(targets):
+        async with AsyncGoogleSheetsClient(mock_auth, max_concurrency=4) as client:
+            return await client.fetch_values_many(targets), client.request_count
+
+    results, request_count = asyncio.run(fetch_values([("id1", "Stock_Data"), ("missing", "Stock_Data")]))
+
+    assert results[0].values == [["Symbol", "Exchange"], ["SYM1", "NASDAQ"]]
+    assert not results[1].ok
+    # open_by_key + worksheet + 全値の取得
+    assert request_count == 3 + 1
@@ -1,9 +1,11 @@
 import pytest
+import threading
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 import json
 
-from src.google_sheets.auth import GoogleSheetsAuth
+from src.google_sheets.auth import CredentialCache, GoogleSheetsAuth
 from google.oauth2.credentials import Credentials
 
 # テスト用の設定
@@ -132,4 +134,120 @@ class TestGoogleSheetsAuth:
             scopes=SCOPES
         )
         
-        assert manager.token_file.name == "token.json"
\ No newline at end of file
+        assert manager.token_file.name == "token.json"
+
+# google-authの有効期限の判定は実際の現在時刻を使うため、テストの基準時刻も現在時刻にする
+NOW = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+@pytest.fixture
+def cache():
+    """固定の現在時刻を使うテスト用のキャッシュ"""
+    return CredentialCache(refresh_margin=timedelta(minutes=5), clock=lambda: NOW)
+
+
+@pytest.fixture
+def token_auth(tmp_path, cache):
+    """有効なトークンファイルを持つGoogleSheetsAuthを作成するフィクスチャ"""
+    token_path = tmp_path / TOKEN_FILE
+    token_path.write_text(json.dumps({
+        "token": "access-token", "refresh_token": "refresh-token",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "client_id": "test_client_id", "client_secret": "test_client_secret",
+        "expiry": (NOW + timedelta(hours=1)).isoformat() + "Z",
+    }))
+    return lambda: GoogleSheetsAuth(credentials_file=str(tmp_path / CREDENTIALS_FILE),
+                                    token_file=str(token_path), scopes=SCOPES, cache=cache)
+
+
+def fake_refresh(expires_in):
+    """トークンを更新したかのように有効期限を延ばすrefreshの代わり"""
+    def refresh(self, request):
+        self.token = "refreshed-token"
+        self.expiry = NOW + expires_in
+    return refresh
+
+
+class TestCredentialCache:
+    """CredentialCacheのテスト"""
+
+    def test_credentials_loaded_once(self, token_auth, mocker):
+        """同じ認証設定ではトークンファイルを1回だけ読み込み、同じ認証情報を共有する"""
+        load = mocker.spy(Credentials, 'from_authorized_user_file')
+
+        first = token_auth().get_credentials()
+        second = token_auth().get_credentials()
+
+        assert first is second
+        assert load.call_count == 1
+
+    def test_different_scopes_are_cached_separately(self, token_auth, tmp_path, cache):
+        other = GoogleSheetsAuth(credentials_file=str(tmp_path / CREDENTIALS_FILE),
+                                 token_file=str(tmp_path / TOKEN_FILE),
+                                 scopes=SCOPES + ["https://www.googleapis.com/auth/drive"], cache=cache)
+
+        assert token_auth().get_credentials() is not other.get_credentials()
+
+    def test_refresh_before_expiry(self, token_auth, cache, mocker):
+        """有効期限がrefresh_margin以内になったトークンは事前に更新し、トークンファイルに保存する"""
+        auth = token_auth()
+        creds = auth.get_credentials()
+        refresh = mocker.patch.object(Credentials, 'refresh', autospec=True, side_effect=fake_refresh(timedelta(hours=1)))
+
+        creds.expiry = NOW + timedelta(minutes=30)
+        auth.get_credentials()
+        refresh.assert_not_called()
+
+        creds.expiry = NOW + timedelta(minutes=4)
+        assert auth.get_credentials().token == "refreshed-token"
+        refresh.assert_called_once()
+        assert json.loads(auth.token_file.read_text())["token"] == "refreshed-token"
+
+    def test_concurrent_refresh_happens_once(self, token_auth, mocker):
+        """複数スレッドから同時に取得しても、トークンの更新は1回だけ行う"""
+        auth = token_auth()
+        auth.get_credentials().expiry = NOW + timedelta(minutes=1)
+        refresh = mocker.patch.object(Credentials, 'refresh', autospec=True, side_effect=fake_refresh(timedelta(hours=1)))
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            auth.get_credentials()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        refresh.assert_called_once()
+
+    def test_gspread_clients_share_session(self, token_auth):
+        """gspreadクライアントは呼び出しごとに作成し、HTTPセッションは共有する"""
+        first = token_auth().get_gspread_client()
+        second = token_auth().get_gspread_client()
+
+        assert first is not second
+        assert first.http_client.session is second.http_client.session
+
+    def test_session_refreshes_before_request(self, token_auth, mocker):
+        """共有セッションはリクエストの送信前に有効期限を確認してトークンを更新する"""
+        auth = token_auth()
+        session = auth.get_gspread_client().http_client.session
+        auth.get_credentials().expiry = NOW + timedelta(minutes=1)
+        refresh = mocker.patch.object(Credentials, 'refresh', autospec=True, side_effect=fake_refresh(timedelta(hours=1)))
+        send = mocker.patch('requests.Session.request', return_value=MagicMock(status_code=200))
+
+        session.request("GET", "https://sheets.googleapis.com/v4/spreadsheets/dummy")
+
+        refresh.assert_called_once()
+        assert send.call_args.kwargs["headers"]["authorization"] == "Bearer refreshed-token"
+
+    def test_revoke_invalidates_cache(self, token_auth, mocker):
+        auth = token_auth()
+        creds = auth.get_credentials()
+
+        auth.revoke_credentials()
+        mocker.patch.object(auth, '_perform_oauth_flow', return_value=MagicMock(spec=Credentials, to_json=lambda: '{}'))
+
+        assert auth.get_credentials() is not creds
@@ -0,0 +1,111 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from src.converters.batch_converter import (
+    collect_input_files, convert_files, export_sheets, output_path_for, sheet_output_path
+)
+from src.converters.symbol_resolver import SymbolResolver, build_symbol_index
+from src.main import cli
+
+SAMPLE_DIR = Path(__file__).parent.parent.parent / "sample"
+TRADINGVIEW_SAMPLE = SAMPLE_DIR / "US_STOCK_012ed.txt"
+SEEKINGALPHA_SAMPLE = SAMPLE_DIR / "UsStock 2025-07-30.xlsx"
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    """TradingView/Seeking Alphaのサンプルと解析できないファイルを含むディレクトリ"""
+    directory = tmp_path / "input"
+    directory.mkdir()
+    shutil.copy(TRADINGVIEW_SAMPLE, directory / "watchlist1.txt")
+    shutil.copy(TRADINGVIEW_SAMPLE, directory / "watchlist2.txt")
+    shutil.copy(SEEKINGALPHA_SAMPLE, directory / "portfolio.xlsx")
+    (directory / "broken.xlsx").write_text("not an excel file")
+    (directory / "notes.md").write_text("ignored")
+    return directory
+
+
+class TestBatchConverter:
+    def test_collect_input_files(self, input_dir):
+        """ディレクトリ指定では対応拡張子のみ、glob指定では一致したファイルが対象になることをテスト"""
+        names = [p.name for p in collect_input_files(str(input_dir))]
+        assert names == ["broken.xlsx", "portfolio.xlsx", "watchlist1.txt", "watchlist2.txt"]
+
+        names = [p.name for p in collect_input_files(str(input_dir / "*.txt"))]
+        assert names == ["watchlist1.txt", "watchlist2.txt"]
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_convert_files(self, input_dir, tmp_path, jobs):
+        """各ファイルが変換され、失敗したファイルも結果として報告されることをテスト"""
+        output_dir = tmp_path / "output"
+        input_paths = collect_input_files(str(input_dir))
+        results = {Path(r.input_path).name: r for r in convert_files(input_paths, "csv", output_dir, jobs=jobs)}
+
+        assert set(results) == {"broken.xlsx", "portfolio.xlsx", "watchlist1.txt", "watchlist2.txt"}
+        assert not results["broken.xlsx"].ok
+        assert "ファイル形式を判定できません" in results["broken.xlsx"].error
+        assert results["watchlist1.txt"].rows == 36
+        assert results["portfolio.xlsx"].ok
+        assert Path(results["watchlist1.txt"].output_path) == output_dir / "watchlist1.csv"
+        assert (output_dir / "portfolio.csv").exists()
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_convert_files_with_resolver(self, tmp_path, jobs):
+        """銘柄索引を指定した場合、ワーカープロセスでも取引所が補完されることをテスト"""
+        build_symbol_index({"AAPL": "NASDAQ"}, tmp_path / "index.bin")
+        resolver = SymbolResolver(tmp_path / "index.bin")
+        inputs = [SEEKINGALPHA_SAMPLE, TRADINGVIEW_SAMPLE]
+        results = list(convert_files(inputs, "tradingview", tmp_path / "output", jobs=jobs, resolver=resolver))
+
+        assert all(result.ok for result in results)
+        symbols = (tmp_path / "output" / "UsStock 2025-07-30.txt").read_text().split(",")
+        assert "NASDAQ:AAPL" in symbols
+        assert "AMZN" in symbols
+
+    def test_convert_files_duplicate_output(self, tmp_path):
+        """出力ファイル名が重複する場合にエラーとなることをテスト"""
+        inputs = [tmp_path / "a.txt", tmp_path / "a.xlsx"]
+        assert output_path_for(inputs[0], tmp_path, "parquet") == tmp_path / "a.parquet"
+        with pytest.raises(ValueError, match="出力ファイル名が重複します"):
+            list(convert_files(inputs, "csv", tmp_path / "output", jobs=1))
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_export_sheets(self, tmp_path, jobs):
+        """シートごとにファイルが書き込まれ、変換できないシートは失敗として報告されることをテスト"""
+        sheet_values = {
+            "Tech": [["Symbol", "Exchange"], ["AAPL", "NASDAQ"], ["MSFT", "NASDAQ"]],
+            "Div/Income": [["Symbol", "Exchange"], ["KO", "NYSE"]],
+            "Memo": [["Note"], ["買い増し検討"]],
+        }
+        results = {r.input_path: r for r in export_sheets("sid", sheet_values, "tradingview", tmp_path, jobs=jobs)}
+
+        assert results["sid:Tech"].rows == 2
+        assert (tmp_path / "Tech.txt").read_text() == "NASDAQ:AAPL,NASDAQ:MSFT"
+        assert Path(results["sid:Div/Income"].output_path) == tmp_path / "Div_Income.txt"
+        assert not results["sid:Memo"].ok
+        assert "Symbol列がありません" in results["sid:Memo"].error
+
+    def test_export_sheets_duplicate_output(self, tmp_path):
+        """シート名から決めた出力ファイル名が重複する場合にエラーとなることをテスト"""
+        assert sheet_output_path(tmp_path, "a b", "csv", prefix="id_") == tmp_path / "id_a_b.csv"
+        with pytest.raises(ValueError, match="出力ファイル名が重複します"):
+            list(export_sheets("sid", {"a b": [], "a/b": []}, "csv", tmp_path, jobs=1))
+
+
+def test_convert_batch_command(input_dir, tmp_path):
+    """convert-batchコマンドがファイルごとの結果と集計を出力することをテスト"""
+    runner = CliRunner()
+    output_dir = tmp_path / "output"
+    result = runner.invoke(cli, ['convert-batch', '--input', str(input_dir / "*.txt"), '--to', 'tradingview',
+                                 '--output-dir', str(output_dir), '--jobs', '2'])
+    assert result.exit_code == 0
+    assert "2件成功, 0件失敗" in result.output
+    assert (output_dir / "watchlist1.txt").read_text(encoding="utf-8")
+
+    result = runner.invoke(cli, ['convert-batch', '--input', str(input_dir), '--to', 'csv',
+                                 '--output-dir', str(output_dir), '--jobs', '1'])
+    assert result.exit_code == 1
+    assert "3件成功, 1件失敗" in result.output
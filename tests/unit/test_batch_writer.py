@@ -0,0 +1,184 @@
+import pytest
+
+from src.google_sheets.batch_writer import BatchWriteError, SheetBatchWriter, TokenBucket
+from tests.unit.fake_sheets_api import FakeResponse, FakeSheetsSession, make_fake_gspread_client
+
+
+class FakeClock:
+    """sleepで時間が進むテスト用の時計"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_session():
+    session = FakeSheetsSession()
+    session.add_spreadsheet("sheet_id", sheets={"Stock_Data": [["Symbol", "Exchange"]]})
+    return session
+
+
+@pytest.fixture
+def spreadsheet(fake_session):
+    return make_fake_gspread_client(fake_session).open_by_key("sheet_id")
+
+
+@pytest.fixture
+def rows():
+    return [[f"SYM{i}", "NASDAQ"] for i in range(5)]
+
+
+def make_writer(clock, **kwargs) -> SheetBatchWriter:
+    kwargs.setdefault("batch_size", 2)
+    return SheetBatchWriter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def batch_update_requests(session: FakeSheetsSession) -> int:
+    return sum(1 for _, url in session.requests if url.endswith("values:batchUpdate"))
+
+
+class TestTokenBucket:
+    """TokenBucketのテスト"""
+
+    def test_burst_then_rate_limited(self, clock):
+        """容量分はすぐに取得でき、それ以降は補充を待つ"""
+        bucket = TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.acquire() == pytest.approx(0.5)
+        assert clock.now == pytest.approx(0.5)
+
+    def test_refill_capped_at_capacity(self, clock):
+        """長時間経過してもトークンは容量を超えて貯まらない"""
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=clock, sleep=clock.sleep)
+        clock.now = 100.0
+
+        assert bucket.acquire() == 0.0
+        assert bucket.acquire() == 0.0
+        assert bucket.acquire() == pytest.approx(1.0)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+
+
+class TestSheetBatchWriter:
+    """SheetBatchWriterのテスト"""
+
+    def test_write_in_chunks(self, clock, fake_session, spreadsheet, rows):
+        """batch_size行ずつ、values.batchUpdateで連続した範囲に書き込む"""
+        writer = make_writer(clock)
+
+        assert writer.write(spreadsheet, "Stock_Data", rows) == 5
+        assert batch_update_requests(fake_session) == 3
+        assert fake_session.values("sheet_id", "Stock_Data") == [["Symbol", "Exchange"]] + rows
+
+    def test_rate_limited(self, clock, spreadsheet):
+        """リクエストはrequests_per_minuteを超えないよう待機する"""
+        rows = [[f"SYM{i}"] for i in range(20)]
+        writer = make_writer(clock, batch_size=1, requests_per_minute=60)
+
+        writer.write(spreadsheet, "Stock_Data", rows)
+
+        # バースト分(5件)を超えた15件は1秒ずつ待機する
+        assert clock.now == pytest.approx(15.0)
+
+    def test_retry_on_rate_limit_and_server_error(self, clock, fake_session, spreadsheet, rows):
+        """429と5xxは指数バックオフで再試行する"""
+        fake_session.fail_next(429, endpoint="values:batchUpdate")
+        fake_session.fail_next(503, endpoint="values:batchUpdate")
+        writer = make_writer(clock, initial_backoff=1.0)
+
+        assert writer.write(spreadsheet, "Stock_Data", rows) == 5
+
+        assert batch_update_requests(fake_session) == 5
+        assert 1.0 <= clock.sleeps[0] < 2.0
+        assert 2.0 <= clock.sleeps[1] < 3.0
+        assert fake_session.values("sheet_id", "Stock_Data")[1:] == rows
+
+    def test_backoff_capped(self, clock, fake_session, spreadsheet, rows):
+        """待機時間はmax_backoffを超えない"""
+        fake_session.fail_next(500, times=4, endpoint="values:batchUpdate")
+        # レート制限による待機が発生しないよう上限を大きくする
+        writer = make_writer(clock, initial_backoff=4.0, max_backoff=10.0, requests_per_minute=6000)
+
+        writer.write(spreadsheet, "Stock_Data", rows)
+
+        assert 4.0 <= clock.sleeps[0] < 5.0
+        assert 8.0 <= clock.sleeps[1] < 9.0
+        assert clock.sleeps[2:] == [10.0, 10.0]
+
+    def test_non_retryable_error(self, clock, fake_session, spreadsheet, rows):
+        """429/5xx以外のエラーは再試行せずに失敗する"""
+        fake_session.fail_next(400, endpoint="values:batchUpdate")
+        writer = make_writer(clock)
+
+        with pytest.raises(BatchWriteError) as exc_info:
+            writer.write(spreadsheet, "Stock_Data", rows)
+
+        assert exc_info.value.committed_rows == 0
+        assert batch_update_requests(fake_session) == 1
+
+    def test_resume_from_last_committed_chunk(self, clock, fake_session, spreadsheet, rows, tmp_path):
+        """失敗したチャンクから書き込みを再開する"""
+        checkpoint_path = tmp_path / "checkpoint.json"
+        writer = make_writer(clock, max_retries=1, checkpoint_path=checkpoint_path)
+
+        # 2チャンク目の書き込みを再試行を含めて失敗させる
+        original_request = fake_session.request
+        calls = []
+
+        def flaky_request(method, url, **kwargs):
+            if url.endswith("values:batchUpdate"):
+                calls.append(url)
+                if len(calls) in (2, 3):
+                    return FakeResponse(503, {"error": {"code": 503, "message": "unavailable"}})
+            return original_request(method, url, **kwargs)
+
+        fake_session.request = flaky_request
+        with pytest.raises(BatchWriteError) as exc_info:
+            writer.write(spreadsheet, "Stock_Data", rows)
+        assert exc_info.value.committed_rows == 2
+        assert exc_info.value.total_rows == 5
+        checkpoint = writer.load_checkpoint()
+        assert checkpoint.committed_rows == 2
+        assert checkpoint.sheet_name == "Stock_Data"
+        # 書き込む前に再開できるかを確認できる（書き込み先とデータの両方が一致する場合のみ）
+        assert writer.resumable_checkpoint(spreadsheet.id, "Stock_Data", rows) == checkpoint
+        assert writer.resumable_checkpoint(spreadsheet.id, "Other", rows) is None
+        assert writer.resumable_checkpoint(spreadsheet.id, "Stock_Data", rows[:4]) is None
+
+        fake_session.request = original_request
+        before = batch_update_requests(fake_session)
+        assert writer.write(spreadsheet, "Stock_Data", rows, resume=True) == 3
+
+        assert batch_update_requests(fake_session) - before == 2
+        assert fake_session.values("sheet_id", "Stock_Data")[1:] == rows
+        assert not checkpoint_path.exists()
+
+    def test_resume_ignores_checkpoint_for_other_data(self, clock, fake_session, spreadsheet, rows, tmp_path):
+        """進捗と異なるデータを書き込む場合は先頭から書き込む"""
+        writer = make_writer(clock, checkpoint_path=tmp_path / "checkpoint.json")
+        fake_session.fail_next(400, endpoint="values:batchUpdate")
+        with pytest.raises(BatchWriteError):
+            writer.write(spreadsheet, "Stock_Data", rows[:1] + rows)
+
+        assert writer.write(spreadsheet, "Stock_Data", rows, resume=True) == 5
+        assert fake_session.values("sheet_id", "Stock_Data")[1:] == rows
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            SheetBatchWriter(batch_size=0)
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from src.daemon import client
+from src.daemon.protocol import send_request
+from src.daemon.server import CommandServer
+from src.main import cli
+
+WATCHLIST = "###SECTION A,NASDAQ:AAPL,NYSE:IBM\n"
+
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIXのパス長の上限（約100バイト）を超えないよう短いディレクトリを使う
+    with tempfile.TemporaryDirectory(prefix="sc") as directory:
+        yield Path(directory) / "stock-cli.sock"
+
+
+@pytest.fixture
+def server(socket_path):
+    """別スレッドで常駐プロセスのサーバーを起動するフィクスチャ"""
+    server = CommandServer(socket_path, cli)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def watchlist(tmp_path):
+    path = tmp_path / "watchlist.txt"
+    path.write_text(WATCHLIST)
+    return path
+
+
+class TestCommandServer:
+    """CommandServerのテスト"""
+
+    def test_run_matches_cli(self, server, socket_path, watchlist):
+        """常駐プロセスで実行した結果は通常のCLIの実行結果と同じになる"""
+        args = ['convert', '--from', 'tradingview', '--to', 'tradingview', '--preserve-sections', '--input']
+
+        response = send_request(socket_path, {"op": "run", "args": args + [watchlist.name],
+                                              "cwd": str(watchlist.parent)})
+
+        expected = CliRunner().invoke(cli, args + [str(watchlist)])
+        assert response["ok"]
+        assert response["exit_code"] == expected.exit_code == 0
+        assert response["stdout"] == expected.stdout
+        assert os.getcwd() != str(watchlist.parent)
+
+    def test_exit_code_and_stderr(self, server, socket_path):
+        """コマンドのエラーは終了コードと標準エラー出力で返す"""
+        response = send_request(socket_path, {"op": "run", "args": ['convert', '--to', 'csv',
+                                                                    '--input', 'missing.txt']})
+
+        assert response["exit_code"] == 2
+        assert "missing.txt" in response["stderr"]
+
+    def test_many_jobs_reuse_process(self, server, socket_path, watchlist):
+        """複数のジョブを同じプロセスで順に実行する"""
+        args = ['convert', '--to', 'csv', '--input', str(watchlist)]
+        for _ in range(5):
+            assert send_request(socket_path, {"op": "run", "args": args})["exit_code"] == 0
+
+        ping = send_request(socket_path, {"op": "ping"})
+        assert ping["pid"] == os.getpid()
+        assert ping["jobs"] == 5
+
+    def test_invalid_requests(self, server, socket_path):
+        assert not send_request(socket_path, {"op": "run", "args": ['serve']})["ok"]
+        assert not send_request(socket_path, {"op": "run", "args": "convert"})["ok"]
+        assert not send_request(socket_path, {"op": "unknown"})["ok"]
+
+    def test_second_server_is_rejected(self, server, socket_path):
+        with pytest.raises(RuntimeError, match="既に常駐プロセスが起動しています"):
+            CommandServer(socket_path, cli)
+
+    def test_stale_socket_is_replaced(self, socket_path):
+        """前回の異常終了で残ったソケットファイルは削除して起動する"""
+        stale = CommandServer(socket_path, cli)
+        stale.socket.close()
+
+        server = CommandServer(socket_path, cli)
+        server.server_close()
+        assert not socket_path.exists()
+
+
+class TestClient:
+    """シンクライアントのテスト"""
+
+    def test_run_via_server(self, server, socket_path, watchlist, capsys):
+        exit_code = client.main(['--socket', str(socket_path), 'convert', '--to', 'tradingview',
+                                 '--input', str(watchlist)])
+
+        assert exit_code == 0
+        assert capsys.readouterr().out.strip() == "NASDAQ:AAPL,NYSE:IBM"
+
+    def test_fallback_runs_locally(self, socket_path, watchlist, capsys):
+        """常駐プロセスに接続できない場合はプロセス内で実行する"""
+        exit_code = client.main(['--socket', str(socket_path), 'convert', '--to', 'tradingview',
+                                 '--input', str(watchlist)])
+
+        assert exit_code == 0
+        assert "NASDAQ:AAPL,NYSE:IBM" in capsys.readouterr().out
+
+    def test_no_fallback(self, socket_path, capsys):
+        assert client.main(['--socket', str(socket_path), '--no-fallback', 'convert']) == 1
+        assert "常駐プロセスに接続できません" in capsys.readouterr().err
+
+    def test_stop(self, socket_path):
+        server = CommandServer(socket_path, cli)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        assert client.main(['--socket', str(socket_path), '--stop']) == 0
+        thread.join(timeout=5)
+        server.server_close()
+        assert not thread.is_alive()
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from src.converters.format_converter import FormatConverter
+from src.google_sheets.field_mapping import RowSerializer, header_to_attribute, to_cell_value
+from src.models.batch import StockBatch
+from src.models.stock import StockData
+
+HEADERS = ["Symbol", "Exchange", "Company_Name", "Current_Price", "Volume", "Date_Updated", "Memo"]
+
+
+def stock(symbol: str, price=None, name=None, volume=None, date_updated=None) -> StockData:
+    return StockData(symbol=symbol, exchange="NASDAQ", full_symbol=f"NASDAQ:{symbol}", name=name,
+                     current_price=price, volume=volume, date_updated=date_updated)
+
+
+def test_header_to_attribute():
+    assert header_to_attribute("Current_Price") == "current_price"
+    assert header_to_attribute(" Company_Name ") == "name"
+
+
+class TestRowSerializer:
+    """RowSerializerのテスト"""
+
+    def test_serialize_stock_data(self):
+        """見出しの順にセルの値を並べ、Noneは空文字、日時はISO 8601形式にする"""
+        data = [
+            stock("AAPL", 190.5, "Apple Inc.", 1000, datetime(2024, 5, 1, 9, 30)),
+            stock("MSFT"),
+        ]
+
+        rows = RowSerializer(HEADERS).serialize(data)
+
+        assert rows == [
+            ["AAPL", "NASDAQ", "Apple Inc.", 190.5, 1000, "2024-05-01T09:30:00", ""],
+            ["MSFT", "NASDAQ", "", "", "", "", ""],
+        ]
+
+    def test_matches_per_cell_conversion(self):
+        """セルごとにgetattrとto_cell_valueで変換した結果と一致する"""
+        data = [stock(f"S{i}", float(i), f"Company {i}", i, datetime(2024, 1, 1)) for i in range(20)]
+        expected = [[to_cell_value(getattr(s, header_to_attribute(h), "")) for h in HEADERS] for s in data]
+
+        assert RowSerializer(HEADERS).serialize(data) == expected
+
+    def test_serialize_stock_batch(self):
+        """StockBatchからもStockDataのリストと同じ行になる"""
+        data = [stock("AAPL", 190.5, "Apple Inc.", 1000, datetime(2024, 5, 1)), stock("MSFT")]
+        serializer = RowSerializer(HEADERS)
+
+        assert serializer.serialize(StockBatch.from_stock_data(data)) == serializer.serialize(data)
+
+    def test_attributes(self):
+        assert RowSerializer(HEADERS).attributes == [
+            "symbol", "exchange", "name", "current_price", "volume", "date_updated", None
+        ]
+
+    def test_empty_data(self):
+        assert RowSerializer(HEADERS).serialize([]) == []
+
+
+def test_from_records_uses_header_aliases():
+    """from_recordsもシートの見出しの別名を解決する"""
+    records = [{"Symbol": "AAPL", "Exchange": "NASDAQ", "Company_Name": "Apple Inc."}]
+
+    assert FormatConverter().from_records(records)[0].name == "Apple Inc."
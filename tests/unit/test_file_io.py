@@ -3,7 +3,7 @@ from pathlib import Path
 import pandas as pd
 
 # この段階ではまだ存在しないモジュールをインポート
-from src.utils.file_io import read_file, get_file_encoding
+from src.utils.file_io import read_file, get_file_encoding, iter_text_chunks, DEFAULT_CHUNK_SIZE
 
 # テスト用のサンプルファイルパス
 SAMPLES_DIR = Path(__file__).parent.parent / "sample_data"
@@ -60,3 +60,21 @@ class TestFileIO:
         encoding = get_file_encoding(SEEKINGALPHA_XLSX)
         # バイナリファイルなので、特定のエンコーディングではなくNoneやbinaryが返ることを期待
         assert encoding is None or "binary" in encoding.lower()
+
+    def test_get_file_encoding_utf8(self, tmp_path):
+        """UTF-8のファイルはchardetを使わずに判定されることをテスト"""
+        path = tmp_path / "utf8.txt"
+        # サンプルの末尾で多バイト文字が切れても UTF-8 と判定される
+        path.write_bytes(("a" * 1023 + "株").encode("utf-8"))
+        assert get_file_encoding(path) == "utf-8"
+
+        path.write_bytes(b"\xef\xbb\xbfNASDAQ:AAPL")
+        assert get_file_encoding(path) == "utf-8-sig"
+
+    def test_iter_text_chunks_late_multibyte(self, tmp_path):
+        """先頭のチャンクより後に初めて多バイト文字が現れるShift-JISのファイルも読み込めることをテスト"""
+        path = tmp_path / "large_sjis.txt"
+        text = "NASDAQ:AAPL," * (DEFAULT_CHUNK_SIZE // 6) + "###米国株,NYSE:IBM"
+        path.write_bytes(text.encode("shift_jis"))
+
+        assert "".join(iter_text_chunks(path)) == text
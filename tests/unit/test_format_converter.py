@@ -1,3 +1,6 @@
+import csv
+import io
+import logging
 import pytest
 from datetime import datetime
 from pydantic import BaseModel # BaseModelをインポート
@@ -245,6 +248,20 @@ class TestFormatConverter:
         assert converted_list[0].symbol == "AAPL"
         assert converted_list[1].symbol == "MSFT"
 
+    def test_convert_list_logging(self, converter, sample_tradingview_data, caplog):
+        """INFOレベルでは変換全体の要約のみを記録し、レコードごとの詳細はDEBUGレベルで記録することをテスト"""
+        with caplog.at_level(logging.INFO):
+            converter.convert_list(sample_tradingview_data, "seekingalpha")
+        messages = [record.getMessage() for record in caplog.records]
+        assert len(messages) == 1
+        assert messages[0].startswith(f"seekingalpha形式への変換: {len(sample_tradingview_data)}件を処理しました")
+
+        caplog.clear()
+        with caplog.at_level(logging.DEBUG):
+            converter.convert_list(sample_tradingview_data, "seekingalpha")
+        assert "TradingViewDataをStockDataに変換中: AAPL" in caplog.text
+        assert "StockDataをSeekingAlphaDataに変換中: MSFT" in caplog.text
+
     def test_convert_to_csv(self, converter, sample_seekingalpha_data):
         """SeekingAlphaDataリストからCSVへの変換をテスト"""
         csv_output = converter.convert_to_csv(sample_seekingalpha_data)
@@ -260,6 +277,47 @@ class TestFormatConverter:
         assert "MSFT,Microsoft Corp.,NASDAQ,450.0" in lines[2]
         assert "GOOG,Alphabet Inc.,NASDAQ,180.0" in lines[3]
 
+    def test_convert_to_csv_quotes_values(self, converter):
+        """カンマや引用符を含む値が正しく引用符で囲まれることをテスト"""
+        data = [SeekingAlphaData(symbol="BRK.B", company_name='Berkshire Hathaway Inc., "Class B"', price=470.5)]
+        csv_output = converter.convert_to_csv(data)
+        assert '"Berkshire Hathaway Inc., ""Class B"""' in csv_output
+
+        rows = list(csv.reader(io.StringIO(csv_output)))
+        headers = list(SeekingAlphaData.model_fields.keys())
+        assert rows[0] == headers
+        row = dict(zip(headers, rows[1]))
+        assert row["company_name"] == 'Berkshire Hathaway Inc., "Class B"'
+        assert row["price"] == "470.5"
+        assert row["volume"] == ""
+
+    def test_write_csv(self, converter, sample_seekingalpha_data, tmp_path):
+        """ファイルへのCSV書き込みが文字列変換と同じ内容になることをテスト"""
+        from src.utils.file_io import open_text_output
+
+        output_path = tmp_path / "output.csv"
+        with open_text_output(output_path, buffer_size=16) as f:
+            written = converter.write_csv(sample_seekingalpha_data, f)
+
+        assert written == len(sample_seekingalpha_data)
+        assert output_path.read_text(encoding="utf-8") == converter.convert_to_csv(sample_seekingalpha_data) + "\n"
+
+        empty = io.StringIO()
+        assert converter.write_csv([], empty) == 0
+        assert empty.getvalue() == ""
+
+    @pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+    def test_write_and_read_columnar(self, converter, sample_stock_data_list, tmp_path, file_format):
+        """Parquet/Arrow形式の書き込みと読み込みでStockDataが復元されることをテスト"""
+        pytest.importorskip("pyarrow")
+        output_path = tmp_path / f"output.{file_format}"
+        writer = getattr(converter, f"write_{file_format}")
+        reader = getattr(converter, f"read_{file_format}")
+
+        assert writer(sample_stock_data_list, output_path) == len(sample_stock_data_list)
+        assert reader(output_path).to_stock_data() == sample_stock_data_list
+        assert reader(output_path, memory_map=False).to_stock_data() == sample_stock_data_list
+
     def test_convert_to_tradingview_txt(self, converter, sample_tradingview_data):
         """TradingViewDataリストからTradingViewテキストへの変換をテスト"""
         txt_output = converter.convert_to_tradingview_txt(sample_tradingview_data, preserve_sections=True)
@@ -296,4 +354,107 @@ class TestFormatConverter:
         """サポートされていないターゲットプラットフォームでの変換をテスト"""
         stock_data = sample_stock_data_list[0]
         with pytest.raises(ValueError, match="サポートされていないターゲットプラットフォームです"):
-            converter.to_platform_data(stock_data, "unsupported_platform")
\ No newline at end of file
+            converter.to_platform_data(stock_data, "unsupported_platform")
+
+    def test_to_stock_data_many(self, converter, sample_tradingview_data, sample_seekingalpha_data):
+        """一括変換が1件ずつの変換と同じ結果になることをテスト"""
+        data_list = sample_tradingview_data + sample_seekingalpha_data
+        bulk = converter.to_stock_data_many(data_list)
+        single = [converter.to_stock_data(d) for d in data_list]
+
+        exclude = {"date_added", "date_updated"}
+        assert [s.model_dump(exclude=exclude) for s in bulk] == [s.model_dump(exclude=exclude) for s in single]
+        assert all(isinstance(s, StockData) for s in bulk)
+        assert bulk[3].full_symbol == "NYSE:BRK.B"
+        assert bulk[5].name == "Apple Inc."
+
+    def test_to_stock_data_many_unsupported_type(self, converter):
+        """一括変換でサポートされていないデータ型が含まれる場合のテスト"""
+        class UnsupportedData(BaseModel):
+            pass
+
+        with pytest.raises(ValueError, match="サポートされていないデータ型です"):
+            converter.to_stock_data_many([UnsupportedData()])
+
+    def test_writers_accept_stock_batch(self, converter, sample_tradingview_data, sample_seekingalpha_data):
+        """CSV/TXTの出力がStockBatchからも同じ結果になることをテスト"""
+        tv_batch = converter.to_stock_batch(sample_tradingview_data)
+        assert converter.convert_to_tradingview_txt(tv_batch, preserve_sections=True) == \
+            converter.convert_to_tradingview_txt(sample_tradingview_data, preserve_sections=True)
+
+        sa_batch = converter.to_stock_batch(sample_seekingalpha_data)
+        sa_list = [converter.to_platform_data(s, "seekingalpha") for s in converter.to_stock_data_many(sample_seekingalpha_data)]
+        assert converter.convert_to_csv(sa_batch) == converter.convert_to_csv(sa_list)
+
+    def test_columns_to_stock_batch(self, converter):
+        """パーサーの列データからStockBatchへの変換をテスト"""
+        batch = converter.columns_to_stock_batch("seekingalpha", {
+            "symbol": ["AAPL"], "company_name": ["Apple Inc."], "price": [211.27],
+        })
+        stock = batch[0]
+        assert stock.name == "Apple Inc."
+        assert stock.current_price == 211.27
+        assert stock.source_platform == "seekingalpha"
+
+        with pytest.raises(ValueError, match="サポートされていないプラットフォームです"):
+            converter.columns_to_stock_batch("unknown", {"symbol": []})
+
+    def test_from_values(self, converter):
+        """シートの値（1行目はヘッダー）からStockBatchへの変換をテスト"""
+        values = [
+            ["Symbol", "Exchange", "Company_Name", "Current_Price", "Volume", "Date_Added", "Status", "Memo"],
+            [" aapl ", "nasdaq", "Apple Inc.", 190.5, 3000000000000, "2024-01-01T00:00:00", "", "x"],
+            ["7203", "TSE", "", "", "", "", "inactive", ""],
+            ["", "", "", "", "", "", "", ""],
+        ]
+
+        batch = converter.from_values(values)
+
+        assert len(batch) == 2
+        apple, toyota = batch.to_stock_data()
+        assert (apple.symbol, apple.exchange, apple.full_symbol) == ("AAPL", "NASDAQ", "NASDAQ:AAPL")
+        assert apple.name == "Apple Inc."
+        assert apple.current_price == 190.5
+        assert apple.volume == 3000000000000
+        assert apple.date_added == datetime(2024, 1, 1)
+        assert (apple.status, apple.source_platform) == ("active", "googlesheets")
+        assert toyota.full_symbol == "TSE:7203"
+        assert toyota.name is None
+        assert toyota.current_price is None
+        assert toyota.status == "inactive"
+
+    def test_from_values_matches_from_records(self, converter):
+        """有効なデータではfrom_recordsと同じ結果になることをテスト"""
+        headers = ["Symbol", "Exchange", "Current_Price", "Volume", "Sector", "Date_Updated"]
+        rows = [[f"S{i}", "NYSE", float(i) + 0.25, i * 100, "Technology", "2024-05-01T09:30:00"] for i in range(50)]
+
+        from_values = converter.from_values([headers] + rows).to_stock_data()
+        from_records = converter.from_records([dict(zip(headers, row)) for row in rows])
+
+        fields = ["symbol", "exchange", "full_symbol", "current_price", "volume", "sector", "date_updated",
+                  "source_platform", "status"]
+        assert [s.model_dump(include=set(fields)) for s in from_values] == \
+            [s.model_dump(include=set(fields)) for s in from_records]
+
+    def test_from_values_drops_invalid_rows(self, converter, caplog):
+        """変換できない値を含む行は警告を出して除外することをテスト"""
+        values = [
+            ["Symbol", "Exchange", "Current_Price", "Volume", "Date_Added"],
+            ["AAPL", "NASDAQ", "N/A", 100, ""],
+            ["MSFT", "NASDAQ", 410.0, 1.5, ""],
+            ["IBM", "NYSE", 180.0, 200, "yesterday"],
+            ["", "NYSE", 1.0, 1, ""],
+            ["GOOG", "NASDAQ", "172.5", "300", ""],
+        ]
+
+        batch = converter.from_values(values)
+
+        assert [s.symbol for s in batch] == ["GOOG"]
+        assert batch[0].current_price == 172.5
+        assert batch[0].volume == 300
+        assert "2行目" in caplog.text and "5行目" in caplog.text
+
+    def test_from_values_requires_symbol_column(self, converter):
+        assert len(converter.from_values([])) == 0
+        with pytest.raises(ValueError, match="Symbol列"):
+            converter.from_values([["Name"], ["Apple"]])
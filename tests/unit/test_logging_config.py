@@ -0,0 +1,50 @@
+import logging
+
+import pytest
+
+from src.utils import logging_config
+from src.utils.logging_config import ProgressLogger, _parse_size
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """ProgressLoggerが参照する時刻を進められる時計"""
+    now = [100.0]
+    monkeypatch.setattr(logging_config.time, 'perf_counter', lambda: now[0])
+    return now
+
+
+class TestProgressLogger:
+    def test_periodic_progress_and_summary(self, clock, caplog):
+        """interval秒ごとに処理件数を、終了時に件数と処理速度を記録することをテスト"""
+        logger = logging.getLogger('stock_watchlist_cli.test')
+        with caplog.at_level(logging.INFO):
+            with ProgressLogger(logger, "変換", total=400, interval=5.0) as progress:
+                progress.update(100)
+                clock[0] += 6
+                progress.update(100)
+                progress.update(200)
+                clock[0] += 2
+
+        assert [record.getMessage() for record in caplog.records] == [
+            "変換: 200/400件 (50%)",
+            "変換: 400件を処理しました (8.00秒, 50件/秒)",
+        ]
+
+    def test_no_summary_on_error(self, clock, caplog):
+        """処理中に例外が発生した場合は要約を記録しないことをテスト"""
+        logger = logging.getLogger('stock_watchlist_cli.test')
+        with caplog.at_level(logging.INFO), pytest.raises(ValueError):
+            with ProgressLogger(logger, "変換") as progress:
+                progress.update()
+                raise ValueError("error")
+
+        assert caplog.records == []
+
+
+def test_parse_size():
+    """サイズ文字列をバイト数に変換できることをテスト"""
+    assert _parse_size("10MB") == 10 * 1024 ** 2
+    assert _parse_size("500") == 500
+    with pytest.raises(ValueError):
+        _parse_size("large")
@@ -28,6 +28,18 @@ def test_convert_command_exists():
     assert result.exit_code == 0
     assert 'Usage: cli convert [OPTIONS]' in result.output
 
+def test_convert_csv_to_stdout(tmp_path, recwarn):
+    """--output未指定のCSV出力が非推奨警告なしに標準出力へ書き込まれることを確認する"""
+    watchlist = tmp_path / "watchlist.txt"
+    watchlist.write_text("NASDAQ:AAPL,NYSE:IBM")
+    runner = CliRunner()
+    result = runner.invoke(cli, ['convert', '--from', 'tradingview', '--to', 'csv', '--input', str(watchlist),
+                                 '--no-cache'])
+    assert result.exit_code == 0, result.output
+    assert 'AAPL' in result.output
+    assert 'IBM' in result.output
+    assert not [w for w in recwarn if issubclass(w.category, DeprecationWarning)]
+
 def test_sheets_command_exists():
     """sheets コマンドの骨組みが存在することを確認する"""
     runner = CliRunner()
@@ -0,0 +1,100 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.parsers.tradingview import TradingViewParser
+from src.utils.parse_cache import ParseCache, CACHE_SUFFIX
+
+
+class CountingParser(TradingViewParser):
+    """解析の呼び出し回数を数えるパーサー"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def parse(self, file_path):
+        self.calls += 1
+        return super().parse(file_path)
+
+    def parse_columns(self, file_path):
+        self.calls += 1
+        return super().parse_columns(file_path)
+
+
+@pytest.fixture
+def watchlist(tmp_path):
+    """TradingView形式のテストファイル"""
+    path = tmp_path / "watchlist.txt"
+    path.write_text("###SECTION 1,NASDAQ:AAPL,NYSE:BRK.B\nNASDAQ:MSFT", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path / "cache")
+
+
+class TestParseCache:
+    def test_parse_columns_uses_cache(self, cache, watchlist):
+        """2回目以降の解析はキャッシュから返され、パーサーが呼ばれないことをテスト"""
+        parser = CountingParser()
+        first = cache.parse_columns(parser, watchlist)
+        second = cache.parse_columns(parser, watchlist)
+        assert first == second == TradingViewParser().parse_columns(watchlist)
+        assert parser.calls == 1
+
+    def test_parse_uses_cache(self, cache, watchlist):
+        """parseの結果もキャッシュから同じデータとして復元されることをテスト"""
+        parser = CountingParser()
+        expected = TradingViewParser().parse(watchlist)
+        assert cache.parse(parser, watchlist) == expected
+        assert cache.parse(parser, watchlist) == expected
+        assert parser.calls == 1
+
+    def test_key_depends_on_content_and_version(self, cache, watchlist):
+        """ファイル内容やパーサーのバージョンが変わるとキーが変わることをテスト"""
+        parser = TradingViewParser()
+        key = cache.make_key(parser, watchlist)
+
+        parser.version = "2"
+        assert cache.make_key(parser, watchlist) != key
+
+        parser.version = TradingViewParser.version
+        watchlist.write_text("NASDAQ:TSLA", encoding="utf-8")
+        assert cache.make_key(parser, watchlist) != key
+
+    def test_corrupted_entry_is_discarded(self, cache, watchlist):
+        """壊れたキャッシュファイルは削除され、再解析されることをテスト"""
+        parser = CountingParser()
+        cache.parse_columns(parser, watchlist)
+        entry = cache.directory / f"{cache.make_key(parser, watchlist)}{CACHE_SUFFIX}"
+        entry.write_bytes(b"broken")
+
+        assert cache.get(cache.make_key(parser, watchlist)) is None
+        assert not entry.exists()
+        assert cache.parse_columns(parser, watchlist)["symbol"] == ["AAPL", "BRK.B", "MSFT"]
+        assert parser.calls == 2
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """サイズ上限を超えた場合、最後に使用された日時の古いエントリから削除されることをテスト"""
+        cache = ParseCache(tmp_path / "cache", max_size_bytes=10 ** 6)
+        payload = {"symbol": ["X" * 1000] * 100}
+        for i, key in enumerate(["old", "used", "new"]):
+            cache.put(key, payload)
+            os.utime(cache.directory / f"{key}{CACHE_SUFFIX}", (1000 + i, 1000 + i))
+        # "used"を読み込むと最終使用日時が更新される
+        assert cache.get("used") == payload
+
+        entry_size = (cache.directory / f"new{CACHE_SUFFIX}").stat().st_size
+        cache.max_size_bytes = entry_size * 2
+        cache.evict()
+        remaining = sorted(p.name for p in cache.directory.glob(f"*{CACHE_SUFFIX}"))
+        assert remaining == [f"new{CACHE_SUFFIX}", f"used{CACHE_SUFFIX}"]
+
+    def test_clear(self, cache, watchlist):
+        """clearで全てのエントリが削除されることをテスト"""
+        cache.parse_columns(TradingViewParser(), watchlist)
+        cache.clear()
+        assert list(Path(cache.directory).glob(f"*{CACHE_SUFFIX}")) == []
@@ -0,0 +1,102 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.parsers.registry import SNIFF_SIZE, ParserRegistry, registry, detect_format, create_parser
+from src.parsers.seekingalpha import SeekingAlphaParser
+from src.parsers.tradingview import TradingViewParser
+
+SAMPLE_DIR = Path(__file__).parent.parent.parent / "sample"
+TRADINGVIEW_SAMPLE = SAMPLE_DIR / "US_STOCK_012ed.txt"
+SEEKINGALPHA_SAMPLE = SAMPLE_DIR / "UsStock 2025-07-30.xlsx"
+
+
+class TestParserRegistry:
+    def test_detect_sample_files(self):
+        """サンプルファイルの形式が判定されることをテスト"""
+        assert detect_format(TRADINGVIEW_SAMPLE) == "tradingview"
+        assert detect_format(SEEKINGALPHA_SAMPLE) == "seekingalpha"
+
+    def test_detect_ignores_extension(self, tmp_path):
+        """拡張子が異なっていても内容から判定されることをテスト"""
+        renamed = tmp_path / "export.dat"
+        shutil.copy(SEEKINGALPHA_SAMPLE, renamed)
+        assert detect_format(renamed) == "seekingalpha"
+
+        watchlist = tmp_path / "watchlist.csv"
+        watchlist.write_text("###SECTION 1,NASDAQ:AAPL,NYSE:BRK.B", encoding="utf-8")
+        assert detect_format(watchlist) == "tradingview"
+
+    def test_detect_columnar_formats(self, tmp_path):
+        """Parquet/Arrowのマジックナンバーが判定されることをテスト"""
+        (tmp_path / "a.bin").write_bytes(b"PAR1" + b"\0" * 16)
+        (tmp_path / "b.bin").write_bytes(b"ARROW1" + b"\0" * 16)
+        assert detect_format(tmp_path / "a.bin") == "parquet"
+        assert detect_format(tmp_path / "b.bin") == "arrow"
+
+    def test_detect_unknown(self, tmp_path):
+        """判定できないファイルはValueErrorとなることをテスト"""
+        markdown = tmp_path / "notes.md"
+        markdown.write_text("# Notes\n### Section\nsome text", encoding="utf-8")
+        with pytest.raises(ValueError, match="ファイル形式を判定できません"):
+            detect_format(markdown)
+
+    def test_detect_reads_bounded_header(self, tmp_path, mocker):
+        """判定時にsniff_sizeを超えて読み込まないことをテスト"""
+        watchlist = tmp_path / "large.txt"
+        watchlist.write_text("NASDAQ:AAPL," * 100000, encoding="utf-8")
+        sniff = mocker.spy(TradingViewParser, "sniff")
+        small_registry = ParserRegistry(sniff_size=64)
+        small_registry.register("tradingview", "src.parsers.tradingview:TradingViewParser")
+        assert small_registry.detect(watchlist) == "tradingview"
+        assert len(sniff.call_args.args[-1]) == 64
+
+    def test_create_parser(self):
+        """形式名から対応するパーサーが生成されることをテスト"""
+        assert isinstance(create_parser("tradingview"), TradingViewParser)
+        assert isinstance(create_parser("seekingalpha"), SeekingAlphaParser)
+        with pytest.raises(ValueError, match="未サポートの入力形式"):
+            create_parser("unknown")
+
+    def test_is_supported_path(self):
+        """拡張子による対応ファイルの判定をテスト"""
+        assert registry.is_supported_path("a.TXT")
+        assert registry.is_supported_path("a.xlsx")
+        assert registry.is_supported_path("a.parquet")
+        assert not registry.is_supported_path("a.md")
+
+    def test_declared_extensions_match_parsers(self):
+        """登録時に宣言した拡張子がパーサーのサポートする拡張子と一致することをテスト"""
+        for format_name, parser_class in (("tradingview", TradingViewParser),
+                                          ("seekingalpha", SeekingAlphaParser)):
+            declared = ParserRegistry()
+            declared.register(format_name, f"{parser_class.__module__}:{parser_class.__name__}")
+            assert registry.extensions(format_name) == declared.extensions(format_name)
+
+
+class TestSniff:
+    def test_tradingview_sniff(self):
+        """TradingView形式の簡易判定をテスト"""
+        assert TradingViewParser.sniff(b"NASDAQ:AAPL")
+        assert TradingViewParser.sniff(b"\xef\xbb\xbf###SECTION 1,NASDAQ:AAPL,NYSE:BR")
+        assert TradingViewParser.sniff("NASDAQ:AAPL,NYSE:IBM".encode("utf-16"))
+        assert not TradingViewParser.sniff(b"### heading only\nno symbols here")
+        assert not TradingViewParser.sniff(b"Symbol,Price\nAAPL,211.27")
+        assert not TradingViewParser.sniff(b"")
+
+    def test_tradingview_sniff_short_file(self, tmp_path):
+        """ファイル全体が判定範囲に収まる場合は、末尾の項目も判定に使うことをテスト"""
+        assert TradingViewParser.sniff(b"###Tech,NASDAQ:AAPL")
+        watchlist = tmp_path / "w.txt"
+        watchlist.write_text("###Tech,NASDAQ:AAPL", encoding="utf-8")
+        assert detect_format(watchlist) == "tradingview"
+        # 判定範囲いっぱいに読み込んだ場合、途切れている可能性のある末尾の項目は使わない
+        header = b"###Tech," + b" " * (SNIFF_SIZE - len(b"###Tech,NASDAQ:AAPL")) + b"NASDAQ:AAPL"
+        assert not TradingViewParser.sniff(header)
+
+    def test_seekingalpha_sniff(self):
+        """Excelワークブックの簡易判定をテスト"""
+        assert SeekingAlphaParser.sniff(SEEKINGALPHA_SAMPLE.read_bytes()[:16])
+        assert SeekingAlphaParser.sniff(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1rest")
+        assert not SeekingAlphaParser.sniff(b"NASDAQ:AAPL")
@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pytest
+
+from src.converters.format_converter import FormatConverter
+from src.models.platform_mapping import (
+    PLATFORM_MAPPINGS, PlatformMapping, from_stock_plan, platform_for_model, register_platform_mapping,
+    to_stock_plan
+)
+from src.models.stock import PlatformData, SeekingAlphaData, StockData, TradingViewData
+
+
+class FinvizData(PlatformData):
+    """テスト用のプラットフォームのデータ（StockDataに無いフィールドを含む）"""
+    symbol: str
+    ticker_exchange: Optional[str] = None
+    company: Optional[str] = None
+    last: Optional[float] = None
+    screener_only: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.model_dump(exclude_none=True)
+
+
+@pytest.fixture
+def finviz_mapping():
+    """テスト用のプラットフォームの対応表を登録し、終了後に削除する"""
+    mapping = register_platform_mapping(PlatformMapping(
+        platform='finviz',
+        model=FinvizData,
+        renames={'ticker_exchange': 'exchange', 'company': 'name', 'last': 'current_price'},
+        constants={'source_platform': 'finviz', 'status': 'active'},
+    ))
+    yield mapping
+    del PLATFORM_MAPPINGS['finviz']
+    to_stock_plan.cache_clear()
+    from_stock_plan.cache_clear()
+
+
+class TestPlatformMapping:
+    def test_plan_is_compiled_once(self):
+        """変換手順はプラットフォームごとに1回だけ組み立てられることをテスト"""
+        assert to_stock_plan('seekingalpha') is to_stock_plan('seekingalpha')
+        assert from_stock_plan('tradingview') is from_stock_plan('tradingview')
+
+    def test_platform_for_model(self):
+        """データモデルから対応するプラットフォームを引けることをテスト"""
+        assert platform_for_model(TradingViewData) == 'tradingview'
+        assert platform_for_model(SeekingAlphaData) == 'seekingalpha'
+        assert platform_for_model(StockData) is None
+
+    def test_to_stock_record(self):
+        """名前の異なるフィールドが読み替えられ、固定値と日時が設定されることをテスト"""
+        now = datetime(2025, 1, 1)
+        record = to_stock_plan('tradingview').record(
+            TradingViewData(symbol="AAPL", exchange="NASDAQ", section="Tech"), now)
+
+        assert record == {
+            'symbol': 'AAPL', 'exchange': 'NASDAQ', 'tradingview_section': 'Tech',
+            'source_platform': 'tradingview', 'status': 'active', 'date_added': now, 'date_updated': now,
+        }
+
+    def test_columns(self):
+        """列データのフィールド名を読み替え、値の列はコピーしないことをテスト"""
+        prices = [1.0, 2.0]
+        columns = to_stock_plan('seekingalpha').columns(
+            {'symbol': ['A', 'B'], 'company_name': ['a', 'b'], 'price': prices}, 2, datetime(2025, 1, 1))
+
+        assert columns['name'] == ['a', 'b']
+        assert columns['current_price'] is prices
+        assert columns['source_platform'] == ['seekingalpha'] * 2
+        assert 'price' not in columns
+
+    def test_stock_field_names(self):
+        """SeekingAlphaのフィールド名の並びがStockDataのフィールド名に読み替えられることをテスト"""
+        names = from_stock_plan('seekingalpha').stock_field_names(['symbol', 'company_name', 'price', 'shares'])
+
+        assert names == ['symbol', 'name', 'current_price', 'shares']
+
+
+def test_new_platform_needs_only_mapping(finviz_mapping):
+    """対応表を登録するだけで、新しいプラットフォームのデータを相互に変換できることをテスト"""
+    converter = FormatConverter()
+    data = FinvizData(symbol="AAPL", ticker_exchange="NASDAQ", company="Apple", last=200.0, screener_only="x")
+
+    stock_data = converter.to_stock_data(data)
+    assert stock_data.full_symbol == "NASDAQ:AAPL"
+    assert stock_data.name == "Apple"
+    assert stock_data.current_price == 200.0
+    assert stock_data.source_platform == "finviz"
+
+    batch = converter.to_stock_batch([data])
+    assert batch.to_pylist('current_price') == [200.0]
+
+    converted = converter.to_platform_data(
+        StockData(symbol="KO", exchange="NYSE", full_symbol="NYSE:KO", name="Coca-Cola"), "finviz")
+    assert converted == FinvizData(symbol="KO", ticker_exchange="NYSE", company="Coca-Cola")
+
+    columns = converter.columns_to_stock_batch("finviz", {'symbol': ['MSFT'], 'last': [500.0]})
+    assert columns.to_pylist('current_price') == [500.0]
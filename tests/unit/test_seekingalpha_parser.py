@@ -53,3 +53,113 @@ class TestSeekingAlphaParser:
         assert sample_stock.symbol is not None
         # Seeking Alphaのデータには取引所情報がないためNone
         assert sample_stock.exchange is None # SeekingAlphaDataにはexchangeフィールドがない
+
+
+class TestSeekingAlphaParserColumnar:
+    @pytest.fixture
+    def excel_data(self):
+        """列単位の変換を検証するための最小構成のワークブック"""
+        return {
+            'Summary': pd.DataFrame({
+                'Symbol': ['aapl', 'MSFT', None, 'MSFT'],
+                'Price': [211.27, '-', 1.0, 999.0],
+                'Volume': ['87860.9', 100, 5, 7],
+            }),
+            'Ratings': pd.DataFrame({
+                'Symbol': ['MSFT', 'aapl', 'MSFT'],
+                'Valuation Grade': [' B+ ', 'F', 'C'],
+            }),
+            'Holdings': pd.DataFrame({'Symbol': ['XYZ'], 'Shares': [10]}),
+            'Dividends': pd.DataFrame({
+                'Symbol': ['aapl', 'MSFT'],
+                'Ex-Div Date': ['5/2/2025', '-'],
+            }),
+        }
+
+    def test_converted_values(self, excel_data):
+        """Summaryシートの銘柄順に、各シートの先頭行の値だけが設定されることをテスト"""
+        parser = SeekingAlphaParser()
+        columnar = parser._frame_to_data(parser._build_frame(excel_data))
+        assert [d.model_dump(exclude_none=True) for d in columnar] == [
+            {'symbol': 'AAPL', 'price': 211.27, 'volume': 87860, 'valuation_grade': 'F',
+             'ex_dividend_date': '2025-05-02'},
+            {'symbol': 'MSFT', 'volume': 100, 'valuation_grade': 'B+'},
+            {'symbol': 'MSFT', 'volume': 100, 'valuation_grade': 'B+'},
+        ]
+
+    def test_missing_symbol_column(self, excel_data):
+        """SummaryシートにSymbol列が無い場合はエラーになることをテスト"""
+        excel_data['Summary'] = excel_data['Summary'].drop(columns=['Symbol'])
+        with pytest.raises(ValueError, match="Summaryシートに'Symbol'列が見つかりません"):
+            SeekingAlphaParser()._build_frame(excel_data)
+
+    def test_column_coercion(self, excel_data):
+        """重複シンボル・'-'・日付形式が列単位で正しく変換されることをテスト"""
+        parser = SeekingAlphaParser()
+        data = parser._frame_to_data(parser._build_frame(excel_data))
+        assert [d.symbol for d in data] == ['AAPL', 'MSFT', 'MSFT']
+        aapl, msft, _ = data
+        assert aapl.volume == 87860
+        assert aapl.valuation_grade == 'F'
+        assert aapl.ex_dividend_date == '2025-05-02'
+        assert msft.price is None
+        assert msft.valuation_grade == 'B+'
+        assert msft.ex_dividend_date is None
+        assert msft.shares is None
+
+    def test_parse_columns_matches_parse(self):
+        """parse_columnsがparseと同じ値を列単位で返すことをテスト"""
+        parser = SeekingAlphaParser()
+        columns = parser.parse_columns(SAMPLE_FILE)
+        parsed = parser.parse(SAMPLE_FILE)
+        assert columns["symbol"] == [d.symbol for d in parsed]
+        for field in ["price", "volume", "valuation_grade", "ex_dividend_date"]:
+            assert columns[field] == [getattr(d, field) for d in parsed]
+
+
+class TestSeekingAlphaParserWorkbookAccess:
+    @pytest.fixture
+    def workbook_path(self, tmp_path):
+        """対応表にない列と余分なシートを含むワークブック"""
+        path = tmp_path / "portfolio.xlsx"
+        with pd.ExcelWriter(path) as writer:
+            pd.DataFrame({'Symbol': ['AAPL', 'MSFT'], 'Price': [211.27, 450.0], 'Notes': ['x', 'y']}) \
+                .to_excel(writer, sheet_name='Summary', index=False)
+            pd.DataFrame({'Symbol': ['MSFT', 'AAPL'], 'Valuation Grade': ['B+', 'F']}) \
+                .to_excel(writer, sheet_name='Ratings', index=False)
+            pd.DataFrame({'Symbol': ['AAPL'], 'Shares': [10]}).to_excel(writer, sheet_name='Holdings', index=False)
+            pd.DataFrame({'Symbol': ['AAPL'], 'Frequency': ['Quarterly']}) \
+                .to_excel(writer, sheet_name='Dividends', index=False)
+            pd.DataFrame({'Other': [1]}).to_excel(writer, sheet_name='Other', index=False)
+        return path
+
+    def test_validate_format_reads_sheet_names_only(self, workbook_path, tmp_path, mocker):
+        """validate_formatがセルの内容を読み込まずにシート構成を検証することをテスト"""
+        read_excel = mocker.patch('pandas.read_excel')
+        parser = SeekingAlphaParser()
+        assert parser.validate_format(workbook_path) is True
+        assert parser.validate_format(SAMPLE_FILE) is True
+        read_excel.assert_not_called()
+
+        missing = tmp_path / "missing.xlsx"
+        pd.DataFrame({'Symbol': ['AAPL']}).to_excel(missing, sheet_name='Summary', index=False)
+        assert parser.validate_format(missing) is False
+        assert parser.validate_format(tmp_path / "not_found.xlsx") is False
+
+    def test_read_sheets_limits_columns(self, workbook_path):
+        """対応表にある列とSymbol列のみが読み込まれることをテスト"""
+        excel_data = SeekingAlphaParser()._read_sheets(workbook_path)
+        assert set(excel_data) == {'Summary', 'Ratings', 'Holdings', 'Dividends'}
+        assert list(excel_data['Summary'].columns) == ['Symbol', 'Price']
+
+        data = {d.symbol: d for d in SeekingAlphaParser().parse(workbook_path)}
+        assert data['AAPL'].valuation_grade == 'F'
+        assert data['AAPL'].shares == 10
+        assert data['MSFT'].shares is None
+
+    def test_missing_sheet(self, tmp_path):
+        """必要なシートがない場合にエラーとなることをテスト"""
+        path = tmp_path / "missing.xlsx"
+        pd.DataFrame({'Symbol': ['AAPL']}).to_excel(path, sheet_name='Summary', index=False)
+        with pytest.raises(ValueError, match="必要なシートが見つかりません"):
+            SeekingAlphaParser().parse(path)
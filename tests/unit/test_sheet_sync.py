@@ -0,0 +1,160 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.google_sheets.auth import GoogleSheetsAuth
+from src.google_sheets.batch_writer import SheetBatchWriter
+from src.google_sheets.client import GoogleSheetsClient
+from src.google_sheets.sheet_sync import plan_sync
+from src.models.stock import StockData
+from tests.unit.fake_sheets_api import FakeSheetsSession, make_fake_gspread_client
+
+HEADERS = ["Symbol", "Exchange", "Current_Price", "Date_Added", "Date_Updated", "Notes"]
+
+
+def stock(symbol: str, price: float, exchange: str = "NASDAQ") -> StockData:
+    return StockData(symbol=symbol, exchange=exchange, full_symbol=f"{exchange}:{symbol}", current_price=price)
+
+
+def sheet_row(symbol: str, price: float, exchange: str = "NASDAQ", notes: str = "") -> list:
+    return [symbol, exchange, price, "2024-01-01T00:00:00", "2024-01-01T00:00:00", notes]
+
+
+def apply_plan(values: list, plan) -> list:
+    """同期内容をシートの値に適用した結果を返す"""
+    result = [list(row) for row in values]
+    for item in plan.data:
+        start = int(item["range"].split("!A")[1]) - 1
+        for offset, row in enumerate(item["values"]):
+            while len(result) <= start + offset:
+                result.append([])
+            result[start + offset] = row
+    while result and not any(cell != "" for cell in result[-1]):
+        result.pop()
+    return result
+
+
+class TestPlanSync:
+    """plan_syncのテスト"""
+
+    def test_unchanged_rows_are_not_written(self):
+        """値が変わっていない行は書き込まない（日時の違いは無視する）"""
+        values = [HEADERS, sheet_row("AAPL", 190.0), sheet_row("MSFT", 410)]
+        plan = plan_sync("Stock_Data", values, [stock("AAPL", 190), stock("MSFT", 410.0)])
+
+        assert (plan.inserted, plan.updated, plan.deleted, plan.unchanged) == (0, 0, 0, 2)
+        assert plan.data == []
+
+    def test_updated_row_only(self):
+        """値が変わった行だけを書き込み、追加日とシート独自の列は維持する"""
+        values = [HEADERS, sheet_row("AAPL", 190.0), sheet_row("MSFT", 410.0, notes="メモ")]
+        plan = plan_sync("Stock_Data", values, [stock("AAPL", 190.0), stock("MSFT", 415.5)])
+
+        assert (plan.updated, plan.unchanged) == (1, 1)
+        assert len(plan.data) == 1
+        assert plan.data[0]["range"] == "'Stock_Data'!A3"
+        row = plan.data[0]["values"][0]
+        assert row[:3] == ["MSFT", "NASDAQ", 415.5]
+        assert row[3] == "2024-01-01T00:00:00"
+        assert row[4] != "2024-01-01T00:00:00"
+        assert row[5] == "メモ"
+
+    def test_insert_appends_rows(self):
+        """シートに無い銘柄は末尾に追加する"""
+        values = [HEADERS, sheet_row("AAPL", 190.0)]
+        plan = plan_sync("Stock_Data", values, [stock("AAPL", 190.0), stock("IBM", 180.0, "NYSE")])
+
+        assert plan.inserted == 1
+        assert plan.data[0]["range"] == "'Stock_Data'!A3"
+        assert plan.data[0]["values"][0][:3] == ["IBM", "NYSE", 180.0]
+        assert plan.row_count == 2
+
+    def test_delete_compacts_rows(self):
+        """データに無い銘柄の行は末尾の行で詰め、末尾を空にする"""
+        values = [HEADERS] + [sheet_row(symbol, 1.0) for symbol in ["A", "B", "C", "D"]]
+        plan = plan_sync("Stock_Data", values, [stock("A", 1.0), stock("C", 1.0), stock("D", 1.0)])
+
+        assert (plan.deleted, plan.unchanged) == (1, 3)
+        result = apply_plan(values, plan)
+        assert [row[0] for row in result[1:]] == ["A", "D", "C"]
+        assert plan.row_count == 3
+        assert plan.changed_rows == 2
+
+    def test_insert_reuses_deleted_rows(self):
+        """削除した行の位置に追加する銘柄を書き込む"""
+        values = [HEADERS] + [sheet_row(symbol, 1.0) for symbol in ["A", "B", "C"]]
+        plan = plan_sync("Stock_Data", values, [stock("A", 1.0), stock("C", 1.0), stock("E", 1.0)])
+
+        assert (plan.inserted, plan.deleted) == (1, 1)
+        assert plan.changed_rows == 1
+        assert [row[0] for row in apply_plan(values, plan)[1:]] == ["A", "E", "C"]
+
+    def test_duplicate_rows_are_removed(self):
+        """シート上で重複している銘柄の行は削除する"""
+        values = [HEADERS, sheet_row("A", 1.0), sheet_row("A", 1.0), sheet_row("B", 1.0)]
+        plan = plan_sync("Stock_Data", values, [stock("A", 1.0), stock("B", 1.0)])
+
+        assert plan.deleted == 1
+        assert [row[0] for row in apply_plan(values, plan)[1:]] == ["A", "B"]
+
+    def test_missing_symbol_column(self):
+        with pytest.raises(ValueError, match="Symbol列"):
+            plan_sync("Stock_Data", [["Name"]], [])
+
+
+@pytest.fixture
+def fake_session():
+    session = FakeSheetsSession()
+    rows = [sheet_row(f"S{i:04d}", float(i)) for i in range(3000)]
+    session.add_spreadsheet("sheet_id", sheets={"Stock_Data": [HEADERS] + rows})
+    return session
+
+
+@pytest.fixture
+def sheets_client(fake_session):
+    mock_auth = MagicMock(spec=GoogleSheetsAuth)
+    mock_auth.get_gspread_client.return_value = make_fake_gspread_client(fake_session)
+    return GoogleSheetsClient(mock_auth, batch_writer=SheetBatchWriter(sleep=lambda seconds: None))
+
+
+class TestSyncSheetWithData:
+    """GoogleSheetsClient.sync_sheet_with_dataのテスト"""
+
+    def test_daily_refresh_writes_changed_rows_only(self, sheets_client, fake_session):
+        """一部の価格だけが変わった場合、変更のある行だけを1回の一括更新で書き込む"""
+        data = [stock(f"S{i:04d}", float(i) + (0.5 if i % 100 == 0 else 0)) for i in range(3000)]
+
+        plan = sheets_client.sync_sheet_with_data("sheet_id", "Stock_Data", data)
+
+        assert (plan.updated, plan.unchanged) == (30, 2970)
+        # open_by_key + worksheet + 全値の取得 + 一括更新
+        assert sheets_client.request_count == 4
+        assert plan.changed_rows == 30
+        values = fake_session.values("sheet_id", "Stock_Data")
+        assert values[101][:3] == ["S0100", "NASDAQ", 100.5]
+        assert values[102][:3] == ["S0101", "NASDAQ", 101.0]
+
+    def test_dry_run_does_not_write(self, sheets_client, fake_session):
+        data = [stock("NEW", 1.0)]
+
+        plan = sheets_client.sync_sheet_with_data("sheet_id", "Stock_Data", data, dry_run=True)
+
+        assert (plan.inserted, plan.deleted) == (1, 3000)
+        assert not any(url.endswith("values:batchUpdate") for _, url in fake_session.requests)
+
+    def test_sync_creates_missing_sheet(self, sheets_client, fake_session):
+        plan = sheets_client.sync_sheet_with_data("sheet_id", "New", [stock("AAPL", 190.0)])
+
+        assert plan.inserted == 1
+        values = fake_session.values("sheet_id", "New")
+        assert values[0][0] == "Symbol"
+        assert values[1][:2] == ["AAPL", "NASDAQ"]
+
+    def test_sync_grows_sheet_when_needed(self, sheets_client, fake_session):
+        """同期後の行数がシートの行数を超える場合は行を追加する"""
+        data = [stock(f"S{i:04d}", float(i)) for i in range(3000)]
+
+        sheets_client.sync_sheet_with_data("sheet_id", "Stock_Data", data + [stock("NEW", 1.0)])
+
+        grid = fake_session.spreadsheets["sheet_id"]["sheets"][0]["properties"]["gridProperties"]
+        assert grid["rowCount"] >= 3002
+        assert fake_session.values("sheet_id", "Stock_Data")[3001][0] == "NEW"
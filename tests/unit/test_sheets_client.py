@@ -1,10 +1,11 @@
 import pytest
 from unittest.mock import MagicMock, patch
 
-from src.google_sheets.client import GoogleSheetsClient
+from src.google_sheets.client import GoogleSheetsClient, DEFAULT_HEADERS
 from src.google_sheets.auth import GoogleSheetsAuth
 from src.models.stock import StockData
 import gspread
+from tests.unit.fake_sheets_api import FakeSheetsSession, make_fake_gspread_client
 
 @pytest.fixture
 def mock_auth_manager():
@@ -83,7 +84,114 @@ class TestGoogleSheetsClient:
         
         sheets_client.update_sheet_with_data("test_id", "TestSheet", test_data)
         
-        mock_worksheet.update.assert_called_once()
-        args, _ = mock_worksheet.update.call_args
-        assert args[0] == 'A2' # 2行目から書き込み
-        assert args[1] == [["AAPL", "NASDAQ"], ["GOOG", "NASDAQ"]] # 書き込むデータ
\ No newline at end of file
+        mock_spreadsheet.values_batch_update.assert_called_once()
+        body = mock_spreadsheet.values_batch_update.call_args.args[0]
+        assert body["data"][0]["range"] == "'TestSheet'!A2" # 2行目から書き込み
+        assert body["data"][0]["values"] == [["AAPL", "NASDAQ"], ["GOOG", "NASDAQ"]] # 書き込むデータ
+
+@pytest.fixture
+def fake_session():
+    """Sheets APIのローカルフェイクを返すフィクスチャ"""
+    session = FakeSheetsSession()
+    session.add_spreadsheet("sheet_id", sheets={
+        "Stock_Data": [["Symbol", "Exchange"], ["OLD", "NYSE"]],
+    })
+    return session
+
+
+@pytest.fixture
+def fake_sheets_client(fake_session):
+    """フェイクのSheets APIに接続したGoogleSheetsClientを返すフィクスチャ"""
+    mock_auth = MagicMock(spec=GoogleSheetsAuth)
+    mock_auth.get_gspread_client.return_value = make_fake_gspread_client(fake_session)
+    return GoogleSheetsClient(mock_auth)
+
+
+class TestGoogleSheetsClientSessionCache:
+    """Spreadsheet/Worksheetのセッション内キャッシュとリクエスト数のテスト"""
+
+    test_data = [
+        StockData(symbol="AAPL", exchange="NASDAQ", full_symbol="NASDAQ:AAPL", source_platform="tradingview"),
+        StockData(symbol="GOOG", exchange="NASDAQ", full_symbol="NASDAQ:GOOG", source_platform="tradingview"),
+    ]
+
+    def test_spreadsheet_opened_once(self, fake_sheets_client, fake_session):
+        """同じスプレッドシートは1回だけ開かれる"""
+        first = fake_sheets_client.get_spreadsheet_by_id("sheet_id")
+        second = fake_sheets_client.get_spreadsheet_by_id("sheet_id")
+
+        assert first is second
+        assert fake_sheets_client.request_count == 1
+        assert len(fake_session.requests) == 1
+
+    def test_import_into_existing_sheet_request_count(self, fake_sheets_client, fake_session):
+        """既存シートへのインポート（存在確認・クリア・書き込み）のリクエスト数"""
+        client = fake_sheets_client
+        assert client.sheet_exists("sheet_id", "Stock_Data")
+        client.clear_sheet("sheet_id", "Stock_Data")
+        client.update_sheet_with_data("sheet_id", "Stock_Data", self.test_data)
+
+        # open_by_key + worksheet + clear + ヘッダーの取得 + デフォルトヘッダーの設定 + データの書き込み
+        assert client.request_count == 6
+        assert client.request_count == len(fake_session.requests)
+        values = fake_session.values("sheet_id", "Stock_Data")
+        assert values[0] == DEFAULT_HEADERS
+        assert [row[:2] for row in values[1:]] == [["AAPL", "NASDAQ"], ["GOOG", "NASDAQ"]]
+
+    def test_import_into_new_sheet_request_count(self, fake_sheets_client, fake_session):
+        """新規シートへのインポートでは作成したワークシートが再利用される"""
+        client = fake_sheets_client
+        assert not client.sheet_exists("sheet_id", "New")
+        client.create_sheet("sheet_id", "New")
+        client.update_sheet_with_data("sheet_id", "New", self.test_data)
+
+        # open_by_key + worksheet(見つからない) + add_worksheet + ヘッダーの設定 + ヘッダーの取得 + データの書き込み
+        assert client.request_count == 6
+        assert fake_session.values("sheet_id", "New")[0] == DEFAULT_HEADERS
+        assert fake_session.values("sheet_id", "New")[1][:2] == ["AAPL", "NASDAQ"]
+
+    def test_rename_sheet_updates_cache(self, fake_sheets_client, fake_session):
+        """シート名の変更がキャッシュに反映される"""
+        client = fake_sheets_client
+        worksheet = client.get_worksheet("sheet_id", "Stock_Data")
+        renamed = client.rename_sheet("sheet_id", "Stock_Data", "Renamed")
+        count = client.request_count
+
+        assert renamed is worksheet
+        assert client.get_worksheet("sheet_id", "Renamed") is worksheet
+        assert client.request_count == count
+        with pytest.raises(gspread.exceptions.WorksheetNotFound):
+            client.get_worksheet("sheet_id", "Stock_Data")
+
+    def test_invalidate(self, fake_sheets_client):
+        """invalidate後は再度APIから取得する"""
+        client = fake_sheets_client
+        client.get_worksheet("sheet_id", "Stock_Data")
+        assert client.request_count == 2
+
+        client.invalidate("sheet_id")
+        client.get_worksheet("sheet_id", "Stock_Data")
+        assert client.request_count == 4
+
+    def test_get_values_many(self, fake_sheets_client, fake_session):
+        """複数のシートの値がvalues.batchGetの1回のリクエストで取得される"""
+        client = fake_sheets_client
+        spreadsheet = client.get_spreadsheet_by_id("sheet_id")
+        spreadsheet.add_worksheet("Growth's", rows=10, cols=3)
+        fake_session.values("sheet_id", "Growth's").extend([["Symbol", "Exchange", "Notes"], ["NVDA", "NASDAQ"]])
+        count = client.request_count
+
+        values = client.get_values_many("sheet_id", ["Growth's", "Stock_Data"])
+
+        assert client.request_count == count + 1
+        assert list(values) == ["Growth's", "Stock_Data"]
+        # 行の長さはget_all_valuesと同様に揃えられる
+        assert values["Growth's"] == [["Symbol", "Exchange", "Notes"], ["NVDA", "NASDAQ", ""]]
+        assert values["Stock_Data"] == [["Symbol", "Exchange"], ["OLD", "NYSE"]]
+
+    def test_get_values_many_all_sheets(self, fake_sheets_client):
+        """シート名を省略した場合はすべてのシートを取得する（open_by_key + シート一覧 + values.batchGet）"""
+        values = fake_sheets_client.get_values_many("sheet_id")
+
+        assert list(values) == ["Stock_Data"]
+        assert fake_sheets_client.request_count == 3
@@ -3,6 +3,8 @@ from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
 from src.main import cli
+from src.config.settings import get_config
+from tests.unit.fake_sheets_api import FakeResponse, FakeSheetsSession, make_fake_gspread_client
 
 @pytest.fixture
 def runner():
@@ -12,7 +14,7 @@ def runner():
 @patch('src.converters.format_converter.FormatConverter')
 @patch('src.parsers.tradingview.TradingViewParser')
 @patch('src.google_sheets.client.GoogleSheetsClient')
-@patch('src.main.GoogleSheetsAuth') # mainの中で直接使われるため、これで正しい
+@patch('src.google_sheets.auth.GoogleSheetsAuth') # mainのコマンド実行時にインポートされるため、定義元をパッチする
 def test_sheets_import_success(mock_auth, mock_client, mock_parser, mock_converter, runner, tmp_path):
     """sheets importコマンドの成功をテスト"""
     # モックの設定
@@ -37,13 +39,11 @@ def test_sheets_import_success(mock_auth, mock_client, mock_parser, mock_convert
 
 @patch('src.converters.format_converter.FormatConverter')
 @patch('src.google_sheets.client.GoogleSheetsClient')
-@patch('src.main.GoogleSheetsAuth') # mainの中で直接使われるため、これで正しい
+@patch('src.google_sheets.auth.GoogleSheetsAuth') # mainのコマンド実行時にインポートされるため、定義元をパッチする
 def test_sheets_export_success(mock_auth, mock_client, mock_converter, runner, tmp_path):
     """sheets exportコマンドの成功をテスト"""
     # モックの設定
-    mock_client.return_value.get_all_records.return_value = [{'Symbol': 'AAPL', 'Exchange': 'NASDAQ'}]
-    mock_converter.return_value.from_records.return_value = [MagicMock()]
-    mock_converter.return_value.convert_to_tradingview_txt.return_value = "NASDAQ:AAPL"
+    mock_client.return_value.get_all_values.return_value = [['Symbol', 'Exchange'], ['AAPL', 'NASDAQ']]
 
     output_file = tmp_path / "output.txt"
 
@@ -57,12 +57,12 @@ def test_sheets_export_success(mock_auth, mock_client, mock_converter, runner, t
     assert result.exit_code == 0
     assert "正常にエクスポートが完了しました" in result.output
     assert output_file.read_text() == "NASDAQ:AAPL"
-    mock_client.return_value.get_all_records.assert_called_once()
+    mock_client.return_value.get_all_values.assert_called_once_with('dummy_id', 'Stock_Data')
 
 @patch('src.converters.format_converter.FormatConverter')
 @patch('src.parsers.tradingview.TradingViewParser')
 @patch('src.google_sheets.client.GoogleSheetsClient')
-@patch('src.main.GoogleSheetsAuth') # mainの中で直接使われるため、これで正しい
+@patch('src.google_sheets.auth.GoogleSheetsAuth') # mainのコマンド実行時にインポートされるため、定義元をパッチする
 def test_sheets_import_sheet_name_generation(mock_auth, mock_client, mock_parser, mock_converter, runner, tmp_path):
     """sheets importコマンドでシート名が指定されていない場合にファイル名からシート名が生成されることをテスト"""
     # モックの設定
@@ -89,4 +89,146 @@ def test_sheets_import_sheet_name_generation(mock_auth, mock_client, mock_parser
         'dummy_id', 'MyStockList', [mock_converter.return_value.to_stock_data.return_value]
     )
     # シートが存在しない場合は作成されることを確認
-    mock_client.return_value.create_sheet.assert_called_once_with('dummy_id', 'MyStockList')
\ No newline at end of file
+    mock_client.return_value.create_sheet.assert_called_once_with('dummy_id', 'MyStockList')
+
+def test_sheets_import_resume(runner, tmp_path, monkeypatch):
+    """書き込みが途中で失敗したインポートを--resumeで再開できることをテスト"""
+    monkeypatch.setattr(get_config().google_sheets, 'batch_size', 1)
+    session = FakeSheetsSession()
+    session.add_spreadsheet("sheet_id")
+    input_file = tmp_path / "Watch.txt"
+    input_file.write_text("NASDAQ:AAPL,NASDAQ:MSFT,NYSE:IBM")
+    args = ['sheets', 'import', '--file', str(input_file), '--format', 'tradingview',
+            '--spreadsheet-id', 'sheet_id', '--no-cache']
+
+    # 3チャンク目の書き込みを失敗させる
+    original_request = session.request
+    calls = []
+
+    def flaky_request(method, url, **kwargs):
+        if url.endswith("values:batchUpdate"):
+            calls.append(url)
+            if len(calls) == 3:
+                return FakeResponse(400, {"error": {"code": 400, "message": "bad request"}})
+        return original_request(method, url, **kwargs)
+
+    with patch('src.google_sheets.auth.GoogleSheetsAuth') as mock_auth:
+        mock_auth.return_value.get_gspread_client.side_effect = lambda: make_fake_gspread_client(session)
+
+        session.request = flaky_request
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 1
+        assert "--resume" in result.output
+        assert [row[0] for row in session.values("sheet_id", "Watch")[1:]] == ["AAPL", "MSFT"]
+
+        # 再開時は書き込み済みの2行を飛ばし、残りの行だけを書き込む
+        resumed_writes = []
+
+        def recording_request(method, url, **kwargs):
+            if url.endswith("values:batchUpdate"):
+                resumed_writes.append(kwargs)
+            return original_request(method, url, **kwargs)
+
+        session.request = recording_request
+        result = runner.invoke(cli, args + ['--resume'])
+
+    assert result.exit_code == 0, result.output
+    assert "続きから再開します" in result.output
+    assert "先頭から書き込みます" not in result.output
+    assert [row[0] for row in session.values("sheet_id", "Watch")[1:]] == ["AAPL", "MSFT", "IBM"]
+    assert len(resumed_writes) == 1
+    assert [item["range"] for item in resumed_writes[0]["json"]["data"]] == ["'Watch'!A4"]
+
+
+def test_sheets_import_resume_with_changed_input(runner, tmp_path, monkeypatch):
+    """入力が前回と異なる場合、--resumeでも再開せずに確認の上でシートをクリアして書き込むことをテスト"""
+    monkeypatch.setattr(get_config().google_sheets, 'batch_size', 1)
+    session = FakeSheetsSession()
+    session.add_spreadsheet("sheet_id")
+    input_file = tmp_path / "Watch.txt"
+    input_file.write_text("NASDAQ:AAPL,NASDAQ:MSFT,NYSE:IBM,NYSE:KO")
+    args = ['sheets', 'import', '--file', str(input_file), '--format', 'tradingview',
+            '--spreadsheet-id', 'sheet_id', '--no-cache']
+
+    # 4チャンク目の書き込みを失敗させる
+    original_request = session.request
+    calls = []
+
+    def flaky_request(method, url, **kwargs):
+        if url.endswith("values:batchUpdate"):
+            calls.append(url)
+            if len(calls) == 4:
+                return FakeResponse(400, {"error": {"code": 400, "message": "bad request"}})
+        return original_request(method, url, **kwargs)
+
+    with patch('src.google_sheets.auth.GoogleSheetsAuth') as mock_auth:
+        mock_auth.return_value.get_gspread_client.side_effect = lambda: make_fake_gspread_client(session)
+
+        session.request = flaky_request
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 1
+        assert [row[0] for row in session.values("sheet_id", "Watch")[1:]] == ["AAPL", "MSFT", "IBM"]
+
+        session.request = original_request
+        input_file.write_text("NYSE:GE")
+        result = runner.invoke(cli, args + ['--resume'], input="y\n")
+
+    assert result.exit_code == 0, result.output
+    assert "最初からインポートします" in result.output
+    assert "続きから再開します" not in result.output
+    # 前回の書き込みの行は残らない
+    assert [row[0] for row in session.values("sheet_id", "Watch")[1:]] == ["GE"]
+
+
+def test_sheets_sync(runner, tmp_path):
+    """sheets syncコマンドで変更のある行だけが書き込まれることをテスト"""
+    session = FakeSheetsSession()
+    session.add_spreadsheet("sheet_id", sheets={"Watch": [
+        ["Symbol", "Exchange", "Notes"],
+        ["AAPL", "NASDAQ", "長期保有"],
+        ["IBM", "NYSE", ""],
+    ]})
+    input_file = tmp_path / "Watch.txt"
+    input_file.write_text("NASDAQ:AAPL,NASDAQ:MSFT")
+
+    with patch('src.google_sheets.auth.GoogleSheetsAuth') as mock_auth:
+        mock_auth.return_value.get_gspread_client.side_effect = lambda: make_fake_gspread_client(session)
+        result = runner.invoke(cli, ['sheets', 'sync', '--file', str(input_file),
+                                     '--spreadsheet-id', 'sheet_id', '--no-cache'])
+
+    assert result.exit_code == 0
+    assert "追加1件, 更新0件, 削除1件, 変更なし1件" in result.output
+    assert session.values("sheet_id", "Watch")[1:] == [["AAPL", "NASDAQ", "長期保有"], ["MSFT", "NASDAQ", ""]]
+
+
+def test_sheets_export_all_sheets(runner, tmp_path):
+    """sheets export --all-sheetsで全シートを1回のvalues.batchGetで取得し、シートごとに出力することをテスト"""
+    session = FakeSheetsSession()
+    session.add_spreadsheet("sheet_id", sheets={
+        "Tech": [["Symbol", "Exchange"], ["AAPL", "NASDAQ"]],
+        "Dividend": [["Symbol", "Exchange"], ["KO", "NYSE"], ["PG", "NYSE"]],
+    })
+    output_dir = tmp_path / "out"
+
+    with patch('src.google_sheets.auth.GoogleSheetsAuth') as mock_auth:
+        mock_auth.return_value.get_gspread_client.side_effect = lambda: make_fake_gspread_client(session)
+        result = runner.invoke(cli, ['sheets', 'export', '--spreadsheet-id', 'sheet_id', '--all-sheets',
+                                     '--format', 'tradingview', '--output-dir', str(output_dir), '-j', '1'])
+
+    assert result.exit_code == 0, result.output
+    assert "完了: 2件成功, 0件失敗" in result.output
+    assert (output_dir / "Tech.txt").read_text() == "NASDAQ:AAPL"
+    assert (output_dir / "Dividend.txt").read_text() == "NYSE:KO,NYSE:PG"
+    assert [url for _, url in session.requests if 'values' in url] == [
+        "https://sheets.googleapis.com/v4/spreadsheets/sheet_id/values:batchGet"
+    ]
+
+
+def test_sheets_export_multiple_sheets_requires_output_dir(runner):
+    """複数のシートを指定した場合は--output-dirが必要"""
+    with patch('src.google_sheets.auth.GoogleSheetsAuth'):
+        result = runner.invoke(cli, ['sheets', 'export', '--spreadsheet-id', 'sheet_id', '--sheet-name', 'A',
+                                     '--sheet-name', 'B', '--format', 'csv', '--output', 'out.csv'])
+
+    assert result.exit_code == 1
+    assert "--output-dir を指定してください" in result.output
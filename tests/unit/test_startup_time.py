@@ -0,0 +1,70 @@
+"""CLIの起動時間（モジュールのインポート時間）の回帰テスト"""
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Set, Tuple
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# サブコマンドごとのインポート時間の上限（ミリ秒）。環境に合わせてSTOCK_CLI_IMPORT_BUDGET_MSで上書きできる
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('STOCK_CLI_IMPORT_BUDGET_MS', 700))
+
+# Excel・Google Sheetsを使わないコマンドで読み込まれてはならないモジュール
+HEAVY_MODULES = {'pandas', 'gspread', 'google.auth', 'google_auth_oauthlib', 'requests', 'chardet', 'pyarrow',
+                 'python_calamine'}
+
+# -X importtimeの出力行（import time: 自身の時間 | 累積時間 | モジュール名）
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def import_profile(args: List[str], cwd: Path) -> Tuple[float, Set[str]]:
+    """python -X importtimeでCLIを実行し、インポート時間の合計（ミリ秒）と読み込まれたモジュールを返す"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'src.main', *args],
+        cwd=cwd, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=str(PROJECT_ROOT)),
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        # トップレベルのインポート（インデント1文字）の累積時間の合計がインポート時間の合計になる
+        if len(match.group(3)) == 1:
+            total_us += int(match.group(2))
+    return total_us / 1000, modules
+
+
+@pytest.fixture
+def watchlist(tmp_path):
+    path = tmp_path / "watchlist.txt"
+    path.write_text("###SECTION A,NASDAQ:AAPL,NYSE:IBM\n", encoding='utf-8')
+    return path
+
+
+@pytest.mark.parametrize('args', [
+    ['--help'],
+    ['convert', '--from', 'tradingview', '--to', 'tradingview', '--input', '{watchlist}'],
+    ['convert', '--to', 'csv', '--input', '{watchlist}'],
+    ['sheets', 'export', '--help'],
+    ['serve', '--help'],
+    ['analyze', '--input', '{watchlist}', '--no-cache'],
+], ids=['help', 'convert-tradingview', 'convert-auto-csv', 'sheets-export-help', 'serve-help', 'analyze'])
+def test_subcommand_import_time(args, watchlist, tmp_path):
+    """Excel・Google Sheetsを使わないコマンドは重い依存を読み込まず、インポート時間が上限以内に収まる"""
+    args = [arg.format(watchlist=watchlist) for arg in args]
+
+    # 計測のばらつきを抑えるため、2回実行して短い方を使う
+    (elapsed, modules), (second, _) = import_profile(args, tmp_path), import_profile(args, tmp_path)
+    elapsed = min(elapsed, second)
+
+    assert not HEAVY_MODULES & modules, f"不要なモジュールが読み込まれています: {sorted(HEAVY_MODULES & modules)}"
+    assert elapsed <= IMPORT_TIME_BUDGET_MS, \
+        f"インポート時間が上限を超えています: {elapsed:.0f}ms > {IMPORT_TIME_BUDGET_MS:.0f}ms"
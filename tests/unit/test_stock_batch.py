@@ -0,0 +1,139 @@
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.models.batch import StockBatch, FIELD_KINDS
+from src.models.stock import StockData
+
+
+@pytest.fixture
+def stock_data_list():
+    """StockDataのサンプルリストを提供するフィクスチャ"""
+    now = datetime(2025, 7, 30, 9, 30)
+    return [
+        StockData(symbol="AAPL", exchange="NASDAQ", full_symbol="NASDAQ:AAPL", name="Apple Inc.",
+                  current_price=211.27, volume=87860, valuation_grade="F", date_added=now,
+                  source_platform="seekingalpha"),
+        StockData(symbol="BRK.B", exchange="NYSE", full_symbol="NYSE:BRK.B",
+                  tradingview_section="SECTION 2", source_platform="tradingview"),
+        StockData(symbol="TSLA", full_symbol="TSLA", valuation_grade="F", volume=None),
+    ]
+
+
+class TestStockBatch:
+    def test_field_kinds(self):
+        """StockDataのフィールド型から列の種類が決まることをテスト"""
+        assert FIELD_KINDS["current_price"] == "float"
+        assert FIELD_KINDS["volume"] == "int"
+        assert FIELD_KINDS["date_added"] == "datetime"
+        assert FIELD_KINDS["valuation_grade"] == "category"
+        assert FIELD_KINDS["name"] == "str"
+        assert set(FIELD_KINDS) == set(StockData.model_fields)
+
+    def test_round_trip(self, stock_data_list):
+        """StockDataのリストから生成したバッチが同じStockDataを返すことをテスト"""
+        batch = StockBatch.from_stock_data(stock_data_list)
+        assert len(batch) == 3
+        assert batch.to_stock_data() == stock_data_list
+        assert list(batch) == stock_data_list
+        assert batch[-1] == stock_data_list[-1]
+        with pytest.raises(IndexError):
+            batch[3]
+
+    def test_typed_columns(self, stock_data_list):
+        """列が型付きのNumPy配列として保持されることをテスト"""
+        batch = StockBatch.from_stock_data(stock_data_list)
+        price = batch.column("current_price")
+        assert price.dtype == np.float64
+        assert price[0] == 211.27 and math.isnan(price[1])
+        volume = batch.column("volume")
+        assert volume[0] == 87860 and math.isnan(volume[2])
+        assert batch.column("date_added").dtype == np.dtype("datetime64[us]")
+        assert batch.to_pylist("volume") == [87860, None, None]
+
+    def test_categorical_columns(self, stock_data_list):
+        """値の種類が少ない列が辞書エンコードされることをテスト"""
+        batch = StockBatch.from_stock_data(stock_data_list)
+        assert batch.categories("valuation_grade") == ["F"]
+        assert batch.codes("valuation_grade").tolist() == [0, -1, 0]
+        assert batch.column("valuation_grade").tolist() == ["F", None, "F"]
+        with pytest.raises(ValueError):
+            batch.codes("symbol")
+
+    def test_from_columns_defaults(self):
+        """列が省略されたフィールドに既定値が入り、full_symbolが生成されることをテスト"""
+        batch = StockBatch.from_columns({"symbol": ["AAPL", "7203"], "exchange": ["NASDAQ", None]})
+        assert batch.to_pylist("full_symbol") == ["NASDAQ:AAPL", "7203"]
+        assert batch.to_pylist("status") == ["active", "active"]
+        assert batch.to_pylist("name") == [None, None]
+
+    def test_from_columns_length_mismatch(self):
+        """列の長さが一致しない場合にエラーとなることをテスト"""
+        with pytest.raises(ValueError, match="長さが一致しません"):
+            StockBatch.from_columns({"symbol": ["AAPL", "MSFT"], "exchange": ["NASDAQ"]})
+
+    def test_arrow_round_trip(self, stock_data_list):
+        """pyarrow.Tableへの変換と復元で同じStockDataが得られることをテスト"""
+        pa = pytest.importorskip("pyarrow")
+        batch = StockBatch.from_stock_data(stock_data_list)
+        table = batch.to_arrow()
+
+        assert table.num_rows == 3
+        assert table.schema.field("current_price").type == pa.float64()
+        assert table.schema.field("volume").type == pa.int64()
+        assert pa.types.is_timestamp(table.schema.field("date_added").type)
+        assert pa.types.is_dictionary(table.schema.field("valuation_grade").type)
+        assert table.column("volume").null_count == 2
+        assert table.column("valuation_grade").to_pylist() == ["F", None, "F"]
+
+        assert StockBatch.from_arrow(table).to_stock_data() == stock_data_list
+
+    def test_from_arrow_missing_columns(self):
+        """不足している列が既定値で埋められ、辞書エンコードされていないカテゴリ列も読めることをテスト"""
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({
+            "symbol": ["AAPL", "TSLA"],
+            "exchange": ["NASDAQ", None],
+            "valuation_grade": ["A+", None],
+            "unknown": [1, 2],
+        })
+        batch = StockBatch.from_arrow(table)
+        assert batch.to_pylist("full_symbol") == ["NASDAQ:AAPL", "TSLA"]
+        assert batch.categories("valuation_grade") == ["A+"]
+        assert batch.to_pylist("status") == ["active", "active"]
+        assert batch[1].valuation_grade is None
+
+    def test_concat_remaps_categories(self, stock_data_list):
+        """連結したバッチでカテゴリ列のコードが統合されたカテゴリ一覧に付け替えられることをテスト"""
+        first = StockBatch.from_stock_data(stock_data_list[:2])
+        second = StockBatch.from_columns({"symbol": ["KO"], "exchange": ["NYSE"], "valuation_grade": ["B"]})
+        batch = StockBatch.concat([first, second])
+
+        assert len(batch) == 3
+        assert batch.to_pylist("exchange") == ["NASDAQ", "NYSE", "NYSE"]
+        assert batch.to_pylist("valuation_grade") == ["F", None, "B"]
+        assert batch.categories("exchange") == ["NASDAQ", "NYSE"]
+        assert batch.to_pylist("volume") == [87860, None, None]
+        assert batch.take([2, 0]).to_pylist("full_symbol") == ["NYSE:KO", "NASDAQ:AAPL"]
+
+    def test_coalesce_rows(self):
+        """グループごとに優先順で最初の欠損でない値が選ばれることをテスト"""
+        batch = StockBatch.from_columns({
+            "symbol": ["A", "A", "B", "A"],
+            "current_price": [None, 2.0, 3.0, 4.0],
+            "volume": [None, None, 7, 8],
+            "sector": ["Tech", None, None, "Energy"],
+        })
+        groups = np.array([0, 0, 1, 0])
+        merged = batch.coalesce_rows(groups, 2, order=np.array([3, 2, 1, 0]))
+
+        assert merged.to_pylist("current_price") == [4.0, 3.0]
+        assert merged.to_pylist("volume") == [8, 7]
+        assert merged.to_pylist("sector") == ["Energy", None]
+
+        merged = batch.coalesce_rows(groups, 2, order=np.arange(4))
+        assert merged.to_pylist("current_price") == [2.0, 3.0]
+        assert merged.to_pylist("sector") == ["Tech", None]
+        assert merged.with_column("full_symbol", ["X:A", "B"]).to_pylist("full_symbol") == ["X:A", "B"]
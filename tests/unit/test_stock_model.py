@@ -2,6 +2,8 @@ import pytest
 from typing import Union
 from datetime import datetime
 
+from pydantic import BaseModel
+
 from src.models.stock import StockData, TradingViewData, SeekingAlphaData, PlatformData
 
 
@@ -198,3 +200,33 @@ class TestStockDataModel:
         assert stock1 != stock3
     
 
+    def test_from_trusted_many(self):
+        """検証済みデータからの一括生成が通常の生成と同じ結果になることをテスト"""
+        now = datetime.now()
+        records = [
+            {"symbol": "AAPL", "exchange": "NASDAQ", "source_platform": "tradingview",
+             "date_added": now, "date_updated": now, "tradingview_section": "SECTION 1"},
+            {"symbol": "BRK.B", "exchange": None, "name": "Berkshire", "current_price": 450.0},
+        ]
+        trusted = StockData.from_trusted_many(records)
+        validated = [StockData(full_symbol="", **record) for record in records]
+
+        assert trusted == validated
+        assert [s.full_symbol for s in trusted] == ["NASDAQ:AAPL", "BRK.B"]
+        assert trusted[1].status == "active"
+        # 入力の辞書は変更されない
+        assert "full_symbol" not in records[0]
+
+    def test_construct_unchecked_matches_model_construct(self):
+        """内部属性を直接設定した生成結果がmodel_constructと同じ状態になることをテスト（pydanticの更新時の確認用）"""
+        values = StockData.model_construct(symbol="AAPL", exchange="NASDAQ").__dict__
+        fields_set = {"symbol", "exchange"}
+        constructed = StockData.model_construct(_fields_set=fields_set, **values)
+        unchecked = StockData._construct_unchecked(dict(values), set(fields_set))
+
+        # BaseModelのスロット（__dict__と内部属性）がすべて一致する
+        for slot in BaseModel.__slots__:
+            assert getattr(unchecked, slot) == getattr(constructed, slot), slot
+        assert unchecked == constructed
+        assert unchecked.model_fields_set == fields_set
+        assert unchecked.model_copy(update={"name": "Apple"}).name == "Apple"
@@ -0,0 +1,144 @@
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from src.config.settings import get_config
+from src.converters.symbol_resolver import (
+    SYMBOL_INDEX_FILE, SymbolResolver, build_symbol_index, load_symbol_mapping
+)
+from src.main import _parse_stock_data, cli
+from src.models.batch import StockBatch
+
+SEEKINGALPHA_SAMPLE = Path(__file__).parent.parent.parent / "sample" / "UsStock 2025-07-30.xlsx"
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    """テスト用の銘柄索引ファイル"""
+    path = tmp_path / SYMBOL_INDEX_FILE
+    build_symbol_index({"AAPL": "NASDAQ", "KO": "NYSE", "BRK.B": "NYSE", "SHOP": "TSX"}, path)
+    return path
+
+
+class TestSymbolResolver:
+    def test_lookup(self, index_path):
+        """シンボルの取引所を大文字・小文字を区別せずに引けることをテスト"""
+        resolver = SymbolResolver(index_path)
+
+        assert len(resolver) == 4
+        assert resolver.lookup("AAPL") == "NASDAQ"
+        assert resolver.lookup(" brk.b ") == "NYSE"
+        assert resolver.lookup("MSFT") is None
+
+    def test_lookup_many(self, index_path):
+        """索引に無いシンボルはfallback_exchangeになり、空のシンボルはNoneのままであることをテスト"""
+        resolver = SymbolResolver(index_path, fallback_exchange="nasdaq")
+
+        # 索引のシンボルより長いシンボルは切り詰めて一致させない
+        assert resolver.lookup_many(["SHOP", "KO", None, "", "BRK.BX", "ZZZ"]) == [
+            "TSX", "NYSE", None, None, "NASDAQ", "NASDAQ"
+        ]
+
+    def test_empty_index(self, tmp_path):
+        """銘柄の無い索引でもエラーにならないことをテスト"""
+        build_symbol_index({}, tmp_path / "empty.bin")
+
+        assert SymbolResolver(tmp_path / "empty.bin", "NYSE").lookup_many(["AAPL"]) == ["NYSE"]
+
+    def test_invalid_file(self, tmp_path):
+        """索引ファイルでない場合はエラーになることをテスト"""
+        path = tmp_path / "invalid.bin"
+        path.write_bytes(b"not an index")
+
+        with pytest.raises(ValueError, match="銘柄索引ファイルではありません"):
+            SymbolResolver(path).lookup("AAPL")
+
+    def test_pickle(self, index_path):
+        """pickleした場合は索引のパスだけが渡され、ワーカープロセスで開き直せることをテスト"""
+        resolver = SymbolResolver(index_path, "NYSE")
+        resolver.lookup("AAPL")
+        restored = pickle.loads(pickle.dumps(resolver))
+
+        assert restored._keys is None
+        assert restored.lookup("SHOP") == "TSX"
+        assert restored.fallback_exchange == "NYSE"
+
+    def test_resolve_batch(self, index_path):
+        """取引所の無い行だけ取引所とfull_symbolが補完されることをテスト"""
+        batch = StockBatch.from_columns({
+            "symbol": ["AAPL", "KO", "MSFT", "SHOP"],
+            "exchange": [None, "NASDAQ", None, None],
+        })
+        resolved, count = SymbolResolver(index_path).resolve_batch(batch)
+
+        assert count == 2
+        assert resolved.to_pylist("exchange") == ["NASDAQ", "NASDAQ", None, "TSX"]
+        assert resolved.to_pylist("full_symbol") == ["NASDAQ:AAPL", "NASDAQ:KO", "MSFT", "TSX:SHOP"]
+
+
+class TestLoadSymbolMapping:
+    def test_json(self, tmp_path):
+        """JSONのオブジェクト・配列のどちらでも読み込め、重複は最初の取引所を使うことをテスト"""
+        path = tmp_path / "mapping.json"
+        path.write_text(json.dumps({"aapl": "nasdaq", "KO": "NYSE", "EMPTY": ""}), encoding="utf-8")
+        assert load_symbol_mapping(path) == {"AAPL": "NASDAQ", "KO": "NYSE"}
+
+        path.write_text(json.dumps([{"symbol": "KO", "exchange": "NYSE"}, {"symbol": "KO", "exchange": "LSE"}]),
+                        encoding="utf-8")
+        assert load_symbol_mapping(path) == {"KO": "NYSE"}
+
+    def test_csv(self, tmp_path):
+        """ヘッダー付き・ヘッダー無しのCSVを読み込めることをテスト"""
+        path = tmp_path / "mapping.csv"
+        path.write_text("name,exchange,symbol\nApple,NASDAQ,AAPL\nCoca-Cola,NYSE,KO\n", encoding="utf-8")
+        assert load_symbol_mapping(path) == {"AAPL": "NASDAQ", "KO": "NYSE"}
+
+        path.write_text("AAPL,NASDAQ\nKO,NYSE\n", encoding="utf-8")
+        assert load_symbol_mapping(path) == {"AAPL": "NASDAQ", "KO": "NYSE"}
+
+
+def test_build_symbol_index_and_convert(tmp_path, monkeypatch):
+    """build-symbol-indexで作成した索引で、SeekingAlphaの銘柄に取引所が補完されることをテスト"""
+    monkeypatch.setattr(get_config().cache, 'directory', str(tmp_path / "cache"))
+    monkeypatch.setattr(get_config().conversion, 'fallback_exchange', "")
+    mapping = tmp_path / "mapping.json"
+    mapping.write_text(json.dumps({"AAPL": "NASDAQ", "GE": "NYSE"}), encoding="utf-8")
+    output = tmp_path / "watchlist.txt"
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ['build-symbol-index', '--input', str(mapping)])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "cache" / SYMBOL_INDEX_FILE).exists()
+
+    result = runner.invoke(cli, ['convert', '--input', str(SEEKINGALPHA_SAMPLE), '--to', 'tradingview',
+                                 '--output', str(output), '--no-cache'])
+    assert result.exit_code == 0, result.output
+    symbols = output.read_text().split(",")
+    assert "NASDAQ:AAPL" in symbols
+    assert "NYSE:GE" in symbols
+    assert "AMZN" in symbols
+
+
+def test_parse_stock_data_resolves_exchanges(monkeypatch, index_path):
+    """sheetsコマンドが使う_parse_stock_dataでも、取引所の無い銘柄に取引所が補完されることをテスト"""
+    monkeypatch.setattr(get_config().cache, 'directory', str(index_path.parent))
+    monkeypatch.setattr(get_config().conversion, 'fallback_exchange', "")
+
+    stock_data = _parse_stock_data(get_config(), str(SEEKINGALPHA_SAMPLE), 'seekingalpha', no_cache=True)
+
+    by_symbol = {stock.symbol: stock for stock in stock_data}
+    assert by_symbol["AAPL"].exchange == "NASDAQ"
+    assert by_symbol["AAPL"].full_symbol == "NASDAQ:AAPL"
+    assert by_symbol["AMZN"].exchange is None
+    assert by_symbol["AMZN"].full_symbol == "AMZN"
+
+
+def test_build_symbol_index_missing_input(tmp_path):
+    """対応表のファイルが無い場合はエラーになることをテスト"""
+    result = CliRunner().invoke(cli, ['build-symbol-index', '--input', str(tmp_path / "missing.json")])
+
+    assert result.exit_code == 1
+    assert "対応表のファイルが見つかりません" in result.output
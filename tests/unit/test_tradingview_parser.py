@@ -56,3 +56,52 @@ class TestTradingViewParser:
         assert isinstance(sample_stock, TradingViewData) # TradingViewDataを直接返すため
         assert sample_stock.symbol is not None
         assert sample_stock.exchange is not None
+
+
+class TestTradingViewParserStreaming:
+    def test_iter_parse_matches_parse(self):
+        """iter_parseがparseと同じ銘柄を返すことをテスト"""
+        parser = TradingViewParser()
+        streamed = list(parser.iter_parse(SAMPLE_FILE))
+        assert len(streamed) == 36
+        assert [d.model_dump() for d in streamed] == [d.model_dump() for d in parser.parse(SAMPLE_FILE)]
+
+    def test_chunk_boundaries(self, tmp_path):
+        """チャンク境界で項目が分断されても正しく解析されることをテスト"""
+        watchlist = tmp_path / "watchlist.txt"
+        watchlist.write_text("NASDAQ:AAPL,###Tech\nNYSE:BRK.B,\nNASDAQ:MSFT,###Other,AMEX:LEU\n", encoding="utf-8")
+        parser = TradingViewParser()
+        for chunk_size in (1, 5, 1024):
+            result = [(d.exchange, d.symbol, d.section) for d in parser.iter_parse(watchlist, chunk_size=chunk_size)]
+            assert result == [
+                ("NASDAQ", "AAPL", None),
+                ("NYSE", "BRK.B", "Tech"),
+                ("NASDAQ", "MSFT", "Tech"),
+                ("AMEX", "LEU", "Other"),
+            ]
+
+    def test_parse_groups_repeated_sections(self, tmp_path):
+        """同じセクションが再度現れた場合、parseは従来通りセクションごとにまとめることをテスト"""
+        watchlist = tmp_path / "watchlist.txt"
+        watchlist.write_text("###A,NASDAQ:AAPL,###B,NYSE:GE,###A,NASDAQ:MSFT", encoding="utf-8")
+        parser = TradingViewParser()
+        assert [d.symbol for d in parser.parse(watchlist)] == ["AAPL", "MSFT", "GE"]
+        assert [d.symbol for d in parser.iter_parse(watchlist)] == ["AAPL", "GE", "MSFT"]
+
+    def test_parse_columns_without_models(self, tmp_path, mocker):
+        """parse_columnsがTradingViewDataを生成せずに、parseと同じ順序の列データを返すことをテスト"""
+        watchlist = tmp_path / "watchlist.txt"
+        watchlist.write_text("###A,NASDAQ:AAPL,###B,NYSE:GE,###A,NASDAQ:MSFT,XETRA:SAP", encoding="utf-8")
+        parser = TradingViewParser()
+        parsed = parser.parse(watchlist)
+
+        model = mocker.patch('src.parsers.tradingview.TradingViewData')
+        columns = parser.parse_columns(watchlist)
+
+        model.assert_not_called()
+        assert columns == {
+            'symbol': [d.symbol for d in parsed],
+            'exchange': [d.exchange for d in parsed],
+            'section': [d.section for d in parsed],
+        }
+        assert columns['symbol'] == ["AAPL", "MSFT", "GE"]
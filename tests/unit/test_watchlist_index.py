@@ -0,0 +1,101 @@
+import pytest
+from click.testing import CliRunner
+
+from src.main import cli
+from src.models.batch import StockBatch
+from src.models.watchlist_index import WatchlistIndex
+
+
+@pytest.fixture
+def tradingview_batch():
+    """TradingView形式相当のデータ（取引所とセクションあり、価格なし）"""
+    return StockBatch.from_columns({
+        "symbol": ["AAPL", "KO", "AAPL", "SHOP", "SHOP"],
+        "exchange": ["NASDAQ", "NYSE", "NASDAQ", "NYSE", "TSX"],
+        "tradingview_section": ["Tech", "Dividend", "Tech", "Tech", None],
+        "source_platform": ["tradingview"] * 5,
+    })
+
+
+@pytest.fixture
+def seekingalpha_batch():
+    """SeekingAlpha形式相当のデータ（取引所なし、価格とグレードあり）"""
+    return StockBatch.from_columns({
+        "symbol": ["KO", "AAPL", "MSFT", "SHOP"],
+        "current_price": [60.0, 200.0, 500.0, 80.0],
+        "valuation_grade": ["B", "F", "C", None],
+        "source_platform": ["seekingalpha"] * 4,
+    })
+
+
+class TestWatchlistIndex:
+    def test_lookup(self, tradingview_batch):
+        """full_symbolと取引所を含まないシンボルで銘柄を引けることをテスト"""
+        index = WatchlistIndex(tradingview_batch)
+
+        assert len(index) == 4
+        assert index.position("NASDAQ:AAPL") == 0
+        assert index.position("aapl") == 0
+        assert index.get("KO").full_symbol == "NYSE:KO"
+        # 複数の取引所にあるシンボルは取引所を含まない指定では解決しない
+        assert "SHOP" not in index
+        assert "TSX:SHOP" in index
+        assert index.get("MSFT") is None
+
+    def test_secondary_indexes(self, tradingview_batch):
+        """取引所・セクションごとの銘柄を元の順序で取得できることをテスト"""
+        index = WatchlistIndex(tradingview_batch)
+
+        assert index.exchanges == ["NASDAQ", "NYSE", "TSX"]
+        assert index.rows_by_exchange("nyse").to_pylist("symbol") == ["KO", "SHOP"]
+        assert index.sections == ["Tech", "Dividend"]
+        assert index.rows_by_section("Tech").to_pylist("full_symbol") == ["NASDAQ:AAPL", "NASDAQ:AAPL", "NYSE:SHOP"]
+        assert len(index.rows_by_section("Unknown")) == 0
+
+    def test_merge(self, tradingview_batch, seekingalpha_batch):
+        """銘柄ごとに1行に統合され、各フィールドは優先するソースの値が採用されることをテスト"""
+        merged = WatchlistIndex.merge([tradingview_batch, seekingalpha_batch]).batch
+
+        # 最初に現れた順。取引所の無いSHOPは解決できないため別の銘柄として残る
+        assert merged.to_pylist("full_symbol") == ["NASDAQ:AAPL", "NYSE:KO", "NYSE:SHOP", "TSX:SHOP", "MSFT", "SHOP"]
+        assert merged.to_pylist("exchange") == ["NASDAQ", "NYSE", "NYSE", "TSX", None, None]
+        assert merged.to_pylist("current_price") == [200.0, 60.0, None, None, 500.0, 80.0]
+        assert merged.to_pylist("valuation_grade") == ["F", "B", None, None, "C", None]
+        assert merged.to_pylist("tradingview_section") == ["Tech", "Dividend", "Tech", None, None, None]
+        assert merged.to_pylist("source_platform")[:2] == ["tradingview", "tradingview"]
+        assert merged[0].full_symbol == "NASDAQ:AAPL"
+
+    def test_merge_precedence(self, tradingview_batch, seekingalpha_batch):
+        """precedence='last'では後に指定したソースの値が優先されることをテスト"""
+        merged = WatchlistIndex.merge([tradingview_batch, seekingalpha_batch], precedence="last").batch
+
+        assert merged.to_pylist("source_platform")[:2] == ["seekingalpha", "seekingalpha"]
+        # 後のソースに値が無いフィールドは前のソースの値を使う
+        assert merged.to_pylist("exchange")[:2] == ["NASDAQ", "NYSE"]
+        with pytest.raises(ValueError, match="precedence"):
+            WatchlistIndex.merge([tradingview_batch], precedence="newest")
+
+    def test_merge_single_source_deduplicates(self, tradingview_batch):
+        """1つのソースでも重複した銘柄は1行にまとめられることをテスト"""
+        index = WatchlistIndex.merge([tradingview_batch])
+
+        assert len(index.batch) == len(index) == 4
+
+
+def test_convert_merge(tmp_path):
+    """convert --mergeで複数のファイルが1つの一覧に統合されることをテスト"""
+    first = tmp_path / "a.txt"
+    first.write_text("###Tech,NASDAQ:AAPL,NASDAQ:MSFT", encoding="utf-8")
+    second = tmp_path / "b.txt"
+    second.write_text("NASDAQ:MSFT,NYSE:KO", encoding="utf-8")
+    output = tmp_path / "merged.txt"
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ['convert', '--merge', str(first), str(second), '--to', 'tradingview',
+                                 '--output', str(output), '--no-cache'])
+    assert result.exit_code == 0, result.output
+    assert output.read_text() == "NASDAQ:AAPL,NASDAQ:MSFT,NYSE:KO"
+
+    result = runner.invoke(cli, ['convert', '--input', str(first), str(second), '--to', 'csv'])
+    assert result.exit_code == 1
+    assert "--merge を指定してください" in result.output